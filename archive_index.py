@@ -0,0 +1,148 @@
+# archive_index.py - 已分析样本及其 TOC 的本地 SQLite 索引
+import os
+import time
+import sqlite3
+from contextlib import closing
+
+from pyi_archive import ScanInfo
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    sha256 TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    pyinst_ver INTEGER,
+    pyinstaller_hint TEXT,
+    pyver TEXT,
+    pylib_name TEXT,
+    entry_points TEXT,
+    pyz_size INTEGER,
+    encrypted INTEGER,
+    member_count INTEGER,
+    scan_error TEXT,
+    indexed_at REAL,
+    extract_status TEXT,
+    extract_message TEXT,
+    extract_dir TEXT,
+    extracted_at REAL
+);
+CREATE INDEX IF NOT EXISTS samples_path ON samples (path);
+CREATE TABLE IF NOT EXISTS members (
+    sha256 TEXT NOT NULL,
+    archive TEXT NOT NULL,
+    name TEXT NOT NULL,
+    type_code TEXT,
+    position INTEGER,
+    stored_size INTEGER,
+    raw_size INTEGER,
+    compressed INTEGER
+);
+CREATE INDEX IF NOT EXISTS members_sample ON members (sha256);
+CREATE INDEX IF NOT EXISTS members_name ON members (name);
+"""
+
+SAMPLE_COLUMNS = ('sha256', 'path', 'size', 'mtime_ns', 'pyinst_ver', 'pyinstaller_hint', 'pyver',
+                  'pylib_name', 'entry_points', 'pyz_size', 'encrypted', 'member_count', 'scan_error')
+
+
+class ArchiveIndex:
+    """按文件 SHA-256 记录样本的 cookie 信息、完整 TOC 与解包结果
+
+    无法解析的样本同样记录, scan_error 为解析错误, 再次扫描时不必重新读取。
+    每次操作使用独立连接, 解包线程与界面线程可以同时访问。
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        with closing(self.connect()) as conn, conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            conn.executescript(SCHEMA)
+            if 0 < version < 2:
+                # 版本 1 只记录解析成功的样本
+                conn.execute("ALTER TABLE samples ADD COLUMN scan_error TEXT")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def lookup(self, path):
+        """路径、大小和修改时间都未变化时直接返回索引中的扫描结果, 否则返回 None"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with closing(self.connect()) as conn:
+            row = conn.execute(
+                "SELECT * FROM samples WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)).fetchone()
+            if row is None:
+                return None
+            return self.to_info(row, path)
+
+    def to_info(self, row, path=None):
+        info = ScanInfo(path or row['path'])
+        info.sha256 = row['sha256']
+        info.size = row['size']
+        info.mtime_ns = row['mtime_ns']
+        if row['scan_error'] is not None:
+            info.error = row['scan_error']
+            return info
+        info.pyinst_ver = row['pyinst_ver']
+        info.pyinstaller_hint = row['pyinstaller_hint']
+        info.pyver = tuple(int(part) for part in row['pyver'].split('.'))
+        info.pylib_name = row['pylib_name']
+        info.entry_points = row['entry_points'].split('\n') if row['entry_points'] else []
+        info.pyz_size = row['pyz_size']
+        info.encrypted = bool(row['encrypted'])
+        info.member_count = row['member_count']
+        return info
+
+    def record_scan(self, info):
+        """写入 detail 扫描结果, 同一哈希的旧 TOC 会被替换; 没有文件哈希时不写入"""
+        if not info.sha256:
+            return
+        pyver = f"{info.pyver[0]}.{info.pyver[1]}" if info.ok else None
+        values = (info.sha256, os.path.abspath(info.path), info.size, info.mtime_ns, info.pyinst_ver,
+                  info.pyinstaller_hint, pyver, info.pylib_name, "\n".join(info.entry_points),
+                  info.pyz_size, int(info.encrypted), info.member_count, info.error)
+        with closing(self.connect()) as conn, conn:
+            # 保留以前的解包结果, 只更新扫描得到的字段
+            conn.execute(
+                f"INSERT INTO samples ({', '.join(SAMPLE_COLUMNS)}, indexed_at) "
+                f"VALUES ({', '.join('?' * len(SAMPLE_COLUMNS))}, ?) "
+                f"ON CONFLICT(sha256) DO UPDATE SET "
+                f"{', '.join(f'{col} = excluded.{col}' for col in SAMPLE_COLUMNS[1:])}, "
+                f"indexed_at = excluded.indexed_at",
+                values + (time.time(),))
+            conn.execute("DELETE FROM members WHERE sha256 = ?", (info.sha256,))
+            conn.executemany(
+                "INSERT INTO members VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((info.sha256,) + member for member in info.members))
+
+    def record_extraction(self, sha256, status, message, extract_dir):
+        """记录解包结果"""
+        with closing(self.connect()) as conn, conn:
+            conn.execute(
+                "UPDATE samples SET extract_status = ?, extract_message = ?, extract_dir = ?, "
+                "extracted_at = ? WHERE sha256 = ?",
+                (status, message, extract_dir, time.time(), sha256))
+
+    def members(self, sha256):
+        """样本的完整 TOC, 按扫描时的顺序"""
+        with closing(self.connect()) as conn:
+            return conn.execute(
+                "SELECT archive, name, type_code, position, stored_size, raw_size, compressed "
+                "FROM members WHERE sha256 = ? ORDER BY rowid", (sha256,)).fetchall()
+
+    def find_module(self, pattern):
+        """查找包含指定模块的样本, pattern 支持 * 通配符"""
+        with closing(self.connect()) as conn:
+            return conn.execute(
+                "SELECT DISTINCT s.sha256, s.path, s.pyver, m.archive, m.name "
+                "FROM members m JOIN samples s ON s.sha256 = m.sha256 "
+                "WHERE m.name GLOB ? ORDER BY s.path, m.name", (pattern,)).fetchall()
@@ -0,0 +1,308 @@
+# code_diff.py - 两个解包目录之间按代码对象比较字节码
+import os
+import time
+import shutil
+
+from decompile_runner import collect_pyc, magic_version, pyc_version, format_version
+from pyc_disasm import load_pyc, header_size, PycFormatError
+from code_units import walk_units, skeleton, unit_pyc, safe_name, is_anonymous
+
+DIFF_SAME = 'same'
+DIFF_CHANGED = 'changed'
+DIFF_ADDED = 'added'
+DIFF_REMOVED = 'removed'
+DIFF_MOVED = 'moved'
+DIFF_LABELS = {DIFF_SAME: "未变化", DIFF_CHANGED: "修改", DIFF_ADDED: "新增", DIFF_REMOVED: "删除",
+               DIFF_MOVED: "移动"}
+
+# 比较结果目录中的报告, 也用来确认目录是本工具生成的
+REPORT_NAME = 'diff_report.txt'
+
+
+class DiffCancelled(Exception):
+    """比较被用户取消"""
+    pass
+
+
+class UnitDiff:
+    """一个代码对象的比较结果, old/new 为两侧的 CodeUnit, 新增时 old 为 None, 删除时 new 为 None
+
+    output_path 为写出的独立 pyc, 不需要反编译时为 None。
+    """
+
+    def __init__(self, status, old, new):
+        self.status = status
+        self.old = old
+        self.new = new
+        self.output_path = None
+
+    @property
+    def unit(self):
+        return self.new if self.new is not None else self.old
+
+
+class ModuleDiff:
+    """一个模块的比较结果
+
+    units 为逐个代码对象的比较结果 (新版本的先序在前, 删除的在后);
+    note 不为空时无法逐个代码对象比较 (版本不同或无法解析), 整个模块交给反编译器。
+    """
+
+    def __init__(self, rel_path, status, version=None, units=None, note=''):
+        self.rel_path = rel_path
+        self.status = status
+        self.version = version
+        self.units = units or []
+        self.note = note
+        self.header = b''
+        self.output_paths = []
+
+    @property
+    def whole(self):
+        """新增的模块与无法逐个比较的模块整体反编译"""
+        return self.status == DIFF_ADDED or (self.status == DIFF_CHANGED and not self.units)
+
+    def changed_units(self):
+        return [unit_diff for unit_diff in self.units if unit_diff.status != DIFF_SAME]
+
+
+def match_units(old_units, new_units):
+    """配对两个版本的代码对象, 返回 UnitDiff 列表
+
+    先按路径与哈希配对; 剩下的按哈希配对, 视为移动 (例如外层改名或 lambda 序号变化);
+    再剩下的同路径对象为修改, 其余为新增或删除。
+    """
+    old_by_key = {unit.key: unit for unit in old_units}
+    matched = set()
+    results = {}
+    for unit in new_units:
+        old = old_by_key.get(unit.key)
+        if old is not None and old.digest == unit.digest:
+            results[unit.key] = UnitDiff(DIFF_SAME, old, unit)
+            matched.add(old.key)
+
+    free = {}
+    for old in old_units:
+        if old.key not in matched:
+            free.setdefault(old.digest, []).append(old)
+    for unit in new_units:
+        candidates = free.get(unit.digest)
+        if unit.key in results or not candidates:
+            continue
+        old = candidates.pop(0)
+        results[unit.key] = UnitDiff(DIFF_MOVED, old, unit)
+        matched.add(old.key)
+
+    for unit in new_units:
+        if unit.key in results:
+            continue
+        old = old_by_key.get(unit.key)
+        if old is not None and old.key not in matched:
+            results[unit.key] = UnitDiff(DIFF_CHANGED, old, unit)
+            matched.add(old.key)
+        else:
+            results[unit.key] = UnitDiff(DIFF_ADDED, None, unit)
+
+    return ([results[unit.key] for unit in new_units] +
+            [UnitDiff(DIFF_REMOVED, old, None) for old in old_units if old.key not in matched])
+
+
+def diff_module(rel_path, old_path, new_path):
+    """比较同一路径的两个 pyc
+
+    内容相同或只有文件头 (时间戳) 不同时不需要解析; 否则逐个代码对象比较归一化哈希。
+    """
+    try:
+        with open(old_path, 'rb') as f:
+            old_data = f.read()
+        with open(new_path, 'rb') as f:
+            new_data = f.read()
+    except OSError as e:
+        return ModuleDiff(rel_path, DIFF_CHANGED, note=f"无法读取: {e}")
+    if old_data == new_data:
+        return ModuleDiff(rel_path, DIFF_SAME, pyc_version(new_path))
+    version = magic_version(new_data[:4]) if old_data[:4] == new_data[:4] else None
+    if version is not None and old_data[header_size(version):] == new_data[header_size(version):]:
+        return ModuleDiff(rel_path, DIFF_SAME, version)
+
+    try:
+        old_version, old_code = load_pyc(old_data)
+        version, new_code = load_pyc(new_data)
+    except PycFormatError as e:
+        return ModuleDiff(rel_path, DIFF_CHANGED, pyc_version(new_path), note=f"无法解析: {e}")
+    if old_version != version:
+        return ModuleDiff(rel_path, DIFF_CHANGED, version,
+                          note=f"Python 版本不同: {format_version(old_version)} -> {format_version(version)}")
+
+    units = match_units(walk_units(old_code, version), walk_units(new_code, version))
+    if all(unit_diff.status in (DIFF_SAME, DIFF_MOVED) for unit_diff in units):
+        return ModuleDiff(rel_path, DIFF_SAME, version)
+    module = ModuleDiff(rel_path, DIFF_CHANGED, version, units)
+    module.header = new_data[:header_size(version)]
+    return module
+
+
+def diff_trees(old_root, new_root, on_progress=None, should_stop=None):
+    """按相对路径比较两个目录中的全部 pyc, 返回 ModuleDiff 列表
+
+    on_progress(已处理数, 总数, 相对路径) 在每个文件之后调用。
+    should_stop() 返回真时抛出 DiffCancelled, 不返回只比较了一部分的结果。
+    """
+    old_paths = set(collect_pyc(old_root))
+    new_paths = set(collect_pyc(new_root))
+    all_paths = sorted(old_paths | new_paths)
+    modules = []
+    for count, rel_path in enumerate(all_paths, 1):
+        if should_stop is not None and should_stop():
+            raise DiffCancelled("比较已取消")
+        if rel_path not in old_paths:
+            modules.append(ModuleDiff(rel_path, DIFF_ADDED, pyc_version(os.path.join(new_root, rel_path))))
+        elif rel_path not in new_paths:
+            modules.append(ModuleDiff(rel_path, DIFF_REMOVED, pyc_version(os.path.join(old_root, rel_path))))
+        else:
+            modules.append(diff_module(rel_path, os.path.join(old_root, rel_path),
+                                       os.path.join(new_root, rel_path)))
+        if on_progress is not None:
+            on_progress(count, len(all_paths), rel_path)
+    return modules
+
+
+def prepare_output(output_dir):
+    """清空上次比较的输出; 不是本工具生成的非空目录不动, 抛出 OSError"""
+    if os.path.isdir(output_dir) and os.listdir(output_dir):
+        if not os.path.exists(os.path.join(output_dir, REPORT_NAME)):
+            raise OSError(f"输出目录已存在且不是差异分析的结果:\n{output_dir}")
+        shutil.rmtree(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+
+def emit_units(modules, new_root, output_dir):
+    """把需要反编译的部分写成独立的 pyc, 目录结构与新版本相同, 返回写出的文件数
+
+    修改或新增的函数整体写出 (包括内层代码对象, 内层不再单独写出);
+    模块与类体只写出本层, 内层的函数和类换成空函数体, 未变化的方法不会被重复反编译,
+    本层的 lambda 与推导式随本层一起写出。
+    新增的模块与无法逐个比较的模块直接复制。
+    """
+    count = 0
+    for module in modules:
+        if module.status not in (DIFF_CHANGED, DIFF_ADDED):
+            continue
+        if module.whole:
+            target = os.path.join(output_dir, module.rel_path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(os.path.join(new_root, module.rel_path), target)
+            module.output_paths.append(target)
+            count += 1
+            continue
+
+        base = os.path.join(output_dir, os.path.splitext(module.rel_path)[0])
+        covered = set()
+        framed = set()
+        used = set()
+        for unit_diff in module.units:
+            unit = unit_diff.new
+            if unit is None:
+                continue
+            if unit.parent is not None and (id(unit.parent) in covered or
+                                            (id(unit.parent) in framed and is_anonymous(unit.co))):
+                covered.add(id(unit))
+                continue
+            if unit_diff.status not in (DIFF_CHANGED, DIFF_ADDED):
+                continue
+            name = safe_name(unit.key)
+            while name in used:
+                name += '_'
+            used.add(name)
+            path = os.path.join(base, name + '.pyc')
+            co = skeleton(unit.co, module.version) if unit.is_container else unit.co
+            os.makedirs(base, exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(unit_pyc(module.header, module.version, co))
+            unit_diff.output_path = path
+            module.output_paths.append(path)
+            count += 1
+            if unit.is_container:
+                framed.add(id(unit))
+            else:
+                covered.add(id(unit))
+    return count
+
+
+def count_changes(modules):
+    """模块与代码对象按状态计数, 返回 (模块计数, 代码对象计数)"""
+    module_counts = dict.fromkeys(DIFF_LABELS, 0)
+    unit_counts = dict.fromkeys(DIFF_LABELS, 0)
+    for module in modules:
+        module_counts[module.status] += 1
+        for unit_diff in module.units:
+            unit_counts[unit_diff.status] += 1
+    return module_counts, unit_counts
+
+
+def describe_unit(unit_diff):
+    """报告与界面中一个代码对象的说明: 名称、参数与两侧的首行号"""
+    unit = unit_diff.unit
+    text = unit.qualname if unit.parent is None or unit.is_container else f"{unit.qualname}({unit.signature()})"
+    if unit_diff.old is not None and unit_diff.new is not None:
+        old_line, new_line = unit_diff.old.co.firstlineno, unit_diff.new.co.firstlineno
+        lines = f"第 {new_line} 行" if old_line == new_line else f"第 {old_line} 行 -> 第 {new_line} 行"
+        if unit_diff.status == DIFF_MOVED:
+            lines = f"{unit_diff.old.qualname} -> {lines}"
+    else:
+        lines = f"第 {unit.co.firstlineno} 行"
+    return f"{unit.kind} {text}  {lines}"
+
+
+def write_report(modules, old_root, new_root, output_dir, elapsed):
+    """在输出目录写出比较报告, 返回报告路径"""
+    module_counts, unit_counts = count_changes(modules)
+    emitted = sum(len(module.output_paths) for module in modules)
+    lines = [
+        "代码差异分析",
+        f"旧版本: {old_root}",
+        f"新版本: {new_root}",
+        f"模块: 共 {len(modules)}  未变化 {module_counts[DIFF_SAME]}  修改 {module_counts[DIFF_CHANGED]}  "
+        f"新增 {module_counts[DIFF_ADDED]}  删除 {module_counts[DIFF_REMOVED]}",
+        f"代码对象: 修改 {unit_counts[DIFF_CHANGED]}  新增 {unit_counts[DIFF_ADDED]}  "
+        f"删除 {unit_counts[DIFF_REMOVED]}  移动 {unit_counts[DIFF_MOVED]}",
+        f"需要反编译的文件: {emitted}  总耗时: {elapsed:.1f}s",
+        "",
+        "修改的模块:",
+    ]
+    for module in modules:
+        if module.status != DIFF_CHANGED:
+            continue
+        lines.append(f"  {module.rel_path}  (Python {format_version(module.version)})")
+        if module.note:
+            lines.append(f"    {module.note}, 整个模块需要反编译")
+        for unit_diff in module.changed_units():
+            line = f"    [{DIFF_LABELS[unit_diff.status]}] {describe_unit(unit_diff)}"
+            if unit_diff.output_path:
+                line += f"  => {os.path.relpath(unit_diff.output_path, output_dir)}"
+            lines.append(line)
+
+    for status, title in ((DIFF_ADDED, "新增的模块:"), (DIFF_REMOVED, "删除的模块:")):
+        lines += ["", title]
+        for module in modules:
+            if module.status == status:
+                lines.append(f"  {module.rel_path}  (Python {format_version(module.version)})")
+
+    os.makedirs(output_dir, exist_ok=True)
+    report_path = os.path.join(output_dir, REPORT_NAME)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    return report_path
+
+
+def run_diff(old_root, new_root, output_dir, on_progress=None, should_stop=None):
+    """比较两个目录, 写出需要反编译的 pyc 与报告, 返回 (ModuleDiff 列表, 报告路径, 总耗时)
+
+    比较全部完成后才清空输出目录, 取消时抛出 DiffCancelled, 上一次的结果保持不变。
+    """
+    start = time.monotonic()
+    modules = diff_trees(old_root, new_root, on_progress, should_stop)
+    prepare_output(output_dir)
+    emit_units(modules, new_root, output_dir)
+    elapsed = time.monotonic() - start
+    return modules, write_report(modules, old_root, new_root, output_dir, elapsed), elapsed
@@ -0,0 +1,363 @@
+# code_index.py - 解包目录中全部 pyc 的代码对象索引
+import os
+import time
+import bisect
+import sqlite3
+from contextlib import closing
+
+from decompile_runner import collect_pyc
+from pyc_disasm import load_pyc, line_starts, as_text, Disassembler, CodeObject, ConstSet, PycFormatError
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS modules (
+    id INTEGER PRIMARY KEY,
+    root TEXT NOT NULL,
+    path TEXT NOT NULL,
+    module TEXT NOT NULL,
+    pyver TEXT,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    error TEXT,
+    indexed_at REAL,
+    UNIQUE (root, path)
+);
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS refs (
+    term_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    module_id INTEGER NOT NULL,
+    code TEXT NOT NULL,
+    line INTEGER
+);
+CREATE INDEX IF NOT EXISTS refs_term ON refs (term_id);
+CREATE INDEX IF NOT EXISTS refs_module ON refs (module_id);
+"""
+
+# 索引的符号种类
+KIND_CLASS = 'class'
+KIND_FUNCTION = 'function'
+KIND_METHOD = 'method'
+KIND_STRING = 'string'
+KIND_IMPORT = 'import'
+KIND_ATTRIBUTE = 'attribute'
+KIND_LABELS = {KIND_CLASS: "类", KIND_FUNCTION: "函数", KIND_METHOD: "方法",
+               KIND_STRING: "字符串", KIND_IMPORT: "导入", KIND_ATTRIBUTE: "属性"}
+
+# 读写属性的指令
+ATTRIBUTE_OPS = ('LOAD_ATTR', 'STORE_ATTR', 'DELETE_ATTR', 'LOAD_METHOD', 'LOAD_SUPER_ATTR')
+
+# 过长的字符串常量 (内嵌数据等) 只索引开头部分
+MAX_STRING_CHARS = 4096
+
+# 一次查询最多返回的条数
+DEFAULT_LIMIT = 1000
+
+# 单个文件的索引结果
+INDEX_OK = 'ok'
+INDEX_SKIPPED = 'skipped'
+INDEX_FAILED = 'failed'
+
+# 每处理这么多个文件提交一次
+COMMIT_EVERY = 200
+INDEX_CACHE_KB = 64 * 1024
+
+CO_OPTIMIZED = 0x1
+
+
+def module_name(rel_path):
+    """由 pyc 的相对路径得到模块名, PYZ 解包目录内按包结构命名"""
+    parts = rel_path.replace('\\', '/').split('/')
+    parts[-1] = os.path.splitext(parts[-1])[0]
+    # __pycache__/mod.cpython-38.pyc 形式的缓存文件按源文件所在位置命名
+    if len(parts) > 1 and parts[-2] == '__pycache__':
+        parts = parts[:-2] + [parts[-1].split('.')[0]]
+    for i in range(len(parts) - 1, -1, -1):
+        if parts[i].endswith('.pyz_extracted'):
+            parts = parts[i + 1:]
+            break
+    else:
+        parts = parts[-1:]
+    if len(parts) > 1 and parts[-1] == '__init__':
+        parts.pop()
+    return '.'.join(parts)
+
+
+def iter_strings(value):
+    """常量中的字符串, 包括元组与集合中的"""
+    if isinstance(value, (str, bytes)):
+        yield as_text(value)[:MAX_STRING_CHARS]
+    elif isinstance(value, tuple):
+        for item in value:
+            yield from iter_strings(item)
+    elif isinstance(value, ConstSet):
+        for item in value.items:
+            yield from iter_strings(item)
+
+
+def extract_symbols(data):
+    """解析 pyc 内容, 返回 (Python 版本, [(种类, 文本, 代码对象限定名, 行号)])
+
+    定义的位置取代码对象的首行; 字符串、导入与属性取引用它的指令所在行,
+    没有被指令引用的字符串常量 (如文档字符串) 取代码对象的首行。
+    """
+    version, module_code = load_pyc(data)
+    disassembler = Disassembler(version)
+    opnames = disassembler.opnames
+    hasconst = disassembler.hasconst
+    name_shifts = disassembler.name_shifts
+    symbols = []
+
+    def walk(co, qualname, parent_kind):
+        starts = line_starts(co, version)
+        offsets = [offset for offset, _ in starts]
+        names = [as_text(name) for name in co.names or ()]
+        consts = co.consts or ()
+        seen = set()
+        used_consts = set()
+        module = None
+
+        def add(kind, text, line):
+            key = (kind, text, line)
+            if text and key not in seen:
+                seen.add(key)
+                symbols.append((kind, text, qualname, line))
+
+        code = co.code if isinstance(co.code, bytes) else b''
+        for start, op, arg, next_pos in disassembler.instructions(code):
+            if arg is None:
+                continue
+            name = opnames.get(op)
+            if name == 'KW_NAMES':
+                # 关键字参数名不作为字符串常量索引
+                used_consts.add(arg)
+                continue
+            if name in hasconst:
+                if arg >= len(consts):
+                    continue
+                used_consts.add(arg)
+                texts = list(iter_strings(consts[arg]))
+                if not texts:
+                    continue
+            elif name == 'IMPORT_NAME' or name == 'IMPORT_FROM' or name in ATTRIBUTE_OPS:
+                index = arg >> name_shifts.get(name, 0)
+                if index >= len(names):
+                    continue
+            else:
+                continue
+            i = bisect.bisect_right(offsets, start) - 1
+            line = starts[i][1] if i >= 0 and starts[i][1] is not None else co.firstlineno
+            if name in hasconst:
+                for text in texts:
+                    add(KIND_STRING, text, line)
+            elif name == 'IMPORT_NAME':
+                module = names[index]
+                add(KIND_IMPORT, module, line)
+            elif name == 'IMPORT_FROM':
+                add(KIND_IMPORT, f"{module}.{names[index]}" if module else names[index], line)
+            else:
+                add(KIND_ATTRIBUTE, names[index], line)
+
+        for i, value in enumerate(consts):
+            if isinstance(value, CodeObject):
+                child_name = as_text(value.name)
+                is_class = not value.flags & CO_OPTIMIZED
+                if version >= (3, 11):
+                    child_qualname = as_text(value.qualname)
+                elif parent_kind == KIND_FUNCTION or parent_kind == KIND_METHOD:
+                    child_qualname = f"{qualname}.<locals>.{child_name}"
+                elif parent_kind == KIND_CLASS:
+                    child_qualname = f"{qualname}.{child_name}"
+                else:
+                    child_qualname = child_name
+                if is_class:
+                    kind = KIND_CLASS
+                elif parent_kind == KIND_CLASS:
+                    kind = KIND_METHOD
+                else:
+                    kind = KIND_FUNCTION
+                # lambda 与推导式没有可搜索的名称, 只索引其中的引用
+                if not child_name.startswith('<'):
+                    symbols.append((kind, child_name, child_qualname, value.firstlineno))
+                walk(value, child_qualname, kind)
+            elif i not in used_consts:
+                for text in iter_strings(value):
+                    add(KIND_STRING, text, co.firstlineno)
+
+    walk(module_code, '<module>', None)
+    return version, symbols
+
+
+class CodeIndex:
+    """以 (目录, pyc 相对路径) 为单位记录代码对象中的名称、字符串、导入与属性
+
+    不同文本只保存一次, 查询先在去重后的文本中匹配再关联引用位置。
+    每次操作使用独立连接, 建立索引的线程与界面线程可以同时访问。
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        with closing(self.connect()) as conn, conn:
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def index_tree(self, root, on_progress=None, should_stop=None):
+        """索引目录中的全部 pyc, 大小和修改时间未变化的文件跳过
+
+        on_progress(已处理数, 总数, 相对路径) 在每个文件之后调用。
+        返回 (新索引的文件数, 跳过的文件数, 解析失败的文件数)。
+        """
+        root = os.path.abspath(root)
+        paths = collect_pyc(root)
+        indexed = skipped = failed = 0
+        with closing(self.connect()) as conn:
+            # 大目录的引用数以百万计, 默认的页缓存放不下索引, 插入会频繁读盘
+            conn.execute(f"PRAGMA cache_size = {-INDEX_CACHE_KB}")
+            known = {row['path']: (row['id'], row['size'], row['mtime_ns'])
+                     for row in conn.execute("SELECT id, path, size, mtime_ns FROM modules WHERE root = ?",
+                                             (root,))}
+            terms = {}
+            # 目录中已不存在的文件从索引中删除
+            removed = [(known[path][0],) for path in set(known) - set(paths)]
+            with conn:
+                conn.executemany("DELETE FROM refs WHERE module_id = ?", removed)
+                conn.executemany("DELETE FROM modules WHERE id = ?", removed)
+
+            replaced = bool(removed)
+            for count, rel_path in enumerate(paths, 1):
+                if should_stop is not None and should_stop():
+                    break
+                entry = known.get(rel_path)
+                result = self.index_file(conn, terms, root, rel_path, entry)
+                if result == INDEX_SKIPPED:
+                    skipped += 1
+                elif result is not None:
+                    indexed += 1
+                    failed += result == INDEX_FAILED
+                    replaced = replaced or entry is not None
+                    if indexed % COMMIT_EVERY == 0:
+                        conn.commit()
+                # 跳过和无法读取的文件也计入进度
+                if on_progress is not None:
+                    on_progress(count, len(paths), rel_path)
+            if replaced:
+                # 删除或重新索引的文件留下的文本不再被任何引用使用
+                conn.execute("DELETE FROM terms WHERE id NOT IN (SELECT DISTINCT term_id FROM refs)")
+            conn.commit()
+        return indexed, skipped, failed
+
+    def index_file(self, conn, terms, root, rel_path, entry):
+        """索引单个文件, 返回 INDEX_* 之一, 文件无法读取时返回 None"""
+        full_path = os.path.join(root, rel_path)
+        try:
+            stat = os.stat(full_path)
+            if entry is not None and entry[1:] == (stat.st_size, stat.st_mtime_ns):
+                return INDEX_SKIPPED
+            with open(full_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            version, symbols = extract_symbols(data)
+            pyver, error = f"{version[0]}.{version[1]}", None
+        except PycFormatError as e:
+            symbols = []
+            pyver, error = None, str(e)
+        if entry is not None:
+            conn.execute("DELETE FROM refs WHERE module_id = ?", (entry[0],))
+        conn.execute("INSERT OR REPLACE INTO modules (root, path, module, pyver, size, mtime_ns, "
+                     "error, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                     (root, rel_path, module_name(rel_path), pyver, stat.st_size, stat.st_mtime_ns,
+                      error, time.time()))
+        module_id = conn.execute("SELECT id FROM modules WHERE root = ? AND path = ?",
+                                 (root, rel_path)).fetchone()[0]
+        conn.executemany("INSERT INTO refs VALUES (?, ?, ?, ?, ?)",
+                         ((self.term_id(conn, terms, text), kind, module_id, code, line)
+                          for kind, text, code, line in symbols))
+        return INDEX_FAILED if error else INDEX_OK
+
+    @staticmethod
+    def term_id(conn, terms, text):
+        """文本对应的编号, 不存在时插入"""
+        term = terms.get(text)
+        if term is None:
+            stored = text
+            try:
+                text.encode('utf-8')
+            except UnicodeEncodeError:
+                # 单独的代理字符无法存入 SQLite, 转义后保存
+                stored = text.encode('utf-8', errors='backslashreplace').decode('utf-8')
+            row = conn.execute("SELECT id FROM terms WHERE text = ?", (stored,)).fetchone()
+            if row is None:
+                term = conn.execute("INSERT INTO terms (text) VALUES (?)", (stored,)).lastrowid
+            else:
+                term = row[0]
+            terms[text] = term
+        return term
+
+    def search(self, text, kind=None, root=None, limit=DEFAULT_LIMIT):
+        """查找包含 text 的符号 (不区分大小写), 完全相同的排在前面
+
+        先在去重后的文本中匹配, 再按文本逐个取引用位置, 凑够 limit 条即停止,
+        常见子串也无需对全部引用排序。
+        """
+        pattern = '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        conditions = ["r.term_id = ?"]
+        params = []
+        if kind:
+            conditions.append("r.kind = ?")
+            params.append(kind)
+        if root:
+            conditions.append("m.root = ?")
+            params.append(os.path.abspath(root))
+        query = ("SELECT r.kind, m.root, m.path, m.module, r.code, r.line "
+                 "FROM refs r JOIN modules m ON m.id = r.module_id "
+                 f"WHERE {' AND '.join(conditions)} ORDER BY m.module, r.line LIMIT ?")
+        results = []
+        with closing(self.connect()) as conn:
+            matched = conn.execute("SELECT id, text FROM terms WHERE text LIKE ? ESCAPE '\\' "
+                                   "ORDER BY lower(text) <> lower(?), length(text), text",
+                                   (pattern, text)).fetchall()
+            for term in matched:
+                for row in conn.execute(query, [term['id']] + params + [limit - len(results)]):
+                    results.append((term['text'],) + tuple(row))
+                if len(results) >= limit:
+                    break
+        return results
+
+    def roots(self):
+        """已索引的目录及其中的文件数与解析失败数"""
+        with closing(self.connect()) as conn:
+            return conn.execute(
+                "SELECT root, COUNT(*) AS modules, COUNT(error) AS errors, MAX(indexed_at) AS indexed_at "
+                "FROM modules GROUP BY root ORDER BY root").fetchall()
+
+    def stats(self, root=None):
+        """(模块数, 引用数)"""
+        with closing(self.connect()) as conn:
+            if root:
+                root = os.path.abspath(root)
+                modules = conn.execute("SELECT COUNT(*) FROM modules WHERE root = ?", (root,)).fetchone()[0]
+                refs = conn.execute("SELECT COUNT(*) FROM refs r JOIN modules m ON m.id = r.module_id "
+                                    "WHERE m.root = ?", (root,)).fetchone()[0]
+            else:
+                modules = conn.execute("SELECT COUNT(*) FROM modules").fetchone()[0]
+                refs = conn.execute("SELECT COUNT(*) FROM refs").fetchone()[0]
+        return modules, refs
+
+    def remove_root(self, root):
+        """删除一个目录的索引, 不再被引用的文本一并删除"""
+        root = os.path.abspath(root)
+        with closing(self.connect()) as conn, conn:
+            conn.execute("DELETE FROM refs WHERE module_id IN (SELECT id FROM modules WHERE root = ?)", (root,))
+            conn.execute("DELETE FROM modules WHERE root = ?", (root,))
+            conn.execute("DELETE FROM terms WHERE id NOT IN (SELECT DISTINCT term_id FROM refs)")
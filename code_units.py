@@ -0,0 +1,192 @@
+# code_units.py - pyc 中代码对象的遍历、归一化哈希与重新打包
+import copy
+import hashlib
+
+from pyc_disasm import CodeObject, ConstSet, ConstDict, as_text, dump_pyc
+from pyc_opcodes import OPCODE_TABLES
+
+CO_OPTIMIZED = 0x1
+CO_VARARGS = 0x4
+CO_VARKEYWORDS = 0x8
+
+MODULE_KEY = '<module>'
+
+# 文件名中不能出现的字符
+UNSAFE_CHARS = '<>:"/\\|?*'
+
+
+class CodeUnit:
+    """模块中的一个代码对象
+
+    key 为从模块开始以 '.' 连接的名称路径, 同一层的同名对象 (多个 lambda、
+    property 的 getter/setter 等) 从第二个起加 #序号; parent 为外层的 CodeUnit,
+    模块本身为 None。digest 为不含行号与文件名的归一化哈希, 只反映这个
+    代码对象自身的字节码, 内层代码对象的变化不会改变外层的哈希。
+    """
+
+    def __init__(self, key, qualname, co, parent):
+        self.key = key
+        self.qualname = qualname
+        self.co = co
+        self.parent = parent
+        self.digest = code_digest(co)
+
+    @property
+    def name(self):
+        return as_text(self.co.name)
+
+    @property
+    def is_container(self):
+        """模块与类体: 没有 CO_OPTIMIZED 标志, 内层的函数各自独立"""
+        return not self.co.flags & CO_OPTIMIZED
+
+    @property
+    def kind(self):
+        if self.parent is None:
+            return "模块"
+        if self.is_container:
+            return "类"
+        return "方法" if self.parent.is_container and self.parent.parent is not None else "函数"
+
+    def signature(self):
+        """由参数表还原的参数列表, 默认值保存在外层代码中, 这里无法得到"""
+        co = self.co
+        names = [as_text(name) for name in (co.localsplusnames or co.varnames or ())]
+        names += ['?'] * (co.argcount + co.kwonlyargcount + 2 - len(names))
+        args = names[:co.argcount]
+        if co.posonlyargcount:
+            args.insert(co.posonlyargcount, '/')
+        keyword_only = names[co.argcount:co.argcount + co.kwonlyargcount]
+        index = co.argcount + co.kwonlyargcount
+        if co.flags & CO_VARARGS:
+            args.append(f"*{names[index]}")
+            index += 1
+        elif keyword_only:
+            args.append('*')
+        args += keyword_only
+        if co.flags & CO_VARKEYWORDS:
+            args.append(f"**{names[index]}")
+        return ", ".join(args)
+
+
+def normalize(value):
+    """常量的可比较形式: 内层代码对象只保留名称, 集合按内容排序
+
+    集合常量在 marshal 中的顺序取决于编译时的字符串哈希种子,
+    同一份源码的两次构建也可能不同, 排序后再比较。
+    """
+    if isinstance(value, CodeObject):
+        return ('code', as_text(value.name))
+    if isinstance(value, ConstSet):
+        return ('frozenset' if value.frozen else 'set', tuple(sorted(repr(normalize(item)) for item in value.items)))
+    if isinstance(value, ConstDict):
+        return ('dict', tuple((normalize(key), normalize(item)) for key, item in value.items))
+    if isinstance(value, (tuple, list)):
+        return (type(value).__name__, tuple(normalize(item) for item in value))
+    if isinstance(value, float):
+        # 区分 0.0 与 -0.0
+        return ('float', value.hex())
+    return (type(value).__name__, value)
+
+
+def code_digest(co):
+    """代码对象的归一化哈希, 不包含文件名、首行号与行号表
+
+    只是行号变化 (例如上方插入了代码) 的函数哈希不变。
+    """
+    fields = (
+        co.argcount, co.posonlyargcount, co.kwonlyargcount, co.flags, co.code,
+        normalize(co.consts), normalize(co.names), normalize(co.varnames), normalize(co.freevars),
+        normalize(co.cellvars), normalize(co.localsplusnames), co.localspluskinds,
+        normalize(co.name), co.exceptiontable,
+    )
+    return hashlib.sha1(repr(fields).encode('utf-8', errors='backslashreplace')).hexdigest()
+
+
+def walk_units(module_code, version):
+    """按先序返回模块中全部代码对象的 CodeUnit 列表, 第一个是模块本身"""
+    units = []
+
+    def walk(co, key, qualname, parent):
+        unit = CodeUnit(key, qualname, co, parent)
+        units.append(unit)
+        seen = {}
+        for value in co.consts or ():
+            if not isinstance(value, CodeObject):
+                continue
+            name = as_text(value.name)
+            seen[name] = seen.get(name, 0) + 1
+            child_key = name if parent is None else f"{key}.{name}"
+            if seen[name] > 1:
+                child_key += f"#{seen[name]}"
+            if version >= (3, 11):
+                child_qualname = as_text(value.qualname)
+            elif parent is None:
+                child_qualname = name
+            elif unit.is_container:
+                child_qualname = f"{qualname}.{name}"
+            else:
+                child_qualname = f"{qualname}.<locals>.{name}"
+            walk(value, child_key, child_qualname, unit)
+
+    walk(module_code, MODULE_KEY, MODULE_KEY, None)
+    return units
+
+
+def opcode(version, name):
+    for number, opname in OPCODE_TABLES[version]['names'].items():
+        if opname == name:
+            return number
+    raise KeyError(name)
+
+
+def stub_bytes(version):
+    """只有 return None 的字节码, None 为第 0 个常量"""
+    if version[0] < 3:
+        return bytes((opcode(version, 'LOAD_CONST'), 0, 0, opcode(version, 'RETURN_VALUE')))
+    ops = []
+    if version >= (3, 11):
+        ops.append('RESUME')
+    if version >= (3, 12):
+        ops.append('RETURN_CONST')
+    else:
+        ops += ['LOAD_CONST', 'RETURN_VALUE']
+    return bytes(byte for name in ops for byte in (opcode(version, name), 0))
+
+
+def stub_code(co, version):
+    """名称、参数与标志不变, 函数体只有 return None 的代码对象"""
+    stub = copy.copy(co)
+    stub.code = stub_bytes(version)
+    stub.consts = (None,)
+    stub.names = ()
+    stub.stacksize = 1
+    stub.linetable = b''
+    stub.exceptiontable = b''
+    return stub
+
+
+def is_anonymous(co):
+    """lambda、推导式与生成器表达式, 名称形如 <lambda>"""
+    return as_text(co.name).startswith('<')
+
+
+def skeleton(co, version):
+    """把内层有名字的函数和类换成空函数体的副本, 反编译后只保留本层的语句和 def/class 头
+
+    lambda 与推导式是本层表达式的一部分, 保持原样。
+    """
+    frame = copy.copy(co)
+    frame.consts = tuple(stub_code(value, version) if isinstance(value, CodeObject) and not is_anonymous(value)
+                         else value for value in co.consts or ())
+    return frame
+
+
+def unit_pyc(header, version, co):
+    """把代码对象当作模块代码写成独立的 pyc 内容, 可以直接交给反编译器"""
+    return dump_pyc(header, version, co)
+
+
+def safe_name(key):
+    """代码对象路径转换成可用作文件名的形式"""
+    return ''.join('_' if char in UNSAFE_CHARS else char for char in key)
@@ -0,0 +1,124 @@
+# content_store.py - 按内容哈希寻址的解包文件仓库
+import os
+import stat
+import shutil
+
+try:
+    import fcntl
+except ImportError:
+    # Windows 没有 fcntl, 只能使用硬链接或复制
+    fcntl = None
+
+# Linux FICLONE ioctl, 在 btrfs/xfs 等文件系统上创建写时复制的副本
+FICLONE = 0x40049409
+
+
+def reflink(src, dst):
+    """尝试以写时复制方式克隆文件, 不支持时返回 False"""
+    if fcntl is None:
+        return False
+    try:
+        with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+        return True
+    except OSError:
+        if os.path.exists(dst):
+            os.remove(dst)
+        return False
+
+
+def link_file(src, dst):
+    """把 src 放到 dst: 优先 reflink, 其次硬链接, 都不支持时复制"""
+    if reflink(src, dst):
+        return 'reflink'
+    try:
+        os.link(src, dst)
+        return 'hardlink'
+    except OSError:
+        shutil.copyfile(src, dst)
+        return 'copy'
+
+
+def copy_file(src, dst):
+    """把 src 复制到 dst: 优先 reflink, 不支持时复制, 两个文件互不影响"""
+    if reflink(src, dst):
+        return 'reflink'
+    shutil.copyfile(src, dst)
+    return 'copy'
+
+
+READONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+def remove_tree(path, ignore_errors=False, store=None):
+    """删除目录, 目录中可能有从仓库硬链接出来的只读文件
+
+    只有 Windows 的只读属性会阻止删除, 其他系统上直接删除链接, 不修改文件属性。
+    Windows 上必须先去掉只读属性, 而硬链接与仓库文件共用属性,
+    因此删除后由 store 把仓库文件重新设为只读。
+    """
+    shared = []
+
+    def clear_readonly(func, path, exc_info):
+        if os.name != 'nt':
+            raise exc_info[1]
+        if os.path.isfile(path) and os.stat(path).st_nlink > 1:
+            shared.append(path)
+        os.chmod(path, stat.S_IWRITE)
+        func(path)
+
+    try:
+        shutil.rmtree(path, onerror=clear_readonly)
+    except OSError:
+        if not ignore_errors:
+            raise
+    finally:
+        if shared and store:
+            store.protect()
+
+
+class ContentStore:
+    """哈希 -> 文件内容的仓库
+
+    键为解包清单中的成员哈希, 相同的键对应完全相同的输出文件。
+    仓库中的文件设为只读, 避免通过硬链接修改输出时破坏仓库内容。
+    仓库与解包目录位于同一文件系统时才能使用链接, 否则退化为复制。
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def blob_path(self, digest):
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def contains(self, digest):
+        return os.path.isfile(self.blob_path(digest))
+
+    def checkout(self, digest, dst):
+        """把仓库中的内容放到 dst, 返回使用的方式"""
+        return link_file(self.blob_path(digest), dst)
+
+    def add(self, src, digest):
+        """把已写出的文件加入仓库, 已存在时忽略"""
+        blob = self.blob_path(digest)
+        if os.path.exists(blob):
+            return
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        # 先放到临时名, 再原子重命名, 多个进程同时写入同一内容时互不影响
+        # 必须复制而不是硬链接, 否则设置只读时会连同用户的输出文件一起改为只读
+        tmp = f"{blob}.{os.getpid()}.tmp"
+        copy_file(src, tmp)
+        os.chmod(tmp, READONLY)
+        try:
+            os.replace(tmp, blob)
+        except OSError:
+            # 其他进程已写入同一内容
+            os.remove(tmp)
+
+    def protect(self):
+        """把仓库中被改为可写的文件重新设为只读"""
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if os.stat(path).st_mode & stat.S_IWRITE:
+                    os.chmod(path, READONLY)
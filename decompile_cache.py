@@ -0,0 +1,122 @@
+# decompile_cache.py - pycdc/pycdas/uncompyle6 共用的反编译结果缓存
+import os
+import time
+import zlib
+import sqlite3
+import hashlib
+from contextlib import closing
+
+# 缓存总大小上限, 超过后按最近使用时间淘汰
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    engine TEXT NOT NULL,
+    engine_version TEXT NOT NULL,
+    options TEXT NOT NULL,
+    returncode INTEGER,
+    stdout BLOB,
+    stderr TEXT,
+    size INTEGER NOT NULL,
+    created REAL,
+    last_used REAL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+# 外部程序的版本标识按 (路径, 大小, 修改时间) 缓存, 避免重复计算哈希
+_exe_versions = {}
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def exe_version(exe_path):
+    """外部反编译器的版本标识: 可执行文件内容的哈希, 替换程序后旧结果自动失效"""
+    stat = os.stat(exe_path)
+    identity = (os.path.abspath(exe_path), stat.st_size, stat.st_mtime_ns)
+    version = _exe_versions.get(identity)
+    if version is None:
+        version = file_sha256(exe_path)[:16]
+        _exe_versions[identity] = version
+    return version
+
+
+def module_version(name):
+    """Python 包形式的反编译器版本"""
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        return 'unknown'
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return 'unknown'
+
+
+class CachedResult:
+    """缓存命中的结果, stdout 为原始字节"""
+
+    def __init__(self, returncode, stdout, stderr):
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+class DecompileCache:
+    """以 (pyc 的 sha256, 引擎, 引擎版本, 选项) 为键的持久化结果缓存
+
+    失败的结果同样缓存, 已知无法处理的文件不会被反复尝试。
+    每次操作使用独立连接, 可在多个线程中同时使用。
+    """
+
+    def __init__(self, db_path, max_bytes=DEFAULT_MAX_BYTES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        with closing(self.connect()) as conn, conn:
+            conn.executescript(SCHEMA)
+
+    def connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @staticmethod
+    def make_key(pyc_hash, engine, engine_version, options=''):
+        return hashlib.sha256(f"{pyc_hash}\0{engine}\0{engine_version}\0{options}".encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """返回 CachedResult, 未命中时返回 None"""
+        with closing(self.connect()) as conn, conn:
+            row = conn.execute("SELECT returncode, stdout, stderr FROM results WHERE key = ?",
+                               (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return CachedResult(row[0], zlib.decompress(row[1]), row[2])
+
+    def put(self, key, engine, engine_version, options, returncode, stdout, stderr):
+        stdout = zlib.compress(bytes(stdout))
+        size = len(stdout) + len(stderr.encode('utf-8'))
+        now = time.time()
+        with closing(self.connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         (key, engine, engine_version, options, returncode, stdout, stderr, size, now, now))
+            self.evict(conn)
+
+    def evict(self, conn):
+        """总大小超过上限时删除最久未使用的条目"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        removed = []
+        for key, size in conn.execute("SELECT key, size FROM results ORDER BY last_used"):
+            removed.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        conn.executemany("DELETE FROM results WHERE key = ?", removed)
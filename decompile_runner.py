@@ -0,0 +1,715 @@
+# decompile_runner.py - 反编译器的批量调度
+import os
+import time
+import locale
+import codecs
+import signal
+import sqlite3
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import resource
+except ImportError:
+    # Windows 没有 rlimit, 只能依靠墙钟超时
+    resource = None
+
+from decompile_cache import file_sha256
+
+# 批量模式处理的文件类型
+PYC_SUFFIXES = ('.pyc', '.pyo')
+
+# 输出目录中的汇总报告
+SUMMARY_NAME = 'decompile_summary.txt'
+
+# 输出通道
+CHANNEL_STDOUT = 'stdout'
+CHANNEL_STDERR = 'stderr'
+
+# 结果状态
+STATUS_OK = 'ok'
+STATUS_FAILED = 'failed'
+STATUS_CANCELLED = 'cancelled'
+STATUS_TIMEOUT = 'timeout'
+
+# 等待子进程时检查超时与取消的间隔(秒)
+POLL_INTERVAL = 0.1
+
+# 每次调用反编译器的默认资源限制, 0 表示不限制
+DEFAULT_TIMEOUT = 120
+DEFAULT_CPU_LIMIT = 120
+DEFAULT_MEMORY_LIMIT = 2048
+DEFAULT_LIMITS = {'timeout': DEFAULT_TIMEOUT, 'cpu_limit': DEFAULT_CPU_LIMIT, 'memory_limit': DEFAULT_MEMORY_LIMIT}
+LIMIT_LABELS = {'timeout': "超时 (秒)", 'cpu_limit': "CPU时间限制 (秒)", 'memory_limit': "内存限制 (MB)"}
+# 错误输出中表明内存分配失败的文字
+MEMORY_MARKERS = ('MemoryError', 'bad_alloc', 'Cannot allocate memory', 'out of memory')
+
+# 自动模式: 回退链依次尝试, 竞速同时运行全部候选引擎
+MODE_CHAIN = 'chain'
+MODE_RACE = 'race'
+
+# 结果评分: 反编译器的满分与每个失败标记的扣分, 反汇编只作为最后的保底
+SCORE_CLEAN = 100
+SCORE_DISASSEMBLY = 10
+MARKER_PENALTY = 20
+FAILURE_MARKERS = (
+    b'# WARNING: Decompyle incomplete',
+    b'Unsupported opcode',
+    b'Unsupported Node type',
+    b'--- This code section failed',
+    b'Parse error',
+    b'# Deparsing stopped',
+)
+
+# pyc magic 到 Python 版本的对应范围 (magic 最小值, 最大值, 版本)
+MAGIC_RANGES = (
+    (20121, 20121, (1, 5)),
+    (50428, 50428, (1, 6)),
+    (50823, 50823, (2, 0)),
+    (60202, 60202, (2, 1)),
+    (60717, 60717, (2, 2)),
+    (62011, 62021, (2, 3)),
+    (62041, 62061, (2, 4)),
+    (62071, 62131, (2, 5)),
+    (62151, 62161, (2, 6)),
+    (62171, 62211, (2, 7)),
+    (3000, 3131, (3, 0)),
+    (3141, 3151, (3, 1)),
+    (3160, 3180, (3, 2)),
+    (3190, 3230, (3, 3)),
+    (3250, 3310, (3, 4)),
+    (3320, 3351, (3, 5)),
+    (3360, 3379, (3, 6)),
+    (3390, 3399, (3, 7)),
+    (3400, 3419, (3, 8)),
+    (3420, 3429, (3, 9)),
+    (3430, 3449, (3, 10)),
+    (3450, 3499, (3, 11)),
+    (3500, 3549, (3, 12)),
+    (3550, 3599, (3, 13)),
+    (3600, 3649, (3, 14)),
+)
+
+
+class DecompileTask:
+    """单个文件的反编译任务, output_path 为输出文件"""
+
+    def __init__(self, input_path, output_path, rel_path):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.rel_path = rel_path
+
+
+class DecompileResult:
+    """反编译结果, stderr 为引擎的错误输出(可能只是警告)"""
+
+    def __init__(self, task, status, returncode=None, elapsed=0.0, stderr='', cached=False, engine=''):
+        self.task = task
+        self.status = status
+        self.returncode = returncode
+        self.elapsed = elapsed
+        self.stderr = stderr
+        self.cached = cached
+        self.engine = engine
+        self.output_path = task.output_path
+        # 自动模式记录的评分、pyc 版本与各引擎的尝试结果
+        self.score = 0
+        self.pyver = None
+        self.attempts = []
+        # 部分成功时的补充说明, 例如函数级反编译中失败的函数
+        self.note = ''
+
+    @property
+    def ok(self):
+        return self.status == STATUS_OK
+
+
+def decode_output(data):
+    return data.decode(locale.getpreferredencoding(False), errors='replace')
+
+
+def collect_pyc(root):
+    """递归收集目录中的 pyc 文件, 返回排序后的相对路径"""
+    found = []
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            if file_name.lower().endswith(PYC_SUFFIXES):
+                found.append(os.path.relpath(os.path.join(dir_path, file_name), root))
+    return found
+
+
+def plan_tree(input_dir, output_dir, suffix):
+    """为目录中的每个 pyc 生成任务, 输出目录保持与输入相同的结构"""
+    tasks = []
+    for rel_path in collect_pyc(input_dir):
+        output_path = os.path.join(output_dir, os.path.splitext(rel_path)[0] + suffix)
+        tasks.append(DecompileTask(os.path.join(input_dir, rel_path), output_path, rel_path))
+    return tasks
+
+
+def magic_version(magic):
+    """pyc magic 对应的 (主版本, 次版本), 未知时返回 None"""
+    number = int.from_bytes(magic[:2], 'little')
+    for low, high, version in MAGIC_RANGES:
+        if low <= number <= high:
+            return version
+    return None
+
+
+def pyc_version(path):
+    """读取 pyc 文件头判断编译它的 Python 版本"""
+    try:
+        with open(path, 'rb') as f:
+            magic = f.read(4)
+    except OSError:
+        return None
+    if len(magic) < 4 or magic[2:4] != b'\r\n':
+        return None
+    return magic_version(magic)
+
+
+def format_version(version):
+    return f"{version[0]}.{version[1]}" if version else "未知"
+
+
+def read_limits(section):
+    """从配置节读取资源限制设置, 返回以 DEFAULT_LIMITS 的键为键的字典"""
+    return {key: max(0, section.getint(key, fallback=default)) for key, default in DEFAULT_LIMITS.items()}
+
+
+class ResourceLimits:
+    """一次反编译器调用的资源限制, 0 或 None 表示不限制
+
+    timeout 为墙钟时间(秒), 所有平台有效; cpu_seconds 与 memory_mb
+    在子进程中通过 setrlimit 设置, 只在支持 rlimit 的系统上生效。
+    """
+
+    def __init__(self, timeout=None, cpu_seconds=None, memory_mb=None):
+        self.timeout = timeout or None
+        self.cpu_seconds = cpu_seconds or None
+        self.memory_mb = memory_mb or None
+
+    @classmethod
+    def from_config(cls, limits):
+        return cls(limits['timeout'], limits['cpu_limit'], limits['memory_limit'])
+
+    @staticmethod
+    def set_limit(kind, soft, hard):
+        # 不能超过当前的硬限制, 否则 setrlimit 会失败
+        _, current = resource.getrlimit(kind)
+        if current != resource.RLIM_INFINITY:
+            soft, hard = min(soft, current), min(hard, current)
+        resource.setrlimit(kind, (soft, hard))
+
+    def apply(self):
+        """在子进程 exec 之前执行"""
+        if self.cpu_seconds:
+            # 达到软限制时收到 SIGXCPU, 一秒后由硬限制强制结束
+            self.set_limit(resource.RLIMIT_CPU, self.cpu_seconds, self.cpu_seconds + 1)
+        if self.memory_mb:
+            size = self.memory_mb * 1024 * 1024
+            self.set_limit(resource.RLIMIT_AS, size, size)
+
+    def preexec_fn(self):
+        if resource is None or not (self.cpu_seconds or self.memory_mb):
+            return None
+        return self.apply
+
+    def cpu_exceeded(self, returncode):
+        """退出码表明进程因超过 CPU 时间限制被终止"""
+        if not self.cpu_seconds or returncode is None or resource is None:
+            return False
+        return returncode in (-signal.SIGXCPU, -signal.SIGKILL)
+
+    def memory_exceeded(self, returncode, stderr):
+        """退出码与错误输出表明进程因超过内存限制失败
+
+        超过 RLIMIT_AS 时进程不会被信号终止, 而是分配失败: Python 抛出 MemoryError,
+        C++ 程序抛出 std::bad_alloc 后 abort。pycdc 的断言失败同样以 SIGABRT 退出,
+        只有错误输出中有分配失败的信息时才算超过内存限制。
+        """
+        if not self.memory_mb or not returncode or resource is None:
+            return False
+        return any(marker in stderr for marker in MEMORY_MARKERS)
+
+    def describe(self):
+        """用于界面显示的简短说明"""
+        parts = []
+        if self.timeout:
+            parts.append(f"{self.timeout} 秒")
+        if self.cpu_seconds:
+            parts.append(f"CPU {self.cpu_seconds} 秒")
+        if self.memory_mb:
+            parts.append(f"内存 {self.memory_mb} MB")
+        return ", ".join(parts) or "不限制"
+
+
+def spool_file(data=b''):
+    """创建保存输出的临时文件, 返回路径"""
+    fd, path = tempfile.mkstemp(prefix='py_re_tools_', suffix='.out')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def run_command(command, output_path, limits=None, should_stop=None):
+    """运行反编译器, 标准输出直接写入 output_path
+
+    超过 limits 中的超时或 CPU 时间, 以及 should_stop() 返回真时终止进程。
+    返回 (退出码, 错误输出, 状态)。
+    """
+    limits = limits or ResourceLimits()
+    timeout = limits.timeout
+    deadline = None if timeout is None else time.monotonic() + timeout
+    status = None
+    # 错误输出写入临时文件, 不需要额外的读取线程
+    with open(output_path, 'wb') as output_file, tempfile.TemporaryFile() as error_file:
+        process = subprocess.Popen(command, stdout=output_file, stderr=error_file,
+                                   preexec_fn=limits.preexec_fn())
+        while True:
+            try:
+                returncode = process.wait(timeout=POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            if deadline is not None and time.monotonic() >= deadline:
+                status = STATUS_TIMEOUT
+            elif should_stop is not None and should_stop():
+                status = STATUS_CANCELLED
+            else:
+                continue
+            process.kill()
+            returncode = process.wait()
+            break
+        error_file.seek(0)
+        stderr = decode_output(error_file.read())
+    if status is None and limits.cpu_exceeded(returncode):
+        status = STATUS_TIMEOUT
+        stderr += f"\n超过 CPU 时间限制 {limits.cpu_seconds} 秒, 已终止"
+    elif status is None and limits.memory_exceeded(returncode, stderr):
+        status = STATUS_TIMEOUT
+        stderr += f"\n超过内存限制 {limits.memory_mb} MB, 已终止"
+    elif status == STATUS_TIMEOUT:
+        stderr += f"\n超过 {timeout} 秒未完成, 已终止"
+    if status is None:
+        status = STATUS_OK if returncode == 0 else STATUS_FAILED
+    return returncode, stderr, status
+
+
+def score_output(engine, status, stdout, stderr):
+    """给一次运行的结果打分, 0 表示不可用"""
+    if status != STATUS_OK or not stdout.strip():
+        return 0
+    if engine.disassembler:
+        return SCORE_DISASSEMBLY
+    errors = stderr.encode('utf-8', errors='replace')
+    markers = sum(stdout.count(marker) + errors.count(marker) for marker in FAILURE_MARKERS)
+    # 有失败标记的结果仍然优于反汇编
+    return max(SCORE_DISASSEMBLY + 1, SCORE_CLEAN - MARKER_PENALTY * markers)
+
+
+class Engine:
+    """一个反编译引擎
+
+    build_command(input_path) 返回命令行参数列表; runner 不为空时代替外部命令,
+    以 runner(input_path, output_path, should_stop) 的形式调用并返回与
+    run_command 相同的结果。version 与 options 参与缓存键; limits 为每次调用的
+    ResourceLimits; versions 为支持的 (最低, 最高) Python 版本, None 表示不限;
+    disassembler 为真时输出的是反汇编, 只作为保底结果。
+    """
+
+    def __init__(self, name, build_command, version='', options='', limits=None,
+                 versions=None, disassembler=False, suffix='.py', runner=None):
+        self.name = name
+        self.build_command = build_command
+        self.runner = runner
+        self.version = version
+        self.options = options
+        self.limits = limits or ResourceLimits()
+        self.versions = versions
+        self.disassembler = disassembler
+        self.suffix = suffix
+
+    def supports(self, pyver):
+        if pyver is None or self.versions is None:
+            return True
+        low, high = self.versions
+        return low <= pyver <= high
+
+
+class StreamingCommand:
+    """运行反编译器并逐行转发输出, 可以在其他线程中调用 kill 终止
+
+    两个输出通道都写入文件 (paths), 运行中即可从文件读取已有的输出;
+    output_path 为空时标准输出写入临时文件, 临时文件由 cleanup 删除。
+    on_output(channel, text) 不为空时在读取线程中被调用。
+    超过 limits 的限制时进程被终止并记为超时。
+    """
+
+    def __init__(self, command, output_path=None, limits=None):
+        self.command = command
+        self.output_path = output_path
+        self.limits = limits or ResourceLimits()
+        self.process = None
+        self.killed = False
+        self.timed_out = False
+        self.lock = threading.Lock()
+        self.temporary = []
+        self.paths = {CHANNEL_STDOUT: output_path or self.spool(),
+                      CHANNEL_STDERR: self.spool()}
+        # 先创建输出文件, 运行开始前就可以打开查看
+        open(self.paths[CHANNEL_STDOUT], 'wb').close()
+
+    def spool(self):
+        path = spool_file()
+        self.temporary.append(path)
+        return path
+
+    def pump(self, pipe, channel, on_output):
+        decoder = None
+        if on_output is not None:
+            decoder = codecs.getincrementaldecoder(locale.getpreferredencoding(False))(errors='replace')
+        with open(self.paths[channel], 'wb') as output_file:
+            for line in iter(pipe.readline, b''):
+                output_file.write(line)
+                # 逐行刷新, 查看器可以实时读到新的输出
+                output_file.flush()
+                if decoder is not None:
+                    on_output(channel, decoder.decode(line))
+        if decoder is not None:
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                on_output(channel, tail)
+        pipe.close()
+
+    def run(self, on_output=None):
+        """阻塞直到进程退出, 返回退出码"""
+        timer = None
+        try:
+            with self.lock:
+                if self.killed:
+                    return None
+                self.process = subprocess.Popen(self.command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                                preexec_fn=self.limits.preexec_fn())
+            if self.limits.timeout:
+                timer = threading.Timer(self.limits.timeout, self.expire)
+                timer.start()
+            # 两个管道分别读取, 避免其中一个写满后子进程阻塞
+            stderr_reader = threading.Thread(target=self.pump,
+                                             args=(self.process.stderr, CHANNEL_STDERR, on_output))
+            stderr_reader.start()
+            self.pump(self.process.stdout, CHANNEL_STDOUT, on_output)
+            stderr_reader.join()
+            return self.process.wait()
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+    def read(self, channel):
+        """读取一个通道的完整输出, 供写入缓存"""
+        with open(self.paths[channel], 'rb') as f:
+            return f.read()
+
+    def cleanup(self):
+        """删除临时输出文件, 仍被查看器打开时由查看器关闭后删除"""
+        for path in self.temporary:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def expire(self):
+        with self.lock:
+            if self.process.poll() is None:
+                self.timed_out = True
+                self.process.kill()
+
+    def kill(self):
+        with self.lock:
+            self.killed = True
+            if self.process is not None and self.process.poll() is None:
+                self.process.kill()
+
+    def status(self, returncode):
+        """根据退出码判断本次运行的结果状态"""
+        if self.timed_out:
+            return STATUS_TIMEOUT
+        if self.killed or returncode is None:
+            return STATUS_CANCELLED
+        if self.limits.cpu_exceeded(returncode):
+            return STATUS_TIMEOUT
+        if returncode and self.limits.memory_mb and \
+                self.limits.memory_exceeded(returncode, decode_output(self.read(CHANNEL_STDERR))):
+            return STATUS_TIMEOUT
+        return STATUS_OK if returncode == 0 else STATUS_FAILED
+
+
+class RunnerCommand(StreamingCommand):
+    """在当前线程中调用 Engine.runner 形式的函数, 接口与 StreamingCommand 相同
+
+    runner 在进程内运行, 只在检查 should_stop 时停止; limits 中只有墙钟时间
+    有效, 到期后 should_stop 返回真并记为超时。
+    """
+
+    def __init__(self, runner, input_path, output_path=None, limits=None):
+        super().__init__([input_path], output_path, limits)
+        self.runner = runner
+        self.input_path = input_path
+        self.deadline = None
+
+    def should_stop(self):
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.timed_out = True
+        return self.killed or self.timed_out
+
+    def run(self, on_output=None):
+        """阻塞直到 runner 返回, 返回退出码"""
+        if self.limits.timeout:
+            self.deadline = time.monotonic() + self.limits.timeout
+        returncode, stderr, _ = self.runner(self.input_path, self.paths[CHANNEL_STDOUT], self.should_stop)
+        with open(self.paths[CHANNEL_STDERR], 'wb') as f:
+            f.write(stderr.encode(locale.getpreferredencoding(False), errors='replace'))
+        if stderr and on_output is not None:
+            on_output(CHANNEL_STDERR, stderr)
+        return returncode
+
+    def kill(self):
+        self.killed = True
+
+
+class BatchDecompiler:
+    """用 workers 个并行的反编译器进程处理一组任务
+
+    每个任务都是独立的子进程, 这里只用线程等待子进程,
+    并行度由同时运行的子进程数决定。cache 为 DecompileCache 时先查缓存。
+    """
+
+    def __init__(self, engine, workers=1, on_result=None, cancel_event=None, cache=None):
+        self.engine = engine
+        self.workers = max(1, workers)
+        self.on_result = on_result or (lambda result: None)
+        self.cancel_event = cancel_event
+        self.cache = cache
+
+    def cancelled(self):
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def cache_key(self, task, engine):
+        return self.cache.make_key(file_sha256(task.input_path), engine.name, engine.version, engine.options)
+
+    def run_engine(self, task, engine, output_path, should_stop=None):
+        """用一个引擎处理任务, 标准输出写入 output_path, 结果附带评分"""
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        start = time.monotonic()
+
+        key = None
+        if self.cache is not None:
+            try:
+                key = self.cache_key(task, engine)
+                cached = self.cache.get(key)
+            except (OSError, sqlite3.Error):
+                key = cached = None
+            if cached is not None:
+                with open(output_path, 'wb') as f:
+                    f.write(cached.stdout)
+                status = STATUS_OK if cached.returncode == 0 else STATUS_FAILED
+                result = DecompileResult(task, status, cached.returncode, time.monotonic() - start,
+                                         cached.stderr, cached=True, engine=engine.name)
+                result.score = score_output(engine, status, cached.stdout, cached.stderr)
+                return result
+
+        try:
+            if engine.runner is not None:
+                returncode, stderr, status = engine.runner(task.input_path, output_path,
+                                                           should_stop or self.cancelled)
+            else:
+                returncode, stderr, status = run_command(engine.build_command(task.input_path), output_path,
+                                                         engine.limits, should_stop or self.cancelled)
+            with open(output_path, 'rb') as f:
+                stdout = f.read()
+        except OSError as e:
+            return DecompileResult(task, STATUS_FAILED, None, time.monotonic() - start, str(e),
+                                   engine=engine.name)
+        result = DecompileResult(task, status, returncode, time.monotonic() - start, stderr,
+                                 engine=engine.name)
+        result.score = score_output(engine, status, stdout, stderr)
+
+        # 超时、超过资源限制与被终止的结果与文件本身无关, 不写入缓存
+        if key is not None and status in (STATUS_OK, STATUS_FAILED):
+            try:
+                self.cache.put(key, engine.name, engine.version, engine.options, returncode, stdout, stderr)
+            except sqlite3.Error:
+                pass
+        return result
+
+    def run_task(self, task):
+        if self.cancelled():
+            return DecompileResult(task, STATUS_CANCELLED)
+        return self.run_engine(task, self.engine, task.output_path)
+
+    def run(self, tasks):
+        """执行全部任务, 按完成顺序回调 on_result, 返回结果列表"""
+        results = []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.run_task, task) for task in tasks]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                self.on_result(result)
+        return results
+
+
+class AutoDecompiler(BatchDecompiler):
+    """按 pyc 的 magic 选择候选引擎, 保留得分最高的结果并记录获胜的引擎
+
+    engines 按优先顺序排列。MODE_CHAIN 依次尝试, 得到满分结果即停止,
+    反汇编引擎只在没有可用的反编译结果时运行; MODE_RACE 同时运行全部候选,
+    第一个满分结果出现后终止其余引擎。每个引擎有各自的超时。
+    """
+
+    def __init__(self, engines, mode=MODE_CHAIN, workers=1, on_result=None, cancel_event=None, cache=None):
+        super().__init__(None, workers, on_result, cancel_event, cache)
+        self.engines = engines
+        self.mode = mode
+
+    @staticmethod
+    def attempt_path(task, engine):
+        return f"{os.path.splitext(task.output_path)[0]}{engine.suffix}.{engine.name}.tmp"
+
+    def chain(self, task, engines):
+        attempts = []
+        for engine in engines:
+            if self.cancelled():
+                break
+            if engine.disassembler and any(attempt.score > SCORE_DISASSEMBLY for attempt in attempts):
+                continue
+            attempt = self.run_engine(task, engine, self.attempt_path(task, engine))
+            attempts.append(attempt)
+            if attempt.score >= SCORE_CLEAN:
+                break
+        return attempts
+
+    def race(self, task, engines):
+        attempts = []
+        won = threading.Event()
+
+        def should_stop():
+            return won.is_set() or self.cancelled()
+
+        with ThreadPoolExecutor(max_workers=len(engines)) as executor:
+            futures = [executor.submit(self.run_engine, task, engine, self.attempt_path(task, engine),
+                                       should_stop) for engine in engines]
+            for future in as_completed(futures):
+                attempt = future.result()
+                attempts.append(attempt)
+                if attempt.score >= SCORE_CLEAN:
+                    won.set()
+        return attempts
+
+    def run_task(self, task):
+        if self.cancelled():
+            return DecompileResult(task, STATUS_CANCELLED)
+        start = time.monotonic()
+        pyver = pyc_version(task.input_path)
+        engines = [engine for engine in self.engines if engine.supports(pyver)]
+        if not engines:
+            result = DecompileResult(task, STATUS_FAILED, stderr=f"没有支持 Python {format_version(pyver)} 的引擎")
+            result.pyver = pyver
+            return result
+
+        attempts = self.chain(task, engines) if self.mode == MODE_CHAIN else self.race(task, engines)
+        order = {engine.name: index for index, engine in enumerate(engines)}
+        by_name = {engine.name: engine for engine in engines}
+        # 得分相同时按引擎优先顺序选择
+        ranked = sorted(attempts, key=lambda attempt: (-attempt.score, order[attempt.engine]))
+
+        if ranked and ranked[0].score > 0:
+            winner = ranked[0]
+            engine = by_name[winner.engine]
+            output_path = os.path.splitext(task.output_path)[0] + engine.suffix
+            os.replace(self.attempt_path(task, engine), output_path)
+            result = DecompileResult(task, STATUS_OK, winner.returncode, 0.0, winner.stderr,
+                                     winner.cached, winner.engine)
+            result.score = winner.score
+            result.output_path = output_path
+        elif all(attempt.status == STATUS_CANCELLED for attempt in attempts):
+            result = DecompileResult(task, STATUS_CANCELLED)
+        else:
+            # 没有可用结果时报告超时或最后一个引擎的错误
+            statuses = {attempt.status for attempt in attempts}
+            status = STATUS_TIMEOUT if statuses == {STATUS_TIMEOUT} else STATUS_FAILED
+            last = attempts[-1]
+            result = DecompileResult(task, status, last.returncode, 0.0, last.stderr)
+
+        for attempt in attempts:
+            path = self.attempt_path(task, by_name[attempt.engine])
+            if os.path.exists(path):
+                os.remove(path)
+        result.elapsed = time.monotonic() - start
+        result.pyver = pyver
+        result.attempts = [(attempt.engine, attempt.status, attempt.score, attempt.elapsed)
+                           for attempt in attempts]
+        return result
+
+
+def summarize(results):
+    """按状态统计结果数量"""
+    counts = {STATUS_OK: 0, STATUS_FAILED: 0, STATUS_CANCELLED: 0, STATUS_TIMEOUT: 0, 'cached': 0}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+        if result.cached:
+            counts['cached'] += 1
+    return counts
+
+
+def write_summary(output_dir, title, results, elapsed):
+    """在输出目录写出汇总报告, 返回报告路径"""
+    counts = summarize(results)
+    ordered = sorted(results, key=lambda result: result.task.rel_path)
+    lines = [
+        title,
+        f"总计: {len(results)}  成功: {counts[STATUS_OK]}  失败: {counts[STATUS_FAILED]}  "
+        f"超时: {counts[STATUS_TIMEOUT]}  取消: {counts[STATUS_CANCELLED]}  "
+        f"缓存命中: {counts['cached']}  总耗时: {elapsed:.1f}s",
+        "",
+        "失败的文件:",
+    ]
+    for result in ordered:
+        if result.status in (STATUS_FAILED, STATUS_TIMEOUT):
+            message = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else ''
+            lines.append(f"  {result.task.rel_path} [{result.status}] (退出码 {result.returncode}) {message}")
+        elif result.note:
+            lines.append(f"  {result.task.rel_path} [部分失败] {result.note}")
+
+    # 自动模式: 各引擎获胜的文件数
+    wins = {}
+    for result in results:
+        if result.ok and result.attempts:
+            wins[result.engine] = wins.get(result.engine, 0) + 1
+    if wins:
+        lines += ["", "获胜引擎:"]
+        for engine, count in sorted(wins.items(), key=lambda item: -item[1]):
+            lines.append(f"  {engine}: {count}")
+
+    lines += ["", "耗时最长的文件:"]
+    for result in sorted(results, key=lambda result: result.elapsed, reverse=True)[:20]:
+        if result.status != STATUS_CANCELLED and not result.cached:
+            lines.append(f"  {result.elapsed:8.2f}s  {result.task.rel_path}")
+
+    lines += ["", "全部结果:"]
+    for result in ordered:
+        cached = " (缓存)" if result.cached else ""
+        line = f"  [{result.status}] {result.elapsed:.2f}s  {result.task.rel_path}{cached}"
+        if result.attempts:
+            tried = ", ".join(f"{engine}={status}/{score}" for engine, status, score, _ in result.attempts)
+            line += f"  Python {format_version(result.pyver)}  引擎: {result.engine or '-'}  ({tried})"
+        lines.append(line)
+
+    os.makedirs(output_dir, exist_ok=True)
+    summary_path = os.path.join(output_dir, SUMMARY_NAME)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    return summary_path
@@ -1,6 +1,7 @@
 # main.py - 主程序入口
 import sys
 import os
+import multiprocessing
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QPushButton, QHBoxLayout, QDialog, QLabel,
                             QDialogButtonBox, QGroupBox)
@@ -13,6 +14,9 @@ from my_pyinstaller import PyInstallerGUI
 from my_pycdc import PycdcGUI
 from my_pycdas import PycdasGUI
 from my_uncompyle6 import Uncompyle6GUI
+from my_autodecompile import AutoDecompileGUI
+from my_codeindex import CodeIndexGUI
+from my_codediff import CodeDiffGUI
 
 
 class OnlineDecompilerDialog(QDialog):
@@ -84,7 +88,7 @@ class DecompilerChoiceDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("选择pyc反编译工具")
-        self.setFixedSize(400, 300)
+        self.setFixedSize(400, 340)
 
         layout = QVBoxLayout(self)
 
@@ -96,6 +100,13 @@ class DecompilerChoiceDialog(QDialog):
         # 工具按钮
         self.tool_buttons = []
 
+        # 自动选择
+        auto_btn = QPushButton("自动 (按pyc版本选择引擎)")
+        auto_btn.setToolTip("根据pyc的magic选择引擎, 失败时自动换用其他引擎, 并记录最终使用的引擎")
+        auto_btn.clicked.connect(lambda: self.select_tool("auto"))
+        layout.addWidget(auto_btn)
+        self.tool_buttons.append(auto_btn)
+
         # pycdc
         pycdc_btn = QPushButton("pycdc (支持Python 3.9及以下)")
         pycdc_btn.setToolTip("最强大的反编译工具之一，支持较新的Python版本")
@@ -187,6 +198,16 @@ class MainWindow(QMainWindow):
         self.decompile_btn.clicked.connect(self.open_decompiler_choice)
         layout.addWidget(self.decompile_btn)
 
+        self.index_btn = QPushButton("4. 代码索引搜索")
+        self.index_btn.setFont(QFont("Arial", 12))
+        self.index_btn.clicked.connect(self.open_codeindex)
+        layout.addWidget(self.index_btn)
+
+        self.diff_btn = QPushButton("5. 版本差异分析")
+        self.diff_btn.setFont(QFont("Arial", 12))
+        self.diff_btn.clicked.connect(self.open_codediff)
+        layout.addWidget(self.diff_btn)
+
         # 添加底部信息
         layout.addStretch()
         footer = QLabel("© 2025 Python工具集 | 版本 1.0 | 作者: xiusi")
@@ -204,12 +225,25 @@ class MainWindow(QMainWindow):
         self.pyinstaller_gui = PyInstallerGUI()  # 使用导入的类
         self.pyinstaller_gui.show()  # 显示窗口
 
+    def open_codeindex(self):
+        """打开解包目录的代码索引搜索"""
+        self.codeindex_gui = CodeIndexGUI()
+        self.codeindex_gui.show()
+
+    def open_codediff(self):
+        """打开两个版本解包目录的差异分析"""
+        self.codediff_gui = CodeDiffGUI()
+        self.codediff_gui.show()
+
     def open_decompiler_choice(self):
         """打开反编译工具选择对话框"""
         dialog = DecompilerChoiceDialog(self)
         if dialog.exec_() == QDialog.Accepted:
             tool = dialog.selected_tool
-            if tool == "pycdc":
+            if tool == "auto":
+                self.auto_gui = AutoDecompileGUI()
+                self.auto_gui.show()
+            elif tool == "pycdc":
                 self.pycdc_gui = PycdcGUI()
                 self.pycdc_gui.show()
             elif tool == "pycdas":
@@ -224,6 +258,8 @@ class MainWindow(QMainWindow):
 
 
 if __name__ == "__main__":
+    # 打包后解包进程池需要
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
 
     # 设置应用样式
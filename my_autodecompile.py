@@ -0,0 +1,580 @@
+# my_autodecompile.py - 自动选择反编译引擎的GUI
+import sys
+import os
+import time
+import sqlite3
+import threading
+import configparser
+import importlib.util
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
+                             QLineEdit, QPushButton, QFileDialog, QMessageBox,
+                             QHBoxLayout, QDialog, QLabel, QDialogButtonBox,
+                             QSpinBox, QComboBox, QProgressDialog,
+                             QFormLayout, QCheckBox)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtGui import QFont
+
+from decompile_cache import DecompileCache, exe_version, module_version
+from decompile_runner import (AutoDecompiler, DecompileTask, Engine, ResourceLimits, plan_tree, summarize,
+                              write_summary, format_version, spool_file, MODE_CHAIN, MODE_RACE,
+                              DEFAULT_CPU_LIMIT, DEFAULT_MEMORY_LIMIT, LIMIT_LABELS,
+                              STATUS_OK, STATUS_FAILED, STATUS_CANCELLED, STATUS_TIMEOUT)
+from output_viewer import OutputViewer
+from split_decompile import SplitDecompiler
+from uncompyle6_pool import Uncompyle6Pool
+from pyc_disasm import run_disassembler, DISASM_VERSION, SUPPORTED_VERSIONS
+
+if getattr(sys, 'frozen', False):
+    # 打包后使用可执行文件所在目录
+    BASE_DIR = os.path.dirname(sys.executable)
+else:
+    # 开发环境使用脚本所在目录
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CONFIG_FILE = os.path.join(BASE_DIR, "autodecompile_config.ini")
+
+# 与其他反编译工具共用的结果缓存
+CACHE_FILE = os.path.join(BASE_DIR, "decompile_cache.db")
+
+# 引擎按优先顺序排列: uncompyle6 只支持到 3.8, pycdc 覆盖全部版本, pycdas 反汇编保底,
+# 没有 pycdas.exe 时由内置反汇编器保底
+ENGINE_NAMES = ("uncompyle6", "pycdc", "pycdas")
+UNCOMPYLE6_VERSIONS = ((1, 0), (3, 8))
+DEFAULT_TIMEOUTS = {"uncompyle6": 60, "pycdc": 60, "pycdas": 30}
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+MODE_NAMES = {MODE_CHAIN: "回退链 (依次尝试)", MODE_RACE: "竞速 (同时运行)"}
+
+
+def default_exe_path(name):
+    """优先使用 pycdc/pycdas 工具中配置的路径"""
+    config = configparser.ConfigParser()
+    config.read(os.path.join(BASE_DIR, f"{name}_config.ini"))
+    exe_path = config.get('DEFAULT', 'exe_path', fallback='')
+    if exe_path and os.path.exists(exe_path):
+        return exe_path
+    return os.path.join(BASE_DIR, f"{name}.exe")
+
+
+def engine_limits(config, name):
+    """引擎各自的超时, CPU 与内存限制所有引擎共用"""
+    return ResourceLimits(config['timeouts'][name], config['cpu_limit'], config['memory_limit'])
+
+
+def has_uncompyle6():
+    return importlib.util.find_spec("uncompyle6") is not None
+
+
+def build_engines(config, pool=None):
+    """按配置构造可用的引擎, 找不到的引擎直接跳过
+
+    pool 为 Uncompyle6Pool 时 uncompyle6 交给常驻工作进程, 否则每个文件启动一次命令行。
+    """
+    engines = []
+    if has_uncompyle6():
+        if pool is not None:
+            engines.append(Engine("uncompyle6", None, module_version("uncompyle6"), "api", pool.limits,
+                                  versions=UNCOMPYLE6_VERSIONS, runner=pool.run))
+        else:
+            engines.append(Engine("uncompyle6",
+                                  lambda input_path: [sys.executable, "-m", "uncompyle6.bin.uncompile", input_path],
+                                  module_version("uncompyle6"), limits=engine_limits(config, "uncompyle6"),
+                                  versions=UNCOMPYLE6_VERSIONS))
+    pycdc_path = config['pycdc_path']
+    if os.path.exists(pycdc_path):
+        engines.append(Engine("pycdc", lambda input_path: [pycdc_path, input_path], exe_version(pycdc_path),
+                              limits=engine_limits(config, "pycdc")))
+    pycdas_path = config['pycdas_path']
+    if os.path.exists(pycdas_path):
+        engines.append(Engine("pycdas", lambda input_path: [pycdas_path, input_path], exe_version(pycdas_path),
+                              limits=engine_limits(config, "pycdas"), disassembler=True, suffix=".txt"))
+    else:
+        engines.append(Engine("pyc_disasm", None, DISASM_VERSION, limits=engine_limits(config, "pycdas"),
+                              versions=(SUPPORTED_VERSIONS[0], SUPPORTED_VERSIONS[-1]), disassembler=True,
+                              suffix=".txt", runner=run_disassembler))
+    return engines
+
+
+class FileDropEdit(QLineEdit):
+    """支持文件或目录拖拽的输入框"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAcceptDrops(True)
+        self.setPlaceholderText("拖拽pyc文件或目录到此处")
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dropEvent(self, event):
+        files = [u.toLocalFile() for u in event.mimeData().urls()]
+        if files:
+            self.setText(files[0])
+
+
+class ConfigDialog(QDialog):
+    """配置对话框"""
+
+    def __init__(self, config, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("配置自动反编译")
+        self.setMinimumWidth(500)
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+
+        self.pycdc_input = QLineEdit(config['pycdc_path'])
+        form.addRow("pycdc.exe 路径:", self.with_browse(self.pycdc_input))
+        self.pycdas_input = QLineEdit(config['pycdas_path'])
+        form.addRow("pycdas.exe 路径:", self.with_browse(self.pycdas_input))
+
+        self.mode_combo = QComboBox()
+        for mode, label in MODE_NAMES.items():
+            self.mode_combo.addItem(label, mode)
+        self.mode_combo.setCurrentIndex(self.mode_combo.findData(config['mode']))
+        form.addRow("运行方式:", self.mode_combo)
+
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, 256)
+        self.workers_spin.setValue(config['workers'])
+        form.addRow("目录模式并行文件数:", self.workers_spin)
+
+        # 每个函数单独反编译, 单个函数失败不影响文件的其余部分
+        self.split_cb = QCheckBox("函数级拆分 (逐个函数并行反编译后拼回)")
+        self.split_cb.setChecked(config['split'])
+        form.addRow("", self.split_cb)
+
+        # 每个引擎单独的超时
+        self.timeout_spins = {}
+        for name in ENGINE_NAMES:
+            spin = QSpinBox()
+            spin.setRange(1, 24 * 3600)
+            spin.setSuffix(" 秒")
+            spin.setValue(config['timeouts'][name])
+            form.addRow(f"{name} 超时:", spin)
+            self.timeout_spins[name] = spin
+
+        # 每次调用引擎的 CPU 与内存限制, 0 表示不限制
+        self.limit_spins = {}
+        for key in ('cpu_limit', 'memory_limit'):
+            spin = QSpinBox()
+            spin.setRange(0, 1024 * 1024)
+            spin.setSpecialValueText("不限制")
+            spin.setValue(config[key])
+            form.addRow(LIMIT_LABELS[key] + ":", spin)
+            self.limit_spins[key] = spin
+
+        layout.addLayout(form)
+
+        # 按钮框
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+    def with_browse(self, line_edit):
+        row = QHBoxLayout()
+        row.addWidget(line_edit)
+        browse_btn = QPushButton("浏览...")
+        browse_btn.clicked.connect(lambda: self.browse_exe(line_edit))
+        row.addWidget(browse_btn)
+        return row
+
+    def browse_exe(self, line_edit):
+        file_path, _ = QFileDialog.getOpenFileName(self, "选择可执行文件", "", "可执行文件 (*.exe)")
+        if file_path:
+            line_edit.setText(file_path)
+
+    def get_config(self):
+        """获取配置"""
+        return {
+            'pycdc_path': self.pycdc_input.text().strip(),
+            'pycdas_path': self.pycdas_input.text().strip(),
+            'mode': self.mode_combo.currentData(),
+            'workers': self.workers_spin.value(),
+            'split': self.split_cb.isChecked(),
+            'timeouts': {name: spin.value() for name, spin in self.timeout_spins.items()},
+            'cpu_limit': self.limit_spins['cpu_limit'].value(),
+            'memory_limit': self.limit_spins['memory_limit'].value(),
+        }
+
+
+class AutoDecompileThread(QThread):
+    """自动模式的反编译线程, output_dir 为空时不写汇总报告
+
+    split 为真时按函数拆分, 进度按代码对象计数。
+    """
+    progress = pyqtSignal(int, int, str)  # 已完成数, 总数, 当前文件
+    finished = pyqtSignal(list, str, float)  # 结果列表, 汇总报告路径, 总耗时
+    error = pyqtSignal(str)
+
+    def __init__(self, engines, mode, workers, input_path, output_dir=None, cache=None, split=False,
+                 parent=None):
+        super().__init__(parent)
+        self.engines = engines
+        self.mode = mode
+        self.workers = workers
+        self.split = split
+        self.input_path = input_path
+        self.output_dir = output_dir
+        self.cache = cache
+        self.cancel_event = threading.Event()
+        self.done = 0
+        self.total = 0
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def plan(self, total):
+        self.total = total
+
+    def report(self, result):
+        self.done += 1
+        self.progress.emit(self.done, self.total, result.task.rel_path)
+
+    def run(self):
+        try:
+            start = time.monotonic()
+            if self.output_dir:
+                tasks = plan_tree(self.input_path, self.output_dir, ".py")
+            else:
+                tasks = [DecompileTask(self.input_path, os.path.splitext(self.input_path)[0] + ".py",
+                                       os.path.basename(self.input_path))]
+            self.total = len(tasks)
+            if self.split:
+                decompiler = SplitDecompiler(self.engines, self.mode, self.workers, on_result=self.report,
+                                             cancel_event=self.cancel_event, cache=self.cache, on_planned=self.plan)
+            else:
+                decompiler = AutoDecompiler(self.engines, self.mode, self.workers, on_result=self.report,
+                                            cancel_event=self.cancel_event, cache=self.cache)
+            results = decompiler.run(tasks)
+            elapsed = time.monotonic() - start
+            summary_path = ''
+            if self.output_dir:
+                title = f"自动反编译 ({self.mode}{', 函数级' if self.split else ''}): {self.input_path}"
+                summary_path = write_summary(self.output_dir, title, results, elapsed)
+            self.finished.emit(results, summary_path, elapsed)
+        except Exception as e:
+            import traceback
+            self.error.emit(f"反编译过程中发生错误:\n{str(e)}\n\n{traceback.format_exc()}")
+
+
+class AutoDecompileGUI(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("自动反编译")
+        self.setGeometry(300, 300, 550, 250)
+        self.run_thread = None
+        self.progress_dialog = None
+        self.pool = None
+        self.pool_settings = None
+        self.cache = self.open_cache()
+
+        # 加载配置
+        self.config = self.load_config()
+
+        # 创建主部件和布局
+        main_widget = QWidget()
+        self.setCentralWidget(main_widget)
+        layout = QVBoxLayout(main_widget)
+
+        # 顶部按钮布局
+        top_layout = QHBoxLayout()
+        self.config_btn = QPushButton("配置")
+        self.config_btn.clicked.connect(self.open_config_dialog)
+        top_layout.addWidget(self.config_btn)
+        self.status_label = QLabel()
+        top_layout.addWidget(self.status_label)
+        top_layout.addStretch()
+        layout.addLayout(top_layout)
+        self.update_status()
+
+        # 输入: pyc文件或目录
+        self.input_edit = FileDropEdit()
+        layout.addWidget(self.input_edit)
+
+        browse_layout = QHBoxLayout()
+        file_btn = QPushButton("选择文件")
+        file_btn.clicked.connect(self.browse_file)
+        browse_layout.addWidget(file_btn)
+        dir_btn = QPushButton("选择目录")
+        dir_btn.clicked.connect(self.browse_dir)
+        browse_layout.addWidget(dir_btn)
+        layout.addLayout(browse_layout)
+
+        layout.addWidget(QLabel("按pyc版本选择引擎: Python 3.8及以下优先uncompyle6, 其次pycdc, "
+                                "都失败时用pycdas (或内置反汇编器) 反汇编"))
+
+        # 执行按钮
+        self.decompile_btn = QPushButton("自动反编译")
+        self.decompile_btn.setFont(QFont("Arial", 12))
+        self.decompile_btn.clicked.connect(self.execute_decompile)
+        layout.addWidget(self.decompile_btn)
+
+        layout.addStretch()
+
+    def load_config(self):
+        """加载配置文件"""
+        config = configparser.ConfigParser()
+        defaults = {
+            'pycdc_path': default_exe_path("pycdc"),
+            'pycdas_path': default_exe_path("pycdas"),
+            'mode': MODE_CHAIN,
+            'workers': DEFAULT_WORKERS,
+            'split': False,
+            'timeouts': dict(DEFAULT_TIMEOUTS),
+            'cpu_limit': DEFAULT_CPU_LIMIT,
+            'memory_limit': DEFAULT_MEMORY_LIMIT,
+        }
+
+        # 如果配置文件不存在，创建默认配置
+        if not os.path.exists(CONFIG_FILE):
+            self.write_config(defaults)
+            return defaults
+
+        try:
+            config.read(CONFIG_FILE)
+            mode = config.get('DEFAULT', 'mode', fallback=MODE_CHAIN)
+            return {
+                'pycdc_path': config.get('DEFAULT', 'pycdc_path', fallback=defaults['pycdc_path']),
+                'pycdas_path': config.get('DEFAULT', 'pycdas_path', fallback=defaults['pycdas_path']),
+                'mode': mode if mode in MODE_NAMES else MODE_CHAIN,
+                'workers': max(1, config.getint('DEFAULT', 'workers', fallback=DEFAULT_WORKERS)),
+                'split': config.getboolean('DEFAULT', 'split', fallback=False),
+                'timeouts': {name: max(1, config.getint('DEFAULT', f'{name}_timeout', fallback=seconds))
+                             for name, seconds in DEFAULT_TIMEOUTS.items()},
+                'cpu_limit': max(0, config.getint('DEFAULT', 'cpu_limit', fallback=DEFAULT_CPU_LIMIT)),
+                'memory_limit': max(0, config.getint('DEFAULT', 'memory_limit', fallback=DEFAULT_MEMORY_LIMIT)),
+            }
+        except Exception as e:
+            QMessageBox.warning(
+                None,
+                "配置文件读取失败",
+                f"无法读取配置文件:\n{str(e)}\n将使用默认配置"
+            )
+            return defaults
+
+    def write_config(self, values):
+        """写入配置文件, 失败时提示但继续使用当前配置"""
+        try:
+            config = configparser.ConfigParser()
+            config['DEFAULT'] = {
+                'pycdc_path': values['pycdc_path'],
+                'pycdas_path': values['pycdas_path'],
+                'mode': values['mode'],
+                'workers': str(values['workers']),
+                'split': str(values['split']),
+                'cpu_limit': str(values['cpu_limit']),
+                'memory_limit': str(values['memory_limit']),
+            }
+            for name, seconds in values['timeouts'].items():
+                config['DEFAULT'][f'{name}_timeout'] = str(seconds)
+            with open(CONFIG_FILE, 'w') as configfile:
+                config.write(configfile)
+        except Exception as e:
+            QMessageBox.warning(
+                None,
+                "配置文件保存失败",
+                f"无法保存配置文件:\n{str(e)}"
+            )
+
+    def save_config(self, values):
+        """保存配置到文件"""
+        self.write_config(values)
+        self.config = values
+        self.update_status()
+
+    def close_pool(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+
+    def get_pool(self):
+        """第一次使用时启动 uncompyle6 工作进程, 之后的运行继续复用, 配置变化后重新启动"""
+        if not has_uncompyle6():
+            return None
+        settings = (self.config['workers'], self.config['timeouts']["uncompyle6"],
+                    self.config['cpu_limit'], self.config['memory_limit'])
+        if self.pool is not None and self.pool_settings != settings:
+            self.close_pool()
+        if self.pool is None:
+            self.pool = Uncompyle6Pool(self.config['workers'], engine_limits(self.config, "uncompyle6"))
+            self.pool_settings = settings
+        return self.pool
+
+    def update_status(self):
+        names = [engine.name for engine in build_engines(self.config)]
+        status = f"可用引擎: {', '.join(names) or '无'}  |  {MODE_NAMES[self.config['mode']]}"
+        if self.config['split']:
+            status += "  |  函数级拆分"
+        self.status_label.setText(status)
+
+    def open_config_dialog(self):
+        """打开配置对话框"""
+        dialog = ConfigDialog(self.config, self)
+        if dialog.exec_() == QDialog.Accepted:
+            self.save_config(dialog.get_config())
+
+    def browse_file(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "选择文件", "", "Python编译文件 (*.pyc *.pyo)")
+        if file_path:
+            self.input_edit.setText(file_path)
+
+    def browse_dir(self):
+        dir_path = QFileDialog.getExistingDirectory(self, "选择目录", "")
+        if dir_path:
+            self.input_edit.setText(dir_path)
+
+    def open_cache(self):
+        """打开结果缓存, 失败时不使用缓存"""
+        try:
+            return DecompileCache(CACHE_FILE)
+        except sqlite3.Error:
+            return None
+
+    def execute_decompile(self):
+        """按pyc版本自动选择引擎执行反编译"""
+        input_path = self.input_edit.text().strip()
+        if not input_path:
+            QMessageBox.warning(self, "错误", "请先选择文件或目录")
+            return
+        if not os.path.exists(input_path):
+            QMessageBox.critical(self, "错误", f"路径不存在:\n{input_path}")
+            return
+
+        engines = build_engines(self.config, self.get_pool())
+        if not engines:
+            QMessageBox.critical(self, "缺少依赖", "没有可用的反编译引擎\n请安装uncompyle6或通过配置按钮设置pycdc/pycdas路径")
+            return
+
+        output_dir = None
+        if os.path.isdir(input_path):
+            output_dir = input_path.rstrip("/\\") + "_decompiled"
+            self.progress_dialog = QProgressDialog("正在扫描目录...", "取消", 0, 0, self)
+            self.progress_dialog.setMinimumWidth(450)
+            self.progress_dialog.setWindowTitle("自动反编译")
+            self.progress_dialog.setWindowModality(Qt.WindowModal)
+            self.progress_dialog.canceled.connect(self.cancel_run)
+            self.progress_dialog.show()
+
+        self.decompile_btn.setEnabled(False)
+        self.run_thread = AutoDecompileThread(engines, self.config['mode'], self.config['workers'],
+                                              input_path, output_dir, self.cache, self.config['split'])
+        self.run_thread.progress.connect(self.update_progress)
+        self.run_thread.finished.connect(self.handle_finished)
+        self.run_thread.error.connect(self.handle_error)
+        self.run_thread.start()
+
+    def cancel_run(self):
+        """取消尚未开始的文件并终止正在运行的引擎"""
+        if self.run_thread:
+            self.run_thread.cancel()
+        self.progress_dialog = None
+
+    def update_progress(self, done, total, rel_path):
+        if self.progress_dialog:
+            self.progress_dialog.setMaximum(total)
+            self.progress_dialog.setValue(done)
+            self.progress_dialog.setLabelText(f"已完成 {done}/{total}\n当前: {rel_path}")
+
+    def close_progress(self):
+        if self.progress_dialog:
+            self.progress_dialog.canceled.disconnect(self.cancel_run)
+            self.progress_dialog.close()
+            self.progress_dialog = None
+        self.run_thread.wait()
+        self.run_thread = None
+        self.decompile_btn.setEnabled(True)
+
+    def handle_finished(self, results, summary_path, elapsed):
+        self.close_progress()
+        if not summary_path:
+            self.show_result_dialog(results[0])
+            return
+        counts = summarize(results)
+        message = (f"共 {len(results)} 个文件, 成功 {counts[STATUS_OK]}, 失败 {counts[STATUS_FAILED]}, "
+                   f"超时 {counts[STATUS_TIMEOUT]}")
+        if counts[STATUS_CANCELLED]:
+            message += f", 取消 {counts[STATUS_CANCELLED]}"
+        partial = sum(1 for result in results if result.note)
+        if partial:
+            message += f"\n部分函数反编译失败的文件: {partial}"
+        wins = {}
+        for result in results:
+            if result.ok:
+                wins[result.engine] = wins.get(result.engine, 0) + 1
+        if wins:
+            message += "\n获胜引擎: " + ", ".join(f"{name} {count}" for name, count in wins.items())
+        message += (f"\n总耗时: {elapsed:.1f}s\n\n输出目录:\n{os.path.dirname(summary_path)}"
+                    f"\n汇总报告:\n{summary_path}")
+        QMessageBox.information(self, "自动反编译完成", message)
+
+    def handle_error(self, error_msg):
+        self.close_progress()
+        QMessageBox.critical(self, "错误", error_msg)
+
+    def show_result_dialog(self, result):
+        """显示单个文件的结果: 获胜引擎、各引擎的尝试情况与输出内容"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("反编译结果")
+        dialog.setMinimumSize(700, 500)
+
+        layout = QVBoxLayout(dialog)
+
+        title = QLabel(f"pyc文件: {result.task.input_path}\nPython版本: {format_version(result.pyver)}")
+        title.setFont(QFont("Arial", 10, QFont.Bold))
+        layout.addWidget(title)
+
+        if result.ok:
+            status = f"获胜引擎: {result.engine} (得分 {result.score})" + (" (来自缓存)" if result.cached else "")
+        else:
+            status = f"全部引擎均未成功: {result.status}"
+        layout.addWidget(QLabel(status))
+        for engine, engine_status, score, elapsed in result.attempts:
+            layout.addWidget(QLabel(f"  {engine}: {engine_status}, 得分 {score}, 耗时 {elapsed:.2f}s"))
+        if result.note:
+            note_label = QLabel(result.note)
+            note_label.setWordWrap(True)
+            layout.addWidget(note_label)
+
+        # 输出文件可能很大, 只读取可见的行
+        views = []
+        if result.ok:
+            layout.addWidget(QLabel(f"输出文件: {result.output_path}"))
+            output_view = OutputViewer()
+            output_view.open(result.output_path)
+            layout.addWidget(output_view)
+            views.append(output_view)
+        if result.stderr.strip():
+            layout.addWidget(QLabel("错误输出:"))
+            error_view = OutputViewer(toolbar=False)
+            error_view.setMaximumHeight(120)
+            error_view.open(spool_file(result.stderr.encode('utf-8')), temporary=True)
+            layout.addWidget(error_view)
+            views.append(error_view)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok)
+        button_box.accepted.connect(dialog.accept)
+        layout.addWidget(button_box)
+
+        dialog.exec_()
+        for view in views:
+            view.close_file()
+
+    def closeEvent(self, event):
+        """窗口关闭时终止正在运行的引擎"""
+        if self.run_thread and self.run_thread.isRunning():
+            self.run_thread.cancel()
+            self.run_thread.wait()
+        self.close_pool()
+        event.accept()
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    window = AutoDecompileGUI()
+    window.show()
+    sys.exit(app.exec_())
@@ -0,0 +1,361 @@
+# my_codediff.py - 两个版本解包目录的差异分析GUI
+import sys
+import os
+import threading
+import configparser
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
+                             QLineEdit, QPushButton, QFileDialog, QMessageBox,
+                             QHBoxLayout, QDialog, QLabel, QDialogButtonBox,
+                             QProgressDialog, QTreeWidget, QTreeWidgetItem,
+                             QFormLayout, QHeaderView)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtGui import QFont, QColor
+
+from code_diff import (run_diff, DiffCancelled, count_changes, describe_unit, DIFF_LABELS, DIFF_SAME,
+                       DIFF_CHANGED, DIFF_ADDED, DIFF_REMOVED, DIFF_MOVED)
+from decompile_runner import spool_file, format_version
+from my_autodecompile import AutoDecompileGUI
+from output_viewer import OutputViewer
+from pyc_disasm import Disassembler
+
+if getattr(sys, 'frozen', False):
+    # 打包后使用可执行文件所在目录
+    BASE_DIR = os.path.dirname(sys.executable)
+else:
+    # 开发环境使用脚本所在目录
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CONFIG_FILE = os.path.join(BASE_DIR, "codediff_config.ini")
+
+STATUS_COLORS = {DIFF_CHANGED: QColor(180, 100, 0), DIFF_ADDED: QColor(0, 128, 0),
+                 DIFF_REMOVED: QColor(200, 0, 0), DIFF_MOVED: QColor(100, 100, 100)}
+
+
+def changed_dir(new_root):
+    """需要反编译的 pyc 与报告写到新版本目录旁边"""
+    return new_root.rstrip("/\\") + "_changed"
+
+
+class DirDropEdit(QLineEdit):
+    """支持目录拖拽的输入框"""
+
+    def __init__(self, placeholder, parent=None):
+        super().__init__(parent)
+        self.setAcceptDrops(True)
+        self.setPlaceholderText(placeholder)
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dropEvent(self, event):
+        files = [u.toLocalFile() for u in event.mimeData().urls()]
+        if files:
+            self.setText(files[0])
+
+
+class DiffThread(QThread):
+    """比较两个目录并写出需要反编译的部分"""
+    progress = pyqtSignal(int, int, str)  # 已处理数, 总数, 当前文件
+    finished = pyqtSignal(list, str, float)  # ModuleDiff 列表, 报告路径, 总耗时
+    cancelled = pyqtSignal()
+    error = pyqtSignal(str)
+
+    def __init__(self, old_root, new_root, output_dir, parent=None):
+        super().__init__(parent)
+        self.old_root = old_root
+        self.new_root = new_root
+        self.output_dir = output_dir
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            modules, report_path, elapsed = run_diff(self.old_root, self.new_root, self.output_dir,
+                                                     self.progress.emit, self.cancel_event.is_set)
+            self.finished.emit(modules, report_path, elapsed)
+        except DiffCancelled:
+            self.cancelled.emit()
+        except OSError as e:
+            self.error.emit(str(e))
+        except Exception as e:
+            import traceback
+            self.error.emit(f"比较过程中发生错误:\n{str(e)}\n\n{traceback.format_exc()}")
+
+
+class CodeDiffGUI(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("版本差异分析")
+        self.setGeometry(300, 300, 900, 600)
+        self.diff_thread = None
+        self.progress_dialog = None
+        self.modules = []
+        self.rows = []
+        self.output_dir = ''
+        self.auto_gui = None
+
+        # 加载配置
+        self.config = self.load_config()
+
+        # 创建主部件和布局
+        main_widget = QWidget()
+        self.setCentralWidget(main_widget)
+        layout = QVBoxLayout(main_widget)
+
+        # 输入: 两个版本的解包目录
+        form = QFormLayout()
+        self.old_edit = DirDropEdit("拖拽旧版本的解包目录 (*_extracted) 到此处")
+        self.old_edit.setText(self.config['old_dir'])
+        form.addRow("旧版本:", self.with_browse(self.old_edit))
+        self.new_edit = DirDropEdit("拖拽新版本的解包目录 (*_extracted) 到此处")
+        self.new_edit.setText(self.config['new_dir'])
+        form.addRow("新版本:", self.with_browse(self.new_edit))
+        layout.addLayout(form)
+
+        layout.addWidget(QLabel("按相对路径配对模块, 再按不含行号的字节码哈希配对代码对象; "
+                                "只有修改和新增的代码对象会写成独立的pyc交给反编译器"))
+
+        button_layout = QHBoxLayout()
+        self.diff_btn = QPushButton("开始比较")
+        self.diff_btn.setFont(QFont("Arial", 12))
+        self.diff_btn.clicked.connect(self.execute_diff)
+        button_layout.addWidget(self.diff_btn)
+        self.decompile_btn = QPushButton("反编译变化的代码")
+        self.decompile_btn.setFont(QFont("Arial", 12))
+        self.decompile_btn.setToolTip("用自动反编译 (uncompyle6/pycdc) 处理比较结果目录中的pyc")
+        self.decompile_btn.setEnabled(False)
+        self.decompile_btn.clicked.connect(self.decompile_changed)
+        button_layout.addWidget(self.decompile_btn)
+        layout.addLayout(button_layout)
+
+        # 比较结果, 双击代码对象查看两个版本的反汇编
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["状态", "模块 / 代码对象", "输出文件"])
+        self.tree.header().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.tree.setColumnWidth(0, 70)
+        self.tree.itemDoubleClicked.connect(self.open_item)
+        layout.addWidget(self.tree)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+    def with_browse(self, line_edit):
+        row = QHBoxLayout()
+        row.addWidget(line_edit)
+        browse_btn = QPushButton("浏览")
+        browse_btn.clicked.connect(lambda: self.browse_dir(line_edit))
+        row.addWidget(browse_btn)
+        return row
+
+    def browse_dir(self, line_edit):
+        dir_path = QFileDialog.getExistingDirectory(self, "选择解包目录", line_edit.text().strip())
+        if dir_path:
+            line_edit.setText(dir_path)
+
+    def load_config(self):
+        """加载配置文件"""
+        config = configparser.ConfigParser()
+        values = {'old_dir': '', 'new_dir': ''}
+        if os.path.exists(CONFIG_FILE):
+            try:
+                config.read(CONFIG_FILE)
+                values['old_dir'] = config.get('DEFAULT', 'old_dir', fallback='')
+                values['new_dir'] = config.get('DEFAULT', 'new_dir', fallback='')
+            except configparser.Error as e:
+                QMessageBox.warning(
+                    self,
+                    "配置文件读取失败",
+                    f"无法读取配置文件:\n{str(e)}\n将使用默认配置"
+                )
+        return values
+
+    def save_config(self):
+        """保存配置文件"""
+        config = configparser.ConfigParser()
+        config['DEFAULT'] = {
+            'old_dir': self.old_edit.text().strip(),
+            'new_dir': self.new_edit.text().strip()
+        }
+        try:
+            with open(CONFIG_FILE, 'w') as configfile:
+                config.write(configfile)
+        except OSError as e:
+            QMessageBox.warning(
+                self,
+                "配置文件保存失败",
+                f"无法保存配置文件:\n{str(e)}"
+            )
+
+    def execute_diff(self):
+        """比较两个目录, 结果写到新版本目录旁的 *_changed 目录"""
+        old_root = self.old_edit.text().strip()
+        new_root = self.new_edit.text().strip()
+        if not old_root or not new_root:
+            QMessageBox.warning(self, "错误", "请先选择两个版本的解包目录")
+            return
+        for path in (old_root, new_root):
+            if not os.path.isdir(path):
+                QMessageBox.critical(self, "错误", f"目录不存在:\n{path}")
+                return
+        if os.path.abspath(old_root) == os.path.abspath(new_root):
+            QMessageBox.warning(self, "错误", "两个目录相同")
+            return
+        self.save_config()
+
+        self.progress_dialog = QProgressDialog("正在扫描目录...", "取消", 0, 0, self)
+        self.progress_dialog.setMinimumWidth(450)
+        self.progress_dialog.setWindowTitle("版本差异分析")
+        self.progress_dialog.setWindowModality(Qt.WindowModal)
+        self.progress_dialog.canceled.connect(self.cancel_diff)
+        self.progress_dialog.show()
+
+        self.diff_btn.setEnabled(False)
+        self.decompile_btn.setEnabled(False)
+        self.diff_thread = DiffThread(old_root, new_root, changed_dir(new_root))
+        self.diff_thread.progress.connect(self.update_progress)
+        self.diff_thread.finished.connect(self.handle_finished)
+        self.diff_thread.cancelled.connect(self.handle_cancelled)
+        self.diff_thread.error.connect(self.handle_error)
+        self.diff_thread.start()
+
+    def cancel_diff(self):
+        """停止比较, 不写出任何结果, 上一次的比较结果保持不变"""
+        if self.diff_thread:
+            self.diff_thread.cancel()
+        self.progress_dialog = None
+
+    def update_progress(self, done, total, rel_path):
+        if self.progress_dialog:
+            self.progress_dialog.setMaximum(total)
+            self.progress_dialog.setValue(done)
+            self.progress_dialog.setLabelText(f"已比较 {done}/{total}\n当前: {rel_path}")
+
+    def close_progress(self):
+        if self.progress_dialog:
+            self.progress_dialog.canceled.disconnect(self.cancel_diff)
+            self.progress_dialog.close()
+            self.progress_dialog = None
+        self.diff_thread.wait()
+        self.diff_thread = None
+        self.diff_btn.setEnabled(True)
+
+    def handle_finished(self, modules, report_path, elapsed):
+        self.output_dir = self.diff_thread.output_dir
+        self.close_progress()
+        self.modules = modules
+        self.show_modules()
+        module_counts, unit_counts = count_changes(modules)
+        emitted = sum(len(module.output_paths) for module in modules)
+        self.decompile_btn.setEnabled(emitted > 0)
+        self.status_label.setText(
+            f"模块: 修改 {module_counts[DIFF_CHANGED]}, 新增 {module_counts[DIFF_ADDED]}, "
+            f"删除 {module_counts[DIFF_REMOVED]}, 未变化 {module_counts[DIFF_SAME]}  |  "
+            f"代码对象: 修改 {unit_counts[DIFF_CHANGED]}, 新增 {unit_counts[DIFF_ADDED]}, "
+            f"删除 {unit_counts[DIFF_REMOVED]}  |  需要反编译 {emitted} 个文件  |  耗时 {elapsed:.1f}s")
+        QMessageBox.information(self, "比较完成", f"需要反编译 {emitted} 个文件\n\n报告:\n{report_path}")
+
+    def handle_cancelled(self):
+        self.close_progress()
+        # 列表与输出目录仍是上一次完整比较的结果
+        self.decompile_btn.setEnabled(any(module.output_paths for module in self.modules))
+        QMessageBox.information(self, "已取消", "比较已取消, 上一次的比较结果保持不变")
+
+    def handle_error(self, error_msg):
+        self.close_progress()
+        QMessageBox.critical(self, "错误", error_msg)
+
+    def add_item(self, parent, status, text, output_path, row):
+        item = QTreeWidgetItem([DIFF_LABELS[status], text,
+                                os.path.relpath(output_path, self.output_dir) if output_path else ''])
+        color = STATUS_COLORS.get(status)
+        if color is not None:
+            item.setForeground(0, color)
+        item.setData(0, Qt.UserRole, row)
+        if parent is None:
+            self.tree.addTopLevelItem(item)
+        else:
+            parent.addChild(item)
+        return item
+
+    def show_modules(self):
+        """只列出有变化的模块, 修改的模块展开到代码对象"""
+        self.tree.clear()
+        self.rows = []
+        for module in self.modules:
+            if module.status == DIFF_SAME:
+                continue
+            text = f"{module.rel_path}  (Python {format_version(module.version)})"
+            if module.note:
+                text += f"  {module.note}"
+            self.rows.append((module, None))
+            item = self.add_item(None, module.status, text,
+                                 module.output_paths[0] if module.whole and module.output_paths else '',
+                                 len(self.rows) - 1)
+            for unit_diff in module.changed_units():
+                self.rows.append((module, unit_diff))
+                self.add_item(item, unit_diff.status, describe_unit(unit_diff), unit_diff.output_path,
+                              len(self.rows) - 1)
+            item.setExpanded(True)
+
+    def open_item(self, item, column):
+        """并排显示代码对象在两个版本中的反汇编"""
+        module, unit_diff = self.rows[item.data(0, Qt.UserRole)]
+        if unit_diff is None:
+            return
+        disassembler = Disassembler(module.version)
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"{module.rel_path} - {unit_diff.unit.qualname}")
+        dialog.setMinimumSize(1000, 600)
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel(describe_unit(unit_diff)))
+
+        views = []
+        row = QHBoxLayout()
+        for title, unit in (("旧版本", unit_diff.old), ("新版本", unit_diff.new)):
+            column_layout = QVBoxLayout()
+            column_layout.addWidget(QLabel(title))
+            view = OutputViewer()
+            if unit is not None:
+                lines = []
+                disassembler.output_object(unit.co, 0, lines)
+                view.open(spool_file("\n".join(lines).encode('utf-8', errors='backslashreplace')),
+                          temporary=True)
+            column_layout.addWidget(view)
+            row.addLayout(column_layout)
+            views.append(view)
+        layout.addLayout(row)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok)
+        button_box.accepted.connect(dialog.accept)
+        layout.addWidget(button_box)
+
+        dialog.exec_()
+        for view in views:
+            view.close_file()
+
+    def decompile_changed(self):
+        """把比较结果目录交给自动反编译, 只处理写出的代码对象"""
+        self.auto_gui = AutoDecompileGUI()
+        self.auto_gui.input_edit.setText(self.output_dir)
+        self.auto_gui.show()
+        self.auto_gui.execute_decompile()
+
+    def closeEvent(self, event):
+        """窗口关闭时停止比较并保存配置"""
+        if self.diff_thread and self.diff_thread.isRunning():
+            self.diff_thread.cancel()
+            self.diff_thread.wait()
+        self.save_config()
+        event.accept()
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    window = CodeDiffGUI()
+    window.show()
+    sys.exit(app.exec_())
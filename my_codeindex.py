@@ -0,0 +1,380 @@
+# my_codeindex.py - 解包目录的代码对象索引与搜索GUI
+import sys
+import os
+import sqlite3
+import threading
+import configparser
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
+                             QLineEdit, QPushButton, QFileDialog, QMessageBox,
+                             QHBoxLayout, QDialog, QLabel, QDialogButtonBox,
+                             QComboBox, QCheckBox, QProgressDialog, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont
+
+from code_index import CodeIndex, KIND_LABELS
+from decompile_runner import spool_file
+from output_viewer import OutputViewer
+from pyc_disasm import disassemble, PycFormatError
+
+if getattr(sys, 'frozen', False):
+    # 打包后使用可执行文件所在目录
+    BASE_DIR = os.path.dirname(sys.executable)
+else:
+    # 开发环境使用脚本所在目录
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CONFIG_FILE = os.path.join(BASE_DIR, "codeindex_config.ini")
+
+INDEX_FILE = os.path.join(BASE_DIR, "code_index.db")
+
+# 输入停顿后再查询, 避免每个按键都访问数据库
+SEARCH_DELAY = 200
+RESULT_LIMIT = 1000
+
+COLUMNS = ("类型", "内容", "模块", "代码对象", "行号")
+
+
+class DirDropEdit(QLineEdit):
+    """支持目录拖拽的输入框"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAcceptDrops(True)
+        self.setPlaceholderText("拖拽解包目录 (*_extracted) 到此处")
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dropEvent(self, event):
+        files = [u.toLocalFile() for u in event.mimeData().urls()]
+        if files:
+            self.setText(files[0])
+
+
+class IndexThread(QThread):
+    """建立索引的线程"""
+    progress = pyqtSignal(int, int, str)  # 已处理数, 总数, 当前文件
+    finished = pyqtSignal(int, int, int)  # 新索引数, 跳过数, 解析失败数
+    error = pyqtSignal(str)
+
+    def __init__(self, index, root, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.root = root
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            counts = self.index.index_tree(self.root, on_progress=self.progress.emit,
+                                           should_stop=self.cancel_event.is_set)
+            self.finished.emit(*counts)
+        except Exception as e:
+            import traceback
+            self.error.emit(f"建立索引时发生错误:\n{str(e)}\n\n{traceback.format_exc()}")
+
+
+class CodeIndexGUI(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("代码索引搜索")
+        self.setGeometry(300, 300, 900, 600)
+        self.index_thread = None
+        self.progress_dialog = None
+        self.index = self.open_index()
+
+        # 加载配置
+        self.config = self.load_config()
+
+        # 创建主部件和布局
+        main_widget = QWidget()
+        self.setCentralWidget(main_widget)
+        layout = QVBoxLayout(main_widget)
+
+        # 输入: 解包目录
+        dir_layout = QHBoxLayout()
+        self.dir_edit = DirDropEdit()
+        self.dir_edit.setText(self.config['last_dir'])
+        self.dir_edit.textChanged.connect(self.schedule_search)
+        dir_layout.addWidget(self.dir_edit)
+        browse_btn = QPushButton("浏览")
+        browse_btn.clicked.connect(self.browse_dir)
+        dir_layout.addWidget(browse_btn)
+        self.index_btn = QPushButton("建立索引")
+        self.index_btn.setToolTip("解析目录中的全部pyc, 已索引且未修改的文件自动跳过")
+        self.index_btn.clicked.connect(self.build_index)
+        dir_layout.addWidget(self.index_btn)
+        layout.addLayout(dir_layout)
+
+        # 搜索条件
+        search_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("搜索函数/类/方法名、字符串常量、导入名、属性名")
+        self.search_edit.setFont(QFont("Arial", 11))
+        self.search_edit.textChanged.connect(self.schedule_search)
+        self.search_edit.returnPressed.connect(self.run_search)
+        search_layout.addWidget(self.search_edit)
+        self.kind_combo = QComboBox()
+        self.kind_combo.addItem("全部", None)
+        for kind, label in KIND_LABELS.items():
+            self.kind_combo.addItem(label, kind)
+        self.kind_combo.currentIndexChanged.connect(self.run_search)
+        search_layout.addWidget(self.kind_combo)
+        self.current_cb = QCheckBox("只搜索当前目录")
+        self.current_cb.setChecked(self.config['current_only'])
+        self.current_cb.stateChanged.connect(self.run_search)
+        search_layout.addWidget(self.current_cb)
+        layout.addLayout(search_layout)
+
+        # 搜索结果, 双击查看所在模块的反汇编
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table.setColumnWidth(0, 60)
+        self.table.setColumnWidth(2, 220)
+        self.table.setColumnWidth(3, 180)
+        self.table.setColumnWidth(4, 60)
+        self.table.cellDoubleClicked.connect(self.open_result)
+        layout.addWidget(self.table)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY)
+        self.search_timer.timeout.connect(self.run_search)
+        self.results = []
+        self.update_status()
+
+    def load_config(self):
+        """加载配置文件"""
+        config = configparser.ConfigParser()
+        values = {'last_dir': '', 'current_only': True}
+        if os.path.exists(CONFIG_FILE):
+            try:
+                config.read(CONFIG_FILE)
+                values['last_dir'] = config.get('DEFAULT', 'last_dir', fallback='')
+                values['current_only'] = config.getboolean('DEFAULT', 'current_only', fallback=True)
+            except (configparser.Error, ValueError) as e:
+                QMessageBox.warning(
+                    self,
+                    "配置文件读取失败",
+                    f"无法读取配置文件:\n{str(e)}\n将使用默认配置"
+                )
+        return values
+
+    def save_config(self):
+        """保存配置文件"""
+        config = configparser.ConfigParser()
+        config['DEFAULT'] = {
+            'last_dir': self.dir_edit.text().strip(),
+            'current_only': str(self.current_cb.isChecked())
+        }
+        try:
+            with open(CONFIG_FILE, 'w') as configfile:
+                config.write(configfile)
+        except OSError as e:
+            QMessageBox.warning(
+                self,
+                "配置文件保存失败",
+                f"无法保存配置文件:\n{str(e)}"
+            )
+
+    def open_index(self):
+        """打开索引数据库, 失败时只能提示"""
+        try:
+            return CodeIndex(INDEX_FILE)
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "错误", f"无法打开索引数据库:\n{INDEX_FILE}\n{str(e)}")
+            return None
+
+    def current_root(self):
+        path = self.dir_edit.text().strip()
+        return path if path and os.path.isdir(path) else None
+
+    def update_status(self, message=''):
+        if self.index is None:
+            self.status_label.setText("索引数据库不可用")
+            return
+        try:
+            root = self.current_root() if self.current_cb.isChecked() else None
+            modules, refs = self.index.stats(root)
+        except sqlite3.Error as e:
+            self.status_label.setText(f"读取索引失败: {e}")
+            return
+        scope = "当前目录" if root else "全部目录"
+        text = f"{scope}: 已索引 {modules} 个模块, {refs} 条引用"
+        if message:
+            text = f"{message}  |  {text}"
+        self.status_label.setText(text)
+
+    def browse_dir(self):
+        dir_path = QFileDialog.getExistingDirectory(self, "选择解包目录", self.dir_edit.text().strip())
+        if dir_path:
+            self.dir_edit.setText(dir_path)
+
+    def build_index(self):
+        """在后台线程中索引目录, 已索引且未修改的文件跳过"""
+        if self.index is None:
+            return
+        root = self.dir_edit.text().strip()
+        if not root:
+            QMessageBox.warning(self, "错误", "请先选择解包目录")
+            return
+        if not os.path.isdir(root):
+            QMessageBox.critical(self, "错误", f"目录不存在:\n{root}")
+            return
+        self.save_config()
+
+        self.progress_dialog = QProgressDialog("正在扫描目录...", "取消", 0, 0, self)
+        self.progress_dialog.setMinimumWidth(450)
+        self.progress_dialog.setWindowTitle("建立索引")
+        self.progress_dialog.setWindowModality(Qt.WindowModal)
+        self.progress_dialog.canceled.connect(self.cancel_index)
+        self.progress_dialog.show()
+
+        self.index_btn.setEnabled(False)
+        self.index_thread = IndexThread(self.index, root)
+        self.index_thread.progress.connect(self.update_progress)
+        self.index_thread.finished.connect(self.handle_finished)
+        self.index_thread.error.connect(self.handle_error)
+        self.index_thread.start()
+
+    def cancel_index(self):
+        """停止索引, 已处理的文件保留在索引中"""
+        if self.index_thread:
+            self.index_thread.cancel()
+        self.progress_dialog = None
+
+    def update_progress(self, done, total, rel_path):
+        if self.progress_dialog:
+            self.progress_dialog.setMaximum(total)
+            self.progress_dialog.setValue(done)
+            self.progress_dialog.setLabelText(f"已处理 {done}/{total}\n当前: {rel_path}")
+
+    def close_progress(self):
+        if self.progress_dialog:
+            self.progress_dialog.canceled.disconnect(self.cancel_index)
+            self.progress_dialog.close()
+            self.progress_dialog = None
+        self.index_thread.wait()
+        self.index_thread = None
+        self.index_btn.setEnabled(True)
+
+    def handle_finished(self, indexed, skipped, failed):
+        self.close_progress()
+        message = f"新索引 {indexed} 个, 未修改跳过 {skipped} 个"
+        if failed:
+            message += f", 无法解析 {failed} 个"
+        if self.search_edit.text().strip():
+            self.run_search()
+        else:
+            self.update_status(message)
+
+    def handle_error(self, error_msg):
+        self.close_progress()
+        QMessageBox.critical(self, "错误", error_msg)
+
+    def schedule_search(self):
+        self.search_timer.start()
+
+    def run_search(self):
+        """按当前条件查询索引并填充结果表"""
+        self.search_timer.stop()
+        text = self.search_edit.text().strip()
+        if self.index is None:
+            return
+        if not text:
+            self.results = []
+            self.table.setRowCount(0)
+            self.update_status()
+            return
+        root = self.current_root() if self.current_cb.isChecked() else None
+        try:
+            self.results = self.index.search(text, self.kind_combo.currentData(), root, RESULT_LIMIT)
+        except sqlite3.Error as e:
+            self.status_label.setText(f"查询失败: {e}")
+            return
+
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(len(self.results))
+        for row, (term, kind, root_dir, path, module, code, line) in enumerate(self.results):
+            items = (KIND_LABELS.get(kind, kind), term, module, code, '' if line is None else str(line))
+            for column, value in enumerate(items):
+                item = QTableWidgetItem(value)
+                if column == 2:
+                    item.setToolTip(os.path.join(root_dir, path))
+                self.table.setItem(row, column, item)
+        self.table.setUpdatesEnabled(True)
+
+        count = f"找到 {len(self.results)} 条"
+        if len(self.results) >= RESULT_LIMIT:
+            count += f" (只显示前 {RESULT_LIMIT} 条)"
+        self.update_status(count)
+
+    def open_result(self, row, column):
+        """反汇编结果所在的模块并定位到对应的代码对象"""
+        term, kind, root_dir, path, module, code, line = self.results[row]
+        full_path = os.path.join(root_dir, path)
+        try:
+            with open(full_path, 'rb') as f:
+                text = disassemble(f.read(), os.path.basename(full_path))
+        except OSError as e:
+            QMessageBox.critical(self, "错误", f"无法读取文件:\n{full_path}\n{str(e)}")
+            return
+        except PycFormatError as e:
+            QMessageBox.critical(self, "错误", f"无法解析pyc:\n{full_path}\n{str(e)}")
+            return
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"{module} - {code}")
+        dialog.setMinimumSize(800, 600)
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel(f"pyc文件: {full_path}\n代码对象: {code}  行号: {line}"))
+
+        viewer = OutputViewer()
+        viewer.open(spool_file(text.encode('utf-8', errors='backslashreplace')), temporary=True)
+        viewer.search_edit.setText(term)
+        layout.addWidget(viewer)
+        if viewer.line_index is not None:
+            # 3.11 起代码对象带有限定名, 之前的版本只能按名称定位
+            target = viewer.line_index.find(f"Qualified Name: {code}\n", -1, case_sensitive=True)
+            if target is None:
+                target = viewer.line_index.find(f"Object Name: {code.rsplit('.', 1)[-1]}\n", -1,
+                                                case_sensitive=True)
+            if target is not None:
+                viewer.go_to_row(target)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok)
+        button_box.accepted.connect(dialog.accept)
+        layout.addWidget(button_box)
+
+        dialog.exec_()
+        viewer.close_file()
+
+    def closeEvent(self, event):
+        """窗口关闭时停止索引并保存配置"""
+        if self.index_thread and self.index_thread.isRunning():
+            self.index_thread.cancel()
+            self.index_thread.wait()
+        self.save_config()
+        event.accept()
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    window = CodeIndexGUI()
+    window.show()
+    sys.exit(app.exec_())
@@ -1,16 +1,23 @@
 # my_pycdas.py - pycdas反汇编工具GUI
 import sys
 import os
-import subprocess
-import configparser
 import locale
+import sqlite3
+import configparser
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QLineEdit, QPushButton, QFileDialog, QMessageBox,
                             QHBoxLayout, QDialog, QLabel, QDialogButtonBox,
-                            QCheckBox, QTextEdit)
-from PyQt5.QtCore import Qt, QUrl
+                            QCheckBox, QSpinBox)
+from PyQt5.QtCore import Qt, QUrl, QThread, pyqtSignal
 from PyQt5.QtGui import QDesktopServices, QFont
 
+from decompile_cache import DecompileCache, file_sha256, exe_version
+from decompile_runner import (ResourceLimits, StreamingCommand, RunnerCommand, read_limits, spool_file,
+                              DEFAULT_LIMITS, LIMIT_LABELS, STATUS_OK, STATUS_FAILED, STATUS_CANCELLED, STATUS_TIMEOUT,
+                              CHANNEL_STDOUT, CHANNEL_STDERR)
+from output_viewer import OutputViewer
+from pyc_disasm import run_disassembler
+
 # 修复1: 使用sys.executable获取可执行文件路径
 if getattr(sys, 'frozen', False):
     # 打包后使用可执行文件所在目录
@@ -22,6 +29,14 @@ else:
 # 修复2: 配置文件放在可执行文件目录
 CONFIG_FILE = os.path.join(BASE_DIR, "pycdas_config.ini")
 
+# 与其他反编译工具共用的结果缓存
+CACHE_FILE = os.path.join(BASE_DIR, "decompile_cache.db")
+ENGINE = "pycdas"
+
+# 反汇编后端: 外部的 pycdas.exe 或 pyc_disasm 中的内置实现
+BACKEND_EXE = "pycdas"
+BACKEND_BUILTIN = "builtin"
+
 
 class FileDropEdit(QLineEdit):
     """支持文件拖拽的输入框"""
@@ -67,10 +82,10 @@ class FileDropLineEdit(FileDropEdit):
 class ConfigDialog(QDialog):
     """配置对话框"""
 
-    def __init__(self, current_path, parent=None):
+    def __init__(self, current_path, limits=DEFAULT_LIMITS, backend=BACKEND_EXE, parent=None):
         super().__init__(parent)
         self.setWindowTitle("配置pycdas工具")
-        self.setFixedSize(500, 200)
+        self.setFixedSize(500, 330)
 
         layout = QVBoxLayout(self)
 
@@ -100,6 +115,25 @@ class ConfigDialog(QDialog):
         github_layout.addStretch()
         layout.addLayout(github_layout)
 
+        # 内置反汇编器不需要pycdas.exe, 在当前进程中直接解析pyc
+        self.builtin_cb = QCheckBox("使用内置反汇编器 (不需要pycdas.exe)")
+        self.builtin_cb.setChecked(backend == BACKEND_BUILTIN)
+        layout.addWidget(self.builtin_cb)
+
+        # 每次运行pycdas的资源限制, 0 表示不限制
+        self.limit_spins = {}
+        for key, label in LIMIT_LABELS.items():
+            limit_layout = QHBoxLayout()
+            limit_layout.addWidget(QLabel(label + ":"))
+            spin = QSpinBox()
+            spin.setRange(0, 1024 * 1024)
+            spin.setSpecialValueText("不限制")
+            spin.setValue(limits[key])
+            limit_layout.addWidget(spin)
+            limit_layout.addStretch()
+            layout.addLayout(limit_layout)
+            self.limit_spins[key] = spin
+
         # 按钮框
         button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         button_box.accepted.connect(self.accept)
@@ -123,12 +157,64 @@ class ConfigDialog(QDialog):
         """获取配置的路径"""
         return self.path_input.text().strip()
 
+    def get_limits(self):
+        """获取资源限制"""
+        return {key: spin.value() for key, spin in self.limit_spins.items()}
+
+    def get_backend(self):
+        """获取反汇编后端"""
+        return BACKEND_BUILTIN if self.builtin_cb.isChecked() else BACKEND_EXE
+
+
+class DisassembleThread(QThread):
+    """在后台运行pycdas, 输出写入文件, 由结果对话框定时读取
+
+    runner 不为空时代替外部命令, 以 runner(pyc路径, 输出路径, should_stop) 的形式调用。
+    key 不为空时, 正常结束的结果在发出 finished 之前写入 cache。
+    """
+    finished = pyqtSignal(object)  # 退出码, 被终止时为 None
+    error = pyqtSignal(str)
+
+    def __init__(self, command, output_path=None, limits=None, runner=None, cache=None, key=None, parent=None):
+        super().__init__(parent)
+        if runner is not None:
+            self.command = RunnerCommand(runner, command[-1], output_path, limits)
+        else:
+            self.command = StreamingCommand(command, output_path, limits)
+        self.cache = cache
+        self.key = key
+
+    def cancel(self):
+        self.command.kill()
+
+    def run(self):
+        try:
+            returncode = self.command.run()
+            # 超时与手动终止的结果不写入缓存
+            if self.key is not None and self.command.status(returncode) in (STATUS_OK, STATUS_FAILED):
+                self.cache_put(returncode)
+            self.finished.emit(returncode)
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def cache_put(self, returncode):
+        """保存本次运行结果, 失败的结果同样保存; 大输出的读取与压缩在线程中完成, 不阻塞界面"""
+        try:
+            stderr = self.command.read(CHANNEL_STDERR).decode(locale.getpreferredencoding(False), errors='replace')
+            self.cache.put(self.key, ENGINE, exe_version(self.command.command[0]), '', returncode,
+                           self.command.read(CHANNEL_STDOUT), stderr)
+        except (OSError, sqlite3.Error):
+            pass
+
 
 class PycdasGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("pycdas反汇编工具")
         self.setGeometry(300, 300, 500, 250)
+        self.run_thread = None
+        self.result_dialog = None
+        self.cache = self.open_cache()
 
         # 加载配置
         self.config = self.load_config()
@@ -147,7 +233,8 @@ class PycdasGUI(QMainWindow):
         top_layout.addWidget(self.config_btn)
 
         # 状态标签
-        self.status_label = QLabel(f"当前pycdas路径: {self.config['exe_path']}")
+        self.status_label = QLabel()
+        self.update_status_label()
         top_layout.addWidget(self.status_label)
 
         layout.addLayout(top_layout)
@@ -177,11 +264,13 @@ class PycdasGUI(QMainWindow):
         if not os.path.exists(CONFIG_FILE):
             try:
                 config['DEFAULT'] = {
-                    'exe_path': default_exe_path
+                    'exe_path': default_exe_path,
+                    'backend': BACKEND_EXE
                 }
+                config['DEFAULT'].update({key: str(value) for key, value in DEFAULT_LIMITS.items()})
                 with open(CONFIG_FILE, 'w') as configfile:
                     config.write(configfile)
-                return {'exe_path': default_exe_path}
+                return {'exe_path': default_exe_path, 'limits': dict(DEFAULT_LIMITS), 'backend': BACKEND_EXE}
             except Exception as e:
                 # 修复4: 处理配置文件创建失败的情况
                 QMessageBox.warning(
@@ -189,12 +278,16 @@ class PycdasGUI(QMainWindow):
                     "配置文件创建失败",
                     f"无法创建配置文件:\n{str(e)}\n将使用默认路径: {default_exe_path}"
                 )
-                return {'exe_path': default_exe_path}
+                return {'exe_path': default_exe_path, 'limits': dict(DEFAULT_LIMITS), 'backend': BACKEND_EXE}
 
         try:
             # 读取现有配置
             config.read(CONFIG_FILE)
             exe_path = config.get('DEFAULT', 'exe_path', fallback=default_exe_path)
+            limits = read_limits(config['DEFAULT'])
+            backend = config.get('DEFAULT', 'backend', fallback=BACKEND_EXE)
+            if backend not in (BACKEND_EXE, BACKEND_BUILTIN):
+                backend = BACKEND_EXE
 
             # 如果配置的路径不存在，使用默认路径
             if not os.path.exists(exe_path):
@@ -203,7 +296,7 @@ class PycdasGUI(QMainWindow):
                 with open(CONFIG_FILE, 'w') as configfile:
                     config.write(configfile)
 
-            return {'exe_path': exe_path}
+            return {'exe_path': exe_path, 'limits': limits, 'backend': backend}
         except Exception as e:
             # 修复5: 处理配置文件读取失败的情况
             QMessageBox.warning(
@@ -211,19 +304,29 @@ class PycdasGUI(QMainWindow):
                 "配置文件读取失败",
                 f"无法读取配置文件:\n{str(e)}\n将使用默认路径: {default_exe_path}"
             )
-            return {'exe_path': default_exe_path}
+            return {'exe_path': default_exe_path, 'limits': dict(DEFAULT_LIMITS), 'backend': BACKEND_EXE}
 
-    def save_config(self, exe_path):
+    def update_status_label(self):
+        if self.config['backend'] == BACKEND_BUILTIN:
+            self.status_label.setText("当前使用内置反汇编器")
+        else:
+            self.status_label.setText(f"当前pycdas路径: {self.config['exe_path']}")
+
+    def save_config(self, exe_path, limits, backend):
         """保存配置到文件"""
         try:
             config = configparser.ConfigParser()
             config['DEFAULT'] = {
-                'exe_path': exe_path
+                'exe_path': exe_path,
+                'backend': backend
             }
+            config['DEFAULT'].update({key: str(value) for key, value in limits.items()})
             with open(CONFIG_FILE, 'w') as configfile:
                 config.write(configfile)
             self.config['exe_path'] = exe_path
-            self.status_label.setText(f"当前pycdas路径: {exe_path}")
+            self.config['limits'] = limits
+            self.config['backend'] = backend
+            self.update_status_label()
         except Exception as e:
             # 修复6: 处理配置文件保存失败的情况
             QMessageBox.warning(
@@ -234,13 +337,14 @@ class PycdasGUI(QMainWindow):
 
     def open_config_dialog(self):
         """打开配置对话框"""
-        dialog = ConfigDialog(self.config['exe_path'], self)
+        dialog = ConfigDialog(self.config['exe_path'], self.config['limits'], self.config['backend'], self)
         if dialog.exec_() == QDialog.Accepted:
             new_path = dialog.get_path()
+            backend = dialog.get_backend()
             if new_path:
-                # 验证路径是否有效
-                if os.path.exists(new_path) and new_path.endswith('.exe'):
-                    self.save_config(new_path)
+                # 验证路径是否有效, 使用内置反汇编器时不需要pycdas.exe
+                if backend == BACKEND_BUILTIN or (os.path.exists(new_path) and new_path.endswith('.exe')):
+                    self.save_config(new_path, dialog.get_limits(), backend)
                 else:
                     QMessageBox.warning(
                         self,
@@ -261,6 +365,17 @@ class PycdasGUI(QMainWindow):
             QMessageBox.critical(self, "错误", f"文件不存在:\n{file_path}")
             return
 
+        output_file = None
+        if self.output_cb.isChecked():
+            output_file = os.path.splitext(file_path)[0] + ".txt"
+
+        limits = ResourceLimits.from_config(self.config['limits'])
+        if self.config['backend'] == BACKEND_BUILTIN:
+            # 内置反汇编器单个文件通常只需几毫秒, 不使用缓存
+            self.start_run(DisassembleThread([file_path], output_file, limits, runner=run_disassembler),
+                           file_path, output_file)
+            return
+
         # 检查pycdas.exe是否存在
         exe_path = self.config['exe_path']
         if not os.path.exists(exe_path):
@@ -271,36 +386,39 @@ class PycdasGUI(QMainWindow):
             )
             return
 
-        try:
-            # 获取系统编码
-            system_encoding = locale.getpreferredencoding()
-
-            # 构造命令
-            command = [exe_path, file_path]
-
-            # 如果需要输出到文件
-            if self.output_cb.isChecked():
-                output_file = os.path.splitext(file_path)[0] + ".txt"
-                command.extend([">", output_file])
-
-            # 执行命令
-            result = subprocess.run(
-                " ".join(command),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                shell=True,
-                encoding=system_encoding,
-                errors='replace'
-            )
-
-            # 显示结果对话框
-            self.show_result_dialog(result, file_path)
+        # 构造命令, 不经过shell, 标准输出由线程写入文件
+        command = [exe_path, file_path]
 
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"发生未知错误:\n{str(e)}")
+        # 同一pyc用同一版本的pycdas处理过时直接使用缓存结果
+        key = self.cache_key(exe_path, file_path)
+        cached = self.cache_get(key)
+        if cached is not None:
+            self.show_cached_result(file_path, output_file, cached)
+            return
 
-    def show_result_dialog(self, result, file_path):
-        """显示结果对话框"""
+        self.start_run(DisassembleThread(command, output_file, limits, cache=self.cache, key=key),
+                       file_path, output_file)
+
+    def start_run(self, run_thread, file_path, output_file):
+        """在后台线程中执行, 结果对话框从输出文件中实时读取"""
+        self.run_thread = run_thread
+        paths = self.run_thread.command.paths
+        self.show_result_dialog(file_path, output_file)
+        self.result_text.open(paths[CHANNEL_STDOUT], temporary=not output_file, follow=True)
+        self.result_errors.open(paths[CHANNEL_STDERR], temporary=True, follow=True)
+        self.run_thread.finished.connect(self.handle_run_finished)
+        self.run_thread.error.connect(self.handle_run_error)
+        self.run_thread.start()
+
+    def closeEvent(self, event):
+        """窗口关闭时终止正在运行的pycdas"""
+        if self.run_thread and self.run_thread.isRunning():
+            self.run_thread.cancel()
+            self.run_thread.wait()
+        event.accept()
+
+    def show_result_dialog(self, file_path, output_file=None):
+        """显示结果对话框, 输出在pycdas运行过程中逐步追加"""
         dialog = QDialog(self)
         dialog.setWindowTitle("反汇编结果")
         dialog.setMinimumSize(600, 400)
@@ -313,32 +431,110 @@ class PycdasGUI(QMainWindow):
         layout.addWidget(title)
 
         # 状态
-        status = QLabel(f"退出代码: {result.returncode}")
-        layout.addWidget(status)
+        self.result_status = QLabel("正在运行...")
+        layout.addWidget(self.result_status)
+        if output_file:
+            layout.addWidget(QLabel(f"输出文件: {output_file}"))
 
         # 输出区域
         output_label = QLabel("输出内容:")
         layout.addWidget(output_label)
 
-        output_text = QTextEdit()
-        output_text.setReadOnly(True)
-        output_text.setFont(QFont("Courier New", 9))
+        # 输出保存在文件中, 只读取可见的行
+        self.result_text = OutputViewer()
+        layout.addWidget(self.result_text)
 
-        # 添加输出内容
-        if result.stdout:
-            output_text.append("标准输出:\n" + result.stdout)
-        if result.stderr:
-            output_text.append("\n错误输出:\n" + result.stderr)
+        # 错误输出单独显示, 避免与源码交错
+        layout.addWidget(QLabel("错误输出:"))
+        self.result_errors = OutputViewer(toolbar=False)
+        self.result_errors.setMaximumHeight(100)
+        layout.addWidget(self.result_errors)
 
-        layout.addWidget(output_text)
-
-        # 关闭按钮
+        # 关闭按钮, 运行中关闭会终止pycdas
         close_btn = QPushButton("关闭")
         close_btn.clicked.connect(dialog.accept)
         layout.addWidget(close_btn)
+        dialog.finished.connect(self.cancel_run)
+
+        # 同一时间只有一个结果对话框, 关闭对话框且pycdas结束后才能开始下一次运行
+        self.disassemble_btn.setEnabled(False)
+        self.result_dialog = dialog
+        dialog.show()
+
+    def open_cache(self):
+        """打开结果缓存, 失败时不使用缓存"""
+        try:
+            return DecompileCache(CACHE_FILE)
+        except sqlite3.Error:
+            return None
+
+    def cache_key(self, exe_path, file_path):
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.make_key(file_sha256(file_path), ENGINE, exe_version(exe_path))
+        except OSError:
+            return None
 
-        dialog.exec_()
+    def cache_get(self, key):
+        if key is None:
+            return None
+        try:
+            return self.cache.get(key)
+        except sqlite3.Error:
+            return None
 
+    def show_cached_result(self, file_path, output_file, cached):
+        """显示缓存中的结果, 需要时同时写出输出文件"""
+        try:
+            if output_file:
+                with open(output_file, 'wb') as f:
+                    f.write(cached.stdout)
+                stdout_path = output_file
+            else:
+                stdout_path = spool_file(cached.stdout)
+            stderr_path = spool_file(cached.stderr.encode(locale.getpreferredencoding(False), errors='replace'))
+        except OSError as e:
+            QMessageBox.critical(self, "错误", f"无法写入输出文件:\n{str(e)}")
+            return
+        self.show_result_dialog(file_path, output_file)
+        self.result_text.open(stdout_path, temporary=not output_file)
+        self.result_errors.open(stderr_path, temporary=True)
+        self.result_status.setText(f"退出代码: {cached.returncode} (来自缓存)")
+
+    def handle_run_finished(self, returncode):
+        command = self.run_thread.command
+        status = command.status(returncode)
+        self.run_thread.wait()
+        self.run_thread = None
+        command.cleanup()
+        self.disassemble_btn.setEnabled(self.result_dialog is None)
+        if self.result_dialog is not None:
+            self.result_text.stop_follow()
+            self.result_errors.stop_follow()
+            if status == STATUS_TIMEOUT:
+                self.result_status.setText(f"超过资源限制 ({command.limits.describe()}), 已终止")
+            elif status == STATUS_CANCELLED:
+                self.result_status.setText("已终止")
+            elif isinstance(command, RunnerCommand):
+                self.result_status.setText("内置反汇编器: " + ("完成" if returncode == 0 else "失败"))
+            else:
+                self.result_status.setText(f"退出代码: {returncode}")
+
+    def handle_run_error(self, error_msg):
+        self.handle_run_finished(None)
+        QMessageBox.critical(self, "错误", f"发生未知错误:\n{error_msg}")
+
+    def cancel_run(self):
+        """结果对话框关闭时终止仍在运行的pycdas, 并释放输出文件"""
+        self.result_dialog = None
+        self.result_text.close_file()
+        self.result_errors.close_file()
+        if self.run_thread:
+            # 按钮在 handle_run_finished 中恢复
+            self.run_thread.cancel()
+        else:
+            self.disassemble_btn.setEnabled(True)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -1,16 +1,24 @@
 # my_pycdc.py - pycdc反编译工具GUI
 import sys
 import os
-import subprocess
-import configparser
+import time
+import threading
 import locale
+import sqlite3
+import configparser
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QLineEdit, QPushButton, QFileDialog, QMessageBox,
                              QHBoxLayout, QDialog, QLabel, QDialogButtonBox,
-                             QCheckBox, QTextEdit)
-from PyQt5.QtCore import Qt, QUrl
+                             QCheckBox, QSpinBox, QProgressDialog)
+from PyQt5.QtCore import Qt, QUrl, QThread, pyqtSignal
 from PyQt5.QtGui import QDesktopServices, QFont
 
+from decompile_cache import DecompileCache, file_sha256, exe_version
+from decompile_runner import (BatchDecompiler, Engine, ResourceLimits, StreamingCommand, plan_tree, spool_file,
+                              summarize, write_summary, read_limits, DEFAULT_LIMITS, LIMIT_LABELS, STATUS_OK, STATUS_FAILED,
+                              STATUS_CANCELLED, STATUS_TIMEOUT, CHANNEL_STDOUT, CHANNEL_STDERR)
+from output_viewer import OutputViewer
+
 # 修复1: 使用sys.executable获取可执行文件路径
 if getattr(sys, 'frozen', False):
     # 打包后使用可执行文件所在目录
@@ -22,6 +30,13 @@ else:
 # 修复2: 配置文件放在可执行文件目录
 CONFIG_FILE = os.path.join(BASE_DIR, "pycdc_config.ini")
 
+# 与其他反编译工具共用的结果缓存
+CACHE_FILE = os.path.join(BASE_DIR, "decompile_cache.db")
+ENGINE = "pycdc"
+
+# 目录模式默认的并行 pycdc 进程数
+DEFAULT_WORKERS = os.cpu_count() or 1
+
 
 class FileDropEdit(QLineEdit):
     """支持文件拖拽的输入框"""
@@ -67,10 +82,10 @@ class FileDropLineEdit(FileDropEdit):
 class ConfigDialog(QDialog):
     """配置对话框"""
 
-    def __init__(self, current_path, parent=None):
+    def __init__(self, current_path, workers=DEFAULT_WORKERS, limits=DEFAULT_LIMITS, parent=None):
         super().__init__(parent)
         self.setWindowTitle("配置pycdc工具")
-        self.setFixedSize(500, 200)
+        self.setFixedSize(500, 340)
 
         layout = QVBoxLayout(self)
 
@@ -100,6 +115,30 @@ class ConfigDialog(QDialog):
         github_layout.addStretch()
         layout.addLayout(github_layout)
 
+        # 目录模式并行进程数
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(QLabel("目录模式并行进程数:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, 256)
+        self.workers_spin.setValue(workers)
+        workers_layout.addWidget(self.workers_spin)
+        workers_layout.addStretch()
+        layout.addLayout(workers_layout)
+
+        # 每次运行pycdc的资源限制, 0 表示不限制
+        self.limit_spins = {}
+        for key, label in LIMIT_LABELS.items():
+            limit_layout = QHBoxLayout()
+            limit_layout.addWidget(QLabel(label + ":"))
+            spin = QSpinBox()
+            spin.setRange(0, 1024 * 1024)
+            spin.setSpecialValueText("不限制")
+            spin.setValue(limits[key])
+            limit_layout.addWidget(spin)
+            limit_layout.addStretch()
+            layout.addLayout(limit_layout)
+            self.limit_spins[key] = spin
+
         # 按钮框
         button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         button_box.accepted.connect(self.accept)
@@ -123,12 +162,106 @@ class ConfigDialog(QDialog):
         """获取配置的路径"""
         return self.path_input.text().strip()
 
+    def get_workers(self):
+        """获取并行进程数"""
+        return self.workers_spin.value()
+
+    def get_limits(self):
+        """获取资源限制"""
+        return {key: spin.value() for key, spin in self.limit_spins.items()}
+
+
+class BatchDecompileThread(QThread):
+    """目录模式的反编译线程"""
+    progress = pyqtSignal(int, int, str)  # 已完成数, 总数, 当前文件
+    finished = pyqtSignal(list, str, float)  # 结果列表, 汇总报告路径, 总耗时
+    error = pyqtSignal(str)
+
+    def __init__(self, exe_path, input_dir, output_dir, workers, limits=None, cache=None, parent=None):
+        super().__init__(parent)
+        self.exe_path = exe_path
+        self.limits = limits
+        self.cache = cache
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.workers = workers
+        self.cancel_event = threading.Event()
+        self.done = 0
+        self.total = 0
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def report(self, result):
+        self.done += 1
+        self.progress.emit(self.done, self.total, result.task.rel_path)
+
+    def run(self):
+        try:
+            start = time.monotonic()
+            tasks = plan_tree(self.input_dir, self.output_dir, ".py")
+            self.total = len(tasks)
+            engine = Engine(ENGINE, lambda input_path: [self.exe_path, input_path], exe_version(self.exe_path),
+                            limits=self.limits)
+            decompiler = BatchDecompiler(engine, self.workers, on_result=self.report,
+                                         cancel_event=self.cancel_event, cache=self.cache)
+            results = decompiler.run(tasks)
+            elapsed = time.monotonic() - start
+            summary_path = write_summary(self.output_dir, f"pycdc 目录反编译: {self.input_dir}",
+                                         results, elapsed)
+            self.finished.emit(results, summary_path, elapsed)
+        except Exception as e:
+            import traceback
+            self.error.emit(f"目录反编译过程中发生错误:\n{str(e)}\n\n{traceback.format_exc()}")
+
+
+class DecompileThread(QThread):
+    """在后台运行pycdc, 输出写入文件, 由结果对话框定时读取
+
+    key 不为空时, 正常结束的结果在发出 finished 之前写入 cache。
+    """
+    finished = pyqtSignal(object)  # 退出码, 被终止时为 None
+    error = pyqtSignal(str)
+
+    def __init__(self, command, output_path=None, limits=None, cache=None, key=None, parent=None):
+        super().__init__(parent)
+        self.command = StreamingCommand(command, output_path, limits)
+        self.cache = cache
+        self.key = key
+
+    def cancel(self):
+        self.command.kill()
+
+    def run(self):
+        try:
+            returncode = self.command.run()
+            # 超时与手动终止的结果不写入缓存
+            if self.key is not None and self.command.status(returncode) in (STATUS_OK, STATUS_FAILED):
+                self.cache_put(returncode)
+            self.finished.emit(returncode)
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def cache_put(self, returncode):
+        """保存本次运行结果, 失败的结果同样保存; 大输出的读取与压缩在线程中完成, 不阻塞界面"""
+        try:
+            stderr = self.command.read(CHANNEL_STDERR).decode(locale.getpreferredencoding(False), errors='replace')
+            self.cache.put(self.key, ENGINE, exe_version(self.command.command[0]), '', returncode,
+                           self.command.read(CHANNEL_STDOUT), stderr)
+        except (OSError, sqlite3.Error):
+            pass
+
 
 class PycdcGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("pycdc反编译工具")
         self.setGeometry(300, 300, 500, 250)
+        self.batch_thread = None
+        self.progress_dialog = None
+        self.run_thread = None
+        self.result_dialog = None
+        self.cache = self.open_cache()
 
         # 加载配置
         self.config = self.load_config()
@@ -156,6 +289,11 @@ class PycdcGUI(QMainWindow):
         self.file_input = FileDropLineEdit()
         layout.addWidget(self.file_input)
 
+        # 目录模式: 选择整个解包目录
+        dir_btn = QPushButton("选择目录 (反编译目录中的全部pyc)")
+        dir_btn.clicked.connect(self.browse_dir)
+        layout.addWidget(dir_btn)
+
         # 输出选项
         self.output_cb = QCheckBox("输出到同名.py文件")
         self.output_cb.setChecked(True)
@@ -177,11 +315,13 @@ class PycdcGUI(QMainWindow):
         if not os.path.exists(CONFIG_FILE):
             try:
                 config['DEFAULT'] = {
-                    'exe_path': default_exe_path
+                    'exe_path': default_exe_path,
+                    'workers': str(DEFAULT_WORKERS)
                 }
+                config['DEFAULT'].update({key: str(value) for key, value in DEFAULT_LIMITS.items()})
                 with open(CONFIG_FILE, 'w') as configfile:
                     config.write(configfile)
-                return {'exe_path': default_exe_path}
+                return {'exe_path': default_exe_path, 'workers': DEFAULT_WORKERS, 'limits': dict(DEFAULT_LIMITS)}
             except Exception as e:
                 # 修复4: 处理配置文件创建失败的情况
                 QMessageBox.warning(
@@ -189,12 +329,14 @@ class PycdcGUI(QMainWindow):
                     "配置文件创建失败",
                     f"无法创建配置文件:\n{str(e)}\n将使用默认路径: {default_exe_path}"
                 )
-                return {'exe_path': default_exe_path}
+                return {'exe_path': default_exe_path, 'workers': DEFAULT_WORKERS, 'limits': dict(DEFAULT_LIMITS)}
 
         try:
             # 读取现有配置
             config.read(CONFIG_FILE)
             exe_path = config.get('DEFAULT', 'exe_path', fallback=default_exe_path)
+            workers = max(1, config.getint('DEFAULT', 'workers', fallback=DEFAULT_WORKERS))
+            limits = read_limits(config['DEFAULT'])
 
             # 如果配置的路径不存在，使用默认路径
             if not os.path.exists(exe_path):
@@ -203,7 +345,7 @@ class PycdcGUI(QMainWindow):
                 with open(CONFIG_FILE, 'w') as configfile:
                     config.write(configfile)
 
-            return {'exe_path': exe_path}
+            return {'exe_path': exe_path, 'workers': workers, 'limits': limits}
         except Exception as e:
             # 修复5: 处理配置文件读取失败的情况
             QMessageBox.warning(
@@ -211,18 +353,22 @@ class PycdcGUI(QMainWindow):
                 "配置文件读取失败",
                 f"无法读取配置文件:\n{str(e)}\n将使用默认路径: {default_exe_path}"
             )
-            return {'exe_path': default_exe_path}
+            return {'exe_path': default_exe_path, 'workers': DEFAULT_WORKERS, 'limits': dict(DEFAULT_LIMITS)}
 
-    def save_config(self, exe_path):
+    def save_config(self, exe_path, workers, limits):
         """保存配置到文件"""
         try:
             config = configparser.ConfigParser()
             config['DEFAULT'] = {
-                'exe_path': exe_path
+                'exe_path': exe_path,
+                'workers': str(workers)
             }
+            config['DEFAULT'].update({key: str(value) for key, value in limits.items()})
             with open(CONFIG_FILE, 'w') as configfile:
                 config.write(configfile)
             self.config['exe_path'] = exe_path
+            self.config['workers'] = workers
+            self.config['limits'] = limits
             self.status_label.setText(f"当前pycdc路径: {exe_path}")
         except Exception as e:
             # 修复6: 处理配置文件保存失败的情况
@@ -234,13 +380,13 @@ class PycdcGUI(QMainWindow):
 
     def open_config_dialog(self):
         """打开配置对话框"""
-        dialog = ConfigDialog(self.config['exe_path'], self)
+        dialog = ConfigDialog(self.config['exe_path'], self.config['workers'], self.config['limits'], self)
         if dialog.exec_() == QDialog.Accepted:
             new_path = dialog.get_path()
             if new_path:
                 # 验证路径是否有效
                 if os.path.exists(new_path) and new_path.endswith('.exe'):
-                    self.save_config(new_path)
+                    self.save_config(new_path, dialog.get_workers(), dialog.get_limits())
                 else:
                     QMessageBox.warning(
                         self,
@@ -257,7 +403,7 @@ class PycdcGUI(QMainWindow):
             QMessageBox.warning(self, "错误", "请先选择文件")
             return
 
-        if not os.path.isfile(file_path):
+        if not os.path.exists(file_path):
             QMessageBox.critical(self, "错误", f"文件不存在:\n{file_path}")
             return
 
@@ -271,36 +417,110 @@ class PycdcGUI(QMainWindow):
             )
             return
 
-        try:
-            # 获取系统编码
-            system_encoding = locale.getpreferredencoding()
-
-            # 构造命令
-            command = [exe_path, file_path]
-
-            # 如果需要输出到文件
-            if self.output_cb.isChecked():
-                output_file = os.path.splitext(file_path)[0] + ".py"
-                command.extend([">", output_file])
-
-            # 执行命令
-            result = subprocess.run(
-                " ".join(command),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                shell=True,
-                encoding=system_encoding,
-                errors='replace'
-            )
-
-            # 显示结果对话框
-            self.show_result_dialog(result, file_path)
+        # 目录模式
+        if os.path.isdir(file_path):
+            self.execute_batch(exe_path, file_path)
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"发生未知错误:\n{str(e)}")
+        # 构造命令, 不经过shell, 标准输出由线程写入文件
+        command = [exe_path, file_path]
+        output_file = None
+        if self.output_cb.isChecked():
+            output_file = os.path.splitext(file_path)[0] + ".py"
+
+        # 同一pyc用同一版本的pycdc处理过时直接使用缓存结果
+        key = self.cache_key(exe_path, file_path)
+        cached = self.cache_get(key)
+        if cached is not None:
+            self.show_cached_result(file_path, output_file, cached)
+            return
 
-    def show_result_dialog(self, result, file_path):
-        """显示结果对话框"""
+        # 在后台线程中执行, 结果对话框从输出文件中实时读取
+        self.run_thread = DecompileThread(command, output_file, ResourceLimits.from_config(self.config['limits']),
+                                          self.cache, key)
+        paths = self.run_thread.command.paths
+        self.show_result_dialog(file_path, output_file)
+        self.result_text.open(paths[CHANNEL_STDOUT], temporary=not output_file, follow=True)
+        self.result_errors.open(paths[CHANNEL_STDERR], temporary=True, follow=True)
+        self.run_thread.finished.connect(self.handle_run_finished)
+        self.run_thread.error.connect(self.handle_run_error)
+        self.run_thread.start()
+
+    def browse_dir(self):
+        """选择要整体反编译的目录"""
+        dir_path = QFileDialog.getExistingDirectory(self, "选择目录", "")
+        if dir_path:
+            self.file_input.setText(dir_path)
+
+    def execute_batch(self, exe_path, input_dir):
+        """并行反编译目录中的全部pyc, 输出到同级的 _decompiled 目录"""
+        output_dir = input_dir.rstrip("/\\") + "_decompiled"
+
+        self.progress_dialog = QProgressDialog("正在扫描目录...", "取消", 0, 0, self)
+        self.progress_dialog.setMinimumWidth(450)
+        self.progress_dialog.setWindowTitle("目录反编译")
+        self.progress_dialog.setWindowModality(Qt.WindowModal)
+        self.progress_dialog.canceled.connect(self.cancel_batch)
+        self.progress_dialog.show()
+        self.decompile_btn.setEnabled(False)
+
+        self.batch_thread = BatchDecompileThread(exe_path, input_dir, output_dir, self.config['workers'],
+                                                 ResourceLimits.from_config(self.config['limits']), self.cache)
+        self.batch_thread.progress.connect(self.update_batch_progress)
+        self.batch_thread.finished.connect(self.handle_batch_finished)
+        self.batch_thread.error.connect(self.handle_batch_error)
+        self.batch_thread.start()
+
+    def cancel_batch(self):
+        """取消尚未开始的文件并终止正在运行的 pycdc 进程"""
+        if self.batch_thread:
+            self.batch_thread.cancel()
+        self.progress_dialog = None
+
+    def update_batch_progress(self, done, total, rel_path):
+        if self.progress_dialog:
+            self.progress_dialog.setMaximum(total)
+            self.progress_dialog.setValue(done)
+            self.progress_dialog.setLabelText(f"已完成 {done}/{total}\n当前: {rel_path}")
+
+    def close_batch_progress(self):
+        if self.progress_dialog:
+            self.progress_dialog.canceled.disconnect(self.cancel_batch)
+            self.progress_dialog.close()
+            self.progress_dialog = None
+        self.batch_thread.wait()
+        self.batch_thread = None
+        self.decompile_btn.setEnabled(True)
+
+    def handle_batch_finished(self, results, summary_path, elapsed):
+        """显示目录反编译的汇总"""
+        self.close_batch_progress()
+        counts = summarize(results)
+        message = f"共 {len(results)} 个文件, 成功 {counts[STATUS_OK]}, 失败 {counts[STATUS_FAILED]}"
+        if counts[STATUS_TIMEOUT]:
+            message += f", 超时 {counts[STATUS_TIMEOUT]}"
+        if counts[STATUS_CANCELLED]:
+            message += f", 取消 {counts[STATUS_CANCELLED]}"
+        if counts['cached']:
+            message += f"\n其中 {counts['cached']} 个来自缓存"
+        message += (f"\n总耗时: {elapsed:.1f}s\n\n输出目录:\n{os.path.dirname(summary_path)}"
+                    f"\n汇总报告:\n{summary_path}")
+        QMessageBox.information(self, "目录反编译完成", message)
+
+    def handle_batch_error(self, error_msg):
+        self.close_batch_progress()
+        QMessageBox.critical(self, "错误", error_msg)
+
+    def closeEvent(self, event):
+        """窗口关闭时停止目录反编译与正在运行的pycdc"""
+        for thread in (self.batch_thread, self.run_thread):
+            if thread and thread.isRunning():
+                thread.cancel()
+                thread.wait()
+        event.accept()
+
+    def show_result_dialog(self, file_path, output_file=None):
+        """显示结果对话框, 输出在pycdc运行过程中逐步追加"""
         dialog = QDialog(self)
         dialog.setWindowTitle("反编译结果")
         dialog.setMinimumSize(600, 400)
@@ -313,32 +533,108 @@ class PycdcGUI(QMainWindow):
         layout.addWidget(title)
 
         # 状态
-        status = QLabel(f"退出代码: {result.returncode}")
-        layout.addWidget(status)
+        self.result_status = QLabel("正在运行...")
+        layout.addWidget(self.result_status)
+        if output_file:
+            layout.addWidget(QLabel(f"输出文件: {output_file}"))
 
         # 输出区域
         output_label = QLabel("输出内容:")
         layout.addWidget(output_label)
 
-        output_text = QTextEdit()
-        output_text.setReadOnly(True)
-        output_text.setFont(QFont("Courier New", 9))
+        # 输出保存在文件中, 只读取可见的行
+        self.result_text = OutputViewer()
+        layout.addWidget(self.result_text)
 
-        # 添加输出内容
-        if result.stdout:
-            output_text.append("标准输出:\n" + result.stdout)
-        if result.stderr:
-            output_text.append("\n错误输出:\n" + result.stderr)
+        # 错误输出单独显示, 避免与源码交错
+        layout.addWidget(QLabel("错误输出:"))
+        self.result_errors = OutputViewer(toolbar=False)
+        self.result_errors.setMaximumHeight(100)
+        layout.addWidget(self.result_errors)
 
-        layout.addWidget(output_text)
-
-        # 关闭按钮
+        # 关闭按钮, 运行中关闭会终止pycdc
         close_btn = QPushButton("关闭")
         close_btn.clicked.connect(dialog.accept)
         layout.addWidget(close_btn)
+        dialog.finished.connect(self.cancel_run)
+
+        # 同一时间只有一个结果对话框, 关闭对话框且pycdc结束后才能开始下一次运行
+        self.decompile_btn.setEnabled(False)
+        self.result_dialog = dialog
+        dialog.show()
+
+    def open_cache(self):
+        """打开结果缓存, 失败时不使用缓存"""
+        try:
+            return DecompileCache(CACHE_FILE)
+        except sqlite3.Error:
+            return None
+
+    def cache_key(self, exe_path, file_path):
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.make_key(file_sha256(file_path), ENGINE, exe_version(exe_path))
+        except OSError:
+            return None
 
-        dialog.exec_()
+    def cache_get(self, key):
+        if key is None:
+            return None
+        try:
+            return self.cache.get(key)
+        except sqlite3.Error:
+            return None
 
+    def show_cached_result(self, file_path, output_file, cached):
+        """显示缓存中的结果, 需要时同时写出输出文件"""
+        try:
+            if output_file:
+                with open(output_file, 'wb') as f:
+                    f.write(cached.stdout)
+                stdout_path = output_file
+            else:
+                stdout_path = spool_file(cached.stdout)
+            stderr_path = spool_file(cached.stderr.encode(locale.getpreferredencoding(False), errors='replace'))
+        except OSError as e:
+            QMessageBox.critical(self, "错误", f"无法写入输出文件:\n{str(e)}")
+            return
+        self.show_result_dialog(file_path, output_file)
+        self.result_text.open(stdout_path, temporary=not output_file)
+        self.result_errors.open(stderr_path, temporary=True)
+        self.result_status.setText(f"退出代码: {cached.returncode} (来自缓存)")
+
+    def handle_run_finished(self, returncode):
+        command = self.run_thread.command
+        status = command.status(returncode)
+        self.run_thread.wait()
+        self.run_thread = None
+        command.cleanup()
+        self.decompile_btn.setEnabled(self.result_dialog is None)
+        if self.result_dialog is not None:
+            self.result_text.stop_follow()
+            self.result_errors.stop_follow()
+            if status == STATUS_TIMEOUT:
+                self.result_status.setText(f"超过资源限制 ({command.limits.describe()}), 已终止")
+            elif status == STATUS_CANCELLED:
+                self.result_status.setText("已终止")
+            else:
+                self.result_status.setText(f"退出代码: {returncode}")
+
+    def handle_run_error(self, error_msg):
+        self.handle_run_finished(None)
+        QMessageBox.critical(self, "错误", f"发生未知错误:\n{error_msg}")
+
+    def cancel_run(self):
+        """结果对话框关闭时终止仍在运行的pycdc, 并释放输出文件"""
+        self.result_dialog = None
+        self.result_text.close_file()
+        self.result_errors.close_file()
+        if self.run_thread:
+            # 按钮在 handle_run_finished 中恢复
+            self.run_thread.cancel()
+        else:
+            self.decompile_btn.setEnabled(True)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -1,19 +1,22 @@
 import sys
 import os
-import subprocess
-import shutil
-import locale
+import time
 import configparser
+import multiprocessing
+import sqlite3
 import webbrowser
 import threading
-import tempfile
-import time
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QLineEdit, QPushButton, QFileDialog, QMessageBox,
                              QHBoxLayout, QDialog, QLabel, QDialogButtonBox,
-                             QProgressDialog)
-from PyQt5.QtCore import Qt, QUrl, QThread, pyqtSignal
-from PyQt5.QtGui import QDesktopServices
+                             QProgressDialog, QSpinBox, QGroupBox, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QAbstractItemView,
+                             QInputDialog)
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
+
+from pyi_archive import ArchiveError, scan_archive, scan_files, sample_sha256
+from pyi_extractor import PyiExtractor, ExtractCancelled
+from archive_index import ArchiveIndex
 
 # 修复1: 使用sys.executable获取可执行文件路径
 if getattr(sys, 'frozen', False):
@@ -23,12 +26,63 @@ else:
     # 开发环境使用脚本所在目录
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# 修复2: 配置文件放在可执行文件目录
+# 配置文件放在可执行文件目录
 CONFIG_FILE = os.path.join(BASE_DIR, "unpacker_config.ini")
+# 已分析样本索引与配置文件放在一起
+INDEX_FILE = os.path.join(BASE_DIR, "unpacker_index.db")
+
+# 默认解包进程数
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# 默认配置, 整数项至少为1
+DEFAULT_CONFIG = {
+    'workers': DEFAULT_WORKERS,   # 单个样本的并行解包进程数
+    'batch_jobs': 4,              # 批量解包时同时处理的样本数
+    'store_dir': '',              # 内容仓库目录, 为空时不启用
+}
+
+# 批量任务表格列
+COL_FILE, COL_STATE, COL_ELAPSED, COL_RESULT = range(4)
+
+# 解包被取消时 finished 信号中的返回码
+RETURNCODE_CANCELLED = 2
+
+# 模块查询结果最多显示的条数
+MAX_QUERY_ROWS = 200
+
+# 样本 TOC 表格列, 与 ArchiveIndex.members 的字段对应
+MEMBER_COLUMNS = ("所属归档", "名称", "类型", "偏移", "存储大小", "原始大小", "压缩")
+
+
+def index_sample(index, path, sha256=None, should_stop=None):
+    """扫描样本并写入索引, 返回 ScanInfo
+
+    sha256 为空时读取整个文件计算哈希, should_stop() 返回真时放弃, 不写入索引。
+    """
+    info = scan_archive(path, detail=True)
+    info.sha256 = sha256 or sample_sha256(path, should_stop)
+    if info.sha256:
+        index.record_scan(info)
+    return info
+
+
+def collect_files(paths):
+    """展开拖入的路径, 目录取其中的文件(不递归)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for entry in sorted(os.scandir(path), key=lambda e: e.name):
+                if entry.is_file():
+                    files.append(entry.path)
+        elif os.path.isfile(path):
+            files.append(path)
+    return files
 
 
 class FileDropEdit(QLineEdit):
     """支持文件拖拽的输入框"""
+    # 一次拖入多个文件或目录时发出, 由界面加入批量队列
+    files_dropped = pyqtSignal(list)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -43,8 +97,10 @@ class FileDropEdit(QLineEdit):
 
     def dropEvent(self, event):
         files = [u.toLocalFile() for u in event.mimeData().urls()]
-        if files:
+        if len(files) == 1 and os.path.isfile(files[0]):
             self.setText(files[0])
+        elif files:
+            self.files_dropped.emit(files)
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -71,38 +127,48 @@ class FileDropLineEdit(FileDropEdit):
 class ConfigDialog(QDialog):
     """配置对话框"""
 
-    def __init__(self, current_path, parent=None):
+    def __init__(self, config, parent=None):
         super().__init__(parent)
         self.setWindowTitle("配置解包工具")
-        self.setFixedSize(500, 200)  # 增加高度以适应新控件
+        self.setFixedSize(500, 250)
 
         layout = QVBoxLayout(self)
 
-        # 路径标签
-        layout.addWidget(QLabel("pyinstxtractor.py 路径:"))
-
-        # 路径输入框（支持拖拽）
-        self.path_input = FileDropEdit()
-        self.path_input.setText(current_path)
-        layout.addWidget(self.path_input)
-
-        # 浏览按钮
-        browse_btn = QPushButton("浏览...")
-        browse_btn.clicked.connect(self.browse_script)
-        layout.addWidget(browse_btn)
-
-        # GitHub链接
-        github_layout = QHBoxLayout()
-        github_layout.addWidget(QLabel("获取/更新 pyinstxtractor.py:"))
-
-        github_btn = QPushButton("GitHub 项目页面")
-        github_btn.setStyleSheet("color: blue; text-decoration: underline;")
-        github_btn.setCursor(Qt.PointingHandCursor)
-        github_btn.clicked.connect(self.open_github)
-        github_layout.addWidget(github_btn)
-
-        github_layout.addStretch()
-        layout.addLayout(github_layout)
+        # 并行进程数
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(QLabel("并行解包进程数:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, max(64, DEFAULT_WORKERS))
+        self.workers_spin.setValue(config['workers'])
+        self.workers_spin.setToolTip("设置为1时在解包线程内串行处理")
+        workers_layout.addWidget(self.workers_spin)
+        workers_layout.addStretch()
+        layout.addLayout(workers_layout)
+
+        # 批量解包并发数
+        batch_layout = QHBoxLayout()
+        batch_layout.addWidget(QLabel("批量解包同时处理的样本数:"))
+        self.batch_spin = QSpinBox()
+        self.batch_spin.setRange(1, 64)
+        self.batch_spin.setValue(config['batch_jobs'])
+        self.batch_spin.setToolTip("解包进程数会在同时处理的样本之间平分")
+        batch_layout.addWidget(self.batch_spin)
+        batch_layout.addStretch()
+        layout.addLayout(batch_layout)
+
+        # 内容仓库
+        layout.addWidget(QLabel("内容仓库目录 (留空不启用):"))
+        store_layout = QHBoxLayout()
+        self.store_input = QLineEdit(config['store_dir'])
+        self.store_input.setToolTip("相同内容的成员只保存一份, 解包目录通过reflink/硬链接引用;\n"
+                                    "仓库需与解包目录在同一文件系统, 否则退化为复制")
+        store_layout.addWidget(self.store_input)
+        store_btn = QPushButton("浏览...")
+        store_btn.clicked.connect(self.browse_store)
+        store_layout.addWidget(store_btn)
+        layout.addLayout(store_layout)
+
+        layout.addStretch()
 
         # 按钮框
         button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
@@ -110,89 +176,179 @@ class ConfigDialog(QDialog):
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
 
-    def browse_script(self):
-        """浏览选择pyinstxtractor.py文件"""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "选择pyinstxtractor.py", "", "Python脚本 (*.py)"
-        )
-        if file_path:
-            self.path_input.setText(file_path)
-
-    def open_github(self):
-        """打开GitHub项目页面"""
-        github_url = "https://github.com/extremecoders-re/pyinstxtractor"
-        QDesktopServices.openUrl(QUrl(github_url))
+    def browse_store(self):
+        """浏览选择内容仓库目录"""
+        dir_path = QFileDialog.getExistingDirectory(self, "选择内容仓库目录", "")
+        if dir_path:
+            self.store_input.setText(dir_path)
 
-    def get_path(self):
-        """获取配置的路径"""
-        return self.path_input.text().strip()
+    def get_config(self):
+        """获取配置"""
+        return {
+            'workers': self.workers_spin.value(),
+            'batch_jobs': self.batch_spin.value(),
+            'store_dir': self.store_input.text().strip(),
+        }
 
 
 class UnpackThread(QThread):
     """解包线程，避免阻塞主线程"""
-    finished = pyqtSignal(int, str, str, str, str)  # returncode, stdout, stderr, target_dir, extracted_dir
-    progress = pyqtSignal(str)
+    finished = pyqtSignal(int, str, str, str)  # returncode, stdout, stderr, target_dir
+    progress = pyqtSignal(object)  # ExtractProgress
+    message = pyqtSignal(str)  # 解包日志
     error = pyqtSignal(str)
 
-    def __init__(self, command, target_dir, extracted_dir, parent=None):
+    def __init__(self, file_path, target_dir, workers=1, store_dir=None, index=None, parent=None):
         super().__init__(parent)
-        self.command = command
+        self.file_path = file_path
+        self.workers = workers
+        self.store_dir = store_dir
+        self.index = index
         self.target_dir = target_dir
-        self.extracted_dir = extracted_dir
-        self.cancelled = False
+        self.cancel_event = threading.Event()
+        self.log_lines = []
 
-    def run(self):
-        try:
-            # 获取系统编码
-            system_encoding = locale.getpreferredencoding()
-
-            # 修复1: 使用临时文件捕获输出，避免内存溢出
-            with tempfile.TemporaryFile(mode='w+', encoding=system_encoding) as stdout_file, \
-                    tempfile.TemporaryFile(mode='w+', encoding=system_encoding) as stderr_file:
-
-                self.progress.emit(f"执行命令: {' '.join(self.command)}")
-
-                # 启动子进程
-                process = subprocess.Popen(
-                    self.command,
-                    stdout=stdout_file,
-                    stderr=stderr_file,
-                    encoding=system_encoding,
-                    errors='replace',
-                    cwd=BASE_DIR
-                )
+    def cancel(self):
+        """请求取消, 解包引擎在下一个成员之前停止"""
+        self.cancel_event.set()
 
-                # 定期检查进程状态
-                while process.poll() is None:
-                    if self.cancelled:
-                        process.terminate()
-                        self.error.emit("操作已取消")
-                        return
-                    time.sleep(0.1)  # 避免过度占用CPU
+    def log(self, message):
+        """记录解包日志并转发到进度对话框"""
+        self.log_lines.append(message)
+        self.message.emit(message)
 
-                # 读取输出
-                stdout_file.seek(0)
-                stdout = stdout_file.read()
-                stderr_file.seek(0)
-                stderr = stderr_file.read()
+    def record_result(self, status, message, sha256=None, index_new=True):
+        """把解包结果写入样本索引, 索引不可用时只记录日志
 
-                self.finished.emit(process.returncode, stdout, stderr, self.target_dir, self.extracted_dir)
+        样本不在索引中时先扫描并写入索引, sha256 为解包时已算好的文件哈希;
+        index_new 为假时只更新已在索引中的样本, 不读取整个文件。
+        """
+        if self.index is None:
+            return
+        try:
+            info = self.index.lookup(self.file_path)
+            if info is None:
+                if not index_new:
+                    return
+                info = index_sample(self.index, self.file_path, sha256, self.cancel_event.is_set)
+            if info.sha256:
+                self.index.record_extraction(info.sha256, status, message, self.target_dir)
+        except (sqlite3.Error, OSError) as e:
+            self.log(f"[!] 写入样本索引失败: {e}")
+
+    def run(self):
+        try:
+            # 在进程内直接解析归档，不再启动外部pyinstxtractor.py
+            extractor = PyiExtractor(self.file_path, log=self.log, workers=self.workers,
+                                     on_progress=self.progress.emit, store_dir=self.store_dir,
+                                     cancel_event=self.cancel_event, hash_source=self.index is not None)
+            try:
+                # 直接解包到目标目录旁的暂存目录, 完成后原子重命名
+                extractor.extract_to(self.target_dir)
+            except ExtractCancelled as e:
+                # 取消后不再为索引读取整个文件, 只更新已索引的样本
+                self.record_result('cancelled', str(e), index_new=False)
+                self.finished.emit(RETURNCODE_CANCELLED, "\n".join(self.log_lines), str(e), self.target_dir)
+                return
+            except ArchiveError as e:
+                self.record_result('failed', str(e))
+                self.finished.emit(1, "\n".join(self.log_lines), str(e), self.target_dir)
+                return
+
+            errors = "\n".join(extractor.errors)
+            self.record_result('partial' if errors else 'ok', errors, extractor.sha256)
+            self.finished.emit(0, "\n".join(self.log_lines), errors, self.target_dir)
 
         except Exception as e:
             import traceback
             self.error.emit(f"解包过程中发生错误:\n{str(e)}\n\n{traceback.format_exc()}")
 
 
+class ScanThread(QThread):
+    """快速扫描线程, 只读取 cookie 与 TOC, 不解包
+
+    全部扫描结果发出之后, 再逐个计算文件哈希并写入样本索引, 这一步可以取消。
+    """
+    scanned = pyqtSignal(int, object)  # 批量队列下标, ScanInfo
+    indexing = pyqtSignal()  # 扫描结果已全部发出, 开始写入索引
+
+    def __init__(self, items, workers=1, index=None, parent=None):
+        super().__init__(parent)
+        self.items = items
+        self.workers = workers
+        self.index = index
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        items = self.items
+        if self.index is not None:
+            # 已索引且未变化的样本直接使用索引中的结果
+            items = []
+            for item_index, path in self.items:
+                info = self.lookup(path)
+                if info is None:
+                    items.append((item_index, path))
+                else:
+                    self.scanned.emit(item_index, info)
+
+        paths = [path for _, path in items]
+        detail = self.index is not None
+        scanned = []
+        results = scan_files(paths, self.workers, detail)
+        try:
+            for (item_index, _), info in zip(items, results):
+                if self.cancelled:
+                    break
+                scanned.append(info)
+                self.scanned.emit(item_index, info)
+        finally:
+            # 取消时立即关闭进程池, 排队中的文件不再扫描
+            results.close()
+
+        if not detail or not scanned or self.cancelled:
+            return
+        # 哈希需要读取整个文件, 不能拖慢快速扫描, 结果显示之后再计算
+        self.indexing.emit()
+        for info in scanned:
+            if self.cancelled:
+                break
+            try:
+                info.sha256 = sample_sha256(info.path, lambda: self.cancelled)
+            except OSError:
+                continue
+            self.record(info)
+
+    def lookup(self, path):
+        try:
+            return self.index.lookup(path)
+        except sqlite3.Error:
+            return None
+
+    def record(self, info):
+        try:
+            self.index.record_scan(info)
+        except sqlite3.Error:
+            pass
+
+
 class PyInstxtractorGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("PyInstaller解包工具")
-        self.setGeometry(300, 300, 500, 200)
+        self.setGeometry(300, 300, 700, 500)
         self.unpack_thread = None
         self.progress_dialog = None
+        self.batch_items = []
+        self.batch_running = False
+        self.batch_stopping = False
+        self.scan_thread = None
 
         # 加载配置
         self.config = self.load_config()
+        self.index = self.open_index()
 
         # 创建主部件和布局
         main_widget = QWidget()
@@ -208,13 +364,15 @@ class PyInstxtractorGUI(QMainWindow):
         top_layout.addWidget(self.config_btn)
 
         # 状态标签
-        self.status_label = QLabel(f"当前pyinstxtractor路径: {self.config['script_path']}")
+        self.status_label = QLabel()
+        self.update_status_label()
         top_layout.addWidget(self.status_label)
 
         layout.addLayout(top_layout)
 
         # 文件输入框
         self.file_input = FileDropLineEdit()
+        self.file_input.files_dropped.connect(self.add_batch_paths)
         layout.addWidget(self.file_input)
 
         # 解包按钮
@@ -222,90 +380,218 @@ class PyInstxtractorGUI(QMainWindow):
         self.unpack_btn.clicked.connect(self.execute_unpack)
         layout.addWidget(self.unpack_btn)
 
+        # 批量解包
+        batch_group = QGroupBox("批量解包 (拖入多个文件或目录)")
+        batch_layout = QVBoxLayout(batch_group)
+
+        batch_btn_layout = QHBoxLayout()
+        add_files_btn = QPushButton("添加文件")
+        add_files_btn.clicked.connect(self.browse_batch_files)
+        batch_btn_layout.addWidget(add_files_btn)
+
+        add_dir_btn = QPushButton("添加目录")
+        add_dir_btn.clicked.connect(self.browse_batch_dir)
+        batch_btn_layout.addWidget(add_dir_btn)
+
+        self.clear_batch_btn = QPushButton("清空")
+        self.clear_batch_btn.clicked.connect(self.clear_batch)
+        batch_btn_layout.addWidget(self.clear_batch_btn)
+
+        batch_btn_layout.addStretch()
+
+        query_btn = QPushButton("查询模块")
+        query_btn.setToolTip("在已分析样本的索引中查找包含指定模块的样本")
+        query_btn.clicked.connect(self.query_module)
+        batch_btn_layout.addWidget(query_btn)
+
+        self.scan_batch_btn = QPushButton("快速扫描")
+        self.scan_batch_btn.setToolTip("只读取归档目录, 识别版本、入口与加密情况, 不解包")
+        self.scan_batch_btn.clicked.connect(self.start_scan)
+        batch_btn_layout.addWidget(self.scan_batch_btn)
+
+        self.start_batch_btn = QPushButton("开始批量解包")
+        self.start_batch_btn.clicked.connect(self.start_batch)
+        batch_btn_layout.addWidget(self.start_batch_btn)
+
+        self.stop_batch_btn = QPushButton("停止")
+        self.stop_batch_btn.setEnabled(False)
+        self.stop_batch_btn.clicked.connect(self.stop_batch)
+        batch_btn_layout.addWidget(self.stop_batch_btn)
+        batch_layout.addLayout(batch_btn_layout)
+
+        self.batch_table = QTableWidget(0, 4)
+        self.batch_table.setHorizontalHeaderLabels(["文件", "状态", "耗时", "结果"])
+        self.batch_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.batch_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        header = self.batch_table.horizontalHeader()
+        header.setSectionResizeMode(COL_FILE, QHeaderView.Stretch)
+        header.setSectionResizeMode(COL_STATE, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(COL_ELAPSED, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(COL_RESULT, QHeaderView.Stretch)
+        # 双击查看样本索引中保存的 TOC, 不需要重新打开样本
+        self.batch_table.setToolTip("双击查看索引中记录的样本内容")
+        self.batch_table.cellDoubleClicked.connect(self.show_members)
+        batch_layout.addWidget(self.batch_table)
+
+        layout.addWidget(batch_group)
+
+        # 定时刷新运行中任务的耗时
+        self.batch_timer = QTimer(self)
+        self.batch_timer.timeout.connect(self.refresh_batch_elapsed)
+
     def load_config(self):
         """加载配置文件"""
         config = configparser.ConfigParser()
 
-        # 修复3: 使用BASE_DIR获取默认路径
-        default_script_path = os.path.join(BASE_DIR, "pyinstxtractor.py")
-
         # 如果配置文件不存在，创建默认配置
         if not os.path.exists(CONFIG_FILE):
             try:
-                config['DEFAULT'] = {
-                    'script_path': default_script_path
-                }
+                config['DEFAULT'] = {key: str(value) for key, value in DEFAULT_CONFIG.items()}
                 with open(CONFIG_FILE, 'w') as configfile:
                     config.write(configfile)
-                return {'script_path': default_script_path}
             except Exception as e:
-                # 修复4: 处理配置文件创建失败的情况
                 QMessageBox.warning(
                     self,
                     "配置文件创建失败",
-                    f"无法创建配置文件:\n{str(e)}\n将使用默认路径: {default_script_path}"
+                    f"无法创建配置文件:\n{str(e)}\n将使用默认配置"
                 )
-                return {'script_path': default_script_path}
+            return dict(DEFAULT_CONFIG)
 
         try:
             # 读取现有配置
             config.read(CONFIG_FILE)
-            script_path = config.get('DEFAULT', 'script_path', fallback=default_script_path)
-
-            # 如果配置的路径不存在，使用默认路径
-            if not os.path.exists(script_path):
-                script_path = default_script_path
-                config.set('DEFAULT', 'script_path', script_path)
-                with open(CONFIG_FILE, 'w') as configfile:
-                    config.write(configfile)
-
-            return {'script_path': script_path}
+            loaded = {}
+            for key, default in DEFAULT_CONFIG.items():
+                if isinstance(default, int):
+                    loaded[key] = max(1, config.getint('DEFAULT', key, fallback=default))
+                else:
+                    loaded[key] = config.get('DEFAULT', key, fallback=default)
+            return loaded
         except Exception as e:
-            # 修复5: 处理配置文件读取失败的情况
             QMessageBox.warning(
                 self,
                 "配置文件读取失败",
-                f"无法读取配置文件:\n{str(e)}\n将使用默认路径: {default_script_path}"
+                f"无法读取配置文件:\n{str(e)}\n将使用默认配置"
             )
-            return {'script_path': default_script_path}
+            return dict(DEFAULT_CONFIG)
 
-    def save_config(self, script_path):
+    def save_config(self, new_config):
         """保存配置到文件"""
         try:
             config = configparser.ConfigParser()
-            config['DEFAULT'] = {
-                'script_path': script_path
-            }
+            config.read(CONFIG_FILE)
+            for key, value in new_config.items():
+                config['DEFAULT'][key] = str(value)
             with open(CONFIG_FILE, 'w') as configfile:
                 config.write(configfile)
-            self.config['script_path'] = script_path
-            self.status_label.setText(f"当前pyinstxtractor路径: {script_path}")
+            self.config.update(new_config)
+            self.update_status_label()
         except Exception as e:
-            # 修复6: 处理配置文件保存失败的情况
             QMessageBox.warning(
                 self,
                 "配置文件保存失败",
-                f"无法保存配置文件:\n{str(e)}\n当前路径: {script_path}"
+                f"无法保存配置文件:\n{str(e)}"
+            )
+
+    def open_index(self):
+        """打开已分析样本索引, 失败时不使用索引"""
+        try:
+            return ArchiveIndex(INDEX_FILE)
+        except sqlite3.Error as e:
+            QMessageBox.warning(
+                self,
+                "样本索引打开失败",
+                f"无法打开样本索引:\n{str(e)}\n将不记录分析结果"
             )
+            return None
+
+    def query_module(self):
+        """查询哪些样本包含指定模块"""
+        if self.index is None:
+            QMessageBox.warning(self, "错误", "样本索引不可用")
+            return
+        pattern, ok = QInputDialog.getText(self, "查询模块", "模块名 (支持 * 通配符):")
+        pattern = pattern.strip()
+        if not ok or not pattern:
+            return
+        try:
+            rows = self.index.find_module(pattern)
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "错误", f"查询失败:\n{str(e)}")
+            return
+
+        if not rows:
+            QMessageBox.information(self, "查询结果", f"索引中没有样本包含 {pattern}")
+            return
+        lines = [f"{row['path']} (Python {row['pyver']}): {row['name']}"
+                 + (f"  [{row['archive']}]" if row['archive'] else "")
+                 for row in rows[:MAX_QUERY_ROWS]]
+        if len(rows) > MAX_QUERY_ROWS:
+            lines.append(f"... 共 {len(rows)} 条")
+        samples = len({row['sha256'] for row in rows})
+        QMessageBox.information(self, "查询结果",
+                                f"{samples} 个样本包含 {pattern}:\n\n" + "\n".join(lines))
+
+    def show_members(self, row, column):
+        """显示索引中记录的样本完整 TOC"""
+        item = next((item for item in self.batch_items if item['row'] == row), None)
+        if item is None:
+            return
+        if self.index is None:
+            QMessageBox.warning(self, "错误", "样本索引不可用")
+            return
+        try:
+            info = self.index.lookup(item['path'])
+            members = self.index.members(info.sha256) if info is not None and info.ok else []
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "错误", f"查询失败:\n{str(e)}")
+            return
+        if info is None:
+            QMessageBox.information(self, "样本内容", "样本尚未写入索引, 快速扫描或解包后即可查看")
+            return
+        if not info.ok:
+            QMessageBox.information(self, "样本内容", f"样本无法解析:\n{info.error}")
+            return
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"样本内容 - {os.path.basename(item['path'])}")
+        dialog.setMinimumSize(800, 500)
+        layout = QVBoxLayout(dialog)
+        summary = QLabel(info.summary())
+        summary.setWordWrap(True)
+        layout.addWidget(summary)
+
+        table = QTableWidget(len(members), len(MEMBER_COLUMNS))
+        table.setHorizontalHeaderLabels(MEMBER_COLUMNS)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        for member_row, member in enumerate(members):
+            values = (member['archive'], member['name'], member['type_code'], member['position'],
+                      member['stored_size'], member['raw_size'], "是" if member['compressed'] else "否")
+            for col, value in enumerate(values):
+                table.setItem(member_row, col, QTableWidgetItem("" if value is None else str(value)))
+        layout.addWidget(table)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok)
+        button_box.accepted.connect(dialog.accept)
+        layout.addWidget(button_box)
+        dialog.exec_()
+
+    def update_status_label(self):
+        """刷新状态标签"""
+        text = f"内置解包引擎 | 并行进程数: {self.config['workers']} | 批量并发: {self.config['batch_jobs']}"
+        if self.config['store_dir']:
+            text += " | 内容仓库: 已启用"
+        self.status_label.setText(text)
 
     def open_config_dialog(self):
         """打开配置对话框"""
-        dialog = ConfigDialog(self.config['script_path'], self)
+        dialog = ConfigDialog(self.config, self)
         if dialog.exec_() == QDialog.Accepted:
-            new_path = dialog.get_path()
-            if new_path:
-                # 验证路径是否有效
-                if os.path.exists(new_path) and new_path.endswith('.py'):
-                    self.save_config(new_path)
-                else:
-                    QMessageBox.warning(
-                        self,
-                        "无效路径",
-                        f"路径无效或不是Python脚本:\n{new_path}"
-                    )
+            self.save_config(dialog.get_config())
 
     def execute_unpack(self):
-        """执行解包命令并移动解包文件"""
+        """执行解包"""
         file_path = self.file_input.text().strip()
 
         # 验证文件路径
@@ -317,129 +603,68 @@ class PyInstxtractorGUI(QMainWindow):
             QMessageBox.critical(self, "错误", f"文件不存在:\n{file_path}")
             return
 
-        # 检查pyinstxtractor.py是否存在
-        script_path = self.config['script_path']
-        if not os.path.exists(script_path):
-            QMessageBox.critical(
-                self,
-                "缺少依赖",
-                f"未找到pyinstxtractor.py:\n{script_path}\n请通过配置按钮设置正确路径"
-            )
-            return
-
         # 获取原文件所在目录和文件名
         original_dir = os.path.dirname(file_path)
         file_name = os.path.basename(file_path)
         # 构造目标目录路径（与原文件同目录）
         target_dir = os.path.join(original_dir, f"{file_name}_extracted")
-        # 修复7: 使用BASE_DIR代替os.getcwd()
-        extracted_dir = os.path.join(BASE_DIR, f"{file_name}_extracted")
 
         # 修复8: 创建进度对话框
         self.progress_dialog = QProgressDialog("正在解包，请稍候...", "取消", 0, 0, self)
+        self.progress_dialog.setMinimumWidth(450)
         self.progress_dialog.setWindowTitle("解包中")
         self.progress_dialog.setWindowModality(Qt.WindowModal)
-        self.progress_dialog.setCancelButton(None)  # 暂时禁用取消按钮
+        self.progress_dialog.canceled.connect(self.cancel_unpack)
         self.progress_dialog.show()
+        self.unpack_btn.setEnabled(False)
 
-        # # 修复9: 使用线程执行解包操作
-        # command = [
-        #     sys.executable,  # 使用当前Python解释器
-        #     script_path,
-        #     file_path
-        # ]
-
-        python_exe = shutil.which("python") or shutil.which("python3")
-        if not python_exe:
-            QMessageBox.critical(self, "错误", "未找到系统 Python，请先安装并配置环境变量")
-            return
-
-        command = [python_exe, script_path, file_path]
-
-        self.unpack_thread = UnpackThread(command, target_dir, extracted_dir)
+        # 修复9: 使用线程执行解包操作
+        self.unpack_thread = UnpackThread(file_path, target_dir, self.config['workers'],
+                                          self.config['store_dir'] or None, self.index)
         self.unpack_thread.finished.connect(self.handle_unpack_finished)
         self.unpack_thread.error.connect(self.handle_unpack_error)
         self.unpack_thread.progress.connect(self.update_progress)
+        self.unpack_thread.message.connect(self.update_message)
         self.unpack_thread.start()
 
-    def update_progress(self, message):
-        """更新进度对话框消息"""
-        if self.progress_dialog:
+    def cancel_unpack(self):
+        """进度对话框的取消按钮"""
+        if self.unpack_thread and self.unpack_thread.isRunning():
+            self.unpack_thread.cancel()
+            self.unpack_btn.setText("正在取消...")
+        # 对话框点击取消后会自动关闭, 不再更新它
+        self.progress_dialog = None
+
+    def update_message(self, message):
+        """解包成员之前的日志显示在进度对话框中"""
+        if self.progress_dialog and self.progress_dialog.maximum() == 0:
             self.progress_dialog.setLabelText(message)
 
-    def handle_unpack_finished(self, returncode, stdout, stderr, target_dir, extracted_dir):
-        """处理解包完成事件"""
+    def update_progress(self, progress):
+        """根据进度事件更新进度条、速度与剩余时间"""
         if self.progress_dialog:
-            self.progress_dialog.close()
-            self.progress_dialog = None
+            self.progress_dialog.setMaximum(1000)
+            self.progress_dialog.setValue(int(progress.fraction * 1000))
+            self.progress_dialog.setLabelText(progress.describe())
+
+    def handle_unpack_finished(self, returncode, stdout, stderr, target_dir):
+        """处理解包完成事件"""
+        self.close_progress_dialog()
 
         # 检查解包结果
-        if returncode == 0:
-            # 检查解包目录是否创建在程序运行目录下
-            if os.path.exists(extracted_dir):
-                # 如果目标目录已存在，先删除
-                if os.path.exists(target_dir):
-                    try:
-                        shutil.rmtree(target_dir)
-                    except Exception as e:
-                        QMessageBox.critical(
-                            self,
-                            "删除目录失败",
-                            f"无法删除现有目录:\n{target_dir}\n错误: {str(e)}"
-                        )
-                        return
-
-                try:
-                    # 移动解包目录到原文件所在目录
-                    shutil.move(extracted_dir, target_dir)
-
-                    QMessageBox.information(
-                        self,
-                        "完成",
-                        f"解包成功完成!\n解包文件已移动到:\n{target_dir}"
-                    )
-                except Exception as e:
-                    QMessageBox.critical(
-                        self,
-                        "移动文件失败",
-                        f"无法移动解包文件:\n{str(e)}"
-                    )
+        if returncode == RETURNCODE_CANCELLED:
+            # 尚未写出任何成员或暂存目录已被删除时没有可以继续的内容
+            if os.path.isdir(f"{target_dir}.partial"):
+                QMessageBox.information(self, "已取消",
+                                        f"解包已取消，已完成的部分保留在:\n{target_dir}.partial\n"
+                                        "再次解包同一文件时将从中断处继续")
             else:
-                # 尝试从输出中获取信息
-                possible_dirs = [
-                    extracted_dir,
-                    os.path.join(os.path.dirname(self.config['script_path']),
-                                 f"{os.path.basename(self.file_input.text())}_extracted"),
-                    os.path.join(os.path.dirname(self.file_input.text()),
-                                 f"{os.path.basename(self.file_input.text())}_extracted"),
-                    os.path.join(BASE_DIR, f"{os.path.basename(self.file_input.text())}_extracted")
-                ]
-
-                found_dir = None
-                for dir_path in possible_dirs:
-                    if os.path.exists(dir_path):
-                        found_dir = dir_path
-                        break
-
-                if found_dir:
-                    QMessageBox.warning(
-                        self,
-                        "解包目录位置",
-                        f"解包目录创建在:\n{found_dir}\n\n"
-                        f"请手动移动到所需位置"
-                    )
-                else:
-                    # 修复10: 显示更详细的错误信息
-                    error_msg = "解包命令执行成功，但未找到解包目录\n\n"
-                    error_msg += f"请检查以下位置:\n"
-                    error_msg += "\n".join(possible_dirs)
-                    error_msg += f"\n\n解包日志:\n{stdout}"
-
-                    QMessageBox.warning(
-                        self,
-                        "警告",
-                        error_msg
-                    )
+                QMessageBox.information(self, "已取消", "解包已取消，没有保留可继续的解包内容")
+        elif returncode == 0:
+            message = f"解包成功完成!\n解包文件已保存到:\n{target_dir}"
+            if stderr:
+                message += f"\n\n以下文件未能正常解包:\n{stderr}"
+            QMessageBox.information(self, "完成", message)
         else:
             error_msg = f"解包失败 (错误代码: {returncode})\n\n"
             error_msg += f"错误信息:\n{stderr if stderr else stdout}"
@@ -447,21 +672,210 @@ class PyInstxtractorGUI(QMainWindow):
 
     def handle_unpack_error(self, error_msg):
         """处理解包错误事件"""
+        self.close_progress_dialog()
+        QMessageBox.critical(self, "错误", error_msg)
+
+    def close_progress_dialog(self):
+        """关闭进度对话框并恢复解包按钮"""
         if self.progress_dialog:
+            self.progress_dialog.canceled.disconnect(self.cancel_unpack)
             self.progress_dialog.close()
             self.progress_dialog = None
-
-        QMessageBox.critical(self, "错误", error_msg)
+        self.unpack_btn.setText("解包")
+        self.unpack_btn.setEnabled(True)
+
+    def browse_batch_files(self):
+        """选择多个文件加入批量队列"""
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "选择文件", "", "所有文件 (*)")
+        if file_paths:
+            self.add_batch_paths(file_paths)
+
+    def browse_batch_dir(self):
+        """选择目录, 将其中的文件加入批量队列"""
+        dir_path = QFileDialog.getExistingDirectory(self, "选择目录", "")
+        if dir_path:
+            self.add_batch_paths([dir_path])
+
+    def add_batch_paths(self, paths):
+        """把文件或目录加入批量队列"""
+        queued = {item['path'] for item in self.batch_items}
+        for path in collect_files(paths):
+            path = os.path.abspath(path)
+            if path in queued:
+                continue
+            queued.add(path)
+
+            row = self.batch_table.rowCount()
+            self.batch_table.insertRow(row)
+            file_item = QTableWidgetItem(os.path.basename(path))
+            file_item.setToolTip(path)
+            self.batch_table.setItem(row, COL_FILE, file_item)
+            for col in (COL_STATE, COL_ELAPSED, COL_RESULT):
+                self.batch_table.setItem(row, col, QTableWidgetItem(""))
+
+            self.batch_items.append({'path': path, 'row': row, 'state': 'pending',
+                                     'start': None, 'thread': None})
+            self.set_batch_row(self.batch_items[-1], "等待中")
+
+    def clear_batch(self):
+        """清空未在运行的批量任务"""
+        if self.batch_running or self.scan_thread:
+            QMessageBox.warning(self, "提示", "批量解包进行中，无法清空")
+            return
+        self.batch_items = []
+        self.batch_table.setRowCount(0)
+
+    def set_batch_row(self, item, state, elapsed=None, result=None):
+        """更新批量任务表格中的一行"""
+        self.batch_table.item(item['row'], COL_STATE).setText(state)
+        if elapsed is not None:
+            self.batch_table.item(item['row'], COL_ELAPSED).setText(f"{elapsed:.1f}s")
+        if result is not None:
+            result_item = self.batch_table.item(item['row'], COL_RESULT)
+            result_item.setText(result.splitlines()[0] if result else "")
+            result_item.setToolTip(result)
+
+    def start_scan(self):
+        """快速扫描队列中等待处理的文件"""
+        items = [(index, item['path']) for index, item in enumerate(self.batch_items)
+                 if item['state'] == 'pending']
+        if not items:
+            QMessageBox.warning(self, "错误", "批量队列中没有待处理的文件")
+            return
+        for index, _ in items:
+            self.set_batch_row(self.batch_items[index], "扫描中")
+
+        self.scan_batch_btn.setEnabled(False)
+        self.clear_batch_btn.setEnabled(False)
+        self.scan_thread = ScanThread(items, self.config['workers'], self.index)
+        self.scan_thread.scanned.connect(self.handle_scanned)
+        self.scan_thread.indexing.connect(lambda: self.scan_batch_btn.setText("正在写入索引..."))
+        self.scan_thread.finished.connect(self.handle_scan_finished)
+        self.scan_thread.start()
+
+    def handle_scanned(self, index, info):
+        """显示单个文件的扫描结果"""
+        item = self.batch_items[index]
+        if item['state'] != 'pending':
+            return
+        if info.ok:
+            self.set_batch_row(item, "等待中", info.elapsed, info.summary())
+        else:
+            # 不是 PyInstaller 程序, 不再加入解包
+            item['state'] = 'skipped'
+            self.set_batch_row(item, "已跳过", info.elapsed, info.error)
+
+    def handle_scan_finished(self):
+        """扫描结束"""
+        self.scan_thread.wait()
+        self.scan_thread = None
+        for item in self.batch_items:
+            if item['state'] == 'pending' and item['row'] is not None:
+                state_item = self.batch_table.item(item['row'], COL_STATE)
+                if state_item.text() == "扫描中":
+                    state_item.setText("等待中")
+        self.scan_batch_btn.setText("快速扫描")
+        self.scan_batch_btn.setEnabled(True)
+        self.clear_batch_btn.setEnabled(True)
+
+    def start_batch(self):
+        """开始处理批量队列"""
+        if not any(item['state'] == 'pending' for item in self.batch_items):
+            QMessageBox.warning(self, "错误", "批量队列中没有待处理的文件")
+            return
+        self.batch_running = True
+        self.batch_stopping = False
+        self.start_batch_btn.setEnabled(False)
+        self.stop_batch_btn.setEnabled(True)
+        self.batch_timer.start(500)
+        self.schedule_batch()
+
+    def stop_batch(self):
+        """停止批量解包: 不再启动新任务, 并取消运行中的任务"""
+        self.batch_stopping = True
+        self.stop_batch_btn.setEnabled(False)
+        for item in self.batch_items:
+            if item['state'] == 'running':
+                item['thread'].cancel()
+                self.set_batch_row(item, "正在取消")
+
+    def schedule_batch(self):
+        """在并发上限内启动等待中的任务"""
+        running = sum(1 for item in self.batch_items if item['state'] == 'running')
+        # 解包进程数在同时处理的样本之间平分
+        workers = max(1, self.config['workers'] // self.config['batch_jobs'])
+        for item in self.batch_items:
+            if running >= self.config['batch_jobs'] or self.batch_stopping:
+                break
+            if item['state'] != 'pending':
+                continue
+
+            target_dir = item['path'] + "_extracted"
+            thread = UnpackThread(item['path'], target_dir, workers, self.config['store_dir'] or None,
+                                  self.index)
+            thread.finished.connect(
+                lambda returncode, stdout, stderr, target, item=item:
+                self.handle_batch_finished(item, returncode, stderr))
+            thread.error.connect(lambda error_msg, item=item: self.handle_batch_finished(item, -1, error_msg))
+            thread.progress.connect(
+                lambda progress, item=item: self.set_batch_row(item, f"解包中 {progress.fraction:.0%}"))
+            item['state'] = 'running'
+            item['start'] = time.monotonic()
+            item['thread'] = thread
+            self.set_batch_row(item, "解包中")
+            thread.start()
+            running += 1
+
+        if running == 0:
+            self.batch_running = False
+            self.start_batch_btn.setEnabled(True)
+            self.stop_batch_btn.setEnabled(False)
+            self.batch_timer.stop()
+
+    def refresh_batch_elapsed(self):
+        """刷新运行中任务的耗时"""
+        now = time.monotonic()
+        for item in self.batch_items:
+            if item['state'] == 'running':
+                self.batch_table.item(item['row'], COL_ELAPSED).setText(f"{now - item['start']:.1f}s")
+
+    def handle_batch_finished(self, item, returncode, message):
+        """批量任务完成"""
+        elapsed = time.monotonic() - item['start']
+        item['thread'].wait()
+        item['thread'] = None
+        if returncode == RETURNCODE_CANCELLED:
+            # 回到等待状态, 再次开始时从检查点继续
+            item['state'] = 'pending'
+            resumable = os.path.isdir(f"{item['path']}_extracted.partial")
+            self.set_batch_row(item, "已取消", elapsed, "再次开始时从中断处继续" if resumable else "没有可继续的内容")
+        elif returncode == 0:
+            item['state'] = 'done'
+            result = "成功" + (f" (部分文件解包失败)\n{message}" if message else "")
+            self.set_batch_row(item, "完成", elapsed, result)
+        else:
+            item['state'] = 'failed'
+            self.set_batch_row(item, "失败", elapsed, message)
+        self.schedule_batch()
 
     def closeEvent(self, event):
         """窗口关闭时确保线程停止"""
-        if self.unpack_thread and self.unpack_thread.isRunning():
-            self.unpack_thread.cancelled = True
-            self.unpack_thread.wait(2000)  # 等待2秒
+        threads = [item['thread'] for item in self.batch_items if item['thread']]
+        if self.scan_thread:
+            threads.append(self.scan_thread)
+        if self.unpack_thread:
+            threads.append(self.unpack_thread)
+        # 先通知所有线程取消, 再逐个等待, 解包引擎在当前成员写完后即停止
+        for thread in threads:
+            thread.cancel()
+        for thread in threads:
+            thread.wait()
         event.accept()
 
 
 if __name__ == "__main__":
+    # 打包后解包进程池需要
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = PyInstxtractorGUI()
     window.show()
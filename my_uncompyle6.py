@@ -1,15 +1,42 @@
 # my_uncompyle6.py - uncompyle6反编译工具GUI
 import sys
 import os
-import subprocess
-import locale
+import time
+import sqlite3
+import threading
+import configparser
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QLineEdit, QPushButton, QFileDialog, QMessageBox,
                              QHBoxLayout, QDialog, QLabel, QDialogButtonBox,
-                             QTextEdit, QGroupBox)
-from PyQt5.QtCore import Qt
+                             QGroupBox, QSpinBox, QFormLayout, QProgressDialog)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtGui import QFont
 
+from decompile_cache import DecompileCache, module_version
+from decompile_runner import (BatchDecompiler, DecompileTask, Engine, ResourceLimits, plan_tree, read_limits,
+                              spool_file, summarize, write_summary, DEFAULT_LIMITS, LIMIT_LABELS,
+                              STATUS_OK, STATUS_FAILED, STATUS_TIMEOUT, STATUS_CANCELLED)
+from output_viewer import OutputViewer
+from uncompyle6_pool import Uncompyle6Pool
+
+if getattr(sys, 'frozen', False):
+    # 打包后使用可执行文件所在目录
+    BASE_DIR = os.path.dirname(sys.executable)
+else:
+    # 开发环境使用脚本所在目录
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CONFIG_FILE = os.path.join(BASE_DIR, "uncompyle6_config.ini")
+
+# 与其他反编译工具共用的结果缓存
+CACHE_FILE = os.path.join(BASE_DIR, "decompile_cache.db")
+ENGINE = "uncompyle6"
+# 常驻进程通过 uncompyle6 的 API 反编译, 结果与命令行分开缓存
+ENGINE_OPTIONS = "api"
+
+# 常驻工作进程数
+DEFAULT_WORKERS = os.cpu_count() or 1
+
 
 class FileDropEdit(QLineEdit):
     """支持文件拖拽的输入框"""
@@ -56,17 +83,141 @@ class FileDropEdit(QLineEdit):
                 self.setText(file_path)
 
 
+class ConfigDialog(QDialog):
+    """配置对话框"""
+
+    def __init__(self, limits, workers=DEFAULT_WORKERS, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("配置uncompyle6")
+        self.setFixedSize(400, 210)
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+
+        # 常驻工作进程数
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, 256)
+        self.workers_spin.setValue(workers)
+        form.addRow("工作进程数:", self.workers_spin)
+
+        # 每次运行uncompyle6的资源限制, 0 表示不限制
+        self.limit_spins = {}
+        for key, label in LIMIT_LABELS.items():
+            spin = QSpinBox()
+            spin.setRange(0, 1024 * 1024)
+            spin.setSpecialValueText("不限制")
+            spin.setValue(limits[key])
+            form.addRow(label + ":", spin)
+            self.limit_spins[key] = spin
+        layout.addLayout(form)
+
+        # 按钮框
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+    def get_limits(self):
+        """获取资源限制"""
+        return {key: spin.value() for key, spin in self.limit_spins.items()}
+
+    def get_workers(self):
+        """获取工作进程数"""
+        return self.workers_spin.value()
+
+
+class DecompileThread(QThread):
+    """把单个文件交给常驻工作进程, 界面线程不等待反编译"""
+    finished = pyqtSignal(object)  # DecompileResult
+    error = pyqtSignal(str)
+
+    def __init__(self, decompiler, task, parent=None):
+        super().__init__(parent)
+        self.decompiler = decompiler
+        self.task = task
+
+    def cancel(self):
+        self.decompiler.cancel_event.set()
+
+    def run(self):
+        try:
+            self.finished.emit(self.decompiler.run_task(self.task))
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class BatchDecompileThread(QThread):
+    """目录模式的反编译线程, 每个工作进程空闲时领取下一个文件"""
+    progress = pyqtSignal(int, int, str)  # 已完成数, 总数, 当前文件
+    finished = pyqtSignal(list, str, float)  # 结果列表, 汇总报告路径, 总耗时
+    error = pyqtSignal(str)
+
+    def __init__(self, engine, input_dir, output_dir, workers, cache=None, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.cache = cache
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.workers = workers
+        self.cancel_event = threading.Event()
+        self.done = 0
+        self.total = 0
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def report(self, result):
+        self.done += 1
+        self.progress.emit(self.done, self.total, result.task.rel_path)
+
+    def run(self):
+        try:
+            start = time.monotonic()
+            tasks = plan_tree(self.input_dir, self.output_dir, ".py")
+            self.total = len(tasks)
+            decompiler = BatchDecompiler(self.engine, self.workers, on_result=self.report,
+                                         cancel_event=self.cancel_event, cache=self.cache)
+            results = decompiler.run(tasks)
+            elapsed = time.monotonic() - start
+            summary_path = write_summary(self.output_dir, f"uncompyle6 目录反编译: {self.input_dir}",
+                                         results, elapsed)
+            self.finished.emit(results, summary_path, elapsed)
+        except Exception as e:
+            import traceback
+            self.error.emit(f"目录反编译过程中发生错误:\n{str(e)}\n\n{traceback.format_exc()}")
+
+
 class Uncompyle6GUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("uncompyle6反编译工具")
         self.setGeometry(300, 300, 600, 400)
+        self.cache = self.open_cache()
+        self.run_thread = None
+        self.progress_dialog = None
+
+        # 加载配置
+        self.config = self.load_config()
+
+        # 窗口打开时启动工作进程, 第一次反编译前完成导入
+        self.pool = self.start_pool()
 
         # 创建主部件和布局
         main_widget = QWidget()
         self.setCentralWidget(main_widget)
         layout = QVBoxLayout(main_widget)
 
+        # 配置按钮与当前的资源限制
+        top_layout = QHBoxLayout()
+        config_btn = QPushButton("配置")
+        config_btn.clicked.connect(self.open_config_dialog)
+        top_layout.addWidget(config_btn)
+        self.status_label = QLabel()
+        top_layout.addWidget(self.status_label)
+        top_layout.addStretch()
+        layout.addLayout(top_layout)
+        self.update_status()
+
         # 输入组
         input_group = QGroupBox("输入设置")
         input_layout = QVBoxLayout(input_group)
@@ -93,6 +244,67 @@ class Uncompyle6GUI(QMainWindow):
         # 添加弹性空间
         layout.addStretch()
 
+    def load_config(self):
+        """加载配置文件"""
+        config = configparser.ConfigParser()
+        defaults = {'limits': dict(DEFAULT_LIMITS), 'workers': DEFAULT_WORKERS}
+        if not os.path.exists(CONFIG_FILE):
+            self.save_config(defaults)
+            return defaults
+        try:
+            config.read(CONFIG_FILE)
+            return {'limits': read_limits(config['DEFAULT']),
+                    'workers': max(1, config.getint('DEFAULT', 'workers', fallback=DEFAULT_WORKERS))}
+        except Exception as e:
+            QMessageBox.warning(
+                None,
+                "配置文件读取失败",
+                f"无法读取配置文件:\n{str(e)}\n将使用默认配置"
+            )
+            return defaults
+
+    def save_config(self, values):
+        """保存配置到文件"""
+        try:
+            config = configparser.ConfigParser()
+            config['DEFAULT'] = {key: str(value) for key, value in values['limits'].items()}
+            config['DEFAULT']['workers'] = str(values['workers'])
+            with open(CONFIG_FILE, 'w') as configfile:
+                config.write(configfile)
+        except Exception as e:
+            QMessageBox.warning(
+                None,
+                "配置文件保存失败",
+                f"无法保存配置文件:\n{str(e)}"
+            )
+
+    def update_status(self):
+        limits = ResourceLimits.from_config(self.config['limits'])
+        self.status_label.setText(f"工作进程: {self.config['workers']}  资源限制: {limits.describe()}")
+
+    def open_config_dialog(self):
+        """打开配置对话框, 设置变化后重启工作进程"""
+        dialog = ConfigDialog(self.config['limits'], self.config['workers'], self)
+        if dialog.exec_() == QDialog.Accepted:
+            self.config = {'limits': dialog.get_limits(), 'workers': dialog.get_workers()}
+            self.save_config(self.config)
+            self.update_status()
+            # 正在运行时等本次反编译结束后再重启
+            self.pool_stale = True
+            if self.run_thread is None:
+                self.restart_pool()
+
+    def restart_pool(self):
+        self.pool.close()
+        self.pool = self.start_pool()
+
+    def start_pool(self):
+        self.pool_stale = False
+        return Uncompyle6Pool(self.config['workers'], ResourceLimits.from_config(self.config['limits']))
+
+    def make_engine(self):
+        return Engine(ENGINE, None, module_version(ENGINE), ENGINE_OPTIONS, self.pool.limits, runner=self.pool.run)
+
     def execute_decompile(self):
         """执行反编译命令"""
         input_path = self.input_path_edit.text().strip()
@@ -119,36 +331,111 @@ class Uncompyle6GUI(QMainWindow):
                 QMessageBox.critical(self, "错误", f"无法创建输出目录:\n{str(e)}")
                 return
 
-        try:
-            # 获取系统编码
-            system_encoding = locale.getpreferredencoding()
-
-            # 修复命令执行方式
-            # 使用正确的模块路径调用uncompyle6
-            command = [
-                sys.executable,  # 使用当前Python解释器
-                "-m", "uncompyle6.bin.uncompyle6",
-                "-o", output_dir,
-                input_path
-            ]
-
-            # 执行命令
-            result = subprocess.run(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                encoding=system_encoding,
-                errors='replace'
-            )
-
-            # 显示结果对话框
-            self.show_result_dialog(result, input_path, output_dir)
-
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"发生未知错误:\n{str(e)}")
+        # 单个文件交给常驻工作进程, 同一pyc处理过时直接使用缓存结果
+        if os.path.isfile(input_path):
+            task = DecompileTask(input_path, self.output_file(input_path, output_dir),
+                                 os.path.basename(input_path))
+            decompiler = BatchDecompiler(self.make_engine(), cancel_event=threading.Event(), cache=self.cache)
+            self.decompile_btn.setEnabled(False)
+            self.run_thread = DecompileThread(decompiler, task)
+            self.run_thread.finished.connect(self.handle_run_finished)
+            self.run_thread.error.connect(self.handle_run_error)
+            self.run_thread.start()
+            return
 
-    def show_result_dialog(self, result, input_path, output_dir):
-        """显示结果对话框"""
+        # 目录按文件分配给全部工作进程, 结果按原目录结构写入输出目录
+        self.progress_dialog = QProgressDialog("正在扫描目录...", "取消", 0, 0, self)
+        self.progress_dialog.setMinimumWidth(450)
+        self.progress_dialog.setWindowTitle("目录反编译")
+        self.progress_dialog.setWindowModality(Qt.WindowModal)
+        self.progress_dialog.canceled.connect(self.cancel_batch)
+        self.progress_dialog.show()
+        self.decompile_btn.setEnabled(False)
+
+        self.run_thread = BatchDecompileThread(self.make_engine(), input_path, output_dir, self.pool.size,
+                                               self.cache)
+        self.run_thread.progress.connect(self.update_batch_progress)
+        self.run_thread.finished.connect(self.handle_batch_finished)
+        self.run_thread.error.connect(self.handle_batch_error)
+        self.run_thread.start()
+
+    def open_cache(self):
+        """打开结果缓存, 失败时不使用缓存"""
+        try:
+            return DecompileCache(CACHE_FILE)
+        except sqlite3.Error:
+            return None
+
+    @staticmethod
+    def output_file(input_path, output_dir):
+        """单个文件的源码输出路径"""
+        return os.path.join(output_dir, os.path.splitext(os.path.basename(input_path))[0] + ".py")
+
+    def finish_run(self):
+        self.run_thread.wait()
+        self.run_thread = None
+        self.decompile_btn.setEnabled(True)
+        if self.pool_stale:
+            self.restart_pool()
+
+    def handle_run_finished(self, result):
+        """显示工作进程的反编译结果"""
+        self.finish_run()
+        if result.status != STATUS_CANCELLED:
+            self.show_result_dialog(result)
+
+    def handle_run_error(self, error_msg):
+        self.finish_run()
+        QMessageBox.critical(self, "错误", f"发生未知错误:\n{error_msg}")
+
+    def cancel_batch(self):
+        """取消尚未开始的文件并终止正在运行的工作进程"""
+        if self.run_thread:
+            self.run_thread.cancel()
+        self.progress_dialog = None
+
+    def update_batch_progress(self, done, total, rel_path):
+        if self.progress_dialog:
+            self.progress_dialog.setMaximum(total)
+            self.progress_dialog.setValue(done)
+            self.progress_dialog.setLabelText(f"已完成 {done}/{total}\n当前: {rel_path}")
+
+    def close_batch_progress(self):
+        if self.progress_dialog:
+            self.progress_dialog.canceled.disconnect(self.cancel_batch)
+            self.progress_dialog.close()
+            self.progress_dialog = None
+        self.finish_run()
+
+    def handle_batch_finished(self, results, summary_path, elapsed):
+        """显示目录反编译的汇总"""
+        self.close_batch_progress()
+        counts = summarize(results)
+        message = f"共 {len(results)} 个文件, 成功 {counts[STATUS_OK]}, 失败 {counts[STATUS_FAILED]}"
+        if counts[STATUS_TIMEOUT]:
+            message += f", 超时 {counts[STATUS_TIMEOUT]}"
+        if counts[STATUS_CANCELLED]:
+            message += f", 取消 {counts[STATUS_CANCELLED]}"
+        if counts['cached']:
+            message += f"\n其中 {counts['cached']} 个来自缓存"
+        message += (f"\n工作进程: {self.pool.size}  总耗时: {elapsed:.1f}s\n\n输出目录:\n"
+                    f"{os.path.dirname(summary_path)}\n汇总报告:\n{summary_path}")
+        QMessageBox.information(self, "目录反编译完成", message)
+
+    def handle_batch_error(self, error_msg):
+        self.close_batch_progress()
+        QMessageBox.critical(self, "错误", error_msg)
+
+    def closeEvent(self, event):
+        """窗口关闭时停止正在运行的任务并结束工作进程"""
+        if self.run_thread and self.run_thread.isRunning():
+            self.run_thread.cancel()
+            self.run_thread.wait()
+        self.pool.close()
+        event.accept()
+
+    def show_result_dialog(self, result):
+        """显示结果对话框, 源码直接从输出文件中按需读取"""
         dialog = QDialog(self)
         dialog.setWindowTitle("反编译结果")
         dialog.setMinimumSize(700, 500)
@@ -156,29 +443,32 @@ class Uncompyle6GUI(QMainWindow):
         layout = QVBoxLayout(dialog)
 
         # 标题
-        title = QLabel(f"输入路径: {input_path}\n输出目录: {output_dir}")
+        title = QLabel(f"输入路径: {result.task.input_path}\n输出文件: {result.task.output_path}")
         title.setFont(QFont("Arial", 10, QFont.Bold))
         layout.addWidget(title)
 
         # 状态
-        status = QLabel(f"退出代码: {result.returncode}")
+        if result.status == STATUS_TIMEOUT:
+            limits = ResourceLimits.from_config(self.config['limits'])
+            status = QLabel(f"超过资源限制 ({limits.describe()}), 已终止")
+        else:
+            status = QLabel(f"退出代码: {result.returncode}" + (" (来自缓存)" if result.cached else ""))
         layout.addWidget(status)
 
         # 输出区域
-        output_label = QLabel("输出内容:")
-        layout.addWidget(output_label)
-
-        output_text = QTextEdit()
-        output_text.setReadOnly(True)
-        output_text.setFont(QFont("Courier New", 9))
-
-        # 添加输出内容
-        if result.stdout:
-            output_text.append("标准输出:\n" + result.stdout)
-        if result.stderr:
-            output_text.append("\n错误输出:\n" + result.stderr)
-
-        layout.addWidget(output_text)
+        layout.addWidget(QLabel("输出内容:"))
+        output_view = OutputViewer()
+        output_view.open(result.task.output_path)
+        layout.addWidget(output_view)
+
+        # 错误输出单独显示
+        error_view = None
+        if result.stderr.strip():
+            layout.addWidget(QLabel("错误输出:"))
+            error_view = OutputViewer(toolbar=False)
+            error_view.setMaximumHeight(120)
+            error_view.open(spool_file(result.stderr.encode('utf-8')), temporary=True)
+            layout.addWidget(error_view)
 
         # 按钮框
         button_box = QDialogButtonBox(QDialogButtonBox.Ok)
@@ -186,6 +476,9 @@ class Uncompyle6GUI(QMainWindow):
         layout.addWidget(button_box)
 
         dialog.exec_()
+        output_view.close_file()
+        if error_view is not None:
+            error_view.close_file()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,435 @@
+# output_viewer.py - 大文件输出的按需加载查看器
+import os
+import re
+import mmap
+import locale
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QLabel, QCheckBox,
+                             QAbstractScrollArea, QApplication)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont, QFontMetrics, QKeySequence, QPainter
+
+# 建立行索引时每次扫描的字节数
+SCAN_CHUNK = 4 * 1024 * 1024
+
+# 单行最多显示的字符数, 超长的行截断显示
+MAX_LINE_CHARS = 4096
+
+# 一次最多复制的行数
+MAX_COPY_LINES = 100000
+
+# 运行中的输出文件刷新间隔(毫秒)
+REFRESH_INTERVAL = 200
+
+
+def detect_encoding(sample):
+    """uncompyle6 的输出为 UTF-8, pycdc/pycdas 的输出为系统编码"""
+    try:
+        sample.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # 样本末尾截断的多字节字符不算错误
+        if e.start < len(sample) - 3:
+            return locale.getpreferredencoding(False)
+    return 'utf-8'
+
+
+def remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class LineIndex:
+    """文本文件的行偏移索引, 内容通过 mmap 按需读取
+
+    只保存每行的起始偏移, 文件仍在写入时可以反复调用 refresh 追加新行。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.map = None
+        self.size = 0
+        self.encoding = None
+        # 最长一行的字节数, 用于确定水平滚动范围
+        self.longest = 0
+        # offsets[i] 为第 i 行的起始偏移, 最后一项是未换行的尾部的起始偏移
+        self.offsets = array('q', [0])
+
+    @property
+    def count(self):
+        return len(self.offsets) - 1 + (1 if self.size > self.offsets[-1] else 0)
+
+    def refresh(self):
+        """扫描文件新增的部分, 返回 False 表示文件被截断后重建了索引"""
+        size = os.fstat(self.file.fileno()).st_size
+        if size == self.size:
+            return True
+        intact = size > self.size
+        if not intact:
+            self.offsets = array('q', [0])
+            self.size = 0
+            self.longest = 0
+        self.remap(size)
+        if self.encoding is None and self.map is not None:
+            self.encoding = detect_encoding(self.map[:64 * 1024])
+        pos = self.size
+        while pos < size:
+            chunk = self.map[pos:min(pos + SCAN_CHUNK, size)]
+            lengths = [len(part) + 1 for part in chunk.split(b'\n')[:-1]]
+            self.offsets.extend(map(pos.__add__, accumulate(lengths)))
+            if lengths:
+                self.longest = max(self.longest, max(lengths))
+            pos += len(chunk)
+        self.size = size
+        return intact
+
+    def remap(self, size):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if size:
+            self.map = mmap.mmap(self.file.fileno(), size, access=mmap.ACCESS_READ)
+
+    def line_range(self, row):
+        start = self.offsets[row]
+        end = self.offsets[row + 1] - 1 if row + 1 < len(self.offsets) else self.size
+        return start, end
+
+    def line(self, row):
+        start, end = self.line_range(row)
+        # 超长的行只读取开头部分
+        text = self.map[start:min(end, start + MAX_LINE_CHARS * 4)].decode(self.encoding, errors='replace')
+        text = text.rstrip('\r')
+        if len(text) > MAX_LINE_CHARS or end > start + MAX_LINE_CHARS * 4:
+            text = text[:MAX_LINE_CHARS] + " …"
+        return text
+
+    def lines(self, rows):
+        return [self.line(row) for row in rows]
+
+    def row_at(self, offset):
+        return bisect_right(self.offsets, offset) - 1
+
+    def find(self, text, row, backward=False, case_sensitive=False):
+        """从 row 之后 (或之前) 查找文本, 到达末尾后从另一端继续, 返回行号或 None
+
+        直接在 mmap 上用正则搜索, 不需要把文件解码成字符串。
+        """
+        if not text or self.map is None:
+            return None
+        pattern = re.compile(re.escape(text.encode(self.encoding or 'utf-8', errors='replace')),
+                             0 if case_sensitive else re.IGNORECASE)
+        if backward:
+            start = self.line_range(row)[0] if 0 <= row < self.count else self.size
+            match = self.search_back(pattern, start) or self.search_back(pattern, self.size)
+        else:
+            start = self.line_range(row)[1] + 1 if 0 <= row < self.count else 0
+            match = pattern.search(self.map, min(start, self.size)) or pattern.search(self.map, 0)
+        return None if match is None else self.row_at(match.start())
+
+    def search_back(self, pattern, end):
+        """在 end 之前查找最后一个匹配, 按块向前扫描"""
+        # 相邻的块重叠一个匹配的长度, 避免跨块的匹配被漏掉
+        overlap = min(len(pattern.pattern), SCAN_CHUNK // 2)
+        while end > 0:
+            start = max(0, end - SCAN_CHUNK)
+            last = None
+            for last in pattern.finditer(self.map, start, end):
+                pass
+            if last is not None:
+                return last
+            end = start + overlap if start else 0
+        return None
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+
+class LineView(QAbstractScrollArea):
+    """只绘制可见行的文本视图, 滚动条以行为单位
+
+    行号显示在左侧, 单击选择一行, Shift+单击或 Shift+方向键扩展选择范围。
+    """
+    current_changed = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.line_index = None
+        self.rows = 0
+        self.current = -1
+        self.anchor = -1
+        font = QFont("Courier New", 9)
+        self.setFont(font)
+        self.viewport().setFont(font)
+        metrics = QFontMetrics(font)
+        self.char_width = metrics.averageCharWidth()
+        self.line_height = metrics.lineSpacing() + 2
+        self.ascent = metrics.ascent() + 1
+        self.gutter = 0
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.verticalScrollBar().valueChanged.connect(self.viewport().update)
+        self.horizontalScrollBar().valueChanged.connect(self.viewport().update)
+
+    def set_index(self, line_index):
+        self.line_index = line_index
+        self.current = self.anchor = -1
+        self.verticalScrollBar().setValue(0)
+        self.horizontalScrollBar().setValue(0)
+        self.sync()
+
+    def sync(self):
+        """行数或最长行变化后更新滚动范围"""
+        self.rows = self.line_index.count if self.line_index is not None else 0
+        self.gutter = (len(str(max(self.rows, 1))) + 2) * self.char_width
+        self.update_scroll_bars()
+        self.viewport().update()
+
+    def page_rows(self):
+        return max(1, self.viewport().height() // self.line_height)
+
+    def update_scroll_bars(self):
+        page = self.page_rows()
+        v_bar = self.verticalScrollBar()
+        v_bar.setRange(0, max(0, self.rows - page))
+        v_bar.setPageStep(page)
+        longest = min(self.line_index.longest, MAX_LINE_CHARS) if self.line_index is not None else 0
+        h_bar = self.horizontalScrollBar()
+        h_bar.setRange(0, max(0, self.gutter + (longest + 2) * self.char_width - self.viewport().width()))
+        h_bar.setPageStep(self.viewport().width())
+        h_bar.setSingleStep(self.char_width * 4)
+
+    def at_end(self):
+        v_bar = self.verticalScrollBar()
+        return v_bar.value() >= v_bar.maximum()
+
+    def scroll_to_end(self):
+        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+
+    def selection(self):
+        if self.current < 0:
+            return -1, -1
+        anchor = self.anchor if self.anchor >= 0 else self.current
+        return min(anchor, self.current), max(anchor, self.current)
+
+    def set_current(self, row, extend=False, center=False):
+        if not self.rows:
+            return
+        row = min(max(row, 0), self.rows - 1)
+        if not extend or self.anchor < 0:
+            self.anchor = row
+        self.current = row
+        first = self.verticalScrollBar().value()
+        page = self.page_rows()
+        if center:
+            self.verticalScrollBar().setValue(row - page // 2)
+        elif row < first:
+            self.verticalScrollBar().setValue(row)
+        elif row >= first + page:
+            self.verticalScrollBar().setValue(row - page + 1)
+        self.viewport().update()
+        self.current_changed.emit(row)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_scroll_bars()
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        palette = self.palette()
+        rect = self.viewport().rect()
+        painter.fillRect(rect, palette.base())
+        if self.line_index is None or not self.rows:
+            return
+        first = self.verticalScrollBar().value()
+        last = min(self.rows, first + self.page_rows() + 1)
+        x_offset = self.horizontalScrollBar().value()
+        low, high = self.selection()
+        text_x = self.gutter - x_offset
+        for i, row in enumerate(range(first, last)):
+            y = i * self.line_height
+            if low <= row <= high:
+                painter.fillRect(0, y, rect.width(), self.line_height, palette.highlight())
+                painter.setPen(palette.highlightedText().color())
+            else:
+                painter.setPen(palette.text().color())
+            painter.drawText(text_x, y + self.ascent, self.line_index.line(row))
+        # 行号区域固定在左侧, 不随水平滚动移动
+        painter.fillRect(0, 0, self.gutter - self.char_width // 2, rect.height(), palette.window())
+        painter.setPen(palette.mid().color())
+        for i, row in enumerate(range(first, last)):
+            painter.drawText(0, i * self.line_height, self.gutter - self.char_width, self.line_height,
+                             Qt.AlignRight | Qt.AlignVCenter, str(row + 1))
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            row = self.verticalScrollBar().value() + event.pos().y() // self.line_height
+            if row < self.rows:
+                self.set_current(row, extend=bool(event.modifiers() & Qt.ShiftModifier))
+
+    def keyPressEvent(self, event):
+        steps = {Qt.Key_Up: -1, Qt.Key_Down: 1, Qt.Key_PageUp: -self.page_rows(),
+                 Qt.Key_PageDown: self.page_rows()}
+        extend = bool(event.modifiers() & Qt.ShiftModifier)
+        if event.matches(QKeySequence.Copy):
+            self.copy_selection()
+        elif event.key() in steps:
+            self.set_current(max(self.current, 0) + steps[event.key()], extend)
+        elif event.key() == Qt.Key_Home:
+            self.set_current(0, extend)
+        elif event.key() == Qt.Key_End:
+            self.set_current(self.rows - 1, extend)
+        else:
+            super().keyPressEvent(event)
+
+    def copy_selection(self):
+        low, high = self.selection()
+        if low < 0:
+            return
+        # 复制范围过大时截断, 避免一次读出整个文件
+        high = min(high, low + MAX_COPY_LINES - 1)
+        QApplication.clipboard().setText("\n".join(self.line_index.lines(range(low, high + 1))))
+
+
+class OutputViewer(QWidget):
+    """文件内容的虚拟化查看器, 支持跳转到行和查找
+
+    视图只读取可见的行, 输出文件再大也不会整体载入控件。
+    temporary 为真的文件在查看器关闭时删除。
+    """
+
+    def __init__(self, parent=None, toolbar=True):
+        super().__init__(parent)
+        self.line_index = None
+        self.temporary = False
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # 跳转与查找
+        self.toolbar = QWidget()
+        bar = QHBoxLayout(self.toolbar)
+        bar.setContentsMargins(0, 0, 0, 0)
+        self.line_edit = QLineEdit()
+        self.line_edit.setPlaceholderText("行号")
+        self.line_edit.setMaximumWidth(80)
+        self.line_edit.returnPressed.connect(self.jump_to_line)
+        bar.addWidget(self.line_edit)
+        jump_btn = QPushButton("跳转")
+        jump_btn.clicked.connect(self.jump_to_line)
+        bar.addWidget(jump_btn)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("查找")
+        self.search_edit.returnPressed.connect(self.find_next)
+        bar.addWidget(self.search_edit)
+        self.case_cb = QCheckBox("区分大小写")
+        bar.addWidget(self.case_cb)
+        prev_btn = QPushButton("上一个")
+        prev_btn.clicked.connect(self.find_previous)
+        bar.addWidget(prev_btn)
+        next_btn = QPushButton("下一个")
+        next_btn.clicked.connect(self.find_next)
+        bar.addWidget(next_btn)
+        self.info_label = QLabel()
+        bar.addWidget(self.info_label)
+        layout.addWidget(self.toolbar)
+        self.toolbar.setVisible(toolbar)
+
+        self.view = LineView()
+        self.view.current_changed.connect(self.update_info)
+        layout.addWidget(self.view)
+
+    def open(self, path, temporary=False, follow=False):
+        """显示文件, follow 为真时定时读取文件新增的内容直到调用 stop_follow"""
+        self.close_file()
+        self.temporary = temporary
+        try:
+            self.line_index = LineIndex(path)
+            self.line_index.refresh()
+        except (OSError, ValueError) as e:
+            self.line_index = None
+            self.info_label.setText(f"无法打开输出: {e}")
+            return
+        self.view.set_index(self.line_index)
+        self.update_info()
+        if follow:
+            self.timer.start(REFRESH_INTERVAL)
+
+    def refresh(self):
+        """读取文件新增的内容, 已经停在末尾时继续显示末尾"""
+        if self.line_index is None:
+            return
+        at_end = self.view.at_end()
+        try:
+            self.line_index.refresh()
+        except (OSError, ValueError):
+            return
+        self.view.sync()
+        if at_end:
+            self.view.scroll_to_end()
+        self.update_info()
+
+    def stop_follow(self):
+        """输出结束后最后刷新一次"""
+        self.timer.stop()
+        self.refresh()
+
+    def close_file(self):
+        self.timer.stop()
+        if self.line_index is None:
+            return
+        self.view.set_index(None)
+        self.line_index.close()
+        if self.temporary:
+            remove_quietly(self.line_index.path)
+        self.line_index = None
+
+    def line_count(self):
+        return self.line_index.count if self.line_index is not None else 0
+
+    def current_row(self):
+        return self.view.current
+
+    def update_info(self, *args):
+        if self.line_index is None:
+            return
+        row = self.current_row()
+        position = f"第 {row + 1} 行 / " if row >= 0 else ""
+        self.info_label.setText(f"{position}共 {self.line_count()} 行")
+
+    def go_to_row(self, row):
+        self.view.set_current(row, center=True)
+        self.view.setFocus()
+
+    def jump_to_line(self):
+        try:
+            line = int(self.line_edit.text().strip())
+        except ValueError:
+            return
+        if self.line_count():
+            self.go_to_row(min(max(line, 1), self.line_count()) - 1)
+
+    def find(self, backward):
+        if self.line_index is None:
+            return
+        row = self.line_index.find(self.search_edit.text(), self.current_row(), backward,
+                                   self.case_cb.isChecked())
+        if row is None:
+            self.info_label.setText("未找到")
+        else:
+            self.go_to_row(row)
+
+    def find_next(self):
+        self.find(False)
+
+    def find_previous(self):
+        self.find(True)
@@ -0,0 +1,867 @@
+# pyc_disasm.py - 纯 Python 实现的 pyc 反汇编器, 输出格式与 pycdas 相同
+import os
+import struct
+
+from decompile_runner import magic_version, STATUS_OK, STATUS_FAILED, STATUS_CANCELLED
+from pyc_opcodes import OPCODE_TABLES
+
+# 参与缓存键, 输出格式变化时递增
+DISASM_VERSION = "1"
+
+SUPPORTED_VERSIONS = tuple(sorted(OPCODE_TABLES))
+
+# 与 pycdas 相同的标志位名称, 按位序排列
+FLAG_NAMES = (
+    "CO_OPTIMIZED", "CO_NEWLOCALS", "CO_VARARGS", "CO_VARKEYWORDS",
+    "CO_NESTED", "CO_GENERATOR", "CO_NOFREE", "CO_COROUTINE",
+    "CO_ITERABLE_COROUTINE", "CO_ASYNC_GENERATOR", "<0x400>", "<0x800>",
+    "CO_GENERATOR_ALLOWED", "<0x2000>", "<0x4000>", "<0x8000>",
+    "<0x10000>", "CO_FUTURE_DIVISION", "CO_FUTURE_ABSOLUTE_IMPORT", "CO_FUTURE_WITH_STATEMENT",
+    "CO_FUTURE_PRINT_FUNCTION", "CO_FUTURE_UNICODE_LITERALS", "CO_FUTURE_BARRY_AS_BDFL",
+    "CO_FUTURE_GENERATOR_STOP", "CO_FUTURE_ANNOTATIONS", "CO_NO_MONITORING_EVENTS", "<0x4000000>",
+    "<0x8000000>", "<0x10000000>", "<0x20000000>", "<0x40000000>", "<0x80000000>",
+)
+
+# 一次加载/存储两个局部变量的指令, 参数高 4 位和低 4 位各是一个下标
+FAST_PAIRS = ('LOAD_FAST_LOAD_FAST', 'STORE_FAST_LOAD_FAST', 'STORE_FAST_STORE_FAST')
+
+FLAG_REF = 0x80
+INT32 = struct.Struct('<i')
+UINT32 = struct.Struct('<I')
+# marshal 中的 '0', 只用作 dict 的结束标记
+NULL = object()
+INDENT = "    "
+
+
+class PycFormatError(ValueError):
+    """无法解析的 pyc 文件"""
+
+
+class DisassembleCancelled(Exception):
+    """反汇编被取消或超过时间限制"""
+
+
+class Py2Long(int):
+    """py2 的 long 常量, 写回 marshal 时仍写成 long"""
+
+
+class CodeObject:
+    """marshal 中读出的代码对象, 字段按 3.11 之后的布局统一"""
+
+    def __init__(self):
+        self.argcount = 0
+        self.posonlyargcount = 0
+        self.kwonlyargcount = 0
+        self.nlocals = 0
+        self.stacksize = 0
+        self.flags = 0
+        self.code = b''
+        self.consts = ()
+        self.names = ()
+        self.varnames = ()
+        self.freevars = ()
+        self.cellvars = ()
+        self.localsplusnames = ()
+        self.localspluskinds = b''
+        self.filename = ''
+        self.name = ''
+        self.qualname = ''
+        self.firstlineno = 0
+        self.linetable = b''
+        self.exceptiontable = b''
+
+
+class MarshalReader:
+    """按 pyc 的 Python 版本解析 marshal 数据, 不依赖当前解释器的 marshal 格式
+
+    py2 的 str 读成 bytes, unicode 读成 str; py3 的 bytes 与 str 保持原样。
+    """
+
+    def __init__(self, data, version, pos=0):
+        self.data = data
+        self.version = version
+        self.pos = pos
+        self.refs = []
+        # py2 的 'R' 引用的是 't' 类型的驻留字符串表
+        self.interned = []
+        # 按类型字节分派, 避免逐个比较类型
+        self.loaders = {ord(kind): loader for kinds, loader in (
+            ('0', lambda: NULL), ('N', lambda: None), ('F', lambda: False), ('T', lambda: True),
+            ('S', lambda: StopIteration), ('.', lambda: Ellipsis),
+            ('i', self.int32), ('I', self.int64), ('l', self.load_long),
+            ('f', self.load_float), ('g', self.load_binary_float),
+            ('x', self.load_complex), ('y', self.load_binary_complex),
+            ('s', self.load_bytes), ('t', self.load_interned), ('R', self.load_string_ref),
+            ('u', self.load_unicode), ('aA', self.load_ascii), ('zZ', self.load_short_ascii),
+            ('(', self.load_tuple), (')', self.load_small_tuple), ('[', self.load_list),
+            ('<', self.load_set), ('>', self.load_frozenset), ('{', self.load_dict),
+            ('c', self.load_code), ('r', self.load_ref),
+        ) for kind in kinds}
+
+    def read(self, size):
+        end = self.pos + size
+        if end > len(self.data):
+            raise PycFormatError("marshal 数据意外结束")
+        chunk = self.data[self.pos:end]
+        self.pos = end
+        return chunk
+
+    def byte(self):
+        if self.pos >= len(self.data):
+            raise PycFormatError("marshal 数据意外结束")
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+
+    def int32(self):
+        return INT32.unpack(self.read(4))[0]
+
+    def uint32(self):
+        return UINT32.unpack(self.read(4))[0]
+
+    def int64(self):
+        return struct.unpack('<q', self.read(8))[0]
+
+    def text(self, size, encoding):
+        return self.read(size).decode(encoding, errors='surrogatepass')
+
+    def load(self):
+        code = self.byte()
+        loader = self.loaders.get(code & ~FLAG_REF)
+        if loader is None:
+            raise PycFormatError(f"未知的 marshal 类型 {chr(code & ~FLAG_REF)!r} (偏移 {self.pos - 1})")
+        if not code & FLAG_REF:
+            return loader()
+        index = len(self.refs)
+        self.refs.append(None)
+        obj = loader()
+        self.refs[index] = obj
+        return obj
+
+    def load_long(self):
+        size = self.int32()
+        digits = struct.unpack(f'<{abs(size)}H', self.read(2 * abs(size)))
+        value = 0
+        for digit in reversed(digits):
+            value = (value << 15) | digit
+        value = -value if size < 0 else value
+        return Py2Long(value) if self.version[0] < 3 else value
+
+    def load_float(self):
+        return float(self.read(self.byte()).decode('ascii'))
+
+    def load_binary_float(self):
+        return struct.unpack('<d', self.read(8))[0]
+
+    def load_complex(self):
+        real = self.load_float()
+        return complex(real, self.load_float())
+
+    def load_binary_complex(self):
+        return complex(*struct.unpack('<dd', self.read(16)))
+
+    def load_bytes(self):
+        return self.read(self.uint32())
+
+    def load_interned(self):
+        if self.version[0] < 3:
+            value = self.read(self.uint32())
+            self.interned.append(value)
+            return value
+        return self.text(self.uint32(), 'utf-8')
+
+    def load_string_ref(self):
+        index = self.uint32()
+        if index >= len(self.interned):
+            raise PycFormatError(f"无效的字符串引用 {index}")
+        return self.interned[index]
+
+    def load_unicode(self):
+        return self.text(self.uint32(), 'utf-8')
+
+    def load_ascii(self):
+        return self.text(self.uint32(), 'latin-1')
+
+    def load_short_ascii(self):
+        return self.text(self.byte(), 'latin-1')
+
+    def load_tuple(self):
+        return tuple([self.load() for _ in range(self.uint32())])
+
+    def load_small_tuple(self):
+        return tuple([self.load() for _ in range(self.byte())])
+
+    def load_list(self):
+        return [self.load() for _ in range(self.uint32())]
+
+    def load_set(self):
+        return ConstSet([self.load() for _ in range(self.uint32())], frozen=False)
+
+    def load_frozenset(self):
+        return ConstSet([self.load() for _ in range(self.uint32())], frozen=True)
+
+    def load_dict(self):
+        items = []
+        while True:
+            key = self.load()
+            if key is NULL:
+                break
+            items.append((key, self.load()))
+        return ConstDict(items)
+
+    def load_ref(self):
+        index = self.uint32()
+        if index >= len(self.refs):
+            raise PycFormatError(f"无效的 marshal 引用 {index}")
+        return self.refs[index]
+
+    def load_code(self):
+        co = CodeObject()
+        version = self.version
+        co.argcount = self.int32()
+        if version >= (3, 8):
+            co.posonlyargcount = self.int32()
+        if version[0] >= 3:
+            co.kwonlyargcount = self.int32()
+        if version < (3, 11):
+            co.nlocals = self.int32()
+        co.stacksize = self.int32()
+        co.flags = self.uint32()
+        co.code = self.load()
+        co.consts = self.load()
+        co.names = self.load()
+        if version >= (3, 11):
+            co.localsplusnames = self.load()
+            co.localspluskinds = self.load()
+        else:
+            co.varnames = self.load()
+            co.freevars = self.load()
+            co.cellvars = self.load()
+        co.filename = self.load()
+        co.name = self.load()
+        if version >= (3, 11):
+            co.qualname = self.load()
+        co.firstlineno = self.int32()
+        co.linetable = self.load()
+        if version >= (3, 11):
+            co.exceptiontable = self.load()
+        return co
+
+
+class ConstSet:
+    """set/frozenset 常量, 保留 marshal 中的顺序"""
+
+    def __init__(self, items, frozen):
+        self.items = items
+        self.frozen = frozen
+
+
+class ConstDict:
+    """dict 常量 (只在 py2 的 pyc 中出现), 保留 marshal 中的顺序"""
+
+    def __init__(self, items):
+        self.items = items
+
+
+class MarshalWriter:
+    """把 MarshalReader 读出的对象按 pyc 的 Python 版本重新写成 marshal 数据
+
+    不生成引用, 字符串一律写成普通字符串; 结果可以被对应版本的 marshal 读回。
+    """
+
+    def __init__(self, version):
+        self.version = version
+        self.parts = []
+        # 按类型分派, bool 是 int 的子类, 必须在 int 之前匹配
+        self.dumpers = (
+            (bool, lambda value: self.write(b'T' if value else b'F')),
+            (int, self.dump_int),
+            (float, lambda value: self.write(b'g' + struct.pack('<d', value))),
+            (complex, lambda value: self.write(b'y' + struct.pack('<dd', value.real, value.imag))),
+            (bytes, lambda value: self.dump_sized(b's', value)),
+            (str, lambda value: self.dump_sized(b'u', value.encode('utf-8', errors='surrogatepass'))),
+            (tuple, lambda value: self.dump_items(b'(', value)),
+            (list, lambda value: self.dump_items(b'[', value)),
+            (ConstSet, lambda value: self.dump_items(b'>' if value.frozen else b'<', value.items)),
+            (ConstDict, self.dump_dict),
+            (CodeObject, self.dump_code),
+        )
+
+    def write(self, data):
+        self.parts.append(data)
+
+    def int32(self, value):
+        self.write(INT32.pack(value))
+
+    def getvalue(self):
+        return b''.join(self.parts)
+
+    def dump(self, obj):
+        if obj is None:
+            self.write(b'N')
+        elif obj is Ellipsis:
+            self.write(b'.')
+        elif obj is StopIteration:
+            self.write(b'S')
+        else:
+            for kind, dumper in self.dumpers:
+                if isinstance(obj, kind):
+                    dumper(obj)
+                    return
+            raise PycFormatError(f"无法写入 marshal 的类型 {type(obj).__name__}")
+
+    def dump_int(self, value):
+        if -2 ** 31 <= value < 2 ** 31 and not isinstance(value, Py2Long):
+            self.write(b'i')
+            self.int32(value)
+            return
+        if self.version[0] < 3 and -2 ** 63 <= value < 2 ** 63 and not isinstance(value, Py2Long):
+            # py2 64 位平台上的 int
+            self.write(b'I' + struct.pack('<q', value))
+            return
+        # 15 位一组, 低位在前, 组数的符号即数值的符号
+        digits = []
+        rest = abs(value)
+        while rest:
+            digits.append(rest & 0x7fff)
+            rest >>= 15
+        self.write(b'l')
+        self.int32(-len(digits) if value < 0 else len(digits))
+        self.write(struct.pack(f'<{len(digits)}H', *digits))
+
+    def dump_sized(self, kind, data):
+        self.write(kind + UINT32.pack(len(data)))
+        self.write(data)
+
+    def dump_items(self, kind, items):
+        self.write(kind + UINT32.pack(len(items)))
+        for item in items:
+            self.dump(item)
+
+    def dump_dict(self, value):
+        self.write(b'{')
+        for key, item in value.items:
+            self.dump(key)
+            self.dump(item)
+        self.write(b'0')
+
+    def dump_code(self, co):
+        version = self.version
+        self.write(b'c')
+        self.int32(co.argcount)
+        if version >= (3, 8):
+            self.int32(co.posonlyargcount)
+        if version[0] >= 3:
+            self.int32(co.kwonlyargcount)
+        if version < (3, 11):
+            self.int32(co.nlocals)
+        self.int32(co.stacksize)
+        self.write(UINT32.pack(co.flags))
+        for value in (co.code, co.consts, co.names):
+            self.dump(value)
+        if version >= (3, 11):
+            self.dump(co.localsplusnames)
+            self.dump(co.localspluskinds)
+        else:
+            for value in (co.varnames, co.freevars, co.cellvars):
+                self.dump(value)
+        self.dump(co.filename)
+        self.dump(co.name)
+        if version >= (3, 11):
+            self.dump(co.qualname)
+        self.int32(co.firstlineno)
+        self.dump(co.linetable)
+        if version >= (3, 11):
+            self.dump(co.exceptiontable)
+
+
+def header_size(version):
+    """pyc 文件头长度: 2.x 为 magic+时间戳, 3.3 起增加源文件大小, 3.7 起增加标志字段"""
+    if version >= (3, 7):
+        return 16
+    if version >= (3, 3):
+        return 12
+    return 8
+
+
+def load_pyc(data):
+    """解析 pyc 文件内容, 返回 (Python 版本, 模块代码对象)"""
+    if len(data) < 8 or data[2:4] != b'\r\n':
+        raise PycFormatError("不是有效的 pyc 文件")
+    version = magic_version(data[:4])
+    if version is None:
+        raise PycFormatError(f"无法识别的 magic: {data[:4].hex()}")
+    if version not in OPCODE_TABLES:
+        supported = ", ".join(f"{major}.{minor}" for major, minor in SUPPORTED_VERSIONS)
+        raise PycFormatError(f"不支持 Python {version[0]}.{version[1]}, 支持的版本: {supported}")
+    try:
+        code = MarshalReader(data, version, header_size(version)).load()
+    except PycFormatError:
+        raise
+    except (IndexError, ValueError, RecursionError) as e:
+        raise PycFormatError(f"marshal 数据损坏: {e}")
+    if not isinstance(code, CodeObject):
+        raise PycFormatError("pyc 中没有模块代码对象")
+    return version, code
+
+
+def dump_pyc(header, version, code):
+    """用原文件的文件头和代码对象生成 pyc 内容"""
+    writer = MarshalWriter(version)
+    writer.dump(code)
+    return header[:header_size(version)] + writer.getvalue()
+
+
+def as_text(value):
+    """py2 的名称是 bytes, 统一成 str 显示"""
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='backslashreplace')
+    return str(value)
+
+
+class Disassembler:
+    """把代码对象转换成 pycdas 格式的文本行
+
+    should_stop() 在每个代码对象之前检查, 返回真时抛出 DisassembleCancelled。
+    """
+
+    def __init__(self, version, should_stop=None):
+        self.version = version
+        self.should_stop = should_stop
+        self.py2 = version[0] < 3
+        table = OPCODE_TABLES[version]
+        self.opnames = table['names']
+        self.have_argument = table['have_argument']
+        # 3.13 中有几条编号不小于 HAVE_ARGUMENT 但没有参数的指令
+        self.noarg = frozenset(op for op, name in self.opnames.items() if name in table['noarg'])
+        self.caches = table['caches']
+        self.cmp_op = table['cmp_op']
+        self.nb_ops = table['nb_ops']
+        self.intrinsic1 = table['intrinsic1']
+        self.intrinsic2 = table['intrinsic2']
+        self.hasconst = frozenset(table['hasconst'])
+        self.hasname = frozenset(table['hasname'])
+        self.haslocal = frozenset(table['haslocal'])
+        self.hasfree = frozenset(table['hasfree'])
+        self.jrel = frozenset(table['jrel'])
+        self.jabs = frozenset(table['jabs'])
+        self.extended_arg = next(op for op, name in self.opnames.items() if name == 'EXTENDED_ARG')
+        # 3.10 起跳转参数以指令 (2 字节) 为单位
+        self.jump_unit = 2 if version >= (3, 10) else 1
+        # 3.12 起 COMPARE_OP 参数的低位用于其他用途
+        self.cmp_shift = 5 if version >= (3, 13) else 4 if version >= (3, 12) else 0
+        # 部分指令的参数低位是标志, 右移后才是名称表下标
+        self.name_shifts = {}
+        if version >= (3, 11):
+            self.name_shifts['LOAD_GLOBAL'] = 1
+        if version >= (3, 12):
+            self.name_shifts['LOAD_ATTR'] = 1
+            self.name_shifts['LOAD_SUPER_ATTR'] = 2
+        # 按操作码预先生成名称列, 参数格式化函数与需要跳过的缓存字节数, 逐条指令只查表
+        self.has_arg = [op >= self.have_argument and op not in self.noarg for op in range(256)]
+        self.skips = [-1 if self.opnames.get(op) == 'CACHE' else 2 * self.caches.get(self.opnames.get(op), 0)
+                      for op in range(256)]
+        self.columns = [f"{self.opnames.get(op) or f'<{op}>':<30s}  " for op in range(256)]
+        self.formatters = [self.operand_formatter(self.opnames.get(op)) for op in range(256)]
+
+    def format_string(self, value):
+        """字符串常量: py3 的 bytes 加 b 前缀, py2 的 unicode 加 u 前缀"""
+        if isinstance(value, bytes):
+            return ('' if self.py2 else 'b') + repr(value)[1:]
+        return ('u' if self.py2 else '') + repr(value)
+
+    def format_const(self, value):
+        """单行显示常量, 用于反汇编中的操作数"""
+        kind = type(value)
+        if kind is str or kind is bytes:
+            return self.format_string(value)
+        if kind is int or value is None:
+            return repr(value)
+        if isinstance(value, CodeObject):
+            return f"<CODE> {as_text(value.name)}"
+        if isinstance(value, (str, bytes)):
+            return self.format_string(value)
+        if isinstance(value, tuple):
+            items = [self.format_const(item) for item in value]
+            return "(" + ", ".join(items) + ("," if len(items) == 1 else "") + ")"
+        if isinstance(value, list):
+            return "[" + ", ".join(self.format_const(item) for item in value) + "]"
+        if isinstance(value, ConstSet):
+            body = "{" + ", ".join(self.format_const(item) for item in value.items) + "}"
+            return f"frozenset({body})" if value.frozen else body
+        if isinstance(value, ConstDict):
+            return "{" + ", ".join(f"{self.format_const(key)}: {self.format_const(item)}"
+                                   for key, item in value.items) + "}"
+        if value is Ellipsis:
+            return "..."
+        if value is StopIteration:
+            return "StopIteration"
+        return repr(value)
+
+    def output_object(self, obj, depth, lines):
+        """按 pycdas 的格式逐行输出对象, 容器与代码对象展开成多行"""
+        pad = INDENT * depth
+        kind = type(obj)
+        if kind is str or kind is bytes or kind is int or obj is None:
+            lines.append(pad + self.format_const(obj))
+        elif kind is CodeObject:
+            self.output_code(obj, depth, lines)
+        elif isinstance(obj, tuple):
+            lines.append(pad + "(")
+            for item in obj:
+                self.output_object(item, depth + 1, lines)
+            lines.append(pad + ")")
+        elif isinstance(obj, list):
+            lines.append(pad + "[")
+            for item in obj:
+                self.output_object(item, depth + 1, lines)
+            lines.append(pad + "]")
+        elif isinstance(obj, ConstSet):
+            lines.append(pad + ("frozenset({" if obj.frozen else "{"))
+            for item in obj.items:
+                self.output_object(item, depth + 1, lines)
+            lines.append(pad + ("})" if obj.frozen else "}"))
+        elif isinstance(obj, ConstDict):
+            lines.append(pad + "{")
+            for key, item in obj.items:
+                self.output_object(key, depth + 1, lines)
+                self.output_object(item, depth + 1, lines)
+            lines.append(pad + "}")
+        else:
+            lines.append(pad + self.format_const(obj))
+
+    def format_flags(self, raw):
+        flags = raw
+        if self.version < (3, 8):
+            # 3.8 之前 __future__ 标志位于低 4 位, 按 3.8 的位置显示名称
+            flags = (raw & 0x1FFF) | ((raw & 0xFFFE000) << 4)
+        text = f"Flags: 0x{raw:08X}"
+        if flags:
+            text += " (" + " | ".join(name for bit, name in enumerate(FLAG_NAMES) if flags & (1 << bit)) + ")"
+        return text
+
+    def output_code(self, co, depth, lines):
+        if self.should_stop is not None and self.should_stop():
+            raise DisassembleCancelled()
+        pad = INDENT * depth
+        inner = INDENT * (depth + 1)
+        version = self.version
+        lines.append(pad + "[Code]")
+        lines.append(f"{inner}File Name: {as_text(co.filename)}")
+        lines.append(f"{inner}Object Name: {as_text(co.name)}")
+        if version >= (3, 11):
+            lines.append(f"{inner}Qualified Name: {as_text(co.qualname)}")
+        lines.append(f"{inner}Arg Count: {co.argcount}")
+        if version >= (3, 8):
+            lines.append(f"{inner}Pos Only Arg Count: {co.posonlyargcount}")
+        if not self.py2:
+            lines.append(f"{inner}KW Only Arg Count: {co.kwonlyargcount}")
+        if version < (3, 11):
+            lines.append(f"{inner}Locals: {co.nlocals}")
+        lines.append(f"{inner}Stack Size: {co.stacksize}")
+        lines.append(inner + self.format_flags(co.flags))
+
+        sections = [("[Names]", co.names)]
+        if version >= (3, 11):
+            sections.append(("[Locals+Names]", co.localsplusnames))
+        else:
+            sections += [("[Var Names]", co.varnames), ("[Free Vars]", co.freevars),
+                         ("[Cell Vars]", co.cellvars)]
+        sections.append(("[Constants]", co.consts))
+        for title, items in sections:
+            lines.append(inner + title)
+            for item in items or ():
+                self.output_object(item, depth + 2, lines)
+
+        lines.append(inner + "[Disassembly]")
+        self.output_disassembly(co, depth + 2, lines)
+        if version >= (3, 11):
+            lines.append(inner + "[Exception Table]")
+            self.output_exception_table(co, depth + 2, lines)
+
+    def instructions(self, code):
+        """逐条解码字节码, 产生 (起始偏移, 操作码, 参数, 下一条指令的偏移)
+
+        EXTENDED_ARG 合并到后一条指令; 3.11 起跳过指令后的内联缓存。
+        """
+        have_argument = self.have_argument
+        extended_arg = self.extended_arg
+        size = len(code)
+        pos = 0
+        start = None
+        ext = 0
+        if self.py2:
+            while pos < size:
+                if start is None:
+                    start = pos
+                op = code[pos]
+                if op >= have_argument:
+                    if pos + 2 >= size:
+                        arg = ext
+                    else:
+                        arg = code[pos + 1] | (code[pos + 2] << 8) | ext
+                    pos += 3
+                    if op == extended_arg:
+                        ext = arg << 16
+                        continue
+                else:
+                    arg = None
+                    pos += 1
+                yield start, op, arg, pos
+                start = None
+                ext = 0
+            return
+        has_arg = self.has_arg
+        skips = self.skips
+        if size & 1:
+            code += b'\0'
+        while pos < size:
+            op = code[pos]
+            arg = code[pos + 1]
+            if op == extended_arg:
+                if start is None:
+                    start = pos
+                ext = (ext | arg) << 8
+                pos += 2
+                continue
+            skip = skips[op]
+            if skip < 0:
+                # 单独出现的 CACHE 不输出
+                pos += 2
+                start = None
+                ext = 0
+                continue
+            if start is None:
+                start = pos
+            pos += 2 + skip
+            yield start, op, (arg | ext) if has_arg[op] else None, pos
+            start = None
+            ext = 0
+
+    def operand_formatter(self, name):
+        """返回把该指令参数转换成 pycdas 风格说明文字的函数
+
+        函数以 (名称表, 参数, 下一条指令的偏移) 调用, 名称表为
+        (常量, 名称, 局部变量, 闭包变量), 每个代码对象只准备一次。
+        """
+        if name in self.hasconst:
+            return lambda tables, arg, next_pos: f"{arg}: {self.format_const(pick(tables[0], arg))}"
+        if name in self.hasname:
+            shift = self.name_shifts.get(name, 0)
+            if name == 'LOAD_GLOBAL' and shift:
+                return lambda tables, arg, next_pos: \
+                    f"{arg}: {'NULL + ' if arg & 1 else ''}{pick(tables[1], arg >> shift)}"
+            if name == 'LOAD_ATTR' and shift:
+                return lambda tables, arg, next_pos: \
+                    f"{arg}: {pick(tables[1], arg >> shift)}{' + NULL|self' if arg & 1 else ''}"
+            return lambda tables, arg, next_pos: f"{arg}: {pick(tables[1], arg >> shift)}"
+        if name in FAST_PAIRS:
+            return lambda tables, arg, next_pos: f"{arg}: {pick(tables[2], arg >> 4)}, {pick(tables[2], arg & 15)}"
+        if name in self.haslocal:
+            return lambda tables, arg, next_pos: f"{arg}: {pick(tables[2], arg)}"
+        if name in self.hasfree:
+            return lambda tables, arg, next_pos: f"{arg}: {pick(tables[3], arg)}"
+        unit = self.jump_unit
+        if name in self.jrel:
+            if 'BACKWARD' in name:
+                return lambda tables, arg, next_pos: f"{arg} (to {next_pos - arg * unit})"
+            return lambda tables, arg, next_pos: f"{arg} (to {next_pos + arg * unit})"
+        if name in self.jabs:
+            return lambda tables, arg, next_pos: f"{arg} (to {arg * unit})"
+        if name == 'COMPARE_OP':
+            return lambda tables, arg, next_pos: f"{arg} ({pick(self.cmp_op, arg >> self.cmp_shift)})"
+        if name == 'BINARY_OP':
+            return lambda tables, arg, next_pos: f"{arg} ({pick(self.nb_ops, arg)})"
+        if name == 'IS_OP':
+            return lambda tables, arg, next_pos: f"{arg} ({'is not' if arg else 'is'})"
+        if name == 'CONTAINS_OP':
+            return lambda tables, arg, next_pos: f"{arg} ({'not in' if arg else 'in'})"
+        if name == 'CALL_INTRINSIC_1':
+            return lambda tables, arg, next_pos: f"{arg} ({pick(self.intrinsic1, arg)})"
+        if name == 'CALL_INTRINSIC_2':
+            return lambda tables, arg, next_pos: f"{arg} ({pick(self.intrinsic2, arg)})"
+        return None
+
+    def output_disassembly(self, co, depth, lines):
+        pad = INDENT * depth
+        code = co.code if isinstance(co.code, bytes) else b''
+        if self.version >= (3, 11):
+            local_names = cells = [as_text(name) for name in co.localsplusnames or ()]
+        else:
+            local_names = [as_text(name) for name in co.varnames or ()]
+            # 3.11 之前闭包变量的下标先编号 cellvars 再编号 freevars
+            cells = [as_text(name) for name in tuple(co.cellvars or ()) + tuple(co.freevars or ())]
+        tables = (co.consts or (), [as_text(name) for name in co.names or ()], local_names, cells)
+        columns = self.columns
+        formatters = self.formatters
+        append = lines.append
+        for start, op, arg, next_pos in self.instructions(code):
+            line = f"{pad}{start:<7d} {columns[op]}"
+            if arg is not None:
+                formatter = formatters[op]
+                line += str(arg) if formatter is None else formatter(tables, arg, next_pos)
+            append(line)
+
+    def output_exception_table(self, co, depth, lines):
+        pad = INDENT * depth
+        for start, end, target, depth_value, lasti in parse_exception_table(co.exceptiontable or b''):
+            lines.append(f"{pad}{start} to {end} -> {target} [{depth_value}]{' lasti' if lasti else ''}")
+
+
+def pick(items, index):
+    """越界的下标不中断反汇编, 与 pycdas 一样标记为无效"""
+    if items is not None and 0 <= index < len(items):
+        return items[index]
+    return f"<INVALID {index}>"
+
+
+def parse_exception_table(data):
+    """解析 3.11 起的异常表, 产生 (起始, 结束, 跳转目标, 栈深度, lasti)
+
+    每项由 6 位一组的变长整数组成, 偏移以指令为单位; 结束偏移是最后一条指令。
+    """
+    pos = 0
+    size = len(data)
+
+    def varint():
+        nonlocal pos
+        byte = data[pos]
+        pos += 1
+        value = byte & 63
+        while byte & 64:
+            byte = data[pos]
+            pos += 1
+            value = (value << 6) | (byte & 63)
+        return value
+
+    while pos < size:
+        try:
+            start = varint() * 2
+            length = varint() * 2
+            target = varint() * 2
+            depth_lasti = varint()
+        except IndexError:
+            return
+        yield start, start + length - 2, target, depth_lasti >> 1, depth_lasti & 1
+
+
+def read_varint(data, pos):
+    """位置表中的变长整数: 每字节 6 位, 低位在前, 0x40 表示还有后续字节"""
+    byte = data[pos]
+    pos += 1
+    value = byte & 63
+    shift = 0
+    while byte & 64:
+        byte = data[pos]
+        pos += 1
+        shift += 6
+        value |= (byte & 63) << shift
+    return value, pos
+
+
+def read_svarint(data, pos):
+    value, pos = read_varint(data, pos)
+    return (-(value >> 1) if value & 1 else value >> 1), pos
+
+
+def line_starts(co, version):
+    """解析代码对象的行号表, 返回按偏移排序的 (起始偏移, 行号), 行号可能为 None
+
+    3.11 起为位置表, 3.10 为 (偏移增量, 行号增量) 的范围表, 更早的版本为 lnotab。
+    """
+    table = co.linetable if isinstance(co.linetable, bytes) else b''
+    line = co.firstlineno
+    starts = []
+    if version >= (3, 11):
+        pos = offset = 0
+        try:
+            while pos < len(table):
+                first = table[pos]
+                pos += 1
+                kind = (first >> 3) & 15
+                if kind == 15:
+                    value = None
+                elif kind == 14:
+                    delta, pos = read_svarint(table, pos)
+                    line += delta
+                    value = line
+                    # 结束行, 起止列
+                    for _ in range(3):
+                        _, pos = read_varint(table, pos)
+                elif kind == 13:
+                    delta, pos = read_svarint(table, pos)
+                    line += delta
+                    value = line
+                elif kind >= 10:
+                    line += kind - 10
+                    value = line
+                    pos += 2
+                else:
+                    value = line
+                    pos += 1
+                starts.append((offset, value))
+                offset += ((first & 7) + 1) * 2
+        except IndexError:
+            pass
+        return starts
+    if version >= (3, 10):
+        offset = 0
+        for i in range(0, len(table) - 1, 2):
+            delta = table[i + 1]
+            # 增量 -128 表示这段指令没有行号, 与 dis 一样沿用前一行
+            if delta != 128:
+                line += delta - 256 if delta > 128 else delta
+                starts.append((offset, line))
+            offset += table[i]
+        return starts
+    offset = 0
+    last = None
+    for i in range(0, len(table) - 1, 2):
+        if table[i]:
+            if line != last:
+                starts.append((offset, line))
+                last = line
+            offset += table[i]
+        delta = table[i + 1]
+        # 3.6 起行号增量是有符号的
+        line += delta - 256 if delta >= 128 and version >= (3, 6) else delta
+    if line != last:
+        starts.append((offset, line))
+    return starts
+
+
+def disassemble(data, display_name, should_stop=None):
+    """返回 pyc 内容的 pycdas 格式反汇编文本"""
+    version, code = load_pyc(data)
+    disassembler = Disassembler(version, should_stop)
+    lines = [f"{display_name} (Python {version[0]}.{version[1]})"]
+    disassembler.output_object(code, 0, lines)
+    lines.append("")
+    return "\n".join(lines)
+
+
+def disassemble_file(input_path, output_path, should_stop=None):
+    """反汇编一个 pyc 文件, 结果以 UTF-8 写入 output_path"""
+    with open(input_path, 'rb') as f:
+        data = f.read()
+    text = disassemble(data, os.path.basename(input_path), should_stop)
+    with open(output_path, 'w', encoding='utf-8', errors='backslashreplace', newline='\n') as f:
+        f.write(text)
+
+
+def run_disassembler(input_path, output_path, should_stop=None):
+    """Engine.runner 形式的入口, 返回 (退出码, 错误输出, 状态)"""
+    if should_stop is not None and should_stop():
+        return None, '', STATUS_CANCELLED
+    try:
+        disassemble_file(input_path, output_path, should_stop)
+    except DisassembleCancelled:
+        return None, '', STATUS_CANCELLED
+    except (OSError, PycFormatError) as e:
+        # 失败时同样写出空的输出文件, 与外部反汇编器的行为一致
+        try:
+            open(output_path, 'wb').close()
+        except OSError:
+            pass
+        return 1, f"{os.path.basename(input_path)}: {e}", STATUS_FAILED
+    return 0, '', STATUS_OK
@@ -0,0 +1,522 @@
+# pyc_opcodes.py - 各 Python 版本的操作码表
+# 由对应版本解释器的 opcode 模块导出: 操作码编号与名称、带参数的起始编号、
+# 相对/绝对跳转指令、3.11 起的内联缓存数量以及比较、二元运算和内置函数的名称
+
+
+OPCODE_TABLES = {
+    (2, 7): {
+        'have_argument': 90,
+        'noarg': (),
+        'names': {
+            0: 'STOP_CODE', 1: 'POP_TOP', 2: 'ROT_TWO', 3: 'ROT_THREE', 4: 'DUP_TOP', 5: 'ROT_FOUR', 9: 'NOP',
+            10: 'UNARY_POSITIVE', 11: 'UNARY_NEGATIVE', 12: 'UNARY_NOT', 13: 'UNARY_CONVERT', 15: 'UNARY_INVERT',
+            19: 'BINARY_POWER', 20: 'BINARY_MULTIPLY', 21: 'BINARY_DIVIDE', 22: 'BINARY_MODULO', 23: 'BINARY_ADD',
+            24: 'BINARY_SUBTRACT', 25: 'BINARY_SUBSCR', 26: 'BINARY_FLOOR_DIVIDE', 27: 'BINARY_TRUE_DIVIDE',
+            28: 'INPLACE_FLOOR_DIVIDE', 29: 'INPLACE_TRUE_DIVIDE', 30: 'SLICE+0', 31: 'SLICE+1', 32: 'SLICE+2',
+            33: 'SLICE+3', 40: 'STORE_SLICE+0', 41: 'STORE_SLICE+1', 42: 'STORE_SLICE+2', 43: 'STORE_SLICE+3',
+            50: 'DELETE_SLICE+0', 51: 'DELETE_SLICE+1', 52: 'DELETE_SLICE+2', 53: 'DELETE_SLICE+3',
+            54: 'STORE_MAP', 55: 'INPLACE_ADD', 56: 'INPLACE_SUBTRACT', 57: 'INPLACE_MULTIPLY',
+            58: 'INPLACE_DIVIDE', 59: 'INPLACE_MODULO', 60: 'STORE_SUBSCR', 61: 'DELETE_SUBSCR',
+            62: 'BINARY_LSHIFT', 63: 'BINARY_RSHIFT', 64: 'BINARY_AND', 65: 'BINARY_XOR', 66: 'BINARY_OR',
+            67: 'INPLACE_POWER', 68: 'GET_ITER', 70: 'PRINT_EXPR', 71: 'PRINT_ITEM', 72: 'PRINT_NEWLINE',
+            73: 'PRINT_ITEM_TO', 74: 'PRINT_NEWLINE_TO', 75: 'INPLACE_LSHIFT', 76: 'INPLACE_RSHIFT',
+            77: 'INPLACE_AND', 78: 'INPLACE_XOR', 79: 'INPLACE_OR', 80: 'BREAK_LOOP', 81: 'WITH_CLEANUP',
+            82: 'LOAD_LOCALS', 83: 'RETURN_VALUE', 84: 'IMPORT_STAR', 85: 'EXEC_STMT', 86: 'YIELD_VALUE',
+            87: 'POP_BLOCK', 88: 'END_FINALLY', 89: 'BUILD_CLASS', 90: 'STORE_NAME', 91: 'DELETE_NAME',
+            92: 'UNPACK_SEQUENCE', 93: 'FOR_ITER', 94: 'LIST_APPEND', 95: 'STORE_ATTR', 96: 'DELETE_ATTR',
+            97: 'STORE_GLOBAL', 98: 'DELETE_GLOBAL', 99: 'DUP_TOPX', 100: 'LOAD_CONST', 101: 'LOAD_NAME',
+            102: 'BUILD_TUPLE', 103: 'BUILD_LIST', 104: 'BUILD_SET', 105: 'BUILD_MAP', 106: 'LOAD_ATTR',
+            107: 'COMPARE_OP', 108: 'IMPORT_NAME', 109: 'IMPORT_FROM', 110: 'JUMP_FORWARD',
+            111: 'JUMP_IF_FALSE_OR_POP', 112: 'JUMP_IF_TRUE_OR_POP', 113: 'JUMP_ABSOLUTE',
+            114: 'POP_JUMP_IF_FALSE', 115: 'POP_JUMP_IF_TRUE', 116: 'LOAD_GLOBAL', 119: 'CONTINUE_LOOP',
+            120: 'SETUP_LOOP', 121: 'SETUP_EXCEPT', 122: 'SETUP_FINALLY', 124: 'LOAD_FAST', 125: 'STORE_FAST',
+            126: 'DELETE_FAST', 130: 'RAISE_VARARGS', 131: 'CALL_FUNCTION', 132: 'MAKE_FUNCTION',
+            133: 'BUILD_SLICE', 134: 'MAKE_CLOSURE', 135: 'LOAD_CLOSURE', 136: 'LOAD_DEREF', 137: 'STORE_DEREF',
+            140: 'CALL_FUNCTION_VAR', 141: 'CALL_FUNCTION_KW', 142: 'CALL_FUNCTION_VAR_KW', 143: 'SETUP_WITH',
+            145: 'EXTENDED_ARG', 146: 'SET_ADD', 147: 'MAP_ADD'
+        },
+        'jrel': ('FOR_ITER', 'JUMP_FORWARD', 'SETUP_EXCEPT', 'SETUP_FINALLY', 'SETUP_LOOP', 'SETUP_WITH'),
+        'jabs': (
+            'CONTINUE_LOOP', 'JUMP_ABSOLUTE', 'JUMP_IF_FALSE_OR_POP', 'JUMP_IF_TRUE_OR_POP', 'POP_JUMP_IF_FALSE',
+            'POP_JUMP_IF_TRUE'
+        ),
+        'hasconst': ('LOAD_CONST',),
+        'hasname': (
+            'DELETE_ATTR', 'DELETE_GLOBAL', 'DELETE_NAME', 'IMPORT_FROM', 'IMPORT_NAME', 'LOAD_ATTR',
+            'LOAD_GLOBAL', 'LOAD_NAME', 'STORE_ATTR', 'STORE_GLOBAL', 'STORE_NAME'
+        ),
+        'haslocal': ('DELETE_FAST', 'LOAD_FAST', 'STORE_FAST'),
+        'hasfree': ('LOAD_CLOSURE', 'LOAD_DEREF', 'STORE_DEREF'),
+        'caches': {},
+        'cmp_op': ('<', '<=', '==', '!=', '>', '>=', 'in', 'not in', 'is', 'is not', 'exception match', 'BAD'),
+        'nb_ops': (),
+        'intrinsic1': (),
+        'intrinsic2': (),
+    },
+    (3, 6): {
+        'have_argument': 90,
+        'noarg': (),
+        'names': {
+            1: 'POP_TOP', 2: 'ROT_TWO', 3: 'ROT_THREE', 4: 'DUP_TOP', 5: 'DUP_TOP_TWO', 9: 'NOP',
+            10: 'UNARY_POSITIVE', 11: 'UNARY_NEGATIVE', 12: 'UNARY_NOT', 15: 'UNARY_INVERT',
+            16: 'BINARY_MATRIX_MULTIPLY', 17: 'INPLACE_MATRIX_MULTIPLY', 19: 'BINARY_POWER', 20: 'BINARY_MULTIPLY',
+            22: 'BINARY_MODULO', 23: 'BINARY_ADD', 24: 'BINARY_SUBTRACT', 25: 'BINARY_SUBSCR',
+            26: 'BINARY_FLOOR_DIVIDE', 27: 'BINARY_TRUE_DIVIDE', 28: 'INPLACE_FLOOR_DIVIDE',
+            29: 'INPLACE_TRUE_DIVIDE', 50: 'GET_AITER', 51: 'GET_ANEXT', 52: 'BEFORE_ASYNC_WITH',
+            55: 'INPLACE_ADD', 56: 'INPLACE_SUBTRACT', 57: 'INPLACE_MULTIPLY', 59: 'INPLACE_MODULO',
+            60: 'STORE_SUBSCR', 61: 'DELETE_SUBSCR', 62: 'BINARY_LSHIFT', 63: 'BINARY_RSHIFT', 64: 'BINARY_AND',
+            65: 'BINARY_XOR', 66: 'BINARY_OR', 67: 'INPLACE_POWER', 68: 'GET_ITER', 69: 'GET_YIELD_FROM_ITER',
+            70: 'PRINT_EXPR', 71: 'LOAD_BUILD_CLASS', 72: 'YIELD_FROM', 73: 'GET_AWAITABLE', 75: 'INPLACE_LSHIFT',
+            76: 'INPLACE_RSHIFT', 77: 'INPLACE_AND', 78: 'INPLACE_XOR', 79: 'INPLACE_OR', 80: 'BREAK_LOOP',
+            81: 'WITH_CLEANUP_START', 82: 'WITH_CLEANUP_FINISH', 83: 'RETURN_VALUE', 84: 'IMPORT_STAR',
+            85: 'SETUP_ANNOTATIONS', 86: 'YIELD_VALUE', 87: 'POP_BLOCK', 88: 'END_FINALLY', 89: 'POP_EXCEPT',
+            90: 'STORE_NAME', 91: 'DELETE_NAME', 92: 'UNPACK_SEQUENCE', 93: 'FOR_ITER', 94: 'UNPACK_EX',
+            95: 'STORE_ATTR', 96: 'DELETE_ATTR', 97: 'STORE_GLOBAL', 98: 'DELETE_GLOBAL', 100: 'LOAD_CONST',
+            101: 'LOAD_NAME', 102: 'BUILD_TUPLE', 103: 'BUILD_LIST', 104: 'BUILD_SET', 105: 'BUILD_MAP',
+            106: 'LOAD_ATTR', 107: 'COMPARE_OP', 108: 'IMPORT_NAME', 109: 'IMPORT_FROM', 110: 'JUMP_FORWARD',
+            111: 'JUMP_IF_FALSE_OR_POP', 112: 'JUMP_IF_TRUE_OR_POP', 113: 'JUMP_ABSOLUTE',
+            114: 'POP_JUMP_IF_FALSE', 115: 'POP_JUMP_IF_TRUE', 116: 'LOAD_GLOBAL', 119: 'CONTINUE_LOOP',
+            120: 'SETUP_LOOP', 121: 'SETUP_EXCEPT', 122: 'SETUP_FINALLY', 124: 'LOAD_FAST', 125: 'STORE_FAST',
+            126: 'DELETE_FAST', 127: 'STORE_ANNOTATION', 130: 'RAISE_VARARGS', 131: 'CALL_FUNCTION',
+            132: 'MAKE_FUNCTION', 133: 'BUILD_SLICE', 135: 'LOAD_CLOSURE', 136: 'LOAD_DEREF', 137: 'STORE_DEREF',
+            138: 'DELETE_DEREF', 141: 'CALL_FUNCTION_KW', 142: 'CALL_FUNCTION_EX', 143: 'SETUP_WITH',
+            144: 'EXTENDED_ARG', 145: 'LIST_APPEND', 146: 'SET_ADD', 147: 'MAP_ADD', 148: 'LOAD_CLASSDEREF',
+            149: 'BUILD_LIST_UNPACK', 150: 'BUILD_MAP_UNPACK', 151: 'BUILD_MAP_UNPACK_WITH_CALL',
+            152: 'BUILD_TUPLE_UNPACK', 153: 'BUILD_SET_UNPACK', 154: 'SETUP_ASYNC_WITH', 155: 'FORMAT_VALUE',
+            156: 'BUILD_CONST_KEY_MAP', 157: 'BUILD_STRING', 158: 'BUILD_TUPLE_UNPACK_WITH_CALL'
+        },
+        'jrel': (
+            'FOR_ITER', 'JUMP_FORWARD', 'SETUP_ASYNC_WITH', 'SETUP_EXCEPT', 'SETUP_FINALLY', 'SETUP_LOOP',
+            'SETUP_WITH'
+        ),
+        'jabs': (
+            'CONTINUE_LOOP', 'JUMP_ABSOLUTE', 'JUMP_IF_FALSE_OR_POP', 'JUMP_IF_TRUE_OR_POP', 'POP_JUMP_IF_FALSE',
+            'POP_JUMP_IF_TRUE'
+        ),
+        'hasconst': ('LOAD_CONST',),
+        'hasname': (
+            'DELETE_ATTR', 'DELETE_GLOBAL', 'DELETE_NAME', 'IMPORT_FROM', 'IMPORT_NAME', 'LOAD_ATTR',
+            'LOAD_GLOBAL', 'LOAD_NAME', 'STORE_ANNOTATION', 'STORE_ATTR', 'STORE_GLOBAL', 'STORE_NAME'
+        ),
+        'haslocal': ('DELETE_FAST', 'LOAD_FAST', 'STORE_FAST'),
+        'hasfree': ('DELETE_DEREF', 'LOAD_CLASSDEREF', 'LOAD_CLOSURE', 'LOAD_DEREF', 'STORE_DEREF'),
+        'caches': {},
+        'cmp_op': ('<', '<=', '==', '!=', '>', '>=', 'in', 'not in', 'is', 'is not', 'exception match', 'BAD'),
+        'nb_ops': (),
+        'intrinsic1': (),
+        'intrinsic2': (),
+    },
+    (3, 7): {
+        'have_argument': 90,
+        'noarg': (),
+        'names': {
+            1: 'POP_TOP', 2: 'ROT_TWO', 3: 'ROT_THREE', 4: 'DUP_TOP', 5: 'DUP_TOP_TWO', 9: 'NOP',
+            10: 'UNARY_POSITIVE', 11: 'UNARY_NEGATIVE', 12: 'UNARY_NOT', 15: 'UNARY_INVERT',
+            16: 'BINARY_MATRIX_MULTIPLY', 17: 'INPLACE_MATRIX_MULTIPLY', 19: 'BINARY_POWER', 20: 'BINARY_MULTIPLY',
+            22: 'BINARY_MODULO', 23: 'BINARY_ADD', 24: 'BINARY_SUBTRACT', 25: 'BINARY_SUBSCR',
+            26: 'BINARY_FLOOR_DIVIDE', 27: 'BINARY_TRUE_DIVIDE', 28: 'INPLACE_FLOOR_DIVIDE',
+            29: 'INPLACE_TRUE_DIVIDE', 50: 'GET_AITER', 51: 'GET_ANEXT', 52: 'BEFORE_ASYNC_WITH',
+            55: 'INPLACE_ADD', 56: 'INPLACE_SUBTRACT', 57: 'INPLACE_MULTIPLY', 59: 'INPLACE_MODULO',
+            60: 'STORE_SUBSCR', 61: 'DELETE_SUBSCR', 62: 'BINARY_LSHIFT', 63: 'BINARY_RSHIFT', 64: 'BINARY_AND',
+            65: 'BINARY_XOR', 66: 'BINARY_OR', 67: 'INPLACE_POWER', 68: 'GET_ITER', 69: 'GET_YIELD_FROM_ITER',
+            70: 'PRINT_EXPR', 71: 'LOAD_BUILD_CLASS', 72: 'YIELD_FROM', 73: 'GET_AWAITABLE', 75: 'INPLACE_LSHIFT',
+            76: 'INPLACE_RSHIFT', 77: 'INPLACE_AND', 78: 'INPLACE_XOR', 79: 'INPLACE_OR', 80: 'BREAK_LOOP',
+            81: 'WITH_CLEANUP_START', 82: 'WITH_CLEANUP_FINISH', 83: 'RETURN_VALUE', 84: 'IMPORT_STAR',
+            85: 'SETUP_ANNOTATIONS', 86: 'YIELD_VALUE', 87: 'POP_BLOCK', 88: 'END_FINALLY', 89: 'POP_EXCEPT',
+            90: 'STORE_NAME', 91: 'DELETE_NAME', 92: 'UNPACK_SEQUENCE', 93: 'FOR_ITER', 94: 'UNPACK_EX',
+            95: 'STORE_ATTR', 96: 'DELETE_ATTR', 97: 'STORE_GLOBAL', 98: 'DELETE_GLOBAL', 100: 'LOAD_CONST',
+            101: 'LOAD_NAME', 102: 'BUILD_TUPLE', 103: 'BUILD_LIST', 104: 'BUILD_SET', 105: 'BUILD_MAP',
+            106: 'LOAD_ATTR', 107: 'COMPARE_OP', 108: 'IMPORT_NAME', 109: 'IMPORT_FROM', 110: 'JUMP_FORWARD',
+            111: 'JUMP_IF_FALSE_OR_POP', 112: 'JUMP_IF_TRUE_OR_POP', 113: 'JUMP_ABSOLUTE',
+            114: 'POP_JUMP_IF_FALSE', 115: 'POP_JUMP_IF_TRUE', 116: 'LOAD_GLOBAL', 119: 'CONTINUE_LOOP',
+            120: 'SETUP_LOOP', 121: 'SETUP_EXCEPT', 122: 'SETUP_FINALLY', 124: 'LOAD_FAST', 125: 'STORE_FAST',
+            126: 'DELETE_FAST', 130: 'RAISE_VARARGS', 131: 'CALL_FUNCTION', 132: 'MAKE_FUNCTION',
+            133: 'BUILD_SLICE', 135: 'LOAD_CLOSURE', 136: 'LOAD_DEREF', 137: 'STORE_DEREF', 138: 'DELETE_DEREF',
+            141: 'CALL_FUNCTION_KW', 142: 'CALL_FUNCTION_EX', 143: 'SETUP_WITH', 144: 'EXTENDED_ARG',
+            145: 'LIST_APPEND', 146: 'SET_ADD', 147: 'MAP_ADD', 148: 'LOAD_CLASSDEREF', 149: 'BUILD_LIST_UNPACK',
+            150: 'BUILD_MAP_UNPACK', 151: 'BUILD_MAP_UNPACK_WITH_CALL', 152: 'BUILD_TUPLE_UNPACK',
+            153: 'BUILD_SET_UNPACK', 154: 'SETUP_ASYNC_WITH', 155: 'FORMAT_VALUE', 156: 'BUILD_CONST_KEY_MAP',
+            157: 'BUILD_STRING', 158: 'BUILD_TUPLE_UNPACK_WITH_CALL', 160: 'LOAD_METHOD', 161: 'CALL_METHOD'
+        },
+        'jrel': (
+            'FOR_ITER', 'JUMP_FORWARD', 'SETUP_ASYNC_WITH', 'SETUP_EXCEPT', 'SETUP_FINALLY', 'SETUP_LOOP',
+            'SETUP_WITH'
+        ),
+        'jabs': (
+            'CONTINUE_LOOP', 'JUMP_ABSOLUTE', 'JUMP_IF_FALSE_OR_POP', 'JUMP_IF_TRUE_OR_POP', 'POP_JUMP_IF_FALSE',
+            'POP_JUMP_IF_TRUE'
+        ),
+        'hasconst': ('LOAD_CONST',),
+        'hasname': (
+            'DELETE_ATTR', 'DELETE_GLOBAL', 'DELETE_NAME', 'IMPORT_FROM', 'IMPORT_NAME', 'LOAD_ATTR',
+            'LOAD_GLOBAL', 'LOAD_METHOD', 'LOAD_NAME', 'STORE_ATTR', 'STORE_GLOBAL', 'STORE_NAME'
+        ),
+        'haslocal': ('DELETE_FAST', 'LOAD_FAST', 'STORE_FAST'),
+        'hasfree': ('DELETE_DEREF', 'LOAD_CLASSDEREF', 'LOAD_CLOSURE', 'LOAD_DEREF', 'STORE_DEREF'),
+        'caches': {},
+        'cmp_op': ('<', '<=', '==', '!=', '>', '>=', 'in', 'not in', 'is', 'is not', 'exception match', 'BAD'),
+        'nb_ops': (),
+        'intrinsic1': (),
+        'intrinsic2': (),
+    },
+    (3, 8): {
+        'have_argument': 90,
+        'noarg': (),
+        'names': {
+            1: 'POP_TOP', 2: 'ROT_TWO', 3: 'ROT_THREE', 4: 'DUP_TOP', 5: 'DUP_TOP_TWO', 6: 'ROT_FOUR', 9: 'NOP',
+            10: 'UNARY_POSITIVE', 11: 'UNARY_NEGATIVE', 12: 'UNARY_NOT', 15: 'UNARY_INVERT',
+            16: 'BINARY_MATRIX_MULTIPLY', 17: 'INPLACE_MATRIX_MULTIPLY', 19: 'BINARY_POWER', 20: 'BINARY_MULTIPLY',
+            22: 'BINARY_MODULO', 23: 'BINARY_ADD', 24: 'BINARY_SUBTRACT', 25: 'BINARY_SUBSCR',
+            26: 'BINARY_FLOOR_DIVIDE', 27: 'BINARY_TRUE_DIVIDE', 28: 'INPLACE_FLOOR_DIVIDE',
+            29: 'INPLACE_TRUE_DIVIDE', 50: 'GET_AITER', 51: 'GET_ANEXT', 52: 'BEFORE_ASYNC_WITH',
+            53: 'BEGIN_FINALLY', 54: 'END_ASYNC_FOR', 55: 'INPLACE_ADD', 56: 'INPLACE_SUBTRACT',
+            57: 'INPLACE_MULTIPLY', 59: 'INPLACE_MODULO', 60: 'STORE_SUBSCR', 61: 'DELETE_SUBSCR',
+            62: 'BINARY_LSHIFT', 63: 'BINARY_RSHIFT', 64: 'BINARY_AND', 65: 'BINARY_XOR', 66: 'BINARY_OR',
+            67: 'INPLACE_POWER', 68: 'GET_ITER', 69: 'GET_YIELD_FROM_ITER', 70: 'PRINT_EXPR',
+            71: 'LOAD_BUILD_CLASS', 72: 'YIELD_FROM', 73: 'GET_AWAITABLE', 75: 'INPLACE_LSHIFT',
+            76: 'INPLACE_RSHIFT', 77: 'INPLACE_AND', 78: 'INPLACE_XOR', 79: 'INPLACE_OR', 81: 'WITH_CLEANUP_START',
+            82: 'WITH_CLEANUP_FINISH', 83: 'RETURN_VALUE', 84: 'IMPORT_STAR', 85: 'SETUP_ANNOTATIONS',
+            86: 'YIELD_VALUE', 87: 'POP_BLOCK', 88: 'END_FINALLY', 89: 'POP_EXCEPT', 90: 'STORE_NAME',
+            91: 'DELETE_NAME', 92: 'UNPACK_SEQUENCE', 93: 'FOR_ITER', 94: 'UNPACK_EX', 95: 'STORE_ATTR',
+            96: 'DELETE_ATTR', 97: 'STORE_GLOBAL', 98: 'DELETE_GLOBAL', 100: 'LOAD_CONST', 101: 'LOAD_NAME',
+            102: 'BUILD_TUPLE', 103: 'BUILD_LIST', 104: 'BUILD_SET', 105: 'BUILD_MAP', 106: 'LOAD_ATTR',
+            107: 'COMPARE_OP', 108: 'IMPORT_NAME', 109: 'IMPORT_FROM', 110: 'JUMP_FORWARD',
+            111: 'JUMP_IF_FALSE_OR_POP', 112: 'JUMP_IF_TRUE_OR_POP', 113: 'JUMP_ABSOLUTE',
+            114: 'POP_JUMP_IF_FALSE', 115: 'POP_JUMP_IF_TRUE', 116: 'LOAD_GLOBAL', 122: 'SETUP_FINALLY',
+            124: 'LOAD_FAST', 125: 'STORE_FAST', 126: 'DELETE_FAST', 130: 'RAISE_VARARGS', 131: 'CALL_FUNCTION',
+            132: 'MAKE_FUNCTION', 133: 'BUILD_SLICE', 135: 'LOAD_CLOSURE', 136: 'LOAD_DEREF', 137: 'STORE_DEREF',
+            138: 'DELETE_DEREF', 141: 'CALL_FUNCTION_KW', 142: 'CALL_FUNCTION_EX', 143: 'SETUP_WITH',
+            144: 'EXTENDED_ARG', 145: 'LIST_APPEND', 146: 'SET_ADD', 147: 'MAP_ADD', 148: 'LOAD_CLASSDEREF',
+            149: 'BUILD_LIST_UNPACK', 150: 'BUILD_MAP_UNPACK', 151: 'BUILD_MAP_UNPACK_WITH_CALL',
+            152: 'BUILD_TUPLE_UNPACK', 153: 'BUILD_SET_UNPACK', 154: 'SETUP_ASYNC_WITH', 155: 'FORMAT_VALUE',
+            156: 'BUILD_CONST_KEY_MAP', 157: 'BUILD_STRING', 158: 'BUILD_TUPLE_UNPACK_WITH_CALL',
+            160: 'LOAD_METHOD', 161: 'CALL_METHOD', 162: 'CALL_FINALLY', 163: 'POP_FINALLY'
+        },
+        'jrel': ('CALL_FINALLY', 'FOR_ITER', 'JUMP_FORWARD', 'SETUP_ASYNC_WITH', 'SETUP_FINALLY', 'SETUP_WITH'),
+        'jabs': (
+            'JUMP_ABSOLUTE', 'JUMP_IF_FALSE_OR_POP', 'JUMP_IF_TRUE_OR_POP', 'POP_JUMP_IF_FALSE',
+            'POP_JUMP_IF_TRUE'
+        ),
+        'hasconst': ('LOAD_CONST',),
+        'hasname': (
+            'DELETE_ATTR', 'DELETE_GLOBAL', 'DELETE_NAME', 'IMPORT_FROM', 'IMPORT_NAME', 'LOAD_ATTR',
+            'LOAD_GLOBAL', 'LOAD_METHOD', 'LOAD_NAME', 'STORE_ATTR', 'STORE_GLOBAL', 'STORE_NAME'
+        ),
+        'haslocal': ('DELETE_FAST', 'LOAD_FAST', 'STORE_FAST'),
+        'hasfree': ('DELETE_DEREF', 'LOAD_CLASSDEREF', 'LOAD_CLOSURE', 'LOAD_DEREF', 'STORE_DEREF'),
+        'caches': {},
+        'cmp_op': ('<', '<=', '==', '!=', '>', '>=', 'in', 'not in', 'is', 'is not', 'exception match', 'BAD'),
+        'nb_ops': (),
+        'intrinsic1': (),
+        'intrinsic2': (),
+    },
+    (3, 9): {
+        'have_argument': 90,
+        'noarg': (),
+        'names': {
+            1: 'POP_TOP', 2: 'ROT_TWO', 3: 'ROT_THREE', 4: 'DUP_TOP', 5: 'DUP_TOP_TWO', 6: 'ROT_FOUR', 9: 'NOP',
+            10: 'UNARY_POSITIVE', 11: 'UNARY_NEGATIVE', 12: 'UNARY_NOT', 15: 'UNARY_INVERT',
+            16: 'BINARY_MATRIX_MULTIPLY', 17: 'INPLACE_MATRIX_MULTIPLY', 19: 'BINARY_POWER', 20: 'BINARY_MULTIPLY',
+            22: 'BINARY_MODULO', 23: 'BINARY_ADD', 24: 'BINARY_SUBTRACT', 25: 'BINARY_SUBSCR',
+            26: 'BINARY_FLOOR_DIVIDE', 27: 'BINARY_TRUE_DIVIDE', 28: 'INPLACE_FLOOR_DIVIDE',
+            29: 'INPLACE_TRUE_DIVIDE', 48: 'RERAISE', 49: 'WITH_EXCEPT_START', 50: 'GET_AITER', 51: 'GET_ANEXT',
+            52: 'BEFORE_ASYNC_WITH', 54: 'END_ASYNC_FOR', 55: 'INPLACE_ADD', 56: 'INPLACE_SUBTRACT',
+            57: 'INPLACE_MULTIPLY', 59: 'INPLACE_MODULO', 60: 'STORE_SUBSCR', 61: 'DELETE_SUBSCR',
+            62: 'BINARY_LSHIFT', 63: 'BINARY_RSHIFT', 64: 'BINARY_AND', 65: 'BINARY_XOR', 66: 'BINARY_OR',
+            67: 'INPLACE_POWER', 68: 'GET_ITER', 69: 'GET_YIELD_FROM_ITER', 70: 'PRINT_EXPR',
+            71: 'LOAD_BUILD_CLASS', 72: 'YIELD_FROM', 73: 'GET_AWAITABLE', 74: 'LOAD_ASSERTION_ERROR',
+            75: 'INPLACE_LSHIFT', 76: 'INPLACE_RSHIFT', 77: 'INPLACE_AND', 78: 'INPLACE_XOR', 79: 'INPLACE_OR',
+            82: 'LIST_TO_TUPLE', 83: 'RETURN_VALUE', 84: 'IMPORT_STAR', 85: 'SETUP_ANNOTATIONS', 86: 'YIELD_VALUE',
+            87: 'POP_BLOCK', 89: 'POP_EXCEPT', 90: 'STORE_NAME', 91: 'DELETE_NAME', 92: 'UNPACK_SEQUENCE',
+            93: 'FOR_ITER', 94: 'UNPACK_EX', 95: 'STORE_ATTR', 96: 'DELETE_ATTR', 97: 'STORE_GLOBAL',
+            98: 'DELETE_GLOBAL', 100: 'LOAD_CONST', 101: 'LOAD_NAME', 102: 'BUILD_TUPLE', 103: 'BUILD_LIST',
+            104: 'BUILD_SET', 105: 'BUILD_MAP', 106: 'LOAD_ATTR', 107: 'COMPARE_OP', 108: 'IMPORT_NAME',
+            109: 'IMPORT_FROM', 110: 'JUMP_FORWARD', 111: 'JUMP_IF_FALSE_OR_POP', 112: 'JUMP_IF_TRUE_OR_POP',
+            113: 'JUMP_ABSOLUTE', 114: 'POP_JUMP_IF_FALSE', 115: 'POP_JUMP_IF_TRUE', 116: 'LOAD_GLOBAL',
+            117: 'IS_OP', 118: 'CONTAINS_OP', 121: 'JUMP_IF_NOT_EXC_MATCH', 122: 'SETUP_FINALLY', 124: 'LOAD_FAST',
+            125: 'STORE_FAST', 126: 'DELETE_FAST', 130: 'RAISE_VARARGS', 131: 'CALL_FUNCTION',
+            132: 'MAKE_FUNCTION', 133: 'BUILD_SLICE', 135: 'LOAD_CLOSURE', 136: 'LOAD_DEREF', 137: 'STORE_DEREF',
+            138: 'DELETE_DEREF', 141: 'CALL_FUNCTION_KW', 142: 'CALL_FUNCTION_EX', 143: 'SETUP_WITH',
+            144: 'EXTENDED_ARG', 145: 'LIST_APPEND', 146: 'SET_ADD', 147: 'MAP_ADD', 148: 'LOAD_CLASSDEREF',
+            154: 'SETUP_ASYNC_WITH', 155: 'FORMAT_VALUE', 156: 'BUILD_CONST_KEY_MAP', 157: 'BUILD_STRING',
+            160: 'LOAD_METHOD', 161: 'CALL_METHOD', 162: 'LIST_EXTEND', 163: 'SET_UPDATE', 164: 'DICT_MERGE',
+            165: 'DICT_UPDATE'
+        },
+        'jrel': ('FOR_ITER', 'JUMP_FORWARD', 'SETUP_ASYNC_WITH', 'SETUP_FINALLY', 'SETUP_WITH'),
+        'jabs': (
+            'JUMP_ABSOLUTE', 'JUMP_IF_FALSE_OR_POP', 'JUMP_IF_NOT_EXC_MATCH', 'JUMP_IF_TRUE_OR_POP',
+            'POP_JUMP_IF_FALSE', 'POP_JUMP_IF_TRUE'
+        ),
+        'hasconst': ('LOAD_CONST',),
+        'hasname': (
+            'DELETE_ATTR', 'DELETE_GLOBAL', 'DELETE_NAME', 'IMPORT_FROM', 'IMPORT_NAME', 'LOAD_ATTR',
+            'LOAD_GLOBAL', 'LOAD_METHOD', 'LOAD_NAME', 'STORE_ATTR', 'STORE_GLOBAL', 'STORE_NAME'
+        ),
+        'haslocal': ('DELETE_FAST', 'LOAD_FAST', 'STORE_FAST'),
+        'hasfree': ('DELETE_DEREF', 'LOAD_CLASSDEREF', 'LOAD_CLOSURE', 'LOAD_DEREF', 'STORE_DEREF'),
+        'caches': {},
+        'cmp_op': ('<', '<=', '==', '!=', '>', '>='),
+        'nb_ops': (),
+        'intrinsic1': (),
+        'intrinsic2': (),
+    },
+    (3, 10): {
+        'have_argument': 90,
+        'noarg': (),
+        'names': {
+            1: 'POP_TOP', 2: 'ROT_TWO', 3: 'ROT_THREE', 4: 'DUP_TOP', 5: 'DUP_TOP_TWO', 6: 'ROT_FOUR', 9: 'NOP',
+            10: 'UNARY_POSITIVE', 11: 'UNARY_NEGATIVE', 12: 'UNARY_NOT', 15: 'UNARY_INVERT',
+            16: 'BINARY_MATRIX_MULTIPLY', 17: 'INPLACE_MATRIX_MULTIPLY', 19: 'BINARY_POWER', 20: 'BINARY_MULTIPLY',
+            22: 'BINARY_MODULO', 23: 'BINARY_ADD', 24: 'BINARY_SUBTRACT', 25: 'BINARY_SUBSCR',
+            26: 'BINARY_FLOOR_DIVIDE', 27: 'BINARY_TRUE_DIVIDE', 28: 'INPLACE_FLOOR_DIVIDE',
+            29: 'INPLACE_TRUE_DIVIDE', 30: 'GET_LEN', 31: 'MATCH_MAPPING', 32: 'MATCH_SEQUENCE', 33: 'MATCH_KEYS',
+            34: 'COPY_DICT_WITHOUT_KEYS', 49: 'WITH_EXCEPT_START', 50: 'GET_AITER', 51: 'GET_ANEXT',
+            52: 'BEFORE_ASYNC_WITH', 54: 'END_ASYNC_FOR', 55: 'INPLACE_ADD', 56: 'INPLACE_SUBTRACT',
+            57: 'INPLACE_MULTIPLY', 59: 'INPLACE_MODULO', 60: 'STORE_SUBSCR', 61: 'DELETE_SUBSCR',
+            62: 'BINARY_LSHIFT', 63: 'BINARY_RSHIFT', 64: 'BINARY_AND', 65: 'BINARY_XOR', 66: 'BINARY_OR',
+            67: 'INPLACE_POWER', 68: 'GET_ITER', 69: 'GET_YIELD_FROM_ITER', 70: 'PRINT_EXPR',
+            71: 'LOAD_BUILD_CLASS', 72: 'YIELD_FROM', 73: 'GET_AWAITABLE', 74: 'LOAD_ASSERTION_ERROR',
+            75: 'INPLACE_LSHIFT', 76: 'INPLACE_RSHIFT', 77: 'INPLACE_AND', 78: 'INPLACE_XOR', 79: 'INPLACE_OR',
+            82: 'LIST_TO_TUPLE', 83: 'RETURN_VALUE', 84: 'IMPORT_STAR', 85: 'SETUP_ANNOTATIONS', 86: 'YIELD_VALUE',
+            87: 'POP_BLOCK', 89: 'POP_EXCEPT', 90: 'STORE_NAME', 91: 'DELETE_NAME', 92: 'UNPACK_SEQUENCE',
+            93: 'FOR_ITER', 94: 'UNPACK_EX', 95: 'STORE_ATTR', 96: 'DELETE_ATTR', 97: 'STORE_GLOBAL',
+            98: 'DELETE_GLOBAL', 99: 'ROT_N', 100: 'LOAD_CONST', 101: 'LOAD_NAME', 102: 'BUILD_TUPLE',
+            103: 'BUILD_LIST', 104: 'BUILD_SET', 105: 'BUILD_MAP', 106: 'LOAD_ATTR', 107: 'COMPARE_OP',
+            108: 'IMPORT_NAME', 109: 'IMPORT_FROM', 110: 'JUMP_FORWARD', 111: 'JUMP_IF_FALSE_OR_POP',
+            112: 'JUMP_IF_TRUE_OR_POP', 113: 'JUMP_ABSOLUTE', 114: 'POP_JUMP_IF_FALSE', 115: 'POP_JUMP_IF_TRUE',
+            116: 'LOAD_GLOBAL', 117: 'IS_OP', 118: 'CONTAINS_OP', 119: 'RERAISE', 121: 'JUMP_IF_NOT_EXC_MATCH',
+            122: 'SETUP_FINALLY', 124: 'LOAD_FAST', 125: 'STORE_FAST', 126: 'DELETE_FAST', 129: 'GEN_START',
+            130: 'RAISE_VARARGS', 131: 'CALL_FUNCTION', 132: 'MAKE_FUNCTION', 133: 'BUILD_SLICE',
+            135: 'LOAD_CLOSURE', 136: 'LOAD_DEREF', 137: 'STORE_DEREF', 138: 'DELETE_DEREF',
+            141: 'CALL_FUNCTION_KW', 142: 'CALL_FUNCTION_EX', 143: 'SETUP_WITH', 144: 'EXTENDED_ARG',
+            145: 'LIST_APPEND', 146: 'SET_ADD', 147: 'MAP_ADD', 148: 'LOAD_CLASSDEREF', 152: 'MATCH_CLASS',
+            154: 'SETUP_ASYNC_WITH', 155: 'FORMAT_VALUE', 156: 'BUILD_CONST_KEY_MAP', 157: 'BUILD_STRING',
+            160: 'LOAD_METHOD', 161: 'CALL_METHOD', 162: 'LIST_EXTEND', 163: 'SET_UPDATE', 164: 'DICT_MERGE',
+            165: 'DICT_UPDATE'
+        },
+        'jrel': ('FOR_ITER', 'JUMP_FORWARD', 'SETUP_ASYNC_WITH', 'SETUP_FINALLY', 'SETUP_WITH'),
+        'jabs': (
+            'JUMP_ABSOLUTE', 'JUMP_IF_FALSE_OR_POP', 'JUMP_IF_NOT_EXC_MATCH', 'JUMP_IF_TRUE_OR_POP',
+            'POP_JUMP_IF_FALSE', 'POP_JUMP_IF_TRUE'
+        ),
+        'hasconst': ('LOAD_CONST',),
+        'hasname': (
+            'DELETE_ATTR', 'DELETE_GLOBAL', 'DELETE_NAME', 'IMPORT_FROM', 'IMPORT_NAME', 'LOAD_ATTR',
+            'LOAD_GLOBAL', 'LOAD_METHOD', 'LOAD_NAME', 'STORE_ATTR', 'STORE_GLOBAL', 'STORE_NAME'
+        ),
+        'haslocal': ('DELETE_FAST', 'LOAD_FAST', 'STORE_FAST'),
+        'hasfree': ('DELETE_DEREF', 'LOAD_CLASSDEREF', 'LOAD_CLOSURE', 'LOAD_DEREF', 'STORE_DEREF'),
+        'caches': {},
+        'cmp_op': ('<', '<=', '==', '!=', '>', '>='),
+        'nb_ops': (),
+        'intrinsic1': (),
+        'intrinsic2': (),
+    },
+    (3, 11): {
+        'have_argument': 90,
+        'noarg': (),
+        'names': {
+            0: 'CACHE', 1: 'POP_TOP', 2: 'PUSH_NULL', 9: 'NOP', 10: 'UNARY_POSITIVE', 11: 'UNARY_NEGATIVE',
+            12: 'UNARY_NOT', 15: 'UNARY_INVERT', 25: 'BINARY_SUBSCR', 30: 'GET_LEN', 31: 'MATCH_MAPPING',
+            32: 'MATCH_SEQUENCE', 33: 'MATCH_KEYS', 35: 'PUSH_EXC_INFO', 36: 'CHECK_EXC_MATCH',
+            37: 'CHECK_EG_MATCH', 49: 'WITH_EXCEPT_START', 50: 'GET_AITER', 51: 'GET_ANEXT',
+            52: 'BEFORE_ASYNC_WITH', 53: 'BEFORE_WITH', 54: 'END_ASYNC_FOR', 60: 'STORE_SUBSCR',
+            61: 'DELETE_SUBSCR', 68: 'GET_ITER', 69: 'GET_YIELD_FROM_ITER', 70: 'PRINT_EXPR',
+            71: 'LOAD_BUILD_CLASS', 74: 'LOAD_ASSERTION_ERROR', 75: 'RETURN_GENERATOR', 82: 'LIST_TO_TUPLE',
+            83: 'RETURN_VALUE', 84: 'IMPORT_STAR', 85: 'SETUP_ANNOTATIONS', 86: 'YIELD_VALUE',
+            87: 'ASYNC_GEN_WRAP', 88: 'PREP_RERAISE_STAR', 89: 'POP_EXCEPT', 90: 'STORE_NAME', 91: 'DELETE_NAME',
+            92: 'UNPACK_SEQUENCE', 93: 'FOR_ITER', 94: 'UNPACK_EX', 95: 'STORE_ATTR', 96: 'DELETE_ATTR',
+            97: 'STORE_GLOBAL', 98: 'DELETE_GLOBAL', 99: 'SWAP', 100: 'LOAD_CONST', 101: 'LOAD_NAME',
+            102: 'BUILD_TUPLE', 103: 'BUILD_LIST', 104: 'BUILD_SET', 105: 'BUILD_MAP', 106: 'LOAD_ATTR',
+            107: 'COMPARE_OP', 108: 'IMPORT_NAME', 109: 'IMPORT_FROM', 110: 'JUMP_FORWARD',
+            111: 'JUMP_IF_FALSE_OR_POP', 112: 'JUMP_IF_TRUE_OR_POP', 114: 'POP_JUMP_FORWARD_IF_FALSE',
+            115: 'POP_JUMP_FORWARD_IF_TRUE', 116: 'LOAD_GLOBAL', 117: 'IS_OP', 118: 'CONTAINS_OP', 119: 'RERAISE',
+            120: 'COPY', 122: 'BINARY_OP', 123: 'SEND', 124: 'LOAD_FAST', 125: 'STORE_FAST', 126: 'DELETE_FAST',
+            128: 'POP_JUMP_FORWARD_IF_NOT_NONE', 129: 'POP_JUMP_FORWARD_IF_NONE', 130: 'RAISE_VARARGS',
+            131: 'GET_AWAITABLE', 132: 'MAKE_FUNCTION', 133: 'BUILD_SLICE', 134: 'JUMP_BACKWARD_NO_INTERRUPT',
+            135: 'MAKE_CELL', 136: 'LOAD_CLOSURE', 137: 'LOAD_DEREF', 138: 'STORE_DEREF', 139: 'DELETE_DEREF',
+            140: 'JUMP_BACKWARD', 142: 'CALL_FUNCTION_EX', 144: 'EXTENDED_ARG', 145: 'LIST_APPEND', 146: 'SET_ADD',
+            147: 'MAP_ADD', 148: 'LOAD_CLASSDEREF', 149: 'COPY_FREE_VARS', 151: 'RESUME', 152: 'MATCH_CLASS',
+            155: 'FORMAT_VALUE', 156: 'BUILD_CONST_KEY_MAP', 157: 'BUILD_STRING', 160: 'LOAD_METHOD',
+            162: 'LIST_EXTEND', 163: 'SET_UPDATE', 164: 'DICT_MERGE', 165: 'DICT_UPDATE', 166: 'PRECALL',
+            171: 'CALL', 172: 'KW_NAMES', 173: 'POP_JUMP_BACKWARD_IF_NOT_NONE', 174: 'POP_JUMP_BACKWARD_IF_NONE',
+            175: 'POP_JUMP_BACKWARD_IF_FALSE', 176: 'POP_JUMP_BACKWARD_IF_TRUE'
+        },
+        'jrel': (
+            'FOR_ITER', 'JUMP_BACKWARD', 'JUMP_BACKWARD_NO_INTERRUPT', 'JUMP_FORWARD', 'JUMP_IF_FALSE_OR_POP',
+            'JUMP_IF_TRUE_OR_POP', 'POP_JUMP_BACKWARD_IF_FALSE', 'POP_JUMP_BACKWARD_IF_NONE',
+            'POP_JUMP_BACKWARD_IF_NOT_NONE', 'POP_JUMP_BACKWARD_IF_TRUE', 'POP_JUMP_FORWARD_IF_FALSE',
+            'POP_JUMP_FORWARD_IF_NONE', 'POP_JUMP_FORWARD_IF_NOT_NONE', 'POP_JUMP_FORWARD_IF_TRUE', 'SEND'
+        ),
+        'jabs': (),
+        'hasconst': ('KW_NAMES', 'LOAD_CONST'),
+        'hasname': (
+            'DELETE_ATTR', 'DELETE_GLOBAL', 'DELETE_NAME', 'IMPORT_FROM', 'IMPORT_NAME', 'LOAD_ATTR',
+            'LOAD_GLOBAL', 'LOAD_METHOD', 'LOAD_NAME', 'STORE_ATTR', 'STORE_GLOBAL', 'STORE_NAME'
+        ),
+        'haslocal': ('DELETE_FAST', 'LOAD_FAST', 'STORE_FAST'),
+        'hasfree': ('DELETE_DEREF', 'LOAD_CLASSDEREF', 'LOAD_CLOSURE', 'LOAD_DEREF', 'MAKE_CELL', 'STORE_DEREF'),
+        'caches': {
+            'BINARY_OP': 1, 'BINARY_SUBSCR': 4, 'CALL': 4, 'COMPARE_OP': 2, 'LOAD_ATTR': 4, 'LOAD_GLOBAL': 5,
+            'LOAD_METHOD': 10, 'PRECALL': 1, 'STORE_ATTR': 4, 'STORE_SUBSCR': 1, 'UNPACK_SEQUENCE': 1
+        },
+        'cmp_op': ('<', '<=', '==', '!=', '>', '>='),
+        'nb_ops': (
+            '+', '&', '//', '<<', '@', '*', '%', '|', '**', '>>', '-', '/', '^', '+=', '&=', '//=', '<<=', '@=',
+            '*=', '%=', '|=', '**=', '>>=', '-=', '/=', '^='
+        ),
+        'intrinsic1': (),
+        'intrinsic2': (),
+    },
+    (3, 12): {
+        'have_argument': 90,
+        'noarg': (),
+        'names': {
+            0: 'CACHE', 1: 'POP_TOP', 2: 'PUSH_NULL', 3: 'INTERPRETER_EXIT', 4: 'END_FOR', 5: 'END_SEND', 9: 'NOP',
+            11: 'UNARY_NEGATIVE', 12: 'UNARY_NOT', 15: 'UNARY_INVERT', 17: 'RESERVED', 25: 'BINARY_SUBSCR',
+            26: 'BINARY_SLICE', 27: 'STORE_SLICE', 30: 'GET_LEN', 31: 'MATCH_MAPPING', 32: 'MATCH_SEQUENCE',
+            33: 'MATCH_KEYS', 35: 'PUSH_EXC_INFO', 36: 'CHECK_EXC_MATCH', 37: 'CHECK_EG_MATCH',
+            49: 'WITH_EXCEPT_START', 50: 'GET_AITER', 51: 'GET_ANEXT', 52: 'BEFORE_ASYNC_WITH', 53: 'BEFORE_WITH',
+            54: 'END_ASYNC_FOR', 55: 'CLEANUP_THROW', 60: 'STORE_SUBSCR', 61: 'DELETE_SUBSCR', 68: 'GET_ITER',
+            69: 'GET_YIELD_FROM_ITER', 71: 'LOAD_BUILD_CLASS', 74: 'LOAD_ASSERTION_ERROR', 75: 'RETURN_GENERATOR',
+            83: 'RETURN_VALUE', 85: 'SETUP_ANNOTATIONS', 87: 'LOAD_LOCALS', 89: 'POP_EXCEPT', 90: 'STORE_NAME',
+            91: 'DELETE_NAME', 92: 'UNPACK_SEQUENCE', 93: 'FOR_ITER', 94: 'UNPACK_EX', 95: 'STORE_ATTR',
+            96: 'DELETE_ATTR', 97: 'STORE_GLOBAL', 98: 'DELETE_GLOBAL', 99: 'SWAP', 100: 'LOAD_CONST',
+            101: 'LOAD_NAME', 102: 'BUILD_TUPLE', 103: 'BUILD_LIST', 104: 'BUILD_SET', 105: 'BUILD_MAP',
+            106: 'LOAD_ATTR', 107: 'COMPARE_OP', 108: 'IMPORT_NAME', 109: 'IMPORT_FROM', 110: 'JUMP_FORWARD',
+            114: 'POP_JUMP_IF_FALSE', 115: 'POP_JUMP_IF_TRUE', 116: 'LOAD_GLOBAL', 117: 'IS_OP',
+            118: 'CONTAINS_OP', 119: 'RERAISE', 120: 'COPY', 121: 'RETURN_CONST', 122: 'BINARY_OP', 123: 'SEND',
+            124: 'LOAD_FAST', 125: 'STORE_FAST', 126: 'DELETE_FAST', 127: 'LOAD_FAST_CHECK',
+            128: 'POP_JUMP_IF_NOT_NONE', 129: 'POP_JUMP_IF_NONE', 130: 'RAISE_VARARGS', 131: 'GET_AWAITABLE',
+            132: 'MAKE_FUNCTION', 133: 'BUILD_SLICE', 134: 'JUMP_BACKWARD_NO_INTERRUPT', 135: 'MAKE_CELL',
+            136: 'LOAD_CLOSURE', 137: 'LOAD_DEREF', 138: 'STORE_DEREF', 139: 'DELETE_DEREF', 140: 'JUMP_BACKWARD',
+            141: 'LOAD_SUPER_ATTR', 142: 'CALL_FUNCTION_EX', 143: 'LOAD_FAST_AND_CLEAR', 144: 'EXTENDED_ARG',
+            145: 'LIST_APPEND', 146: 'SET_ADD', 147: 'MAP_ADD', 149: 'COPY_FREE_VARS', 150: 'YIELD_VALUE',
+            151: 'RESUME', 152: 'MATCH_CLASS', 155: 'FORMAT_VALUE', 156: 'BUILD_CONST_KEY_MAP',
+            157: 'BUILD_STRING', 162: 'LIST_EXTEND', 163: 'SET_UPDATE', 164: 'DICT_MERGE', 165: 'DICT_UPDATE',
+            171: 'CALL', 172: 'KW_NAMES', 173: 'CALL_INTRINSIC_1', 174: 'CALL_INTRINSIC_2',
+            175: 'LOAD_FROM_DICT_OR_GLOBALS', 176: 'LOAD_FROM_DICT_OR_DEREF', 237: 'INSTRUMENTED_LOAD_SUPER_ATTR',
+            238: 'INSTRUMENTED_POP_JUMP_IF_NONE', 239: 'INSTRUMENTED_POP_JUMP_IF_NOT_NONE',
+            240: 'INSTRUMENTED_RESUME', 241: 'INSTRUMENTED_CALL', 242: 'INSTRUMENTED_RETURN_VALUE',
+            243: 'INSTRUMENTED_YIELD_VALUE', 244: 'INSTRUMENTED_CALL_FUNCTION_EX',
+            245: 'INSTRUMENTED_JUMP_FORWARD', 246: 'INSTRUMENTED_JUMP_BACKWARD', 247: 'INSTRUMENTED_RETURN_CONST',
+            248: 'INSTRUMENTED_FOR_ITER', 249: 'INSTRUMENTED_POP_JUMP_IF_FALSE',
+            250: 'INSTRUMENTED_POP_JUMP_IF_TRUE', 251: 'INSTRUMENTED_END_FOR', 252: 'INSTRUMENTED_END_SEND',
+            253: 'INSTRUMENTED_INSTRUCTION', 254: 'INSTRUMENTED_LINE'
+        },
+        'jrel': (
+            'FOR_ITER', 'JUMP_BACKWARD', 'JUMP_BACKWARD_NO_INTERRUPT', 'JUMP_FORWARD', 'POP_JUMP_IF_FALSE',
+            'POP_JUMP_IF_NONE', 'POP_JUMP_IF_NOT_NONE', 'POP_JUMP_IF_TRUE', 'SEND'
+        ),
+        'jabs': (),
+        'hasconst': ('KW_NAMES', 'LOAD_CONST', 'RETURN_CONST'),
+        'hasname': (
+            'DELETE_ATTR', 'DELETE_GLOBAL', 'DELETE_NAME', 'IMPORT_FROM', 'IMPORT_NAME', 'LOAD_ATTR',
+            'LOAD_FROM_DICT_OR_GLOBALS', 'LOAD_GLOBAL', 'LOAD_NAME', 'LOAD_SUPER_ATTR', 'STORE_ATTR',
+            'STORE_GLOBAL', 'STORE_NAME'
+        ),
+        'haslocal': ('DELETE_FAST', 'LOAD_FAST', 'LOAD_FAST_AND_CLEAR', 'LOAD_FAST_CHECK', 'STORE_FAST'),
+        'hasfree': (
+            'DELETE_DEREF', 'LOAD_CLOSURE', 'LOAD_DEREF', 'LOAD_FROM_DICT_OR_DEREF', 'MAKE_CELL', 'STORE_DEREF'
+        ),
+        'caches': {
+            'BINARY_OP': 1, 'BINARY_SUBSCR': 1, 'CALL': 3, 'COMPARE_OP': 1, 'FOR_ITER': 1, 'LOAD_ATTR': 9,
+            'LOAD_GLOBAL': 4, 'LOAD_SUPER_ATTR': 1, 'SEND': 1, 'STORE_ATTR': 4, 'STORE_SUBSCR': 1,
+            'UNPACK_SEQUENCE': 1
+        },
+        'cmp_op': ('<', '<=', '==', '!=', '>', '>='),
+        'nb_ops': (
+            '+', '&', '//', '<<', '@', '*', '%', '|', '**', '>>', '-', '/', '^', '+=', '&=', '//=', '<<=', '@=',
+            '*=', '%=', '|=', '**=', '>>=', '-=', '/=', '^='
+        ),
+        'intrinsic1': (
+            'INTRINSIC_1_INVALID', 'INTRINSIC_PRINT', 'INTRINSIC_IMPORT_STAR', 'INTRINSIC_STOPITERATION_ERROR',
+            'INTRINSIC_ASYNC_GEN_WRAP', 'INTRINSIC_UNARY_POSITIVE', 'INTRINSIC_LIST_TO_TUPLE', 'INTRINSIC_TYPEVAR',
+            'INTRINSIC_PARAMSPEC', 'INTRINSIC_TYPEVARTUPLE', 'INTRINSIC_SUBSCRIPT_GENERIC', 'INTRINSIC_TYPEALIAS'
+        ),
+        'intrinsic2': (
+            'INTRINSIC_2_INVALID', 'INTRINSIC_PREP_RERAISE_STAR', 'INTRINSIC_TYPEVAR_WITH_BOUND',
+            'INTRINSIC_TYPEVAR_WITH_CONSTRAINTS', 'INTRINSIC_SET_FUNCTION_TYPE_PARAMS'
+        ),
+    },
+    (3, 13): {
+        'have_argument': 44,
+        'noarg': (
+            'INSTRUMENTED_CALL_FUNCTION_EX', 'INSTRUMENTED_END_FOR', 'INSTRUMENTED_END_SEND',
+            'INSTRUMENTED_INSTRUCTION', 'INSTRUMENTED_LINE', 'INSTRUMENTED_RETURN_VALUE', 'WITH_EXCEPT_START'
+        ),
+        'names': {
+            0: 'CACHE', 1: 'BEFORE_ASYNC_WITH', 2: 'BEFORE_WITH', 4: 'BINARY_SLICE', 5: 'BINARY_SUBSCR',
+            6: 'CHECK_EG_MATCH', 7: 'CHECK_EXC_MATCH', 8: 'CLEANUP_THROW', 9: 'DELETE_SUBSCR', 10: 'END_ASYNC_FOR',
+            11: 'END_FOR', 12: 'END_SEND', 13: 'EXIT_INIT_CHECK', 14: 'FORMAT_SIMPLE', 15: 'FORMAT_WITH_SPEC',
+            16: 'GET_AITER', 17: 'RESERVED', 18: 'GET_ANEXT', 19: 'GET_ITER', 20: 'GET_LEN',
+            21: 'GET_YIELD_FROM_ITER', 22: 'INTERPRETER_EXIT', 23: 'LOAD_ASSERTION_ERROR', 24: 'LOAD_BUILD_CLASS',
+            25: 'LOAD_LOCALS', 26: 'MAKE_FUNCTION', 27: 'MATCH_KEYS', 28: 'MATCH_MAPPING', 29: 'MATCH_SEQUENCE',
+            30: 'NOP', 31: 'POP_EXCEPT', 32: 'POP_TOP', 33: 'PUSH_EXC_INFO', 34: 'PUSH_NULL',
+            35: 'RETURN_GENERATOR', 36: 'RETURN_VALUE', 37: 'SETUP_ANNOTATIONS', 38: 'STORE_SLICE',
+            39: 'STORE_SUBSCR', 40: 'TO_BOOL', 41: 'UNARY_INVERT', 42: 'UNARY_NEGATIVE', 43: 'UNARY_NOT',
+            44: 'WITH_EXCEPT_START', 45: 'BINARY_OP', 46: 'BUILD_CONST_KEY_MAP', 47: 'BUILD_LIST', 48: 'BUILD_MAP',
+            49: 'BUILD_SET', 50: 'BUILD_SLICE', 51: 'BUILD_STRING', 52: 'BUILD_TUPLE', 53: 'CALL',
+            54: 'CALL_FUNCTION_EX', 55: 'CALL_INTRINSIC_1', 56: 'CALL_INTRINSIC_2', 57: 'CALL_KW',
+            58: 'COMPARE_OP', 59: 'CONTAINS_OP', 60: 'CONVERT_VALUE', 61: 'COPY', 62: 'COPY_FREE_VARS',
+            63: 'DELETE_ATTR', 64: 'DELETE_DEREF', 65: 'DELETE_FAST', 66: 'DELETE_GLOBAL', 67: 'DELETE_NAME',
+            68: 'DICT_MERGE', 69: 'DICT_UPDATE', 70: 'ENTER_EXECUTOR', 71: 'EXTENDED_ARG', 72: 'FOR_ITER',
+            73: 'GET_AWAITABLE', 74: 'IMPORT_FROM', 75: 'IMPORT_NAME', 76: 'IS_OP', 77: 'JUMP_BACKWARD',
+            78: 'JUMP_BACKWARD_NO_INTERRUPT', 79: 'JUMP_FORWARD', 80: 'LIST_APPEND', 81: 'LIST_EXTEND',
+            82: 'LOAD_ATTR', 83: 'LOAD_CONST', 84: 'LOAD_DEREF', 85: 'LOAD_FAST', 86: 'LOAD_FAST_AND_CLEAR',
+            87: 'LOAD_FAST_CHECK', 88: 'LOAD_FAST_LOAD_FAST', 89: 'LOAD_FROM_DICT_OR_DEREF',
+            90: 'LOAD_FROM_DICT_OR_GLOBALS', 91: 'LOAD_GLOBAL', 92: 'LOAD_NAME', 93: 'LOAD_SUPER_ATTR',
+            94: 'MAKE_CELL', 95: 'MAP_ADD', 96: 'MATCH_CLASS', 97: 'POP_JUMP_IF_FALSE', 98: 'POP_JUMP_IF_NONE',
+            99: 'POP_JUMP_IF_NOT_NONE', 100: 'POP_JUMP_IF_TRUE', 101: 'RAISE_VARARGS', 102: 'RERAISE',
+            103: 'RETURN_CONST', 104: 'SEND', 105: 'SET_ADD', 106: 'SET_FUNCTION_ATTRIBUTE', 107: 'SET_UPDATE',
+            108: 'STORE_ATTR', 109: 'STORE_DEREF', 110: 'STORE_FAST', 111: 'STORE_FAST_LOAD_FAST',
+            112: 'STORE_FAST_STORE_FAST', 113: 'STORE_GLOBAL', 114: 'STORE_NAME', 115: 'SWAP', 116: 'UNPACK_EX',
+            117: 'UNPACK_SEQUENCE', 118: 'YIELD_VALUE', 149: 'RESUME', 236: 'INSTRUMENTED_RESUME',
+            237: 'INSTRUMENTED_END_FOR', 238: 'INSTRUMENTED_END_SEND', 239: 'INSTRUMENTED_RETURN_VALUE',
+            240: 'INSTRUMENTED_RETURN_CONST', 241: 'INSTRUMENTED_YIELD_VALUE', 242: 'INSTRUMENTED_LOAD_SUPER_ATTR',
+            243: 'INSTRUMENTED_FOR_ITER', 244: 'INSTRUMENTED_CALL', 245: 'INSTRUMENTED_CALL_KW',
+            246: 'INSTRUMENTED_CALL_FUNCTION_EX', 247: 'INSTRUMENTED_INSTRUCTION',
+            248: 'INSTRUMENTED_JUMP_FORWARD', 249: 'INSTRUMENTED_JUMP_BACKWARD',
+            250: 'INSTRUMENTED_POP_JUMP_IF_TRUE', 251: 'INSTRUMENTED_POP_JUMP_IF_FALSE',
+            252: 'INSTRUMENTED_POP_JUMP_IF_NONE', 253: 'INSTRUMENTED_POP_JUMP_IF_NOT_NONE',
+            254: 'INSTRUMENTED_LINE'
+        },
+        'jrel': (
+            'FOR_ITER', 'JUMP_BACKWARD', 'JUMP_BACKWARD_NO_INTERRUPT', 'JUMP_FORWARD', 'POP_JUMP_IF_FALSE',
+            'POP_JUMP_IF_NONE', 'POP_JUMP_IF_NOT_NONE', 'POP_JUMP_IF_TRUE', 'SEND'
+        ),
+        'jabs': (),
+        'hasconst': ('INSTRUMENTED_RETURN_CONST', 'LOAD_CONST', 'RETURN_CONST'),
+        'hasname': (
+            'DELETE_ATTR', 'DELETE_GLOBAL', 'DELETE_NAME', 'IMPORT_FROM', 'IMPORT_NAME', 'LOAD_ATTR',
+            'LOAD_FROM_DICT_OR_GLOBALS', 'LOAD_GLOBAL', 'LOAD_NAME', 'LOAD_SUPER_ATTR', 'STORE_ATTR',
+            'STORE_GLOBAL', 'STORE_NAME'
+        ),
+        'haslocal': (
+            'DELETE_FAST', 'LOAD_FAST', 'LOAD_FAST_AND_CLEAR', 'LOAD_FAST_CHECK', 'LOAD_FAST_LOAD_FAST',
+            'STORE_FAST', 'STORE_FAST_LOAD_FAST', 'STORE_FAST_STORE_FAST'
+        ),
+        'hasfree': ('DELETE_DEREF', 'LOAD_DEREF', 'LOAD_FROM_DICT_OR_DEREF', 'MAKE_CELL', 'STORE_DEREF'),
+        'caches': {
+            'BINARY_OP': 1, 'BINARY_SUBSCR': 1, 'CALL': 3, 'COMPARE_OP': 1, 'CONTAINS_OP': 1, 'FOR_ITER': 1,
+            'JUMP_BACKWARD': 1, 'LOAD_ATTR': 9, 'LOAD_GLOBAL': 4, 'LOAD_SUPER_ATTR': 1, 'POP_JUMP_IF_FALSE': 1,
+            'POP_JUMP_IF_NONE': 1, 'POP_JUMP_IF_NOT_NONE': 1, 'POP_JUMP_IF_TRUE': 1, 'SEND': 1, 'STORE_ATTR': 4,
+            'STORE_SUBSCR': 1, 'TO_BOOL': 3, 'UNPACK_SEQUENCE': 1
+        },
+        'cmp_op': ('<', '<=', '==', '!=', '>', '>='),
+        'nb_ops': (
+            '+', '&', '//', '<<', '@', '*', '%', '|', '**', '>>', '-', '/', '^', '+=', '&=', '//=', '<<=', '@=',
+            '*=', '%=', '|=', '**=', '>>=', '-=', '/=', '^='
+        ),
+        'intrinsic1': (
+            'INTRINSIC_1_INVALID', 'INTRINSIC_PRINT', 'INTRINSIC_IMPORT_STAR', 'INTRINSIC_STOPITERATION_ERROR',
+            'INTRINSIC_ASYNC_GEN_WRAP', 'INTRINSIC_UNARY_POSITIVE', 'INTRINSIC_LIST_TO_TUPLE', 'INTRINSIC_TYPEVAR',
+            'INTRINSIC_PARAMSPEC', 'INTRINSIC_TYPEVARTUPLE', 'INTRINSIC_SUBSCRIPT_GENERIC', 'INTRINSIC_TYPEALIAS'
+        ),
+        'intrinsic2': (
+            'INTRINSIC_2_INVALID', 'INTRINSIC_PREP_RERAISE_STAR', 'INTRINSIC_TYPEVAR_WITH_BOUND',
+            'INTRINSIC_TYPEVAR_WITH_CONSTRAINTS', 'INTRINSIC_SET_FUNCTION_TYPE_PARAMS',
+            'INTRINSIC_SET_TYPEPARAM_DEFAULT'
+        ),
+    },
+}
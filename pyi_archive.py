@@ -0,0 +1,494 @@
+# pyi_archive.py - PyInstaller归档(CArchive/PYZ)解析
+import os
+import mmap
+import time
+import hashlib
+import struct
+import marshal
+import zlib
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+# CArchive cookie 魔数
+MAGIC = b'MEI\014\013\012\013\016'
+# PYZ 归档魔数
+PYZ_MAGIC = b'PYZ\0'
+
+# PyInstaller 2.0 的 cookie: magic, 包长度, TOC偏移, TOC长度, Python版本
+PYINST20_COOKIE_FORMAT = '!8siiii'
+PYINST20_COOKIE_SIZE = struct.calcsize(PYINST20_COOKIE_FORMAT)
+# PyInstaller 2.1+ 的 cookie 额外带有 64 字节的 Python 库名
+PYINST21_COOKIE_FORMAT = '!8sIIii64s'
+PYINST21_COOKIE_SIZE = struct.calcsize(PYINST21_COOKIE_FORMAT)
+
+# TOC 条目头: 条目长度, 偏移, 压缩后大小, 原始大小, 压缩标志, 类型
+TOC_ENTRY_FORMAT = '!iIIIBc'
+TOC_ENTRY_SIZE = struct.calcsize(TOC_ENTRY_FORMAT)
+
+# CArchive 条目类型
+TYPE_BINARY = b'b'
+TYPE_DEPENDENCY = b'd'
+TYPE_PYZ = b'z'
+TYPE_ZIPFILE = b'Z'
+TYPE_PYPACKAGE = b'M'
+TYPE_PYMODULE = b'm'
+TYPE_PYSOURCE = b's'
+TYPE_DATA = b'x'
+TYPE_RUNTIME_OPTION = b'o'
+TYPE_SPLASH = b'l'
+
+# PYZ 条目类型 (PyInstaller 3.1 之前为 ispkg 布尔值, 与前两项兼容)
+PYZ_ITEM_MODULE = 0
+PYZ_ITEM_PKG = 1
+PYZ_ITEM_DATA = 2
+PYZ_ITEM_NSPKG = 3
+
+# 流式解压时每次处理的块大小, 保证大文件解包时内存占用稳定
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# 快速扫描时只在文件末尾这么大的范围内搜索 cookie (签名证书等附加数据通常远小于此)
+SCAN_TAIL_SIZE = 1024 * 1024
+
+# 计算样本哈希时每次读取的块大小, 两块之间检查是否取消
+HASH_CHUNK_SIZE = 16 * 1024 * 1024
+
+# 启动脚本与运行时钩子, 不算作程序入口
+BOOTSTRAP_PREFIXES = ('pyiboot', 'pyi_rth_')
+# 使用 --key 加密时打包进来的密钥模块
+CRYPTO_KEY_MODULE = 'pyimod00_crypto_key'
+
+# 无法从归档中获取魔数时, 按Python版本回退使用的pyc魔数
+KNOWN_PYC_MAGIC = {
+    (2, 7): b'\x03\xf3\r\n',
+    (3, 3): b'\x9e\x0c\r\n',
+    (3, 4): b'\xee\x0c\r\n',
+    (3, 5): b'\x17\r\r\n',
+    (3, 6): b'3\r\r\n',
+    (3, 7): b'B\r\r\n',
+    (3, 8): b'U\r\r\n',
+    (3, 9): b'a\r\r\n',
+    (3, 10): b'o\r\r\n',
+    (3, 11): b'\xa7\r\r\n',
+    (3, 12): b'\xcb\r\r\n',
+    (3, 13): b'\xf3\r\r\n',
+}
+
+
+class ArchiveError(Exception):
+    """归档格式错误"""
+
+
+class TocEntry:
+    """CArchive TOC 条目"""
+
+    def __init__(self, position, compressed_size, uncompressed_size, compress_flag, type_code, name):
+        self.position = position
+        self.compressed_size = compressed_size
+        self.uncompressed_size = uncompressed_size
+        self.compress_flag = compress_flag
+        self.type_code = type_code
+        self.name = name
+
+    @property
+    def is_compressed(self):
+        return self.compress_flag == 1
+
+
+class PyzEntry:
+    """PYZ TOC 条目, position 为相对于 PYZ 起始处的偏移"""
+
+    def __init__(self, name, type_code, position, length):
+        self.name = name
+        self.type_code = type_code
+        self.position = position
+        self.length = length
+
+    @property
+    def is_package(self):
+        return self.type_code == PYZ_ITEM_PKG
+
+    def output_path(self):
+        """条目在 <PYZ>_extracted 目录下的相对路径"""
+        # 防止写出到目标目录之外
+        file_name = self.name.replace('..', '__').replace('.', '/')
+        if self.type_code == PYZ_ITEM_NSPKG:
+            return file_name
+        if self.is_package:
+            return file_name + '/__init__.pyc'
+        return file_name + '.pyc'
+
+
+def sanitize_name(name):
+    """规范化 TOC 中的条目名, 避免绝对路径和目录穿越"""
+    parts = []
+    for part in name.replace('\\', '/').split('/'):
+        if part in ('', '.'):
+            continue
+        if part == '..':
+            part = '__'
+        parts.append(part)
+    return '/'.join(parts)
+
+
+def build_pyc_header(magic, pyver):
+    """根据Python版本构造pyc文件头"""
+    if pyver >= (3, 7):
+        # PEP 552: 标志位 + (时间戳 + 大小) 或 哈希
+        return magic + b'\0' * 12
+    if pyver >= (3, 3):
+        # 时间戳 + 源文件大小
+        return magic + b'\0' * 8
+    # 仅时间戳
+    return magic + b'\0' * 4
+
+
+def has_pyc_header(data):
+    """判断数据是否已经带有pyc文件头 (PyInstaller 5.3 之前的模块条目)"""
+    return bytes(data[2:4]) == b'\r\n'
+
+
+def iter_decompress(data, chunk_size=STREAM_CHUNK_SIZE):
+    """分块解压 zlib 数据, 每次产出不超过 chunk_size 字节"""
+    decompressor = zlib.decompressobj()
+    for start in range(0, len(data), chunk_size):
+        buf = data[start:start + chunk_size]
+        while buf:
+            yield decompressor.decompress(buf, chunk_size)
+            buf = decompressor.unconsumed_tail
+    tail = decompressor.flush()
+    if not decompressor.eof:
+        raise zlib.error("压缩数据不完整")
+    if tail:
+        yield tail
+
+
+class CArchiveReader:
+    """PyInstaller CArchive 解析器
+
+    整个文件以只读方式映射到内存, 条目数据以 memoryview 切片的形式提供,
+    不会把成员读入额外的 bytes 对象。
+    """
+
+    def __init__(self, file_path, search_tail=None):
+        self.file_path = file_path
+        self.search_tail = search_tail
+        self.mmap = None
+        self.view = None
+        self.file_size = 0
+        self.cookie_pos = -1
+        self.pyinst_ver = 0
+        self.pyver = (0, 0)
+        self.pylib_name = ''
+        self.overlay_pos = 0
+        self.overlay_size = 0
+        self.toc_pos = 0
+        self.toc_size = 0
+        self.toc = []
+
+    def open(self):
+        """映射文件并解析 cookie 与 TOC"""
+        with open(self.file_path, 'rb') as f:
+            self.file_size = os.fstat(f.fileno()).st_size
+            if self.file_size == 0:
+                raise ArchiveError("文件为空")
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mmap)
+        try:
+            self.find_cookie()
+            self.parse_cookie()
+            self.parse_toc()
+        except Exception:
+            self.close()
+            raise
+        return self
+
+    def close(self):
+        if self.view is not None:
+            self.view.release()
+            self.view = None
+        if self.mmap is not None:
+            try:
+                self.mmap.close()
+            except BufferError:
+                # 仍有切片未释放时交给垃圾回收关闭映射
+                pass
+            self.mmap = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def read_at(self, position, size):
+        """返回映射中的只读切片, 不复制数据"""
+        return self.view[position:position + size]
+
+    def find_cookie(self):
+        """从文件末尾反向搜索 cookie 魔数, search_tail 限定只搜索末尾的字节数"""
+        start = max(0, self.file_size - self.search_tail) if self.search_tail else 0
+        self.cookie_pos = self.mmap.rfind(MAGIC, start)
+        if self.cookie_pos == -1:
+            raise ArchiveError("未找到 PyInstaller cookie, 文件可能不是 PyInstaller 打包的程序")
+        return self.cookie_pos
+
+    def parse_cookie(self):
+        """解析 cookie, 计算归档在文件中的位置"""
+        # 2.1+ 的 cookie 在 2.0 结构之后跟有 Python 库名
+        lib_name = bytes(self.read_at(self.cookie_pos + PYINST20_COOKIE_SIZE, 64))
+        if b'python' in lib_name.lower():
+            self.pyinst_ver = 21
+            cookie = self.read_at(self.cookie_pos, PYINST21_COOKIE_SIZE)
+            if len(cookie) < PYINST21_COOKIE_SIZE:
+                raise ArchiveError("cookie 数据不完整")
+            (_, package_len, toc_offset, toc_len, pyver, pylib_name) = struct.unpack(
+                PYINST21_COOKIE_FORMAT, cookie)
+            self.pylib_name = pylib_name.rstrip(b'\0').decode('utf-8', errors='replace')
+            cookie_size = PYINST21_COOKIE_SIZE
+        else:
+            self.pyinst_ver = 20
+            cookie = self.read_at(self.cookie_pos, PYINST20_COOKIE_SIZE)
+            if len(cookie) < PYINST20_COOKIE_SIZE:
+                raise ArchiveError("cookie 数据不完整")
+            (_, package_len, toc_offset, toc_len, pyver) = struct.unpack(PYINST20_COOKIE_FORMAT, cookie)
+            cookie_size = PYINST20_COOKIE_SIZE
+
+        # 版本号形如 27 / 312
+        if pyver >= 100:
+            self.pyver = (pyver // 100, pyver % 100)
+        else:
+            self.pyver = (pyver // 10, pyver % 10)
+
+        tail_bytes = self.file_size - self.cookie_pos - cookie_size
+        self.overlay_size = package_len + tail_bytes
+        self.overlay_pos = self.file_size - self.overlay_size
+        self.toc_pos = self.overlay_pos + toc_offset
+        self.toc_size = toc_len
+
+        if self.overlay_pos < 0 or self.toc_pos + self.toc_size > self.file_size:
+            raise ArchiveError("cookie 中的偏移超出文件范围")
+
+    def parse_toc(self):
+        """解析 CArchive TOC"""
+        data = self.read_at(self.toc_pos, self.toc_size)
+        self.toc = []
+        parsed = 0
+        unnamed = 0
+        while parsed + TOC_ENTRY_SIZE <= len(data):
+            (entry_size, position, compressed_size, uncompressed_size, compress_flag, type_code) = \
+                struct.unpack_from(TOC_ENTRY_FORMAT, data, parsed)
+            if entry_size < TOC_ENTRY_SIZE:
+                raise ArchiveError(f"TOC 条目长度无效: {entry_size}")
+
+            raw_name = bytes(data[parsed + TOC_ENTRY_SIZE:parsed + entry_size])
+            try:
+                name = sanitize_name(raw_name.rstrip(b'\0').decode('utf-8'))
+            except UnicodeDecodeError:
+                name = ''
+            if not name:
+                unnamed += 1
+                name = f"unknown_{unnamed}"
+
+            self.toc.append(TocEntry(self.overlay_pos + position, compressed_size, uncompressed_size,
+                                     compress_flag, type_code, name))
+            parsed += entry_size
+        return self.toc
+
+    def entry_view(self, entry):
+        """条目在映射中的原始(可能已压缩)数据"""
+        return self.read_at(entry.position, entry.compressed_size)
+
+    def read_entry(self, entry):
+        """读取条目数据; 未压缩的条目直接返回映射切片"""
+        data = self.entry_view(entry)
+        if entry.is_compressed:
+            return zlib.decompress(data)
+        return data
+
+    def read_entry_head(self, entry, size):
+        """只读取条目解压后的前 size 个字节"""
+        if not entry.is_compressed:
+            return bytes(self.read_at(entry.position, min(size, entry.compressed_size)))
+        return zlib.decompressobj().decompress(self.entry_view(entry), size)
+
+    def detect_pyc_magic(self):
+        """在写出任何文件之前确定pyc魔数"""
+        # PYZ 头部中的魔数最可靠
+        for entry in self.toc:
+            if entry.type_code in (TYPE_PYZ, TYPE_ZIPFILE):
+                head = self.read_entry_head(entry, 8)
+                if head[:4] == PYZ_MAGIC and len(head) == 8:
+                    return head[4:8]
+        # 其次是带有文件头的模块条目
+        for entry in self.toc:
+            if entry.type_code in (TYPE_PYMODULE, TYPE_PYPACKAGE):
+                head = self.read_entry_head(entry, 4)
+                if has_pyc_header(head):
+                    return head[:4]
+        return KNOWN_PYC_MAGIC.get(self.pyver, b'\0' * 4)
+
+    def open_pyz(self, entry):
+        """解析嵌入在 CArchive 中的 PYZ 归档"""
+        return PyzArchive.parse(self.read_entry(entry))
+
+
+class PyzArchive:
+    """PYZ 归档, data 可以是 bytes 或 CArchive 映射中的 memoryview"""
+
+    def __init__(self, data, pyc_magic, entries):
+        self.data = data
+        self.pyc_magic = pyc_magic
+        self.entries = entries
+
+    @classmethod
+    def parse(cls, data):
+        """解析 PYZ 头与 TOC"""
+        if bytes(data[:4]) != PYZ_MAGIC:
+            raise ArchiveError("PYZ 魔数不匹配")
+        pyc_magic = bytes(data[4:8])
+        (toc_pos,) = struct.unpack('!i', data[8:12])
+        try:
+            toc = marshal.loads(data[toc_pos:])
+        except (EOFError, ValueError, TypeError) as e:
+            raise ArchiveError(f"无法反序列化 PYZ TOC: {e}")
+
+        # PyInstaller 3.1+ 的 TOC 是元组列表
+        if isinstance(toc, dict):
+            toc = list(toc.items())
+
+        entries = []
+        for name, (type_code, position, length) in toc:
+            if isinstance(name, bytes):
+                name = name.decode('utf-8', errors='replace')
+            entries.append(PyzEntry(name, int(type_code), position, length))
+        return cls(data, pyc_magic, entries)
+
+    def read_entry(self, entry):
+        """PYZ 条目的原始(压缩)数据切片"""
+        return self.data[entry.position:entry.position + entry.length]
+
+
+class ScanInfo:
+    """快速扫描结果, 不解包任何成员"""
+
+    def __init__(self, path):
+        self.path = path
+        self.error = None
+        self.pyinst_ver = 0
+        self.pyinstaller_hint = ''
+        self.pyver = (0, 0)
+        self.entry_points = []
+        self.pyz_size = 0
+        self.encrypted = False
+        self.member_count = 0
+        self.elapsed = 0.0
+        # 以下字段只在 detail 扫描时填充, 供档案索引使用
+        # sha256 需要读取整个文件, 由调用方按需用 sample_sha256 计算
+        self.sha256 = ''
+        self.size = 0
+        self.mtime_ns = 0
+        self.pylib_name = ''
+        self.members = []  # (所属归档, 名称, 类型, 偏移, 存储大小, 原始大小, 是否压缩)
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def summary(self):
+        """单行摘要"""
+        if not self.ok:
+            return self.error
+        return (f"PyInstaller {self.pyinstaller_hint} | Python {self.pyver[0]}.{self.pyver[1]} | "
+                f"入口: {', '.join(self.entry_points) or '无'} | 成员: {self.member_count} | "
+                f"PYZ: {self.pyz_size / 1048576:.1f} MB | 加密: {'是' if self.encrypted else '否'}")
+
+
+def guess_pyinstaller_version(reader, names):
+    """根据 cookie 格式与引导模块名粗略推断 PyInstaller 版本"""
+    if reader.pyinst_ver == 20:
+        return '2.0'
+    # PyInstaller 6 移除了 --key 加密
+    encrypted = CRYPTO_KEY_MODULE in names
+    if 'pyimod01_archive' in names:
+        return '5.x' if encrypted else '5.x+'
+    if 'pyimod01_os_path' in names:
+        return '3.x-4.x'
+    return '3.x-5.x' if encrypted else '2.1+'
+
+
+def scan_archive(path, detail=False):
+    """只解析 cookie 与 TOC 获取样本概况, 用于决定是否值得完整解包
+
+    detail 为真时额外收集文件大小、修改时间与完整的 TOC, 同样不读取整个文件。
+    """
+    info = ScanInfo(path)
+    start = time.perf_counter()
+    try:
+        if detail:
+            # 解析失败的样本同样需要用大小与修改时间在索引中查找
+            stat = os.stat(path)
+            info.size = stat.st_size
+            info.mtime_ns = stat.st_mtime_ns
+        with CArchiveReader(path, search_tail=SCAN_TAIL_SIZE) as reader:
+            names = {entry.name for entry in reader.toc}
+            info.pyinst_ver = reader.pyinst_ver
+            info.pyver = reader.pyver
+            info.member_count = len(reader.toc)
+            if detail:
+                info.pylib_name = reader.pylib_name
+                info.members = [('', entry.name, entry.type_code.decode('ascii', errors='replace'),
+                                 entry.position, entry.compressed_size, entry.uncompressed_size,
+                                 entry.is_compressed) for entry in reader.toc]
+            info.entry_points = [entry.name for entry in reader.toc
+                                 if entry.type_code == TYPE_PYSOURCE and
+                                 not entry.name.startswith(BOOTSTRAP_PREFIXES)]
+
+            for entry in reader.toc:
+                if entry.type_code not in (TYPE_PYZ, TYPE_ZIPFILE):
+                    continue
+                info.pyz_size += entry.compressed_size
+                try:
+                    pyz = reader.open_pyz(entry)
+                except (ArchiveError, zlib.error):
+                    continue
+                info.member_count += len(pyz.entries)
+                names.update(pyz_entry.name for pyz_entry in pyz.entries)
+                if detail:
+                    # PYZ 条目单独压缩, 原始大小要解压后才知道
+                    info.members.extend((entry.name, pyz_entry.name, str(pyz_entry.type_code),
+                                         pyz_entry.position, pyz_entry.length, None, True)
+                                        for pyz_entry in pyz.entries)
+                del pyz
+
+            info.encrypted = CRYPTO_KEY_MODULE in names
+            info.pyinstaller_hint = guess_pyinstaller_version(reader, names)
+    except (ArchiveError, OSError, ValueError, struct.error) as e:
+        info.error = str(e)
+    info.elapsed = time.perf_counter() - start
+    return info
+
+
+def sample_sha256(path, should_stop=None):
+    """分块计算整个文件的 SHA-256, should_stop() 返回真时放弃并返回 None"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            if should_stop is not None and should_stop():
+                return None
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def scan_files(paths, workers=1, detail=False):
+    """并行扫描多个文件, 按输入顺序产出 ScanInfo"""
+    if workers <= 1 or len(paths) < 2:
+        for path in paths:
+            yield scan_archive(path, detail)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        yield from executor.map(partial(scan_archive, detail=detail), paths, chunksize=max(1, len(paths) // (workers * 8)))
+    finally:
+        # 调用方提前关闭生成器 (取消扫描) 时丢弃尚未开始的文件, 不等它们扫描完
+        executor.shutdown(wait=True, cancel_futures=True)
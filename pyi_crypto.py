@@ -0,0 +1,114 @@
+# pyi_crypto.py - PyInstaller --key 加密的 PYZ 条目解密
+import re
+import zlib
+import marshal
+
+try:
+    from Crypto.Cipher import AES
+except ImportError:
+    # 未安装 pycryptodome 时加密条目按原样写出
+    AES = None
+
+from pyi_archive import CRYPTO_KEY_MODULE, has_pyc_header
+
+CRYPT_BLOCK_SIZE = 16
+
+# 解密模式: PyInstaller 4.x/5.x 使用 tinyaes CTR, 3.x 使用 pycrypto CFB
+MODE_CTR = 'ctr'
+MODE_CFB = 'cfb'
+MODE_CFB128 = 'cfb128'
+CIPHER_MODES = (MODE_CTR, MODE_CFB, MODE_CFB128)
+
+# marshal 中的字符串类型标记 (去掉 FLAG_REF 位后): s/t/u/a/A/z/Z
+MARSHAL_STRING = re.compile(rb'[\x73\x74\x75\x61\x41\xf3\xf4\xf5\xe1\xc1](.{4})|[\x7a\x5a\xfa\xda](.)', re.S)
+KEY_MODULE_NAMES = {'key', '<module>', CRYPTO_KEY_MODULE}
+
+
+def normalize_key(key):
+    """与 PyInstaller 一致: 超长截断, 不足左侧补 0"""
+    if len(key) > CRYPT_BLOCK_SIZE:
+        return key[:CRYPT_BLOCK_SIZE]
+    return key.zfill(CRYPT_BLOCK_SIZE)
+
+
+def strip_pyc_header(data):
+    if not has_pyc_header(data):
+        return data
+    # 文件头长度随版本不同, 依次尝试能被 marshal 识别的偏移
+    for size in (16, 12, 8):
+        if data[size:size + 1] in (b'c', b'\xe3'):
+            return data[size:]
+    return data[16:]
+
+
+def find_key_constant(code_data):
+    """从不同 Python 版本的 marshal 数据中找出 key 常量
+
+    当前解释器版本不同时 marshal.loads 无法解析, 按字符串标记扫描常量,
+    第一个不是名字的字符串就是密钥。
+    """
+    for match in MARSHAL_STRING.finditer(code_data):
+        if match.group(1) is not None:
+            length = int.from_bytes(match.group(1), 'little')
+        else:
+            length = match.group(2)[0]
+        start = match.end()
+        value = code_data[start:start + length]
+        if not 0 < length <= 256 or len(value) != length:
+            continue
+        try:
+            text = value.decode('ascii')
+        except UnicodeDecodeError:
+            continue
+        if text.isprintable() and text not in KEY_MODULE_NAMES and not text.endswith('.py'):
+            return text
+    return None
+
+
+def load_crypto_key(module_data):
+    """解析 pyimod00_crypto_key 模块, 返回 16 字节密钥, 失败时返回 None"""
+    code_data = bytes(strip_pyc_header(bytes(module_data)))
+    try:
+        code = marshal.loads(code_data)
+        key = next(const for const in code.co_consts if isinstance(const, str))
+    except (ValueError, EOFError, TypeError, AttributeError, StopIteration):
+        key = find_key_constant(code_data)
+    if key is None:
+        return None
+    return normalize_key(key).encode('utf-8')
+
+
+class PyzCipher:
+    """PYZ 条目解密器, 只保存密钥与模式, 可以发送到工作进程
+
+    加密条目的格式为 16 字节 IV + 密文, 解密后是 zlib 压缩的 marshal 数据。
+    """
+
+    def __init__(self, key, mode=MODE_CTR):
+        self.key = key
+        self.mode = mode
+
+    def decrypt(self, data):
+        iv = bytes(data[:CRYPT_BLOCK_SIZE])
+        if self.mode == MODE_CTR:
+            # tinyaes 的 CTR 以整个 IV 作为初始计数器
+            cipher = AES.new(self.key, AES.MODE_CTR, nonce=b'', initial_value=iv)
+        elif self.mode == MODE_CFB:
+            cipher = AES.new(self.key, AES.MODE_CFB, iv=iv, segment_size=8)
+        else:
+            cipher = AES.new(self.key, AES.MODE_CFB, iv=iv, segment_size=128)
+        return cipher.decrypt(data[CRYPT_BLOCK_SIZE:])
+
+
+def detect_cipher(key, sample):
+    """用一个加密条目试出解密模式, 解密后能被 zlib 解压即为正确模式"""
+    if AES is None or len(sample) <= CRYPT_BLOCK_SIZE:
+        return None
+    for mode in CIPHER_MODES:
+        cipher = PyzCipher(key, mode)
+        try:
+            zlib.decompressobj().decompress(cipher.decrypt(sample), 64)
+        except zlib.error:
+            continue
+        return cipher
+    return None
@@ -0,0 +1,695 @@
+# pyi_extractor.py - PyInstaller可执行文件解包引擎
+import os
+import mmap
+import json
+import time
+import hashlib
+import zlib
+import itertools
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from content_store import ContentStore, link_file, remove_tree
+
+from pyi_archive import (CArchiveReader, ArchiveError, build_pyc_header, has_pyc_header, iter_decompress,
+                         PYZ_MAGIC, PYZ_ITEM_NSPKG, TYPE_DEPENDENCY, TYPE_RUNTIME_OPTION,
+                         TYPE_PYSOURCE, TYPE_PYMODULE, TYPE_PYPACKAGE, TYPE_PYZ, TYPE_ZIPFILE,
+                         CRYPTO_KEY_MODULE, sample_sha256)
+from pyi_crypto import AES, load_crypto_key, detect_cipher
+
+# 解包任务类型
+JOB_RAW = 0          # 原样写出
+JOB_PYC = 1          # 补全pyc文件头后写出
+JOB_MODULE = 2       # 缺少pyc文件头时才补全
+JOB_PYZ_ENTRY = 3    # PYZ 条目, 解压失败时按原样写出为 .encrypted
+
+# 成员数少于该值时不启动进程池, 进程启动开销大于收益
+PARALLEL_MIN_JOBS = 200
+
+# 进度事件的最短上报间隔(秒), 避免成员很多时刷屏
+PROGRESS_INTERVAL = 0.1
+
+# 解包目录中记录成员哈希的清单文件
+MANIFEST_NAME = '.pyi_manifest.json'
+MANIFEST_VERSION = 1
+
+# 暂存目录中记录已完成成员的检查点日志, 中断后据此继续
+JOURNAL_NAME = '.pyi_journal'
+JOURNAL_VERSION = 1
+# 检查点日志落盘的最短间隔(秒)
+JOURNAL_SYNC_INTERVAL = 1.0
+
+
+class ExtractCancelled(Exception):
+    """解包被用户取消"""
+    pass
+
+
+class ExtractJob:
+    """单个成员的解包任务, 只包含路径与偏移, 可以发送到工作进程
+
+    reuse_hash/reuse_path 来自上一次解包的清单: 成员内容哈希未变时,
+    直接把旧文件链接到新目录, 不再解压写出。
+    """
+    __slots__ = ('name', 'rel_path', 'source', 'position', 'size', 'compressed', 'kind', 'header',
+                 'reuse_hash', 'reuse_path')
+
+    def __init__(self, name, rel_path, source, position, size, compressed, kind, header=b''):
+        self.name = name
+        self.rel_path = rel_path
+        self.source = source
+        self.position = position
+        self.size = size
+        self.compressed = compressed
+        self.kind = kind
+        self.header = header
+        self.reuse_hash = None
+        self.reuse_path = None
+
+
+class JobResult:
+    """解包任务的结果, output 为实际写出的相对路径
+
+    reused 表示从上一次解包目录移入, linked 表示从内容仓库链接。
+    """
+    __slots__ = ('rel_path', 'output', 'size', 'digest', 'reused', 'linked', 'error')
+
+    def __init__(self, rel_path, output, size, digest, reused=False, linked=False, error=None):
+        self.rel_path = rel_path
+        self.output = output
+        self.size = size
+        self.digest = digest
+        self.reused = reused
+        self.linked = linked
+        self.error = error
+
+
+class ExtractProgress:
+    """解包进度事件
+
+    进度比例与剩余时间按归档中已处理的存储字节数估算,
+    单个超大成员也能反映真实进度。
+    """
+
+    def __init__(self, done, total, bytes_written, stored_done, stored_total, elapsed, current):
+        self.done = done
+        self.total = total
+        self.bytes_written = bytes_written
+        self.stored_done = stored_done
+        self.stored_total = stored_total
+        self.elapsed = elapsed
+        self.current = current
+
+    @property
+    def fraction(self):
+        if self.stored_total:
+            return self.stored_done / self.stored_total
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def rate(self):
+        """写出速度, 字节/秒"""
+        return self.bytes_written / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        """预计剩余秒数, 无法估算时为 None"""
+        fraction = self.fraction
+        if fraction <= 0:
+            return None
+        return self.elapsed * (1 - fraction) / fraction
+
+    def describe(self):
+        """供界面显示的进度文字"""
+        text = (f"已解包 {self.done}/{self.total} 个成员 | "
+                f"已写出 {self.bytes_written / 1048576:.1f} MB | {self.rate / 1048576:.1f} MB/s")
+        eta = self.eta
+        if eta is not None and self.done < self.total:
+            text += f" | 剩余约 {eta:.0f} 秒"
+        return text + f"\n当前: {self.current}"
+
+
+def output_path(output_dir, rel_path):
+    return os.path.join(output_dir, *rel_path.split('/'))
+
+
+def job_digest(job, data):
+    """成员内容哈希: 基于文件头与归档中存储的原始数据, 无需解压
+
+    写出方式与是否压缩也计入哈希, 存储字节相同但写出内容不同的成员
+    (如原样写出与补全文件头后写出) 不会共用同一个仓库文件。
+    """
+    digest = hashlib.sha256(f"{job.kind}:{int(job.compressed)}:".encode())
+    digest.update(job.header)
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def load_manifest(directory):
+    """读取上一次解包留下的清单, 不存在或格式不对时返回空字典"""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('members', {})
+
+
+def save_manifest(directory, source, members):
+    with open(os.path.join(directory, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'source': source, 'members': members},
+                  f, ensure_ascii=False, indent=1)
+
+
+def replace_directory(source_dir, target_dir, store=None):
+    """用 source_dir 替换 target_dir, 两者需位于同一文件系统"""
+    if not os.path.exists(target_dir):
+        os.rename(source_dir, target_dir)
+        return
+
+    # 目录无法直接覆盖, 先把旧目录挪开再删除
+    old_dir = target_dir + '.old'
+    if os.path.exists(old_dir):
+        remove_tree(old_dir, store=store)
+    os.rename(target_dir, old_dir)
+    os.rename(source_dir, target_dir)
+    remove_tree(old_dir, ignore_errors=True, store=store)
+
+
+def source_identity(file_path):
+    """用路径、大小与修改时间标识源文件, 判断检查点是否属于同一个样本"""
+    stat = os.stat(file_path)
+    return {'version': JOURNAL_VERSION, 'source': os.path.abspath(file_path),
+            'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+class CheckpointJournal:
+    """暂存目录中的检查点日志, 每行一个 JSON 对象
+
+    第一行为源文件标识, 之后每完成一个成员追加一行。
+    进程崩溃时最后一行可能不完整, 读取时忽略无法解析的行。
+    """
+
+    def __init__(self, directory, file_path):
+        self.path = os.path.join(directory, JOURNAL_NAME)
+        self.identity = source_identity(file_path)
+        self.file = None
+        self.last_sync = 0.0
+
+    def load(self):
+        """返回 rel_path -> 记录, 日志不存在或不属于当前样本时返回 None"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+        try:
+            if not lines or json.loads(lines[0]) != self.identity:
+                return None
+        except ValueError:
+            return None
+
+        completed = {}
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            completed[record['rel_path']] = record
+        return completed
+
+    def open(self, resume):
+        """开始记录; 不是继续上一次时重写文件头"""
+        self.file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        if not resume:
+            self.write(self.identity)
+            self.sync()
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def record(self, rel_path, output, entry, error):
+        self.write({'rel_path': rel_path, 'output': output, 'entry': entry, 'error': error})
+        now = time.monotonic()
+        if now - self.last_sync >= JOURNAL_SYNC_INTERVAL:
+            self.sync()
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.last_sync = time.monotonic()
+
+    def close(self):
+        if self.file:
+            self.sync()
+            self.file.close()
+            self.file = None
+
+    def remove(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def encrypted_message(job):
+    return f"[!] 解压 {job.rel_path} 失败, 可能已加密, 按原样写出"
+
+
+class MemberWriter:
+    """执行解包任务, 主进程串行解包与工作进程共用
+
+    cipher 不为空时, PYZ 条目在解压前先解密。
+    """
+
+    def __init__(self, output_dir, store_dir=None, cipher=None):
+        self.output_dir = output_dir
+        self.store = ContentStore(store_dir) if store_dir else None
+        self.cipher = cipher
+        self.sources = {}
+
+    def view(self, source):
+        """按源文件缓存只读映射"""
+        view = self.sources.get(source)
+        if view is None:
+            with open(source, 'rb') as f:
+                view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            self.sources[source] = view
+        return view
+
+    def run(self, job):
+        """执行任务, 返回 JobResult"""
+        data = self.view(job.source)[job.position:job.position + job.size]
+        path = output_path(self.output_dir, job.rel_path)
+        digest = job_digest(job, data)
+
+        # 内容未变化时直接复用上一次解包的文件
+        if digest == job.reuse_hash and os.path.isfile(job.reuse_path):
+            return self.reuse(job, path, digest)
+
+        # 内容仓库中已有相同内容时直接链接, 不再解压写出
+        if self.store and self.store.contains(digest):
+            self.store.checkout(digest, path)
+            return JobResult(job.rel_path, job.rel_path, os.path.getsize(path), digest, linked=True)
+
+        stored = data
+        if self.cipher and job.kind == JOB_PYZ_ENTRY:
+            data = self.cipher.decrypt(data)
+
+        try:
+            written = self.write(path, self.iter_job(job, data))
+        except zlib.error:
+            # 删除写了一半的文件
+            if os.path.exists(path):
+                os.remove(path)
+            if job.kind == JOB_PYZ_ENTRY:
+                written = self.write(path + '.encrypted', [stored])
+                return JobResult(job.rel_path, job.rel_path + '.encrypted', written, digest,
+                                 error=encrypted_message(job))
+            return JobResult(job.rel_path, None, 0, digest, error=f"[!] 解压失败: {job.rel_path}")
+
+        if self.store:
+            self.store.add(path, digest)
+        return JobResult(job.rel_path, job.rel_path, written, digest)
+
+    @staticmethod
+    def reuse(job, path, digest):
+        """把上一次解包的文件链接到新的输出位置
+
+        旧目录在新目录完成之前保持完整, 解包取消或失败时不会丢失文件。
+        不支持链接的文件系统 (FAT/exFAT、部分网络共享) 退化为复制, 不能移动旧文件。
+        """
+        output = job.rel_path
+        error = None
+        if job.reuse_path.endswith('.encrypted'):
+            output += '.encrypted'
+            path += '.encrypted'
+            error = encrypted_message(job)
+        link_file(job.reuse_path, path)
+        return JobResult(job.rel_path, output, os.path.getsize(path), digest, reused=True, error=error)
+
+    @staticmethod
+    def iter_job(job, data):
+        """解压数据并按需补全pyc文件头"""
+        if job.compressed:
+            chunks = iter_decompress(data)
+        else:
+            chunks = iter([data])
+
+        if job.kind == JOB_RAW:
+            return chunks
+        if job.kind == JOB_MODULE:
+            # PyInstaller 5.3 之前的模块条目自带pyc文件头
+            first = next(chunks, b'')
+            chunks = itertools.chain([first], chunks)
+            if has_pyc_header(first):
+                return chunks
+        return itertools.chain([job.header], chunks)
+
+    @staticmethod
+    def write(path, chunks):
+        """按块写出文件, memoryview 直接写入, 不经过中间拷贝"""
+        written = 0
+        with open(path, 'wb') as f:
+            for chunk in chunks:
+                written += f.write(chunk)
+        return written
+
+
+# 工作进程内的解包器, 由进程池初始化函数创建
+_worker_writer = None
+
+
+def _init_worker(output_dir, store_dir, cipher):
+    global _worker_writer
+    _worker_writer = MemberWriter(output_dir, store_dir, cipher)
+
+
+def _run_job(job):
+    return _worker_writer.run(job)
+
+
+class PyiExtractor:
+    """在进程内解包 PyInstaller 可执行文件, 输出布局与 pyinstxtractor.py 保持一致
+
+    workers 大于 1 时, 成员的解压与pyc文件头重建分发到进程池中执行,
+    完成情况仍按 TOC 顺序以 ExtractProgress 事件通过 on_progress 回调报告。
+    使用 --key 打包的样本从 pyimod00_crypto_key 中取出密钥, PYZ 条目的解密
+    随解压一起分批在工作进程中完成。
+    cancel_event (threading.Event) 被设置后, 在下一个成员之前抛出 ExtractCancelled。
+    hash_source 为真时在后台线程中与解包并行计算样本的 SHA-256, 完成后保存在 sha256 中,
+    样本索引直接使用, 不必在解包后再读一遍文件。
+    """
+
+    def __init__(self, file_path, log=None, workers=1, on_progress=None, store_dir=None,
+                 cancel_event=None, hash_source=False):
+        self.file_path = file_path
+        self.hash_source = hash_source
+        self.sha256 = None
+        self.log = log or (lambda message: None)
+        self.workers = max(1, workers)
+        self.store_dir = store_dir
+        self.on_progress = on_progress or (lambda progress: None)
+        self.cancel_event = cancel_event
+        self.reader = None
+        self.pyc_magic = b'\0' * 4
+        self.header = b''
+        self.cipher = None
+        self.manifest = {}
+        self.errors = []
+
+    def extract_to(self, target_dir):
+        """解包到与 target_dir 同一文件系统的暂存目录, 完成后整体重命名为 target_dir
+
+        target_dir 中已有上一次解包的结果时, 内容未变化的成员直接从旧目录链接。
+        取消或崩溃后暂存目录连同检查点日志一起保留, 再次解包同一样本时继续。
+        """
+        staging_dir = target_dir + '.partial'
+        store = ContentStore(self.store_dir) if self.store_dir else None
+        if os.path.exists(staging_dir) and CheckpointJournal(staging_dir, self.file_path).load() is None:
+            remove_tree(staging_dir, store=store)
+
+        previous_dir = target_dir if os.path.isdir(target_dir) else None
+        try:
+            written = self.extract(staging_dir, previous_dir)
+        except ExtractCancelled:
+            # 还没有开始写检查点时没有可继续的内容
+            if CheckpointJournal(staging_dir, self.file_path).load() is None:
+                remove_tree(staging_dir, ignore_errors=True, store=store)
+            raise
+        except BaseException:
+            # 解包失败时不留下半成品, 上一次的解包目录保持不变
+            remove_tree(staging_dir, ignore_errors=True, store=store)
+            raise
+        replace_directory(staging_dir, target_dir, store)
+        return written
+
+    def extract(self, output_dir, previous_dir=None):
+        """解包到 output_dir, 返回写出的文件数
+
+        previous_dir 为上一次解包的目录, 其清单中哈希一致的成员会被链接复用。
+        output_dir 中有同一样本的检查点日志时, 日志中已完成的成员直接跳过。
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        with CArchiveReader(self.file_path) as reader:
+            self.reader = reader
+            self.log(f"[+] 正在处理 {self.file_path}")
+            self.log(f"[+] PyInstaller 版本: {'2.1+' if reader.pyinst_ver == 21 else '2.0'}")
+            self.log(f"[+] Python 版本: {reader.pyver[0]}.{reader.pyver[1]}")
+            self.log(f"[+] 归档长度: {reader.overlay_size} 字节")
+            self.log(f"[+] CArchive 中共有 {len(reader.toc)} 个文件")
+
+            self.pyc_magic = reader.detect_pyc_magic()
+            self.header = build_pyc_header(self.pyc_magic, reader.pyver)
+            self.manifest = {}
+            self.cipher = None
+            jobs = self.plan(output_dir)
+
+        journal = CheckpointJournal(output_dir, self.file_path)
+        completed = journal.load()
+        pending, resumed_bytes = self.skip_completed(jobs, completed or {}, output_dir)
+        resumed = len(jobs) - len(pending)
+        if resumed:
+            self.log(f"[+] 从检查点继续, 跳过已完成的 {resumed} 个文件")
+
+        if previous_dir:
+            self.attach_previous(pending, previous_dir)
+
+        # 目录在分发任务前统一创建, 避免工作进程之间竞争
+        for directory in {os.path.dirname(output_path(output_dir, job.rel_path)) for job in pending}:
+            os.makedirs(directory, exist_ok=True)
+
+        written = 0
+        reused = 0
+        linked = 0
+        bytes_written = resumed_bytes
+        stored_total = sum(job.size for job in jobs)
+        stored_done = stored_total - sum(job.size for job in pending)
+        start = time.monotonic()
+        last_report = 0.0
+        journal.open(completed is not None)
+        hasher = None
+        if self.hash_source:
+            hasher = threading.Thread(target=self.hash_source_file, daemon=True)
+            hasher.start()
+        results = self.run_jobs(pending, output_dir)
+        try:
+            for done, (job, result) in enumerate(zip(pending, results), resumed + 1):
+                self.check_cancelled()
+                if result.error:
+                    self.error(result.error)
+                elif result.reused:
+                    reused += 1
+                elif result.linked:
+                    linked += 1
+                else:
+                    written += 1
+                entry = None
+                if result.output:
+                    entry = {
+                        'name': job.name,
+                        'offset': job.position,
+                        'compressed_size': job.size,
+                        'size': result.size,
+                        'hash': result.digest,
+                    }
+                    self.manifest[result.output] = entry
+                    journal.record(job.rel_path, result.output, entry, result.error)
+                bytes_written += result.size
+                stored_done += job.size
+
+                now = time.monotonic()
+                if now - last_report >= PROGRESS_INTERVAL or done == len(jobs):
+                    last_report = now
+                    self.on_progress(ExtractProgress(done, len(jobs), bytes_written, stored_done, stored_total,
+                                                     now - start, result.rel_path))
+        finally:
+            # 取消时关闭进程池, 丢弃尚未开始的任务
+            results.close()
+            journal.close()
+
+        save_manifest(output_dir, self.file_path, self.manifest)
+        journal.remove()
+        if hasher is not None:
+            # 只在解包成功时等待哈希; 取消时哈希线程发现取消标志后自行结束
+            hasher.join()
+
+        self.log(f"[+] 解包完成: {self.file_path}")
+        if reused:
+            self.log(f"[+] {reused} 个文件内容未变化, 已直接复用")
+        if linked:
+            self.log(f"[+] {linked} 个文件已从内容仓库链接")
+        self.log(f"[+] 共写出 {written} 个文件, 输出目录: {output_dir}")
+        return written + reused + linked + resumed
+
+    def skip_completed(self, jobs, completed, output_dir):
+        """去掉检查点日志中已完成且输出文件完整的任务, 返回仍需执行的任务与已完成的字节数"""
+        pending = []
+        resumed_bytes = 0
+        for job in jobs:
+            record = completed.get(job.rel_path)
+            if record is not None:
+                entry = record['entry']
+                path = output_path(output_dir, record['output'])
+                if (entry['offset'] == job.position and entry['compressed_size'] == job.size and
+                        os.path.isfile(path) and os.path.getsize(path) == entry['size']):
+                    self.manifest[record['output']] = entry
+                    resumed_bytes += entry['size']
+                    if record['error']:
+                        self.error(record['error'])
+                    continue
+            pending.append(job)
+        return pending, resumed_bytes
+
+    def attach_previous(self, jobs, previous_dir):
+        """根据上一次解包的清单为任务标记可复用的文件"""
+        previous = load_manifest(previous_dir)
+        if not previous:
+            return
+        # 清单以实际写出的路径为键, 加密条目带有 .encrypted 后缀
+        by_rel_path = {}
+        for output, member in previous.items():
+            if output.endswith('.encrypted') and self.cipher:
+                # 上一次未能解密, 这次需要重新解包
+                continue
+            rel_path = output[:-len('.encrypted')] if output.endswith('.encrypted') else output
+            by_rel_path[rel_path] = (output, member['hash'])
+
+        for job in jobs:
+            match = by_rel_path.get(job.rel_path)
+            if match:
+                job.reuse_path = output_path(previous_dir, match[0])
+                job.reuse_hash = match[1]
+
+    def run_jobs(self, jobs, output_dir):
+        """按提交顺序产出每个任务的结果"""
+        if self.workers == 1 or len(jobs) < PARALLEL_MIN_JOBS:
+            writer = MemberWriter(output_dir, self.store_dir, self.cipher)
+            for job in jobs:
+                self.check_cancelled()
+                yield writer.run(job)
+            return
+
+        self.log(f"[+] 使用 {self.workers} 个进程并行解包")
+        chunk_size = max(1, len(jobs) // (self.workers * 16))
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                       initargs=(output_dir, self.store_dir, self.cipher))
+        try:
+            yield from executor.map(_run_job, jobs, chunksize=chunk_size)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def plan(self, output_dir):
+        """遍历 TOC 生成解包任务列表"""
+        jobs = []
+        for entry in self.reader.toc:
+            self.check_cancelled()
+            # 依赖项与运行时选项不对应实际文件
+            if entry.type_code in (TYPE_DEPENDENCY, TYPE_RUNTIME_OPTION):
+                continue
+
+            if entry.type_code == TYPE_PYSOURCE:
+                self.log(f"[+] 可能的入口点: {entry.name}.pyc")
+                jobs.append(self.entry_job(entry, entry.name + '.pyc', JOB_PYC))
+            elif entry.type_code in (TYPE_PYMODULE, TYPE_PYPACKAGE):
+                jobs.append(self.entry_job(entry, entry.name + '.pyc', JOB_MODULE))
+            elif entry.type_code in (TYPE_PYZ, TYPE_ZIPFILE):
+                jobs.extend(self.plan_pyz(entry, output_dir))
+            else:
+                jobs.append(self.entry_job(entry, entry.name, JOB_RAW))
+        return jobs
+
+    def entry_job(self, entry, rel_path, kind):
+        return ExtractJob(entry.name, rel_path, self.file_path, entry.position, entry.compressed_size,
+                          entry.is_compressed, kind, self.header)
+
+    def plan_pyz(self, entry, output_dir):
+        """为 PYZ 文件本身及其中每个条目生成任务"""
+        try:
+            if self.reader.read_entry_head(entry, 4) != PYZ_MAGIC:
+                return [self.entry_job(entry, entry.name, JOB_RAW)]
+            pyz = self.reader.open_pyz(entry)
+        except (ArchiveError, zlib.error) as e:
+            self.error(f"[!] 无法解析 {entry.name}: {e}")
+            return [self.entry_job(entry, entry.name, JOB_RAW)]
+
+        if pyz.pyc_magic != self.pyc_magic:
+            self.log("[!] 警告: PYZ 中的pyc魔数与其他条目不一致, 以 PYZ 为准")
+            self.pyc_magic = pyz.pyc_magic
+            self.header = build_pyc_header(self.pyc_magic, self.reader.pyver)
+
+        if entry.is_compressed:
+            # 压缩存储的 PYZ 先解压写出, 其条目再从写出的文件中读取
+            source = output_path(output_dir, entry.name)
+            os.makedirs(os.path.dirname(source), exist_ok=True)
+            size = MemberWriter.write(source, [pyz.data])
+            self.manifest[entry.name] = {
+                'name': entry.name,
+                'offset': entry.position,
+                'compressed_size': entry.compressed_size,
+                'size': size,
+                'hash': hashlib.sha256(self.reader.entry_view(entry)).hexdigest(),
+            }
+            jobs = []
+            base = 0
+        else:
+            source = self.file_path
+            jobs = [self.entry_job(entry, entry.name, JOB_RAW)]
+            base = entry.position
+
+        self.log(f"[+] PYZ 归档 {entry.name} 中共有 {len(pyz.entries)} 个文件")
+        if self.cipher is None:
+            self.setup_cipher(pyz)
+        pyz_dir = entry.name + '_extracted'
+        for pyz_entry in pyz.entries:
+            rel_path = pyz_dir + '/' + pyz_entry.output_path()
+            if pyz_entry.type_code == PYZ_ITEM_NSPKG:
+                os.makedirs(output_path(output_dir, rel_path), exist_ok=True)
+                continue
+            jobs.append(ExtractJob(pyz_entry.name, rel_path, source, base + pyz_entry.position,
+                                   pyz_entry.length, True, JOB_PYZ_ENTRY, self.header))
+        return jobs
+
+    def setup_cipher(self, pyz):
+        """样本带有 pyimod00_crypto_key 时读取密钥并确定解密模式"""
+        key_entry = next((entry for entry in self.reader.toc if entry.name == CRYPTO_KEY_MODULE), None)
+        if key_entry is None:
+            return
+        if AES is None:
+            self.error("[!] PYZ 已加密, 但未安装 pycryptodome, 加密条目将按原样写出")
+            return
+        try:
+            key = load_crypto_key(self.reader.read_entry(key_entry))
+        except zlib.error:
+            key = None
+        if key is None:
+            self.error(f"[!] 无法从 {CRYPTO_KEY_MODULE} 中读取密钥")
+            return
+
+        self.log(f"[+] PYZ 已加密, 密钥: {key.decode('utf-8', errors='replace')}")
+        sample = next((pyz.read_entry(pyz_entry) for pyz_entry in pyz.entries
+                       if pyz_entry.type_code != PYZ_ITEM_NSPKG and pyz_entry.length), b'')
+        self.cipher = detect_cipher(key, sample)
+        if self.cipher is None:
+            self.error("[!] 无法确定 PYZ 的加密方式, 加密条目将按原样写出")
+        else:
+            self.log(f"[+] 解密模式: AES-{self.cipher.mode.upper()}")
+
+    def hash_source_file(self):
+        """后台线程: 计算样本哈希, 被取消或读取失败时 sha256 保持为 None"""
+        try:
+            self.sha256 = sample_sha256(self.file_path, self.is_cancelled)
+        except OSError:
+            self.sha256 = None
+
+    def is_cancelled(self):
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self.is_cancelled():
+            raise ExtractCancelled("解包已取消")
+
+    def error(self, message):
+        self.errors.append(message)
+        self.log(message)
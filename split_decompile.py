@@ -0,0 +1,382 @@
+# split_decompile.py - 函数级反编译: 把模块拆成代码对象并行反编译, 再拼回一个文件
+import os
+import re
+import shutil
+import tempfile
+
+from decompile_runner import (AutoDecompiler, DecompileTask, DecompileResult, MODE_CHAIN, SCORE_CLEAN,
+                              STATUS_OK, STATUS_FAILED, STATUS_CANCELLED, decode_output, format_version,
+                              pyc_version)
+from pyc_disasm import load_pyc, as_text, Disassembler, PycFormatError
+from code_units import walk_units, skeleton, unit_pyc, is_anonymous
+
+CO_COROUTINE = 0x80
+
+# 拼接结果中的说明都以这个标记开头, 便于搜索失败的函数
+MARKER = "# [函数级反编译]"
+INDENT = "    "
+
+# def/class 头最多跨越的行数 (参数很多时反编译器会换行)
+HEADER_LINES = 10
+
+# 反编译器输出开头的版本说明与空行
+BANNER_LINE = re.compile(r'^\s*(#.*)?$')
+# 类体作为模块反编译时多出的语句, py2 的类体以 return locals() 结束
+CLASS_BOILERPLATE = re.compile(r'^(__module__ = __name__|__qualname__ = .*|return locals\(\))$')
+CLASS_DOC = re.compile(r'^__doc__ = (.*)$')
+# 模块与函数末尾隐含的 return
+TRAILING_RETURN = re.compile(r'^return( None)?$')
+
+
+class SplitPart:
+    """拆分出的一个代码对象
+
+    模块与类体只保留本层 (内层有名字的函数和类换成空函数体), 函数连同
+    内层代码对象一起反编译。children 为需要拼回这一层的 SplitPart, 按常量顺序排列。
+    """
+
+    def __init__(self, unit, task):
+        self.unit = unit
+        self.task = task
+        self.children = []
+        self.result = None
+
+
+class SplitModule:
+    """一个被拆分的模块, parts 为全部 SplitPart, 第一个是模块本身"""
+
+    def __init__(self, task, version, parts):
+        self.task = task
+        self.version = version
+        self.parts = parts
+
+    @property
+    def root(self):
+        return self.parts[0]
+
+
+def splittable(unit):
+    """模块与类体中有名字的函数和类单独反编译; lambda 与推导式是表达式的一部分, 留在外层"""
+    return unit.parent is not None and unit.parent.is_container and not is_anonymous(unit.co)
+
+
+def split_module(task, work_dir):
+    """把一个 pyc 拆成代码对象写入 work_dir, 返回 SplitModule
+
+    无法解析或没有可拆分的函数时返回 None, 整个模块按原样反编译。
+    """
+    with open(task.input_path, 'rb') as f:
+        data = f.read()
+    try:
+        version, code = load_pyc(data)
+    except PycFormatError:
+        return None
+    units = walk_units(code, version)
+    if not any(splittable(unit) for unit in units):
+        return None
+
+    os.makedirs(work_dir, exist_ok=True)
+    parts = []
+    by_unit = {}
+    for unit in units:
+        if unit.parent is not None and not splittable(unit):
+            continue
+        if unit.parent is not None and id(unit.parent) not in by_unit:
+            # 已经包含在外层函数中
+            continue
+        path = os.path.join(work_dir, f"{len(parts)}.pyc")
+        part = SplitPart(unit, DecompileTask(path, os.path.splitext(path)[0] + ".py",
+                                             f"{task.rel_path}:{unit.key}"))
+        co = skeleton(unit.co, version) if unit.is_container else unit.co
+        with open(path, 'wb') as f:
+            f.write(unit_pyc(data, version, co))
+        parts.append(part)
+        if unit.parent is not None:
+            by_unit[id(unit.parent)].children.append(part)
+        if unit.is_container:
+            by_unit[id(unit)] = part
+    return SplitModule(task, version, parts)
+
+
+def read_text(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return decode_output(data)
+
+
+def format_docstring(doc):
+    if '\\' in doc or '"""' in doc or doc.endswith('"'):
+        return repr(doc)
+    return f'"""{doc}"""'
+
+
+def strip_banner(text):
+    """去掉反编译器输出开头的说明注释与空行, 返回行列表"""
+    lines = text.splitlines()
+    while lines and BANNER_LINE.match(lines[0]):
+        lines.pop(0)
+    return lines
+
+
+def clean_output(text, unit):
+    """去掉反编译器的说明注释以及代码对象单独反编译时多出的语句, 返回行列表"""
+    lines = strip_banner(text)
+    while lines and (not lines[-1].strip() or lines[-1].startswith('#')):
+        lines.pop()
+    if lines and TRAILING_RETURN.match(lines[-1]):
+        lines.pop()
+    if unit.is_container and unit.parent is not None:
+        lines = [line for line in lines if not CLASS_BOILERPLATE.match(line)]
+        if lines:
+            match = CLASS_DOC.match(lines[0])
+            if match:
+                lines[0] = match.group(1)
+    return lines
+
+
+def function_prologue(unit, version):
+    """函数单独反编译时丢失的文档字符串与 global 声明
+
+    函数的文档字符串是第 0 个常量, 函数体不会加载它; global 声明
+    只体现在 STORE_GLOBAL/DELETE_GLOBAL 指令上, 作为模块反编译时看不出来。
+    """
+    co = unit.co
+    disassembler = Disassembler(version)
+    code = co.code if isinstance(co.code, bytes) else b''
+    names = [as_text(name) for name in co.names or ()]
+    consts = co.consts or ()
+    loads_first = False
+    declared = []
+    for start, op, arg, next_pos in disassembler.instructions(code):
+        opname = disassembler.opnames.get(op)
+        if opname in disassembler.hasconst and arg == 0:
+            loads_first = True
+        elif opname in ('STORE_GLOBAL', 'DELETE_GLOBAL') and arg < len(names) and names[arg] not in declared:
+            declared.append(names[arg])
+    lines = []
+    if consts and isinstance(consts[0], (str, bytes)) and not loads_first:
+        lines.append(format_docstring(as_text(consts[0])))
+    if declared:
+        lines.append("global " + ", ".join(declared))
+    return lines
+
+
+def header_line(unit):
+    """找不到原有的 def/class 头时按代码对象生成一个, 默认值与装饰器无法还原"""
+    if unit.is_container:
+        return f"class {unit.name}:"
+    prefix = "async def" if unit.co.flags & CO_COROUTINE else "def"
+    return f"{prefix} {unit.name}({unit.signature()}):"
+
+
+def header_pattern(unit):
+    name = re.escape(unit.name)
+    if unit.is_container:
+        return re.compile(rf'^(\s*)class\s+{name}\b')
+    return re.compile(rf'^(\s*)(?:async\s+)?def\s+{name}\s*\(')
+
+
+def find_header(lines, unit, start):
+    """从 start 行起查找子代码对象的 def/class 头, 返回 (缩进, 头部最后一行的行号)"""
+    pattern = header_pattern(unit)
+    for index in range(start, len(lines)):
+        match = pattern.match(lines[index])
+        if not match:
+            continue
+        for end in range(index, min(index + HEADER_LINES, len(lines))):
+            if lines[end].rstrip().endswith(':'):
+                return match.group(1), end
+    return None
+
+
+def indent_lines(lines, indent):
+    """缩进放入外层的代码; 单独反编译时按顶层代码空两行, 放入外层后连续的空行合并为一行"""
+    result = []
+    for line in lines:
+        if line.strip():
+            result.append(indent + line)
+        elif result and result[-1]:
+            result.append('')
+    return result
+
+
+def stitch(lines, children):
+    """把子代码对象的文本放到外层文本中对应的 def/class 头下面, 替换空函数体
+
+    children 为 (CodeUnit, 行列表); 按顺序查找, 同名的函数依次对应。
+    找不到位置的附在末尾并加上说明。
+    """
+    lines = list(lines)
+    cursor = 0
+    orphans = []
+    for unit, body in children:
+        found = find_header(lines, unit, cursor)
+        if found is None:
+            orphans.append((unit, body))
+            continue
+        indent, end = found
+        # 空函数体: 头部之后缩进更深的行, 保留其后的空行
+        last = end
+        for index in range(end + 1, len(lines)):
+            line = lines[index]
+            if not line.strip():
+                continue
+            if len(line) - len(line.lstrip()) <= len(indent):
+                break
+            last = index
+        body = indent_lines(body, indent + INDENT)
+        lines[end + 1:last + 1] = body
+        cursor = end + 1 + len(body)
+    for unit, body in orphans:
+        lines += ["", f"{MARKER} 未在外层代码中找到 {unit.qualname} 的位置, 附在末尾", header_line(unit)]
+        lines += indent_lines(body, INDENT)
+    return lines
+
+
+class SplitDecompiler:
+    """函数级反编译
+
+    每个模块拆成模块本层、类体与函数几个独立的 pyc, 全部交给 AutoDecompiler
+    并行处理, 一个大模块也能用满全部 worker; 单个函数失败只影响这个函数,
+    其余部分仍然是源码。结果按 def/class 头拼回一个文件, 失败的函数体
+    换成说明和反汇编。无法拆分的模块整体反编译。
+
+    on_result 在每个代码对象完成后调用, on_planned(总数) 在拆分完成后调用。
+    run() 返回的结果与模块一一对应。
+    """
+
+    def __init__(self, engines, mode=MODE_CHAIN, workers=1, on_result=None, cancel_event=None, cache=None,
+                 on_planned=None):
+        self.engines = engines
+        self.decompiler = AutoDecompiler(engines, mode, workers, on_result, cancel_event, cache)
+        self.on_planned = on_planned or (lambda total: None)
+
+    def is_disassembly(self, result):
+        return any(engine.name == result.engine and engine.disassembler for engine in self.engines)
+
+    def can_split(self, task):
+        """只有反汇编引擎支持的版本拆开也得不到源码, 整体处理"""
+        pyver = pyc_version(task.input_path)
+        return any(engine.supports(pyver) and not engine.disassembler for engine in self.engines)
+
+    def run(self, tasks):
+        work_dir = tempfile.mkdtemp(prefix='py_re_tools_split_')
+        try:
+            modules = []
+            jobs = []
+            for index, task in enumerate(tasks):
+                module = None
+                if self.can_split(task):
+                    try:
+                        module = split_module(task, os.path.join(work_dir, str(index)))
+                    except OSError:
+                        # 读不到源文件或写不出拆分结果时整体反编译, 由引擎报告错误
+                        module = None
+                modules.append(module)
+                if module is None:
+                    jobs.append(task)
+                else:
+                    jobs += [part.task for part in module.parts]
+            self.on_planned(len(jobs))
+
+            results = {id(result.task): result for result in self.decompiler.run(jobs)}
+            # 结果与输入按顺序一一对应
+            output = []
+            for task, module in zip(tasks, modules):
+                if module is None:
+                    output.append(results[id(task)])
+                    continue
+                for part in module.parts:
+                    part.result = results[id(part.task)]
+                output.append(self.assemble(module))
+            return output
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def part_text(self, part, version):
+        """拼好的代码对象文本 (不带缩进); 返回 (行列表, 失败的 SplitPart 列表)"""
+        unit = part.unit
+        result = part.result
+        failed = []
+        if result.ok and result.score >= SCORE_CLEAN:
+            lines = clean_output(read_text(result.output_path), unit)
+            if not unit.is_container:
+                lines = function_prologue(unit, version) + lines
+        else:
+            failed.append(part)
+            if not result.ok:
+                reason = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else result.status
+            elif self.is_disassembly(result):
+                reason = f"只有 {result.engine} 的反汇编结果"
+            else:
+                reason = f"{result.engine} 的输出中有失败标记"
+            lines = [f"{MARKER} {unit.qualname} 反编译失败: {reason}"]
+            if result.ok:
+                # 不完整的输出与反汇编作为注释保留
+                lines += ["# " + line if line.strip() else "#"
+                          for line in strip_banner(read_text(result.output_path))]
+            if unit.is_container:
+                # 本层无法还原, 只保留内层的 def/class
+                for child in part.children:
+                    lines += ["", "", header_line(child.unit), INDENT + "pass"]
+
+        children = []
+        for child in part.children:
+            child_lines, child_failed = self.part_text(child, version)
+            children.append((child.unit, child_lines))
+            failed += child_failed
+        lines = stitch(lines, children)
+        if not any(line.strip() and not line.lstrip().startswith('#') for line in lines):
+            lines.append("pass")
+        return lines, failed
+
+    def assemble(self, module):
+        """把一个模块各部分的结果拼回源码文件, 返回模块的 DecompileResult"""
+        task = module.task
+        parts = module.parts
+        part_results = [part.result for part in parts]
+        if any(result.status == STATUS_CANCELLED for result in part_results):
+            result = DecompileResult(task, STATUS_CANCELLED)
+            result.pyver = module.version
+            return result
+
+        lines, failed = self.part_text(module.root, module.version)
+        decompiled = [part.result for part in parts if part not in failed]
+
+        # 按引擎合并各代码对象的尝试情况
+        attempts = {}
+        for part in parts:
+            name = part.result.engine if part not in failed else "失败"
+            count, score, elapsed = attempts.get(name, (0, 0, 0.0))
+            attempts[name] = (count + 1, score + part.result.score, elapsed + part.result.elapsed)
+        engines = sorted((name for name in attempts if name != "失败"), key=lambda name: -attempts[name][0])
+
+        header = [
+            f"{MARKER} {task.rel_path} (Python {format_version(module.version)})",
+            f"{MARKER} 代码对象 {len(parts)} 个, 成功 {len(decompiled)}, 失败 {len(failed)}",
+            "",
+        ]
+        os.makedirs(os.path.dirname(task.output_path), exist_ok=True)
+        with open(task.output_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(header + lines) + "\n")
+
+        status = STATUS_OK if any(result.ok for result in part_results) else STATUS_FAILED
+        stderr = "\n".join(f"{part.unit.qualname}: {part.result.stderr.strip() or part.result.status}"
+                           for part in failed)
+        result = DecompileResult(task, status, 0 if status == STATUS_OK else None,
+                                 sum(part_result.elapsed for part_result in part_results), stderr,
+                                 all(part_result.cached for part_result in part_results),
+                                 engines[0] if engines else '')
+        result.pyver = module.version
+        result.score = sum(part_result.score for part_result in part_results) // len(parts)
+        if decompiled and failed:
+            result.score = min(result.score, SCORE_CLEAN - 1)
+        result.attempts = [(name, f"{count} 个代码对象", score // count, elapsed)
+                           for name, (count, score, elapsed) in attempts.items()]
+        if failed:
+            result.note = f"函数级反编译失败 {len(failed)} 个: " + ", ".join(
+                part.unit.qualname for part in failed)
+        return result
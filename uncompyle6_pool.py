@@ -0,0 +1,211 @@
+# uncompyle6_pool.py - 常驻的 uncompyle6 工作进程池
+import io
+import time
+import queue
+import signal
+import traceback
+import threading
+import multiprocessing
+from contextlib import redirect_stdout, redirect_stderr
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from decompile_runner import (ResourceLimits, POLL_INTERVAL, STATUS_OK, STATUS_FAILED, STATUS_CANCELLED,
+                              STATUS_TIMEOUT)
+
+# 每个工作进程处理这么多文件后重启, 避免内存持续增长
+DEFAULT_MAX_JOBS = 500
+
+# 任务因分配失败而中止时返回的错误输出, 与 MEMORY_MARKERS 匹配
+MEMORY_ERROR = "MemoryError"
+
+
+def limit_cpu(seconds):
+    """CPU 时间限制是进程累计的, 每个任务开始前按已用时间重新设置软限制"""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + 1 + seconds
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def decompile_job(decompile_file, input_path, output_path):
+    """在工作进程中反编译一个文件, 返回 (退出码, 错误输出)"""
+    messages = io.StringIO()
+    try:
+        with open(output_path, 'w', encoding='utf-8') as out, \
+                redirect_stdout(messages), redirect_stderr(messages):
+            decompile_file(input_path, out)
+    except MemoryError:
+        # 超过内存限制时格式化异常信息也可能失败, 只返回固定的文字
+        return 1, MEMORY_ERROR
+    except Exception:
+        return 1, messages.getvalue() + traceback.format_exc()
+    return 0, messages.getvalue()
+
+
+def worker_main(conn, cpu_seconds, memory_mb):
+    """工作进程入口: 只导入一次 uncompyle6, 之后循环处理管道中的任务"""
+    if resource is not None and memory_mb:
+        ResourceLimits(memory_mb=memory_mb).apply()
+    try:
+        from uncompyle6.main import decompile_file
+    except ImportError as e:
+        conn.send(str(e))
+        return
+    conn.send(None)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        if resource is not None and cpu_seconds:
+            limit_cpu(cpu_seconds)
+        try:
+            result = decompile_job(decompile_file, *job)
+        except MemoryError:
+            # 关闭输出文件等收尾操作也可能分配失败
+            result = 1, MEMORY_ERROR
+        conn.send(result)
+
+
+class WarmWorker:
+    """一个常驻工作进程, 超时或异常退出后自动重启"""
+
+    def __init__(self, context, limits, max_jobs=DEFAULT_MAX_JOBS):
+        self.context = context
+        self.limits = limits
+        self.max_jobs = max_jobs
+        self.process = None
+        self.conn = None
+        self.ready = False
+        self.jobs = 0
+        self.closed = False
+        self.start()
+
+    def start(self):
+        self.conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(target=worker_main, daemon=True,
+                                            args=(child_conn, self.limits.cpu_seconds, self.limits.memory_mb))
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.jobs = 0
+
+    def stop(self):
+        if self.process is not None and self.process.is_alive():
+            self.process.kill()
+        if self.process is not None:
+            self.process.join()
+        self.conn.close()
+
+    def restart(self):
+        self.stop()
+        if not self.closed:
+            self.start()
+
+    def close(self):
+        self.closed = True
+        self.stop()
+
+    def wait(self, deadline=None, should_stop=None):
+        """等待管道中的下一条消息, 超时或被取消时返回对应的状态"""
+        while not self.conn.poll(POLL_INTERVAL):
+            if deadline is not None and time.monotonic() >= deadline:
+                return STATUS_TIMEOUT
+            if should_stop is not None and should_stop():
+                return STATUS_CANCELLED
+            if not self.process.is_alive() and not self.conn.poll():
+                raise EOFError
+        return None
+
+    def call(self, input_path, output_path, should_stop=None):
+        """处理一个文件, 返回 (退出码, 错误输出, 状态)"""
+        try:
+            # 第一个任务前等待工作进程导入 uncompyle6, 这段时间不计入超时
+            if not self.ready:
+                if self.wait(should_stop=should_stop) == STATUS_CANCELLED:
+                    return None, '', STATUS_CANCELLED
+                error = self.conn.recv()
+                if error is not None:
+                    self.restart()
+                    return None, f"无法导入 uncompyle6: {error}", STATUS_FAILED
+                self.ready = True
+
+            self.conn.send((input_path, output_path))
+            deadline = None if self.limits.timeout is None else time.monotonic() + self.limits.timeout
+            status = self.wait(deadline, should_stop)
+            if status is not None:
+                # 正在运行的任务无法中断, 只能终止整个工作进程
+                self.restart()
+                message = f"超过 {self.limits.timeout} 秒未完成, 已终止" if status == STATUS_TIMEOUT else ''
+                return None, message, status
+            returncode, stderr = self.conn.recv()
+        except (EOFError, OSError):
+            # 管道关闭时进程可能尚未完全退出, 等待后才能取得退出码
+            self.process.join(1)
+            exitcode = self.process.exitcode
+            self.restart()
+            if resource is not None and exitcode in (-signal.SIGXCPU, -signal.SIGKILL) and self.limits.cpu_seconds:
+                return exitcode, f"超过 CPU 时间限制 {self.limits.cpu_seconds} 秒, 已终止", STATUS_TIMEOUT
+            # 分配失败由工作进程作为任务结果返回, 其他原因的退出 (启动失败等) 都按失败处理
+            return exitcode, f"工作进程异常退出 (退出码 {exitcode})", STATUS_FAILED
+
+        if self.limits.memory_exceeded(returncode, stderr):
+            # 分配失败后进程状态不可靠, 重启工作进程
+            self.restart()
+            return returncode, stderr + f"\n超过内存限制 {self.limits.memory_mb} MB, 已终止", STATUS_TIMEOUT
+        self.jobs += 1
+        if self.jobs >= self.max_jobs:
+            self.restart()
+        return returncode, stderr, STATUS_OK if returncode == 0 else STATUS_FAILED
+
+
+class Uncompyle6Pool:
+    """size 个预先启动的 uncompyle6 工作进程, 任务通过队列分配给空闲进程
+
+    每个进程只导入一次 uncompyle6 并构造一次语法分析器, 之后的文件只有
+    反编译本身的开销。run 可以在多个线程中同时调用, 空闲进程不足时等待。
+    """
+
+    def __init__(self, size, limits=None, max_jobs=DEFAULT_MAX_JOBS):
+        # 界面进程中有多个线程, 统一用 spawn 启动工作进程
+        context = multiprocessing.get_context('spawn')
+        self.size = max(1, size)
+        self.limits = limits or ResourceLimits()
+        self.workers = [WarmWorker(context, self.limits, max_jobs) for _ in range(self.size)]
+        self.idle = queue.Queue()
+        for worker in self.workers:
+            self.idle.put(worker)
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def run(self, input_path, output_path, should_stop=None):
+        """反编译一个文件, 源码写入 output_path, 返回 (退出码, 错误输出, 状态)"""
+        while True:
+            if self.closed or (should_stop is not None and should_stop()):
+                return None, '', STATUS_CANCELLED
+            try:
+                worker = self.idle.get(timeout=POLL_INTERVAL)
+                break
+            except queue.Empty:
+                pass
+        try:
+            return worker.call(input_path, output_path, should_stop)
+        finally:
+            self.idle.put(worker)
+
+    def close(self):
+        """终止全部工作进程"""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+        for worker in self.workers:
+            worker.close()